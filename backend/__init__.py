@@ -1,12 +1,11 @@
 # -*- coding: utf-8 -*-
 """
 Flask 애플리케이션 팩토리 모듈
-MQTT, SocketIO, SQLAlchemy 등 확장 모듈 초기화
+SocketIO, SQLAlchemy 등 확장 모듈 초기화 (MQTT는 mqtt_client의 paho 클라이언트 하나로 처리)
 """
 
 from flask import Flask
 from flask_cors import CORS
-from flask_mqtt import Mqtt
 from flask_socketio import SocketIO
 from flask_sqlalchemy import SQLAlchemy
 
@@ -14,7 +13,6 @@ from .server_configuration.appConfig import config
 
 # 전역 인스턴스 (싱글톤)
 db = SQLAlchemy()
-mqtt = Mqtt()
 socketio = SocketIO()
 
 
@@ -43,20 +41,21 @@ def create_app(config_name='development'):
     # SQLAlchemy 초기화
     db.init_app(app)
     
-    # MQTT 초기화 (production 환경에서만)
-    if config_name != 'testing':
-        try:
-            mqtt.init_app(app)
-        except Exception as e:
-            app.logger.warning(f"MQTT 초기화 실패: {e}")
-    
-    # SocketIO 초기화
+    # 수집 워커(PROCESS_ROLE='ingest')는 paho 클라이언트만 직접 시작
+    role = app.config.get('PROCESS_ROLE', 'all')
+
+    # SocketIO 초기화 (SOCKETIO_MESSAGE_QUEUE 설정 시 워커 간 룸 공유)
+    from .emit_bus import socketio_queue_options
+    from .codec import SocketIOJSON
     socketio.init_app(
         app,
+        json=SocketIOJSON,
         cors_allowed_origins=app.config.get('CORS_ORIGINS', '*'),
         async_mode='gevent',
         logger=True,
-        engineio_logger=True
+        engineio_logger=True,
+        # 수집 워커는 발송만 하므로 메시지 큐 수신 없이 발송 전용으로 연결
+        **socketio_queue_options(app, write_only=(role == 'ingest'))
     )
     
     # 데이터베이스 테이블 생성
@@ -70,14 +69,14 @@ def create_app(config_name='development'):
     register_blueprints(app)
     
     # MQTT 핸들러 등록
-    if config_name != 'testing':
+    if config_name != 'testing' and role != 'ingest':
         register_mqtt_handlers(app)
     
     # Socket 핸들러 등록
     register_socket_handlers(app)
     
     # 백그라운드 스레드 시작
-    if config_name != 'testing':
+    if config_name != 'testing' and role != 'ingest':
         start_background_threads(app)
     
     return app
@@ -88,31 +87,32 @@ def register_blueprints(app):
     from .api.api_band import band_bp
     from .api.api_nervestim import nervestim_bp
     from .api.dashboard import dashboard_bp
+    from .api.scheduler import scheduler_bp
     # from .api.api_create import create_api_blueprints
 
     # 커스텀 API
     app.register_blueprint(band_bp, url_prefix='/api/Wellsafer/v1')
     app.register_blueprint(nervestim_bp, url_prefix='/api/Wellsafer/v1')
     app.register_blueprint(dashboard_bp, url_prefix='/api/Wellsafer/v1/dashboard')
+    app.register_blueprint(scheduler_bp, url_prefix='/api/Wellsafer/v1/scheduler')
 
     # Flask-Restless 자동 생성 API (임시로 주석 처리)
     # create_api_blueprints(app)
 
 
 def register_mqtt_handlers(app):
-    """MQTT 핸들러 등록"""
-    # 커스텀 MQTT 클라이언트 초기화 (paho-mqtt 사용)
+    """MQTT 클라이언트 초기화 (수신/발송 모두 paho 연결 하나 사용)"""
     from .mqtt_client import init_mqtt
-    init_mqtt(app, socketio)
-
-    # 기존 Flask-MQTT 핸들러도 등록 (호환성)
-    try:
-        from .api import mqtt as mqtt_handler
-        from .api import mqtt_nervestim
-        mqtt_handler.register_handlers(mqtt, socketio, app)
-        mqtt_nervestim.register_handlers(mqtt, socketio, app)
-    except Exception as e:
-        app.logger.warning(f"Flask-MQTT handlers registration failed: {e}")
+
+    if app.config.get('PROCESS_ROLE', 'all') == 'all':
+        init_mqtt(app, socketio)
+    else:
+        # 'web' 역할: 수신은 수집 워커가 담당하고 기기 명령 발송용으로만 연결
+        init_mqtt(app, socketio, ingest=False)
+
+        # 수집 워커가 DB에 쓴 최신 측정값을 주기적으로 읽어 옴
+        from .latest_vitals import init_latest_vitals
+        init_latest_vitals(app, refresh=True)
 
 
 def register_socket_handlers(app):
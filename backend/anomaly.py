@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+생체신호 이상 감지 모듈
+밴드별로 측정값 스트림을 따라가며 이상 구간(에피소드)마다 이벤트를 한 번만 발생시킨다.
+
+- 이동 평균: 최근 window개 측정값의 평균으로 판단 (단발성 잡음 무시)
+- 디바운스: 평균이 진입 기준을 debounce초 이상 벗어나야 에피소드 시작
+- 히스테리시스: 진입(enter)과 해제(exit) 기준을 분리하고, 해제 기준을 clear_after초 유지해야 종료
+"""
+
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+
+# 기본 기준값 (실시간 전송의 경보 수준 판단에도 사용)
+HR_HIGH_THRESHOLD = 120
+HR_LOW_THRESHOLD = 50
+SPO2_LOW_THRESHOLD = 95
+
+# 규칙: type은 events.type 코드, direction은 'high'(기준 초과가 이상) 또는 'low'(기준 미만이 이상)
+Rule = namedtuple('Rule', [
+    'name', 'type', 'field', 'direction', 'enter', 'exit',
+    'window', 'debounce', 'clear_after'
+])
+
+DEFAULT_RULES = (
+    Rule('hr_high', 8, 'hr', 'high', HR_HIGH_THRESHOLD, 110, window=5, debounce=10, clear_after=30),
+    Rule('hr_low', 9, 'hr', 'low', HR_LOW_THRESHOLD, 55, window=5, debounce=10, clear_after=30),
+    Rule('spo2_low', 10, 'spo2', 'low', SPO2_LOW_THRESHOLD, 96, window=5, debounce=10, clear_after=30),
+)
+
+# 규칙에서 밴드/처방별로 바꿀 수 있는 값
+TUNABLE = ('enter', 'exit', 'window', 'debounce', 'clear_after')
+
+# 에피소드 시작 알림: started_at은 평균이 처음 기준을 벗어난 시각, detected_at은 이벤트 발생 시각
+Onset = namedtuple('Onset', ['rule', 'value', 'started_at', 'detected_at'])
+
+NORMAL, PENDING, ACTIVE, CLEARING = range(4)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def apply_overrides(rules, overrides):
+    """
+    규칙 기준값 변경
+
+    Args:
+        rules: Rule 목록
+        overrides: {'hr_high': {'enter': 130, 'exit': 115}, ...} (규칙 이름 → 바꿀 값)
+
+    Returns:
+        tuple: 변경된 Rule 목록
+    """
+    if not overrides:
+        return tuple(rules)
+
+    result = []
+    for rule in rules:
+        changes = {
+            key: value for key, value in (overrides.get(rule.name) or {}).items()
+            if key in TUNABLE and value is not None
+        }
+        if 'window' in changes:
+            changes['window'] = max(1, int(changes['window']))
+        result.append(rule._replace(**changes) if changes else rule)
+    return tuple(result)
+
+
+class RuleState:
+    """규칙 하나의 밴드별 상태 (측정값 수와 관계없이 window 크기로 고정)"""
+
+    __slots__ = ('rule', 'values', 'index', 'count', 'total', 'state', 'since', 'started_at', 'peak')
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.values = [0] * rule.window     # 이동 평균용 링 버퍼
+        self.index = 0
+        self.count = 0
+        self.total = 0
+        self.state = NORMAL
+        self.since = None       # PENDING/CLEARING 시작 시각
+        self.started_at = None  # 현재 에피소드 시작 시각
+        self.peak = None        # 현재 에피소드 최대 이탈값
+
+    def reset(self):
+        self.index = self.count = self.total = 0
+        self.state = NORMAL
+        self.since = self.started_at = self.peak = None
+
+    def observe(self, value, at):
+        """
+        측정값 반영
+
+        Args:
+            value: 측정값
+            at: 측정 시각 (epoch 초)
+
+        Returns:
+            Onset: 에피소드가 시작되었으면 Onset, 아니면 None
+        """
+        rule = self.rule
+        if self.count == rule.window:
+            self.total -= self.values[self.index]
+        else:
+            self.count += 1
+        self.values[self.index] = value
+        self.total += value
+        self.index = (self.index + 1) % rule.window
+        mean = self.total / self.count
+
+        if rule.direction == 'high':
+            abnormal = mean > rule.enter
+            recovered = mean <= rule.exit
+            worse = self.peak is None or value > self.peak
+        else:
+            abnormal = mean < rule.enter
+            recovered = mean >= rule.exit
+            worse = self.peak is None or value < self.peak
+
+        state = self.state
+        if state == NORMAL:
+            if abnormal:
+                self.state, self.since, self.peak = PENDING, at, value
+                state = PENDING
+            else:
+                return None
+
+        if state == PENDING:
+            if not abnormal:
+                self.state, self.since, self.peak = NORMAL, None, None
+                return None
+            if worse:
+                self.peak = value
+            if at - self.since < rule.debounce:
+                return None
+            self.state, self.started_at = ACTIVE, self.since
+            return Onset(rule, self.peak, self.started_at, at)
+
+        if state == ACTIVE:
+            if recovered:
+                self.state, self.since = CLEARING, at
+        elif not recovered:
+            self.state, self.since = ACTIVE, None
+        elif at - self.since >= rule.clear_after:
+            self.reset_episode()
+        return None
+
+    def reset_episode(self):
+        """에피소드 종료 (이동 평균은 유지)"""
+        self.state = NORMAL
+        self.since = self.started_at = self.peak = None
+
+    @property
+    def in_episode(self):
+        return self.state in (ACTIVE, CLEARING)
+
+
+class BandDetector:
+    """밴드 하나의 규칙별 상태"""
+
+    __slots__ = ('rules', 'last_at', 'loaded_at')
+
+    def __init__(self, rules, loaded_at=0.0):
+        self.rules = [RuleState(rule) for rule in rules]
+        self.last_at = None
+        self.loaded_at = loaded_at
+
+    def observe(self, reading, at, gap_reset):
+        """측정값 하나를 모든 규칙에 반영하고 시작된 에피소드 목록 반환"""
+        # 측정 공백(밴드 미착용, 통신 두절) 후에는 이전 평균을 버림
+        if self.last_at is not None and (at - self.last_at > gap_reset or at < self.last_at - gap_reset):
+            for state in self.rules:
+                state.reset()
+        self.last_at = at
+
+        onsets = []
+        for state in self.rules:
+            value = getattr(reading, state.rule.field, None)
+            # 0은 피부 접촉이 없을 때의 값이므로 측정값으로 보지 않음
+            if not value:
+                continue
+            onset = state.observe(value, at)
+            if onset is not None:
+                onsets.append(onset)
+        return onsets
+
+
+class AnomalyDetector:
+    """
+    밴드별 이상 감지기
+
+    밴드마다 규칙별 고정 크기 상태만 유지하며, 같은 밴드의 측정값은
+    MQTT 디스패처가 한 워커에서 순서대로 처리하므로 밴드 상태에는 잠금이 없다.
+    규칙 기준값은 기본값 ← 설정(ANOMALY_RULES) ← 밴드별 설정(ANOMALY_RULES_BY_BAND)
+    ← 유효한 처방의 vital_thresholds 순으로 덮어쓴다.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, profile_loader=None, profile_ttl=300,
+                 gap_reset=300, clock=time.monotonic):
+        """
+        Args:
+            rules: 기본 규칙
+            profile_loader: bands.id를 받아 처방 기준값(overrides)을 반환하는 함수
+            profile_ttl: 밴드별 기준값 재적재 주기 (초)
+            gap_reset: 이 시간(초) 이상 측정값이 없으면 이동 평균 초기화
+            clock: 기준값 재적재 판단용 시계 (테스트용)
+        """
+        self.rules = tuple(rules)
+        self.band_overrides = {}
+        self.profile_loader = profile_loader if profile_loader is not None else _load_prescription_thresholds
+        self.profile_ttl = profile_ttl
+        self.gap_reset = gap_reset
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._bands = {}
+        self._observed = 0
+        self._onsets = 0
+        self._profile_errors = 0
+
+    def init_app(self, app):
+        """설정값 적용"""
+        self.rules = apply_overrides(DEFAULT_RULES, app.config.get('ANOMALY_RULES'))
+        self.band_overrides = dict(app.config.get('ANOMALY_RULES_BY_BAND') or {})
+        self.profile_ttl = app.config.get('ANOMALY_PROFILE_TTL', self.profile_ttl)
+        self.gap_reset = app.config.get('ANOMALY_GAP_RESET', self.gap_reset)
+        self.invalidate()
+
+    def _rules_for(self, band):
+        """밴드에 적용할 규칙 (설정 → 처방 순으로 덮어씀)"""
+        rules = apply_overrides(self.rules, self.band_overrides.get(band.bid))
+        try:
+            prescription = self.profile_loader(band.id)
+        except Exception:
+            self._profile_errors += 1
+            prescription = None
+        return apply_overrides(rules, prescription)
+
+    def _detector(self, band):
+        detector = self._bands.get(band.id)
+        now = self._clock()
+        if detector is not None:
+            # 에피소드 진행 중에는 기준을 바꾸지 않음
+            if now - detector.loaded_at < self.profile_ttl or any(s.in_episode for s in detector.rules):
+                return detector
+            rules = self._rules_for(band)
+            if rules == tuple(s.rule for s in detector.rules):
+                detector.loaded_at = now
+                return detector
+
+        detector = BandDetector(self._rules_for(band), now)
+        with self._lock:
+            self._bands[band.id] = detector
+        return detector
+
+    def observe(self, band, reading):
+        """
+        측정값 반영
+
+        Args:
+            band: BandInfo
+            reading: SensorReading (datetime은 기기 측정 시각)
+
+        Returns:
+            list: 이번 측정값으로 시작된 Onset 목록 (대부분 빈 목록)
+        """
+        at = (reading.datetime - _EPOCH).total_seconds()
+        onsets = self._detector(band).observe(reading, at, self.gap_reset)
+        self._observed += 1
+        if onsets:
+            self._onsets += len(onsets)
+        return onsets
+
+    def invalidate(self, band_id=None):
+        """밴드(없으면 전체) 상태 및 기준값 초기화 (처방 변경 시 호출)"""
+        with self._lock:
+            if band_id is None:
+                self._bands = {}
+            else:
+                self._bands.pop(band_id, None)
+
+    def get_stats(self):
+        """감지 통계"""
+        with self._lock:
+            active = sum(
+                1 for detector in self._bands.values()
+                if any(s.in_episode for s in detector.rules)
+            )
+            return {
+                'bands': len(self._bands),
+                'active_episodes': active,
+                'observed': self._observed,
+                'onsets': self._onsets,
+                'profile_errors': self._profile_errors,
+                'rules': {rule.name: {k: getattr(rule, k) for k in TUNABLE} for rule in self.rules}
+            }
+
+
+def _load_prescription_thresholds(band_id):
+    """유효한 최신 처방의 vital_thresholds (앱 컨텍스트 필요)"""
+    from backend.db import models as db_models
+    Prescription = db_models.Prescription
+
+    now = datetime.utcnow()
+    try:
+        prescription = Prescription.query.filter(
+            Prescription.FK_bid == band_id,
+            Prescription.is_active.is_(True),
+            Prescription.vital_thresholds.isnot(None),
+            (Prescription.valid_until.is_(None)) | (Prescription.valid_until > now)
+        ).order_by(Prescription.created_at.desc()).first()
+    except Exception:
+        # 같은 세션으로 이어지는 센서 데이터 저장이 실패하지 않도록 롤백
+        db_models.db.session.rollback()
+        raise
+    return prescription.vital_thresholds if prescription else None
+
+
+# 전역 인스턴스
+anomaly_detector = AnomalyDetector()
+
+
+def init_anomaly(app):
+    """설정값 적용"""
+    anomaly_detector.init_app(app)
+    return anomaly_detector
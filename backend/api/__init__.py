@@ -8,7 +8,6 @@ Blueprint 등록
 from . import api_band
 from . import api_nervestim
 # from . import api_create  # SQLAlchemy 2.0 호환 문제로 비활성화
-from . import mqtt
 from . import mqtt_nervestim
 from . import socket
 from . import thread
@@ -19,6 +18,7 @@ from .dashboard import dashboard_bp
 from .bands import bands_bp
 from .nervestim import nervestim_bp
 from .events import events_bp
+from .scheduler import scheduler_bp
 
 
 def register_blueprints(app):
@@ -35,5 +35,6 @@ def register_blueprints(app):
     app.register_blueprint(bands_bp, url_prefix=f'{api_prefix}/bands')
     app.register_blueprint(nervestim_bp, url_prefix=f'{api_prefix}/nervestim')
     app.register_blueprint(events_bp, url_prefix=f'{api_prefix}/events')
+    app.register_blueprint(scheduler_bp, url_prefix=f'{api_prefix}/scheduler')
     
     app.logger.info(f"API blueprints registered with prefix: {api_prefix}")
@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from backend import db
 from backend.db.table import User, Band, SensorData, Event
 from backend.db.service import query, select
+from backend.utils import encode_cursor, decode_cursor
+from backend.api.bands import band_list_item, BAND_LIST_MAX_LIMIT
 
 band_bp = Blueprint('band', __name__)
 
@@ -204,39 +206,38 @@ def get_dashboard_events():
 @band_bp.route('/bands/list', methods=['GET'])
 @token_required
 def get_bands_list():
-    """밴드 목록 조회"""
+    """밴드 목록 조회 (단일 쿼리, 커서 페이지네이션)"""
     include_offline = request.args.get('include_offline', 'true').lower() == 'true'
+    connect_state = request.args.get('connect_state', type=int)
+    if connect_state is None and not include_offline:
+        connect_state = 1
+    name = request.args.get('name')
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = min(max(limit, 1), BAND_LIST_MAX_LIMIT)
+
+    cursor = request.args.get('cursor')
+    after = decode_cursor(cursor, 3, types=(int, str, int))
+    if cursor and after is None:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    rows, has_more = select.get_band_list_page(
+        connect_state=connect_state, name=name, after=after, limit=limit
+    )
 
-    if include_offline:
-        bands = select.get_all_bands()
-    else:
-        bands = select.get_online_bands()
-
-    # 각 밴드에 최신 센서 데이터 추가
-    result = []
-    for band in bands:
-        band_dict = band.to_dict()
-
-        # 최신 센서 데이터 조회
-        latest_sensor = SensorData.query.filter_by(FK_bid=band.id)\
-            .order_by(SensorData.datetime.desc()).first()
-
-        if latest_sensor:
-            band_dict['latest_hr'] = latest_sensor.hr
-            band_dict['latest_spo2'] = latest_sensor.spo2
-            band_dict['battery'] = latest_sensor.battery_level or 0
-            current_app.logger.info(f"Band {band.bid} - HR: {latest_sensor.hr}, SpO2: {latest_sensor.spo2}, Battery: {latest_sensor.battery_level}")
-        else:
-            band_dict['latest_hr'] = 0
-            band_dict['latest_spo2'] = 0
-            band_dict['battery'] = 0
+    # 각 밴드에 최신 센서 데이터, 24시간 이벤트 수 포함
+    result = [band_list_item(row) for row in rows]
 
-        result.append(band_dict)
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.connect_state or 0, last.name or '', last.id)
 
     return jsonify({
         'success': True,
         'data': result,
-        'total': len(result)
+        'total': len(result),
+        'next_cursor': next_cursor
     })
 
 
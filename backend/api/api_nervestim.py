@@ -6,7 +6,6 @@
 
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
-import json
 
 # Import 순서 중요: db 패키지를 먼저 import한 후 SQLAlchemy 인스턴스를 import
 from backend.db.table import (
@@ -17,11 +16,18 @@ from backend.db.service import query, select
 from backend.api.api_band import token_required
 
 # SQLAlchemy db는 마지막에 import (덮어쓰기 방지)
-from backend import db, mqtt, socketio
+from backend import db, socketio
+from backend.mqtt_client import publish
 
 nervestim_bp = Blueprint('nervestim', __name__)
 
 
+def _publish(topic, payload):
+    """기기 명령 발송 (수신과 같은 MQTT 연결 사용, 연결이 없으면 예외)"""
+    if not publish(topic, payload):
+        raise ConnectionError(f"MQTT publish to {topic} failed")
+
+
 # ============================================================
 # 신경자극 세션 API
 # ============================================================
@@ -181,7 +187,7 @@ def create_session():
             }
 
             try:
-                mqtt.publish(mqtt_topic, json.dumps(mqtt_payload))
+                _publish(mqtt_topic, mqtt_payload)
                 current_app.logger.info(f"[NERVESTIM] MQTT 시작 명령 전송: {mqtt_topic}")
             except Exception as mqtt_error:
                 current_app.logger.error(f"[NERVESTIM] MQTT 전송 실패: {str(mqtt_error)}")
@@ -282,7 +288,7 @@ def start_session(session_id):
     }
     
     try:
-        mqtt.publish(mqtt_topic, json.dumps(mqtt_payload))
+        _publish(mqtt_topic, mqtt_payload)
     except Exception as e:
         current_app.logger.error(f"MQTT publish failed: {e}")
         return jsonify({'error': 'Failed to send command to device'}), 500
@@ -329,7 +335,7 @@ def stop_session(session_id):
     }
     
     try:
-        mqtt.publish(mqtt_topic, json.dumps(mqtt_payload))
+        _publish(mqtt_topic, mqtt_payload)
     except Exception as e:
         current_app.logger.error(f"MQTT publish failed: {e}")
     
@@ -398,7 +404,7 @@ def change_level(session_id):
     }
     
     try:
-        mqtt.publish(mqtt_topic, json.dumps(mqtt_payload))
+        _publish(mqtt_topic, mqtt_payload)
     except Exception as e:
         current_app.logger.error(f"MQTT publish failed: {e}")
         return jsonify({'error': 'Failed to send command'}), 500
@@ -9,51 +9,77 @@ from datetime import datetime, timedelta
 from sqlalchemy import func, desc
 from backend.db.models import db, Band, SensorData, Event, NervestimulationStatus
 from backend.utils import token_required, admin_required, success_response, error_response, paginate_query
+from backend.utils import encode_cursor, decode_cursor
+from backend.db.service import select
+from backend.band_cache import invalidate_band
+from backend.latest_vitals import latest_vitals
 
 bands_bp = Blueprint('bands', __name__)
 
+# 목록 API 한 페이지 최대 항목 수
+BAND_LIST_MAX_LIMIT = 500
+
 
 @bands_bp.route('/list', methods=['GET'])
 @token_required
 def get_band_list():
     """
-    밴드 목록 조회
+    밴드 목록 조회 (단일 쿼리, 커서 페이지네이션)
     
-    GET /api/Wellsafer/v1/bands/list?include_offline=true
+    GET /api/Wellsafer/v1/bands/list?include_offline=true&connect_state=1&name=홍&limit=100&cursor=...
     """
     include_offline = request.args.get('include_offline', 'true').lower() == 'true'
+    connect_state = request.args.get('connect_state', type=int)
+    if connect_state is None and not include_offline:
+        connect_state = 1
+    name = request.args.get('name')
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = min(max(limit, 1), BAND_LIST_MAX_LIMIT)
 
-    query = Band.query  # is_active는 @property라서 필터링 제거
+    cursor = request.args.get('cursor')
+    after = decode_cursor(cursor, 3, types=(int, str, int))
+    if cursor and after is None:
+        return error_response('Invalid cursor', 400)
 
-    if not include_offline:
-        query = query.filter_by(connect_state=1)
+    rows, has_more = select.get_band_list_page(
+        connect_state=connect_state, name=name, after=after, limit=limit
+    )
 
-    # wearer_name은 @property라서 name으로 정렬
-    bands = query.order_by(Band.connect_state.desc(), Band.name).all()
-    
-    result = []
-    for band in bands:
-        # 최신 센서 데이터
-        latest_sensor = SensorData.query.filter_by(FK_bid=band.id)\
-            .order_by(SensorData.datetime.desc()).first()
+    result = [band_list_item(row) for row in rows]
 
-        band_dict = band.to_dict()
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.connect_state or 0, last.name or '', last.id)
 
-        if latest_sensor:
-            band_dict['latest_hr'] = latest_sensor.hr
-            band_dict['latest_spo2'] = latest_sensor.spo2
-            band_dict['battery'] = latest_sensor.battery_level or 0
-            band_dict['last_data_at'] = latest_sensor.datetime.isoformat()
-            current_app.logger.info(f"Band {band.bid} - Found sensor data: hr={latest_sensor.hr}, spo2={latest_sensor.spo2}, battery={latest_sensor.battery_level}")
-        else:
-            band_dict['latest_hr'] = 0
-            band_dict['latest_spo2'] = 0
-            band_dict['battery'] = 0
-            current_app.logger.info(f"Band {band.bid} (id={band.id}) - No sensor data found")
+    return jsonify({
+        'success': True,
+        'data': result,
+        'next_cursor': next_cursor
+    })
 
-        result.append(band_dict)
-    
-    return success_response(result)
+
+def band_list_item(row):
+    """
+    get_band_list_page() 결과 행을 목록 응답 항목으로 변환
+
+    센서 데이터가 아직 DB에 적재되지 않았으면 최신 생체신호 저장소 값을 사용
+    """
+    band, hr, spo2, battery_level, sensor_datetime, event_count = row
+    band_dict = band.to_dict()
+
+    live = latest_vitals.get(band.id)
+    if live is not None and live.datetime and (sensor_datetime is None or live.datetime > sensor_datetime):
+        hr, spo2, battery_level, sensor_datetime = live.hr, live.spo2, live.battery_level, live.datetime
+
+    band_dict['latest_hr'] = hr or 0
+    band_dict['latest_spo2'] = spo2 or 0
+    band_dict['battery'] = battery_level or 0
+    if sensor_datetime:
+        band_dict['last_data_at'] = sensor_datetime.isoformat()
+    band_dict['event_count_24h'] = event_count
+    return band_dict
 
 
 @bands_bp.route('/<bid>/detail', methods=['GET'])
@@ -263,6 +289,9 @@ def create_band():
     
     db.session.add(band)
     db.session.commit()
+
+    # 미등록 bid로 캐시되어 있을 수 있으므로 무효화 (수집 워커 포함)
+    invalidate_band(bid)
     
     return success_response(band.to_dict(), status_code=201)
 
@@ -291,6 +320,8 @@ def update_band(bid):
     
     band.updated_at = datetime.utcnow()
     db.session.commit()
+
+    invalidate_band(bid)
     
     return success_response(band.to_dict())
 
@@ -311,6 +342,8 @@ def delete_band(bid):
     band.is_active = False
     band.updated_at = datetime.utcnow()
     db.session.commit()
+
+    invalidate_band(bid)
     
     return success_response(message='Band deleted successfully')
 
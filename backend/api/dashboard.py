@@ -8,63 +8,23 @@ from flask import Blueprint, jsonify, request, g
 from datetime import datetime, timedelta
 from backend.db.models import db, Band, Event, SensorData, NervestimulationStatus, NervestimulationHist
 from backend.utils import token_required, success_response, error_response
+from backend.latest_vitals import latest_vitals
+from backend.dashboard_summary import dashboard_summary
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
 
 def get_dashboard_summary():
     """
-    대시보드 요약 데이터 생성
+    대시보드 요약 데이터 생성 (메모리 캐시 조회)
+    
+    카운터는 MQTT/이벤트/세션 경로에서 증분 갱신되고 주기적으로 DB와 대조됨
+    (backend/dashboard_summary.py)
     
     Returns:
         dict: 대시보드 요약 데이터
     """
-    # 밴드 통계
-    total_bands = Band.query.count()
-    online_bands = Band.query.filter_by(connect_state=1).count()
-    offline_bands = total_bands - online_bands
-
-    # 오늘 날짜 범위
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
-
-    # 이벤트 통계
-    unread_events = Event.query.filter(Event.action_status == 0).count()
-    urgent_events = Event.query.filter(
-        Event.type.in_([6, 7, 8, 9, 10]),
-        Event.action_status != 2
-    ).count()
-    
-    today_events = Event.query.filter(
-        Event.datetime >= today_start,
-        Event.datetime < today_end
-    ).count()
-    
-    # 신경자극 통계
-    today_sessions = NervestimulationHist.query.filter(
-        NervestimulationHist.started_at >= today_start,
-        NervestimulationHist.started_at < today_end
-    ).count()
-    
-    active_sessions = NervestimulationStatus.query.filter_by(status=1).count()
-    
-    # 신경자극기 연결 밴드 수 (stimulator_connected는 @property라서 직접 필터링 불가)
-    # 모든 밴드를 가져와서 Python에서 필터링
-    all_bands = Band.query.all()
-    stimulator_connected = sum(1 for b in all_bands if b.stimulator_connected)
-    
-    return {
-        'total_bands': total_bands,
-        'online_bands': online_bands,
-        'offline_bands': offline_bands,
-        'unread_events': unread_events,
-        'urgent_events': urgent_events,
-        'today_events': today_events,
-        'today_sessions': today_sessions,
-        'active_sessions': active_sessions,
-        'stimulator_connected': stimulator_connected,
-        'timestamp': datetime.utcnow().isoformat()
-    }
+    return dashboard_summary.get_summary()
 
 
 @dashboard_bp.route('', methods=['GET'])
@@ -122,9 +82,8 @@ def get_bands_status():
     
     result = []
     for band in bands:
-        # 최신 센서 데이터
-        latest_sensor = SensorData.query.filter_by(FK_bid=band.id)\
-            .order_by(SensorData.datetime.desc()).first()
+        # 최신 센서 데이터 (메모리 저장소에서 조회)
+        latest_sensor = latest_vitals.get(band.id)
         
         # 최근 24시간 이벤트 수
         yesterday = datetime.utcnow() - timedelta(days=1)
@@ -148,6 +107,25 @@ def get_bands_status():
     return success_response(result)
 
 
+@dashboard_bp.route('/ingest-status', methods=['GET'])
+@token_required
+def get_ingest_status():
+    """
+    센서 데이터 적재 큐 상태 (큐 길이, flush 지연 시간, 중복 제거, 이상 감지, 오프라인 감지)
+
+    GET /api/Wellsafer/v1/dashboard/ingest-status
+    """
+    from backend.ingest import sensor_ingest
+    from backend.dedup import message_dedup
+    from backend.anomaly import anomaly_detector
+    from backend.band_presence import band_presence
+    stats = sensor_ingest.get_stats()
+    stats['dedup'] = message_dedup.get_stats()
+    stats['anomaly'] = anomaly_detector.get_stats()
+    stats['presence'] = band_presence.get_stats()
+    return success_response(stats)
+
+
 @dashboard_bp.route('/statistics', methods=['GET'])
 @token_required
 def get_statistics():
@@ -10,9 +10,10 @@ from flask import current_app
 
 from backend.db.service import query, select
 from backend.db.table import SessionStatus, EndReason, EventType
+from backend.dashboard_summary import report_stimulator_connected
 
 
-# 구독 토픽 목록
+# 처리 토픽 (구독과 분배는 mqtt_client의 수집 엔진이 담당)
 SUBSCRIBE_TOPICS = [
     '/DT/eHG4/NerveStim/Connect',      # 신경자극기 연결
     '/DT/eHG4/NerveStim/Disconnect',   # 신경자극기 연결 해제
@@ -22,73 +23,6 @@ SUBSCRIBE_TOPICS = [
 ]
 
 
-def register_handlers(mqtt, socketio, app):
-    """신경자극 MQTT 핸들러 등록"""
-    
-    # 추가 토픽 구독
-    @mqtt.on_connect()
-    def on_nervestim_connect(client, userdata, flags, rc):
-        if rc == 0:
-            for topic in SUBSCRIBE_TOPICS:
-                mqtt.subscribe(topic)
-                app.logger.info(f"NerveStim subscribed to {topic}")
-    
-    @mqtt.on_topic('/DT/eHG4/NerveStim/Connect')
-    def on_stimulator_connect(client, userdata, message):
-        """신경자극기 BLE 연결 처리"""
-        try:
-            payload = json.loads(message.payload.decode('utf-8'))
-        except:
-            return
-        
-        with app.app_context():
-            handle_stimulator_connect(payload, socketio, app)
-    
-    @mqtt.on_topic('/DT/eHG4/NerveStim/Disconnect')
-    def on_stimulator_disconnect(client, userdata, message):
-        """신경자극기 BLE 연결 해제 처리"""
-        try:
-            payload = json.loads(message.payload.decode('utf-8'))
-        except:
-            return
-        
-        with app.app_context():
-            handle_stimulator_disconnect(payload, socketio, app)
-    
-    @mqtt.on_topic('/DT/eHG4/NerveStim/Status')
-    def on_stim_status(client, userdata, message):
-        """자극 상태 변경 처리"""
-        try:
-            payload = json.loads(message.payload.decode('utf-8'))
-        except:
-            return
-        
-        with app.app_context():
-            handle_stim_status(payload, socketio, app)
-    
-    @mqtt.on_topic('/DT/eHG4/NerveStim/Complete')
-    def on_stim_complete(client, userdata, message):
-        """자극 완료 처리"""
-        try:
-            payload = json.loads(message.payload.decode('utf-8'))
-        except:
-            return
-        
-        with app.app_context():
-            handle_stim_complete(payload, socketio, app)
-    
-    @mqtt.on_topic('/DT/eHG4/NerveStim/Error')
-    def on_stim_error(client, userdata, message):
-        """자극 오류 처리"""
-        try:
-            payload = json.loads(message.payload.decode('utf-8'))
-        except:
-            return
-        
-        with app.app_context():
-            handle_stim_error(payload, socketio, app)
-
-
 def handle_stimulator_connect(payload, socketio, app):
     """
     신경자극기 연결 처리
@@ -108,6 +42,7 @@ def handle_stimulator_connect(payload, socketio, app):
     
     # 밴드 상태 업데이트
     query.update_band_stimulator_connection(bid, True, stimulator_id)
+    report_stimulator_connected(bid, True)
     
     app.logger.info(f"Stimulator {stimulator_id} connected to band {bid}")
     
@@ -141,6 +76,7 @@ def handle_stimulator_disconnect(payload, socketio, app):
     
     # 밴드 상태 업데이트
     query.update_band_stimulator_connection(bid, False)
+    report_stimulator_connected(bid, False)
     
     app.logger.info(f"Stimulator {stimulator_id} disconnected from band {bid}, reason: {reason}")
     
@@ -154,7 +90,7 @@ def handle_stimulator_disconnect(payload, socketio, app):
         )
         
         # 이벤트 생성
-        band = select.get_band_by_bid(bid)
+        band = select.get_band_info_by_bid(bid)
         if band:
             query.insert_event(
                 band.id,
@@ -267,7 +203,7 @@ def handle_stim_error(payload, socketio, app):
     # 이벤트 생성
     bid = payload.get('bid')
     if bid:
-        band = select.get_band_by_bid(bid)
+        band = select.get_band_info_by_bid(bid)
         if band:
             query.insert_event(
                 band.id,
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+스케줄러 API 모듈
+주기 작업 실행 상태 조회
+"""
+
+from flask import Blueprint
+from backend.utils import token_required, success_response
+
+scheduler_bp = Blueprint('scheduler', __name__)
+
+
+@scheduler_bp.route('/status', methods=['GET'])
+@token_required
+def get_scheduler_status():
+    """
+    작업별 다음 실행 시각, 실행/실패/놓친 횟수, 실행 시간 히스토그램
+
+    GET /api/Wellsafer/v1/scheduler/status
+    """
+    from backend.scheduler import scheduler
+    return success_response(scheduler.get_status())
@@ -57,10 +57,31 @@ def register_handlers(socketio, app):
     
     @socketio.on('subscribe_dashboard')
     def on_subscribe_dashboard():
-        """대시보드 구독 (전체 알림 수신)"""
+        """
+        대시보드 구독 (전체 알림 수신)
+        
+        룸 참가 후 seq가 포함된 전체 요약(dashboard_data)을 한 번 보내고,
+        이후에는 변경분(dashboard_delta)만 발송
+        """
         join_room('dashboard')
         app.logger.info(f"Client {request.sid} subscribed to dashboard")
         emit('subscribed', {'room': 'dashboard'})
+        _emit_dashboard_snapshot()
+
+    @socketio.on('dashboard_resync')
+    def on_dashboard_resync():
+        """
+        대시보드 재동기화
+        클라이언트가 dashboard_delta의 seq 누락 또는 origin 변경(리더 교체)을 감지하면
+        전체 요약을 다시 요청
+        """
+        app.logger.debug(f"Client {request.sid} requested dashboard resync")
+        _emit_dashboard_snapshot()
+
+    def _emit_dashboard_snapshot():
+        # dashboard_delta를 발송하는 리더 워커의 seq/origin으로 보내야 클라이언트가 이어 붙일 수 있음
+        from backend.dashboard_summary import send_snapshot
+        send_snapshot(socketio, request.sid)
 
     @socketio.on('subscribe_alerts')
     def on_subscribe_alerts():
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+밴드 식별 캐시 모듈
+MQTT 메시지마다 반복되는 bid → Band 조회를 프로세스 내 캐시로 대체
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+
+# MQTT 핸들러가 필요로 하는 밴드 정보 (ORM 객체 대신 불변 스냅샷)
+# sw_ver: 바이너리 텔레메트리 스키마 선택용 펌웨어 버전
+BandInfo = namedtuple('BandInfo', [
+    'id', 'bid', 'wearer_name', 'wearer_phone', 'guardian_phone', 'address', 'sw_ver'
+], defaults=(None,))
+
+
+class BandCache:
+    """
+    bid → BandInfo TTL 캐시
+
+    등록된 밴드는 ttl 동안, 등록되지 않은 bid는 negative_ttl 동안 캐시하여
+    위조되거나 미등록된 디바이스가 반복 전송해도 DB를 조회하지 않는다.
+    밴드 등록/수정/삭제는 invalidate_band()로 모든 프로세스에 알린다.
+    두 캐시 모두 최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거한다.
+    """
+
+    def __init__(self, ttl=300, negative_ttl=60, max_size=20000,
+                 max_negative_size=10000, loader=None):
+        """
+        Args:
+            ttl: 등록 밴드 캐시 유지 시간 (초)
+            negative_ttl: 미등록 bid 캐시 유지 시간 (초)
+            max_size: 등록 밴드 캐시 최대 항목 수
+            max_negative_size: 미등록 bid 캐시 최대 항목 수
+            loader: bid를 받아 BandInfo 또는 None을 반환하는 함수
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.max_negative_size = max_negative_size
+        self.loader = loader or _load_band_info
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()     # bid → (expires_at, BandInfo)
+        self._negative = OrderedDict()    # bid → expires_at
+        # 무효화/직접 등록마다 증가 (조회 중 무효화된 결과를 저장하지 않기 위함)
+        self._generation = 0
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+
+    def init_app(self, app):
+        """설정값 적용"""
+        self.ttl = app.config.get('BAND_CACHE_TTL', self.ttl)
+        self.negative_ttl = app.config.get('BAND_CACHE_NEGATIVE_TTL', self.negative_ttl)
+        self.max_size = app.config.get('BAND_CACHE_MAX_SIZE', self.max_size)
+        self.max_negative_size = app.config.get('BAND_CACHE_MAX_NEGATIVE_SIZE', self.max_negative_size)
+
+    def get(self, bid):
+        """
+        bid로 밴드 정보 조회 (캐시 미스 시 loader 호출)
+
+        Args:
+            bid: 밴드 ID
+
+        Returns:
+            BandInfo: 밴드 정보 (미등록 bid면 None)
+        """
+        if not bid:
+            return None
+
+        bid = str(bid)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(bid)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(bid)
+                    self._hits += 1
+                    return entry[1]
+                del self._entries[bid]
+
+            expires_at = self._negative.get(bid)
+            if expires_at is not None:
+                if expires_at > now:
+                    self._negative_hits += 1
+                    return None
+                del self._negative[bid]
+
+            self._misses += 1
+            generation = self._generation
+
+        info = self.loader(bid)
+
+        with self._lock:
+            if generation != self._generation:
+                # 조회 도중 invalidate()/put()/clear() → 이전 행일 수 있으므로 캐시하지 않음
+                return info
+            if info is None:
+                self._negative[bid] = now + self.negative_ttl
+                self._negative.move_to_end(bid)
+                while len(self._negative) > self.max_negative_size:
+                    self._negative.popitem(last=False)
+            else:
+                self._store(bid, now + self.ttl, info)
+
+        return info
+
+    def put(self, info):
+        """밴드 정보 직접 등록 (생성/수정 직후 갱신용)"""
+        with self._lock:
+            self._generation += 1
+            self._negative.pop(info.bid, None)
+            self._store(info.bid, time.monotonic() + self.ttl, info)
+
+    def _store(self, bid, expires_at, info):
+        """등록 밴드 캐시에 저장하고 최대 크기 초과분 제거 (lock 보유 상태에서 호출)"""
+        self._entries[bid] = (expires_at, info)
+        self._entries.move_to_end(bid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, bid):
+        """특정 bid 캐시 무효화 (등록/미등록 캐시 모두)"""
+        bid = str(bid)
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(bid, None)
+            self._negative.pop(bid, None)
+
+    def clear(self):
+        """전체 캐시 비우기"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._negative.clear()
+
+    def get_stats(self):
+        """캐시 통계"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'negative_size': len(self._negative),
+                'hits': self._hits,
+                'negative_hits': self._negative_hits,
+                'misses': self._misses
+            }
+
+
+def band_info_from_model(band):
+    """Band ORM 객체를 BandInfo로 변환"""
+    return BandInfo(
+        id=band.id,
+        bid=band.bid,
+        wearer_name=band.wearer_name,
+        wearer_phone=band.wearer_phone,
+        guardian_phone=band.guardian_phone,
+        address=band.address,
+        sw_ver=band.sw_ver
+    )
+
+
+def _load_band_info(bid):
+    """DB에서 밴드 조회 (앱 컨텍스트 필요)"""
+    from backend.db import models as db_models
+    Band = db_models.Band
+
+    band = Band.query.filter_by(bid=bid).first()
+    if not band:
+        return None
+    return band_info_from_model(band)
+
+
+# 전역 인스턴스
+band_cache = BandCache()
+
+
+def invalidate_band(bid):
+    """
+    모든 프로세스의 bid 캐시 무효화 (밴드 등록/수정/삭제 후 호출)
+
+    이 프로세스의 캐시는 바로 지우고, 수집 워커 등 다른 프로세스에는
+    MQTT(Topics.BAND_CACHE_INVALIDATE)로 알린다.
+    알림이 닿지 않으면 다른 프로세스는 ttl / negative_ttl이 지날 때까지 이전 값을 사용한다.
+    """
+    from backend.mqtt_client import Topics, publish
+
+    band_cache.invalidate(bid)
+    publish(Topics.BAND_CACHE_INVALIDATE, {'bid': str(bid)})
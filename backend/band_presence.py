@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+밴드 오프라인 감지 모듈
+온라인 밴드 목록을 주기적으로 조회하지 않고, 메시지를 받을 때마다 밴드별 마지막 수신 시각만 갱신한 뒤
+타이머 휠에서 만료된 밴드만 꺼내 한 번에 오프라인 처리한다.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class TimerWheel:
+    """
+    해시 타이머 휠
+
+    만료 시각을 tick 단위로 올림해 slots개 칸 중 (tick % slots) 칸에 넣는다.
+    slots * tick이 최대 대기 시간보다 길면 한 칸에는 만료된 항목만 있으므로
+    advance()는 만료된 항목 수에 비례하는 시간만 쓴다 (더 먼 항목은 칸에 남겨 다음 바퀴에 확인).
+    """
+
+    def __init__(self, tick=1.0, slots=1024, now=0.0):
+        self.tick = tick
+        self.slots = [dict() for _ in range(slots)]
+        self._where = {}        # key → 칸 번호
+        self._current = math.floor(now / tick)
+
+    def schedule(self, key, deadline):
+        """key를 deadline(초)에 만료되도록 등록 (이미 있으면 옮김)"""
+        self.cancel(key)
+        # 이미 지난 시각은 다음 advance()에서 바로 만료
+        due = max(math.ceil(deadline / self.tick), self._current + 1)
+        index = due % len(self.slots)
+        self.slots[index][key] = due
+        self._where[key] = index
+
+    def cancel(self, key):
+        index = self._where.pop(key, None)
+        if index is not None:
+            del self.slots[index][key]
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def __len__(self):
+        return len(self._where)
+
+    def advance(self, now):
+        """
+        now(초)까지 시계를 진행
+
+        Returns:
+            list: 만료된 key 목록
+        """
+        target = math.floor(now / self.tick)
+        if target <= self._current:
+            return []
+
+        expired = []
+        # 한 바퀴 이상 멈춰 있었으면 모든 칸을 한 번씩만 확인
+        start = max(self._current + 1, target - len(self.slots) + 1)
+        for tick in range(start, target + 1):
+            slot = self.slots[tick % len(self.slots)]
+            if not slot:
+                continue
+            due_keys = [key for key, due in slot.items() if due <= target]
+            for key in due_keys:
+                del slot[key]
+                del self._where[key]
+            expired.extend(due_keys)
+        self._current = target
+        return expired
+
+
+class BandPresence:
+    """
+    밴드 접속 상태 추적
+
+    touch()는 마지막 수신 시각만 기록하고, 휠에는 밴드당 하나의 만료 시각만 둔다.
+    만료 시 그 사이 메시지가 있었으면 마지막 수신 시각 기준으로 다시 등록하므로
+    메시지마다 휠을 조작하지 않고 밴드당 timeout에 한 번만 재등록한다.
+    오프라인 처리는 만료된 밴드들을 모아 bands를 한 번에 UPDATE한다.
+    """
+
+    def __init__(self, app=None, socketio=None, timeout=300, tick=1.0, clock=time.monotonic, writer=None):
+        """
+        Args:
+            app: Flask 애플리케이션
+            socketio: Socket.IO 인스턴스
+            timeout: 마지막 수신 후 오프라인으로 볼 시간 (초)
+            tick: 만료 확인 주기 (초)
+            clock: 단조 증가 시계 (테스트용)
+            writer: 만료된 밴드 목록을 받아 실제로 오프라인 처리한 밴드 목록을 반환하는 함수
+                    (기본값: bands 일괄 UPDATE)
+        """
+        self.app = app
+        self.socketio = socketio
+        self.timeout = timeout
+        self.tick = tick
+        self._clock = clock
+        self.writer = writer or self._write_offline
+
+        self.running = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._wheel = TimerWheel(tick, self._slot_count(), clock())
+        self._last_seen = {}    # band_id → 마지막 수신 시각 (clock 기준)
+        self._bids = {}         # band_id → bid
+        self._touches = 0
+        self._rescheduled = 0
+        self._offline = 0
+        self._skipped = 0
+
+    def _slot_count(self):
+        # 한 바퀴가 timeout보다 길면 칸마다 만료 항목만 남음
+        return max(64, int(self.timeout / self.tick) + 2)
+
+    def init_app(self, app, socketio=None):
+        """설정값 적용"""
+        self.app = app
+        if socketio is not None:
+            self.socketio = socketio
+        self.timeout = app.config.get('BAND_OFFLINE_TIMEOUT', self.timeout)
+        self.tick = app.config.get('BAND_OFFLINE_TICK', self.tick)
+        with self._lock:
+            entries = dict(self._last_seen)
+            self._wheel = TimerWheel(self.tick, self._slot_count(), self._clock())
+            for band_id, seen in entries.items():
+                self._wheel.schedule(band_id, seen + self.timeout)
+
+    def touch(self, band_id, bid):
+        """메시지 수신 기록 (수집 경로에서 메시지마다 호출)"""
+        now = self._clock()
+        with self._lock:
+            self._last_seen[band_id] = now
+            self._touches += 1
+            if band_id not in self._wheel:
+                self._bids[band_id] = bid
+                self._wheel.schedule(band_id, now + self.timeout)
+
+    def forget(self, band_id):
+        """추적 중단 (밴드가 스스로 오프라인/미착용을 알린 경우)"""
+        with self._lock:
+            self._wheel.cancel(band_id)
+            self._last_seen.pop(band_id, None)
+            self._bids.pop(band_id, None)
+
+    def seed(self, bands):
+        """
+        재시작 전 온라인이던 밴드 등록 (시작 시 한 번)
+
+        Args:
+            bands: (band_id, bid, 마지막 수신 datetime(UTC)) 목록
+        """
+        now = self._clock()
+        utcnow = datetime.utcnow()
+        with self._lock:
+            for band_id, bid, last_seen in bands:
+                if band_id in self._wheel:
+                    continue
+                age = (utcnow - last_seen).total_seconds() if last_seen else self.timeout
+                seen = now - max(0.0, age)
+                self._last_seen[band_id] = seen
+                self._bids[band_id] = bid
+                self._wheel.schedule(band_id, seen + self.timeout)
+
+    def expire(self):
+        """
+        만료 확인 및 오프라인 처리
+
+        Returns:
+            list: 오프라인 처리한 band_id 목록
+        """
+        now = self._clock()
+        expired = []
+        with self._lock:
+            for band_id in self._wheel.advance(now):
+                deadline = self._last_seen.get(band_id, now) + self.timeout
+                if deadline > now:
+                    # 그 사이 메시지를 받은 밴드는 마지막 수신 기준으로 다시 등록
+                    self._wheel.schedule(band_id, deadline)
+                    self._rescheduled += 1
+                    continue
+                seen = self._last_seen.pop(band_id, now)
+                expired.append((band_id, self._bids.pop(band_id, None), now - seen))
+
+        if not expired:
+            return []
+
+        offline = self.writer(expired)
+        with self._lock:
+            self._offline += len(offline)
+            self._skipped += len(expired) - len(offline)
+        self._notify(offline)
+        return [band_id for band_id, _, _ in offline]
+
+    def _write_offline(self, expired):
+        """
+        bands 일괄 오프라인 UPDATE 및 기기 오프라인 이벤트 INSERT (한 트랜잭션)
+
+        수집 워커가 여러 개면 다른 워커가 이 밴드의 메시지를 받았을 수 있으므로,
+        DB의 connect_time(각 워커의 band_state가 주기적으로 반영)도 timeout보다 오래된 밴드만 처리한다.
+        """
+        from sqlalchemy import select, update
+        from backend.db import models as db_models
+        from backend.band_state import band_state
+        from backend.mqtt_client import EVENT_TYPE_CODES
+        table = db_models.Band.__table__
+        events = db_models.Event.__table__
+
+        by_id = {band_id: (band_id, bid, idle) for band_id, bid, idle in expired}
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.timeout)
+
+        with self.app.app_context():
+            db = self.app.extensions['sqlalchemy']
+            try:
+                rows = db.session.execute(
+                    select(table.c.id, table.c.name, table.c.alias).where(
+                        table.c.id.in_(list(by_id)),
+                        table.c.connect_state == 1,
+                        (table.c.connect_time.is_(None)) | (table.c.connect_time < cutoff)
+                    )
+                ).all()
+                ids = [row.id for row in rows]
+                if ids:
+                    db.session.execute(
+                        update(table).where(table.c.id.in_(ids)).values(connect_state=0, disconnect_time=now)
+                    )
+                    db.session.execute(events.insert(), [
+                        {
+                            'FK_bid': row.id,
+                            'datetime': now,
+                            'type': EVENT_TYPE_CODES[db_models.EventType.DEVICE_OFFLINE],
+                            'action_status': 0,
+                            'action_note': f"{row.name or row.alias}님 밴드 연결 끊김",
+                        }
+                        for row in rows
+                    ])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+        for band_id in ids:
+            band_state.note_persisted(band_id, 0)
+        return [by_id[band_id] for band_id in ids]
+
+    def _notify(self, offline):
+        """오프라인 전환 알림 (대시보드 요약/프레임, band_status) 및 밴드 룸 발송 제한 기록 정리"""
+        from backend.dashboard_summary import report_band_online
+        from backend.dashboard_frame import dashboard_frames
+        from backend.emit_throttle import emit_throttle
+
+        for band_id, bid, idle in offline:
+            report_band_online(band_id, False)
+            if bid:
+                emit_throttle.forget(f'band_{bid}')
+            if self.app:
+                self.app.logger.info(f"Band {bid} marked as offline (no message for {idle:.0f}s)")
+            if self.socketio and bid:
+                self.socketio.emit('band_status', {'bid': bid, 'status': 'offline'})
+                dashboard_frames.update(bid, status='offline')
+
+    def start(self):
+        """만료 확인 스레드 시작"""
+        if self.running:
+            return
+
+        self.running = True
+        self._wakeup.clear()
+        self.thread = threading.Thread(target=self._run, name='band-presence', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+
+    def _run(self):
+        while self.running:
+            self._wakeup.wait(self.tick)
+            if not self.running:
+                break
+            try:
+                self.expire()
+            except Exception as e:
+                if self.app:
+                    self.app.logger.error(f"Band offline check failed: {e}")
+
+    def get_stats(self):
+        """추적 통계"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'timeout': self.timeout,
+                'tracked_bands': len(self._wheel),
+                'touches': self._touches,
+                'rescheduled': self._rescheduled,
+                'offline': self._offline,
+                'skipped': self._skipped
+            }
+
+
+def _load_online_bands(app):
+    """재시작 전 온라인이던 밴드 (시작 시 한 번 조회)"""
+    from backend.db import models as db_models
+    Band = db_models.Band
+
+    with app.app_context():
+        rows = Band.query.with_entities(Band.id, Band.bid, Band.connect_time)\
+            .filter(Band.connect_state == 1).all()
+    return [(row.id, row.bid, row.connect_time) for row in rows]
+
+
+# 전역 인스턴스
+band_presence = BandPresence()
+
+
+def init_band_presence(app, socketio=None):
+    """
+    오프라인 감지 시작
+
+    Args:
+        app: Flask 애플리케이션
+        socketio: Socket.IO 인스턴스
+    """
+    band_presence.init_app(app, socketio)
+    try:
+        band_presence.seed(_load_online_bands(app))
+    except Exception as e:
+        app.logger.error(f"Band presence seed failed: {e}")
+    band_presence.start()
+    return band_presence
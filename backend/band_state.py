@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+밴드 상태 write-behind 저장소 모듈
+메시지마다 bands 행을 UPDATE하지 않고 최신 상태를 메모리에 모아 주기적으로 일괄 반영
+"""
+
+import threading
+
+
+# 메모리에 보관하는 bands 컬럼
+STATE_FIELDS = ('connect_state', 'connect_time', 'latitude', 'longitude')
+
+
+class BandStateStore:
+    """
+    밴드 상태 저장소
+
+    connect_state, connect_time, 위치를 밴드별로 최신 값만 유지하고
+    flush_interval마다 변경된 행을 한 번에 UPDATE한다.
+    온라인↔오프라인 전환이 일어난 경우에만 즉시 반영한다.
+    """
+
+    def __init__(self, app=None, flush_interval=5.0, writer=None):
+        """
+        Args:
+            app: Flask 애플리케이션
+            flush_interval: 일괄 반영 주기 (초)
+            writer: 변경 행 목록을 저장하는 함수 (기본값: bands 일괄 UPDATE)
+        """
+        self.app = app
+        self.flush_interval = flush_interval
+        self.writer = writer or self._write_rows
+
+        self.running = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._states = {}       # band_id → {필드: 값}
+        self._dirty = {}        # band_id → 변경된 필드 집합
+        self._persisted = {}    # band_id → DB에 반영된 connect_state
+        self._flush_count = 0
+        self._flushed_rows = 0
+        self._transition_flushes = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """설정값 적용"""
+        self.app = app
+        self.flush_interval = app.config.get('BAND_STATE_FLUSH_INTERVAL', self.flush_interval)
+
+    def start(self):
+        """주기적 반영 스레드 시작"""
+        if self.running:
+            return
+
+        self.running = True
+        self._wakeup.clear()
+        self.thread = threading.Thread(target=self._run, name='band-state', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        """반영 스레드 중지 (남은 변경분은 모두 저장)"""
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+        self.flush()
+
+    def update(self, band_id, **fields):
+        """
+        밴드 상태 갱신
+
+        Args:
+            band_id: bands.id
+            **fields: connect_state, connect_time, latitude, longitude
+
+        Returns:
+            bool: 온라인/오프라인 전환 여부 (전환 시 즉시 DB 반영)
+        """
+        with self._lock:
+            state = self._states.setdefault(band_id, {})
+            dirty = self._dirty.setdefault(band_id, set())
+            for key, value in fields.items():
+                if key not in STATE_FIELDS:
+                    raise ValueError(f"Unknown band state field: {key}")
+                if state.get(key) != value or key not in state:
+                    state[key] = value
+                    dirty.add(key)
+            if not dirty:
+                del self._dirty[band_id]
+
+            connect_state = fields.get('connect_state')
+            transition = (
+                connect_state is not None
+                and self._persisted.get(band_id) != connect_state
+            )
+            if transition:
+                self._transition_flushes += 1
+
+        # 반영 스레드가 없으면(테스트, 단독 실행) 바로 저장
+        if transition or not self.running:
+            self.flush()
+
+        return transition
+
+    def seed_persisted(self, states):
+        """
+        DB에 저장된 connect_state를 기준값으로 설정
+
+        시작 직후 밴드마다 첫 메시지가 전환으로 처리되어 밴드별 UPDATE가 몰리지 않도록
+        init_band_state()에서 bands를 한 번 읽어 넣는다 (이미 아는 밴드는 유지).
+
+        Args:
+            states: {band_id: connect_state}
+        """
+        with self._lock:
+            for band_id, connect_state in states.items():
+                self._persisted.setdefault(band_id, connect_state)
+
+    def _load_persisted(self):
+        """bands.connect_state 조회 (SELECT 한 번)"""
+        from sqlalchemy import select
+        from backend.db import models as db_models
+        table = db_models.Band.__table__
+
+        with self.app.app_context():
+            db = self.app.extensions['sqlalchemy']
+            rows = db.session.execute(select(table.c.id, table.c.connect_state)).all()
+            db.session.remove()
+        return {band_id: connect_state for band_id, connect_state in rows}
+
+    def note_persisted(self, band_id, connect_state):
+        """다른 경로에서 DB에 직접 기록한 connect_state 반영 (오프라인 감지 등)"""
+        with self._lock:
+            self._persisted[band_id] = connect_state
+            state = self._states.get(band_id)
+            if state is not None:
+                state['connect_state'] = connect_state
+                dirty = self._dirty.get(band_id)
+                if dirty:
+                    dirty.discard('connect_state')
+
+    def get(self, band_id):
+        """메모리에 있는 밴드 상태 (없으면 None)"""
+        with self._lock:
+            state = self._states.get(band_id)
+            return dict(state) if state is not None else None
+
+    def dirty_count(self):
+        """반영 대기 중인 밴드 수"""
+        with self._lock:
+            return len(self._dirty)
+
+    def _run(self):
+        """주기적 반영 루프"""
+        while self.running:
+            self._wakeup.wait(self.flush_interval)
+            if not self.running:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                if self.app:
+                    self.app.logger.error(f"Band state flush failed: {e}")
+
+    def flush(self):
+        """
+        변경된 밴드 상태를 DB에 일괄 반영
+
+        Returns:
+            int: 반영된 행 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                rows = []
+                for band_id, keys in self._dirty.items():
+                    state = self._states[band_id]
+                    row = {key: state[key] for key in keys}
+                    row['id'] = band_id
+                    rows.append(row)
+                dirty, self._dirty = self._dirty, {}
+
+            try:
+                self.writer(rows)
+            except Exception:
+                # 실패한 변경분은 다음 주기에 다시 반영
+                with self._lock:
+                    for band_id, keys in dirty.items():
+                        self._dirty.setdefault(band_id, set()).update(keys)
+                raise
+
+            with self._lock:
+                for row in rows:
+                    if 'connect_state' in row:
+                        self._persisted[row['id']] = row['connect_state']
+                self._flush_count += 1
+                self._flushed_rows += len(rows)
+
+            return len(rows)
+
+    def _write_rows(self, rows):
+        """bands 일괄 UPDATE (같은 컬럼 조합끼리 executemany)"""
+        from sqlalchemy import update, bindparam
+        from backend.db import models as db_models
+        table = db_models.Band.__table__
+
+        groups = {}
+        for row in rows:
+            keys = tuple(sorted(k for k in row if k != 'id'))
+            groups.setdefault(keys, []).append(row)
+
+        with self.app.app_context():
+            db = self.app.extensions['sqlalchemy']
+            try:
+                for keys, group in groups.items():
+                    stmt = update(table)\
+                        .where(table.c.id == bindparam('_id'))\
+                        .values({key: bindparam(f'_{key}') for key in keys})
+                    params = [
+                        {'_id': row['id'], **{f'_{key}': row[key] for key in keys}}
+                        for row in group
+                    ]
+                    db.session.execute(stmt, params)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def get_stats(self):
+        """반영 통계"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'tracked_bands': len(self._states),
+                'dirty_bands': len(self._dirty),
+                'flush_count': self._flush_count,
+                'flushed_rows': self._flushed_rows,
+                'transition_flushes': self._transition_flushes
+            }
+
+
+# 전역 인스턴스
+band_state = BandStateStore()
+
+
+def init_band_state(app):
+    """
+    밴드 상태 저장소 초기화 및 반영 스레드 시작
+
+    Args:
+        app: Flask 애플리케이션
+    """
+    band_state.init_app(app)
+    try:
+        band_state.seed_persisted(band_state._load_persisted())
+    except Exception as e:
+        # 기준값 없이 시작 (밴드별 첫 메시지가 즉시 반영될 뿐 상태는 맞음)
+        app.logger.error(f"Band state seed failed: {e}")
+    band_state.start()
+    return band_state
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Wellsafer Backend 성능 측정 스크립트
+"""
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 수집 경로 재생 벤치마크
+구 Flask-MQTT 핸들러(/DT/eHG4/SensorData)와 paho 클라이언트가 나눠 처리하던 방식과,
+모든 토픽을 하나의 수집 엔진(mqtt_client)으로 처리하는 방식의 초당 처리량 비교
+
+같은 원본 메시지(bytes)를 SQLite 파일 DB에 재생하며, 큐에 남은 행 저장까지 시간에 포함한다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_ingest_replay [--messages 20000] [--bands 200] [--dt-share 0.5]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# backend를 불러올 때 MQTT 연결과 백그라운드 스레드가 시작되지 않도록 지정
+os.environ['PROCESS_ROLE'] = 'ingest'
+
+from flask import Flask
+
+import backend
+from backend import mqtt_client
+from backend.band_cache import band_cache
+from backend.band_state import band_state, init_band_state
+from backend.dedup import message_dedup
+from backend.anomaly import anomaly_detector
+from backend.db.table import Band, Prescription, SensorData
+from backend.ingest import sensor_ingest, init_ingest
+from backend.latest_vitals import latest_vitals
+
+
+Message = namedtuple('Message', ['topic', 'payload'])
+
+
+def _make_messages(count, bands, dt_share, seed=42):
+    """두 토픽 체계의 센서 메시지 (정상 범위 생체신호, 원본 bytes)"""
+    rng = random.Random(seed)
+    bids = [f'4671912136{i:05d}' for i in range(1, bands + 1)]
+    # 같은 밴드의 측정값이 같은 기기 시각을 갖지 않도록 메시지마다 1ms씩 증가 (중복 제거 대상 아님)
+    base_ms = int(time.time() * 1000)
+    messages = []
+    for i in range(count):
+        bid = rng.choice(bids)
+        vitals = {'hr': rng.randint(60, 100), 'spo2': rng.randint(96, 100), 'skin_temp': 36.5}
+        if rng.random() < dt_share:
+            payload = {'bid': bid, 'timestamp': base_ms + i, 'acc_x': 1, 'acc_y': 2,
+                       'acc_z': 3, 'steps': rng.randint(0, 9000), 'hrv_sdnn': 40, **vitals}
+            topic = '/DT/eHG4/SensorData/gw1'
+        else:
+            payload = {'x': 1, 'y': 2, 'z': 3, 'walk_steps': rng.randint(0, 9000),
+                       'battery_level': 80, 'scdState': 1, **vitals}
+            topic = f'wellsafer/band/{bid}/sensor'
+        messages.append(Message(topic, json.dumps(payload).encode()))
+    return messages
+
+
+def _legacy_sensordata(app, msg):
+    """
+    기존 Flask-MQTT on_message → handle_sensor_data 흐름 (비교 기준)
+
+    메시지마다 UTF-8 디코딩 + JSON 파싱, 밴드 조회 2회, 행 단위 INSERT/UPDATE 커밋.
+    기존 코드의 acc_x/steps 등은 실제 컬럼이 아니어서 저장이 실패하므로 컬럼명만 맞춰 재현한다.
+    """
+    payload = json.loads(msg.payload.decode('utf-8'))
+    with app.app_context():
+        db = app.extensions['sqlalchemy']
+        if '/SensorData/' not in msg.topic:
+            return
+        band = Band.query.filter_by(bid=payload['bid']).first()
+        if not band:
+            return
+        row = {
+            'FK_bid': band.id,
+            'datetime': datetime.fromtimestamp(payload['timestamp'] / 1000),
+            'hr': payload.get('hr'),
+            'spo2': payload.get('spo2'),
+            'skin_temp': payload.get('skin_temp'),
+            'x': payload.get('acc_x'),
+            'y': payload.get('acc_y'),
+            'z': payload.get('acc_z'),
+            'walk_steps': payload.get('steps'),
+        }
+        db.session.add(SensorData(**row))
+        db.session.commit()
+
+        band = Band.query.filter_by(bid=payload['bid']).first()
+        band.connect_state = 1
+        band.connect_time = datetime.utcnow()
+        db.session.commit()
+        latest_vitals.update(band.id, row)
+
+
+def _setup(path, bands):
+    db = backend.app.extensions['sqlalchemy']
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=[Band.__table__, SensorData.__table__, Prescription.__table__])
+        for band_id in range(1, bands + 1):
+            db.session.add(Band(id=band_id, bid=f'4671912136{band_id:05d}', name=f'착용자{band_id}'))
+        db.session.commit()
+
+    band_cache.init_app(app)
+    mqtt_client._register_default_handlers(app, None)
+    return app, db
+
+
+def _replay(app, messages, legacy):
+    """메시지 재생 후 저장 완료까지 걸린 시간 (초)"""
+    band_cache.clear()
+    message_dedup.clear()
+    anomaly_detector.invalidate()
+    init_ingest(app)
+    init_band_state(app)
+
+    on_message = mqtt_client._on_message
+    started = time.perf_counter()
+    for msg in messages:
+        if legacy and msg.topic.startswith('/DT/'):
+            _legacy_sensordata(app, msg)
+        else:
+            on_message(None, None, msg)
+    sensor_ingest.stop()
+    band_state.stop()
+    return time.perf_counter() - started
+
+
+def run(messages, bands, dt_share):
+    directory = tempfile.mkdtemp(prefix='bench-ingest')
+    try:
+        app, db = _setup(os.path.join(directory, 'replay.db'), bands)
+        stream = _make_messages(messages, bands, dt_share)
+
+        results = {}
+        for name, legacy in (('dual stack', True), ('unified', False)):
+            with app.app_context():
+                db.session.query(SensorData).delete()
+                db.session.commit()
+            elapsed = _replay(app, stream, legacy)
+            with app.app_context():
+                stored = db.session.query(SensorData).count()
+            assert stored == messages, f'{name}: stored {stored} of {messages}'
+            results[name] = elapsed
+
+        print(f"messages: {messages}, bands: {bands}, /DT/eHG4/SensorData share: {dt_share:.0%}")
+        for name, elapsed in results.items():
+            print(f"{name:<11}: {elapsed * 1e6 / messages:8.1f} us/msg  ({messages / elapsed:,.0f} msg/s)")
+        print(f"speedup    : {results['dual stack'] / results['unified']:8.2f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MQTT ingest replay benchmark')
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--bands', type=int, default=200)
+    parser.add_argument('--dt-share', type=float, default=0.5,
+                        help='fraction of messages on /DT/eHG4/SensorData')
+    args = parser.parse_args()
+    run(args.messages, args.bands, args.dt_share)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+센서 업링크 형식 벤치마크
+JSON 센서 토픽과 바이너리 텔레메트리(스키마 v1)의 메시지 크기와 측정값 변환 시간 비교
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_telemetry [--messages 200000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec
+from ingest_engine import SensorReading, from_band_payload
+from telemetry import SCHEMA_V1, SchemaRegistry
+
+
+def _make_readings(count, seed=42):
+    """밴드가 보내는 센서 측정값 (JSON 토픽과 같은 필드)"""
+    rng = random.Random(seed)
+    start = 1714555800
+    return [{
+        'timestamp': start + i,
+        'battery_level': rng.randint(5, 100),
+        'hr': rng.randint(50, 130),
+        'spo2': rng.randint(90, 100),
+        'skin_temp': round(rng.uniform(35.0, 37.5), 2),
+        'x': rng.randint(-2000, 2000),
+        'y': rng.randint(-2000, 2000),
+        'z': rng.randint(-2000, 2000),
+        'walk_steps': rng.randint(0, 20000),
+        'run_steps': rng.randint(0, 5000),
+        'activity': rng.randint(0, 5),
+        'motionFlag': rng.randint(0, 1),
+        'scdState': 1,
+        'rssi': rng.randint(-100, -40),
+    } for i in range(count)]
+
+
+def run(messages):
+    readings = _make_readings(messages)
+    # JSON 토픽은 ms, 바이너리는 초 단위 timestamp
+    json_frames = [json.dumps(dict(r, timestamp=r['timestamp'] * 1000)).encode('utf-8') for r in readings]
+    bin_frames = [SCHEMA_V1.encode(r) for r in readings]
+    registry = SchemaRegistry([SCHEMA_V1])
+    registry.map_firmware('2.0', 1)
+    bid = '467191213660619'
+
+    def from_json():
+        for frame in json_frames:
+            from_band_payload(bid, codec.loads(frame))
+
+    def from_binary():
+        decode = registry.decode
+        for frame in bin_frames:
+            SensorReading(bid, **decode(frame, '2.0.1'))
+
+    json_size = sum(map(len, json_frames)) / messages
+    bin_size = sum(map(len, bin_frames)) / messages
+    json_time = min(timeit.repeat(from_json, number=1, repeat=3))
+    bin_time = min(timeit.repeat(from_binary, number=1, repeat=3))
+
+    print(f"messages: {messages}, json codec: {codec.BACKEND}")
+    print(f"json   : {json_size:6.1f} bytes/msg  {json_time * 1e6 / messages:6.2f} us/msg")
+    print(f"binary : {bin_size:6.1f} bytes/msg  {bin_time * 1e6 / messages:6.2f} us/msg")
+    print(f"ratio  : {json_size / bin_size:6.1f}x smaller  {json_time / bin_time:6.2f}x faster")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Band uplink format benchmark')
+    parser.add_argument('--messages', type=int, default=200000)
+    args = parser.parse_args()
+    run(args.messages)
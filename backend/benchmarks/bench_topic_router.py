@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 토픽 매칭 벤치마크
+기존 선형 패턴 스캔과 토픽 트라이의 메시지당 매칭 시간 비교
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_topic_router [--messages 200000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mqtt_topic import TopicTrie, match_topic_linear, to_subscription
+
+
+# mqtt_client.py에서 구독하는 패턴 (구 Flask-MQTT 토픽 포함)
+PATTERNS = [
+    'wellsafer/band/{bid}/sensor',
+    'wellsafer/band/{bid}/location',
+    'wellsafer/band/{bid}/status',
+    'wellsafer/band/{bid}/event',
+    'wellsafer/stim/{bid}/status',
+    'wellsafer/stim/{bid}/connected',
+    'wellsafer/stim/{bid}/disconnected',
+    '/DT/eHG4/naas/post/async',
+    '/DT/eHG4/naas/post/sync',
+    '/DT/eHG4/SensorData/#',
+    '/DT/eHG4/Location/#',
+    '/DT/eHG4/Event/#',
+    '/DT/eHG4/Status/#',
+    '/DT/eHG4/NerveStim/Connect',
+    '/DT/eHG4/NerveStim/Disconnect',
+    '/DT/eHG4/NerveStim/Status',
+    '/DT/eHG4/NerveStim/Complete',
+    '/DT/eHG4/NerveStim/Error',
+]
+
+
+def _make_topics(count, bands=3000, seed=42):
+    """실제 트래픽 비율과 비슷한 토픽 목록 생성 (센서 데이터 위주)"""
+    rng = random.Random(seed)
+    bids = [str(467191213660000 + i) for i in range(bands)]
+    weighted = [
+        ('wellsafer/band/{bid}/sensor', 70),
+        ('wellsafer/band/{bid}/location', 10),
+        ('wellsafer/band/{bid}/status', 5),
+        ('wellsafer/band/{bid}/event', 1),
+        ('/DT/eHG4/naas/post/async', 12),
+        ('wellsafer/stim/{bid}/status', 2),
+    ]
+    population = [template for template, weight in weighted for _ in range(weight)]
+    return [
+        rng.choice(population).format(bid=rng.choice(bids))
+        for _ in range(count)
+    ]
+
+
+def _linear_dispatch(handlers, topic):
+    """기존 MQTTHandler.handle_message 방식: 패턴 전체 순회 + bid 재분리"""
+    matched = []
+    for pattern, handler in handlers.items():
+        if match_topic_linear(pattern, topic):
+            parts = topic.split('/')
+            bid = parts[2] if len(parts) >= 4 else None
+            matched.append((handler, bid))
+    return matched
+
+
+def run(messages):
+    topics = _make_topics(messages)
+
+    linear_handlers = {to_subscription(p): p for p in PATTERNS}
+    trie = TopicTrie()
+    for pattern in PATTERNS:
+        trie.add(pattern, pattern)
+
+    # 결과 동일성 확인
+    for topic in topics[:1000]:
+        expected = [h for h, _ in _linear_dispatch(linear_handlers, topic)]
+        actual = [h for h, _ in trie.match(topic)]
+        assert expected == actual, topic
+
+    def linear():
+        for topic in topics:
+            _linear_dispatch(linear_handlers, topic)
+
+    def trie_match():
+        match = trie.match
+        for topic in topics:
+            match(topic)
+
+    linear_time = min(timeit.repeat(linear, number=1, repeat=3))
+    trie_time = min(timeit.repeat(trie_match, number=1, repeat=3))
+
+    print(f"patterns: {len(PATTERNS)}, messages: {messages}")
+    print(f"linear scan : {linear_time * 1e6 / messages:8.2f} us/msg  ({messages / linear_time:,.0f} msg/s)")
+    print(f"topic trie  : {trie_time * 1e6 / messages:8.2f} us/msg  ({messages / trie_time:,.0f} msg/s)")
+    print(f"speedup     : {linear_time / trie_time:8.2f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MQTT topic matcher benchmark')
+    parser.add_argument('--messages', type=int, default=200000)
+    args = parser.parse_args()
+    run(args.messages)
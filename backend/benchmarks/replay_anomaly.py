@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+생체신호 이상 감지 재생 도구
+기록된 측정값 스트림을 측정값별 고정 기준(이전 방식)과 이상 구간 감지기(anomaly.py)에 재생하여
+이벤트 수와 감지 지연을 비교한다.
+
+입력 형식 (시각 순 정렬 불필요):
+    .jsonl: {"bid": "...", "timestamp": 1714555800000, "hr": 72, "spo2": 98, "episode": "hr_high"}
+    .csv:   sensordata 내보내기 (FK_bid 또는 bid, datetime 또는 timestamp, hr, spo2[, episode])
+episode 열은 선택이며, 있으면 실제 이상 구간(라벨)으로 보고 구간별 감지 여부/지연을 계산한다.
+입력이 없으면 라벨이 붙은 합성 스트림을 만든다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.replay_anomaly [--input stream.jsonl] [--bands 50] [--hours 2]
+                                        [--rules '{"hr_high": {"enter": 130}}']
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anomaly import AnomalyDetector, DEFAULT_RULES, apply_overrides
+from band_cache import BandInfo
+from ingest_engine import SensorReading
+
+
+# 이전 방식: 측정값 하나가 기준을 벗어날 때마다 이벤트
+def legacy_events(reading):
+    events = []
+    if reading.hr:
+        if reading.hr > 120:
+            events.append('hr_high')
+        elif reading.hr < 50:
+            events.append('hr_low')
+    if reading.spo2 and reading.spo2 < 95:
+        events.append('spo2_low')
+    return events
+
+
+def _row_datetime(row):
+    ts = row.get('timestamp')
+    if ts not in (None, ''):
+        return datetime.utcfromtimestamp(float(ts) / 1000)
+    return datetime.fromisoformat(str(row['datetime']))
+
+
+def _int_or_none(value):
+    return None if value in (None, '') else int(float(value))
+
+
+def load_stream(path):
+    """파일 → (SensorReading, 라벨) 목록"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    stream = []
+    for row in rows:
+        bid = str(row.get('bid') or row.get('FK_bid'))
+        reading = SensorReading(bid, _row_datetime(row), hr=_int_or_none(row.get('hr')),
+                                spo2=_int_or_none(row.get('spo2')))
+        stream.append((reading, row.get('episode') or None))
+    return stream
+
+
+def synthetic_stream(bands, hours, seed=7):
+    """
+    1Hz 합성 스트림
+
+    정상 구간에 단발성 잡음(1~2초 이탈)을 섞고, 밴드마다 라벨이 붙은
+    빈맥/서맥/산소포화도 저하 구간(2~6분, 기준 부근에서 오르내림)을 넣는다.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 5, 1, 9, 0, 0)
+    seconds = int(hours * 3600)
+    stream = []
+
+    for band in range(bands):
+        bid = f'4671912136{band + 1:05d}'
+        episodes = []
+        t = rng.randint(300, 900)
+        while t < seconds - 600:
+            kind = rng.choice(('hr_high', 'hr_high', 'hr_low', 'spo2_low'))
+            length = rng.randint(120, 360)
+            episodes.append((t, t + length, kind))
+            t += length + rng.randint(900, 2400)
+
+        for s in range(seconds):
+            hr = rng.gauss(75, 4)
+            spo2 = rng.gauss(98, 0.7)
+            label = None
+            for begin, end, kind in episodes:
+                if begin <= s < end:
+                    label = kind
+                    # 기준 부근에서 흔들리는 값 (측정값별 판단은 구간 안에서 수십 번 오르내림)
+                    if kind == 'hr_high':
+                        hr = rng.gauss(126, 6)
+                    elif kind == 'hr_low':
+                        hr = rng.gauss(46, 3)
+                    else:
+                        spo2 = rng.gauss(93.5, 1.2)
+                    break
+            if label is None and rng.random() < 0.002:
+                hr = rng.choice((135, 42))      # 움직임 잡음
+            stream.append((SensorReading(bid, start + timedelta(seconds=s), hr=int(hr),
+                                         spo2=min(100, int(round(spo2)))), label))
+    return stream
+
+
+def _label_spans(stream):
+    """라벨 → 밴드별 (시작, 끝, 종류) 구간"""
+    spans = {}
+    current = {}
+    for reading, label in stream:
+        at = reading.datetime
+        open_span = current.get(reading.bid)
+        if open_span and (open_span[2] != label or at - open_span[1] > timedelta(seconds=5)):
+            spans.setdefault(reading.bid, []).append(tuple(open_span))
+            current.pop(reading.bid)
+            open_span = None
+        if label:
+            if open_span:
+                open_span[1] = at
+            else:
+                current[reading.bid] = [at, at, label]
+    for bid, span in current.items():
+        spans.setdefault(bid, []).append(tuple(span))
+    return spans
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def replay(stream, rules=DEFAULT_RULES):
+    """
+    스트림 재생
+
+    Returns:
+        dict: 방식별 이벤트 수, 라벨 구간 감지 결과, 감지 지연(초)
+    """
+    stream = sorted(stream, key=lambda item: (item[0].datetime, item[0].bid))
+    detector = AnomalyDetector(rules, profile_loader=lambda band_id: None)
+    bands = {}
+    legacy = {}
+    onsets = []
+
+    started = time.perf_counter()
+    for reading, _ in stream:
+        band = bands.get(reading.bid)
+        if band is None:
+            band = bands[reading.bid] = BandInfo(len(bands) + 1, reading.bid, None, None, None, '')
+        for name in legacy_events(reading):
+            legacy[name] = legacy.get(name, 0) + 1
+        for onset in detector.observe(band, reading):
+            onsets.append((reading.bid, onset))
+    elapsed = time.perf_counter() - started
+
+    streaming = {}
+    for _, onset in onsets:
+        streaming[onset.rule.name] = streaming.get(onset.rule.name, 0) + 1
+
+    result = {
+        'samples': len(stream),
+        'bands': len(bands),
+        'us_per_sample': elapsed * 1e6 / max(1, len(stream)),
+        'legacy_events': legacy,
+        'streaming_events': streaming,
+        # 라벨이 없을 때의 지연: 평균이 기준을 벗어난 뒤 이벤트까지 (디바운스)
+        'onset_delay': [onset.detected_at - onset.started_at for _, onset in onsets],
+    }
+
+    spans = _label_spans(stream)
+    if spans:
+        epoch = datetime(1970, 1, 1)
+        detected, latency, matched = 0, [], set()
+        total = sum(len(v) for v in spans.values())
+        for bid, band_spans in spans.items():
+            for begin, end, kind in band_spans:
+                b = (begin - epoch).total_seconds()
+                e = (end - epoch).total_seconds()
+                hits = [
+                    (i, onset) for i, (onset_bid, onset) in enumerate(onsets)
+                    if onset_bid == bid and onset.rule.name == kind and b <= onset.detected_at <= e + 60
+                ]
+                if hits:
+                    detected += 1
+                    latency.append(hits[0][1].detected_at - b)
+                    matched.update(i for i, _ in hits)
+        result.update({
+            'episodes': total,
+            'detected': detected,
+            'false_events': len(onsets) - len(matched),
+            'latency': latency,
+        })
+    return result
+
+
+def report(result):
+    print(f"samples: {result['samples']}, bands: {result['bands']}, "
+          f"{result['us_per_sample']:.2f} us/sample")
+    print(f"legacy per-sample events : {sum(result['legacy_events'].values()):7d}  {result['legacy_events']}")
+    print(f"streaming episode events : {sum(result['streaming_events'].values()):7d}  {result['streaming_events']}")
+    if 'episodes' in result:
+        latency = result['latency']
+        print(f"labelled episodes: {result['episodes']}, detected: {result['detected']}, "
+              f"false events: {result['false_events']}")
+        if latency:
+            print(f"detection latency (s): p50={_percentile(latency, 50):.0f} "
+                  f"p95={_percentile(latency, 95):.0f} max={max(latency):.0f}")
+    elif result['onset_delay']:
+        delay = result['onset_delay']
+        print(f"onset delay (s): p50={_percentile(delay, 50):.0f} max={max(delay):.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vital anomaly detection replay')
+    parser.add_argument('--input', help='recorded stream (.jsonl or .csv)')
+    parser.add_argument('--bands', type=int, default=50)
+    parser.add_argument('--hours', type=float, default=2)
+    parser.add_argument('--rules', help='rule overrides as JSON')
+    args = parser.parse_args()
+
+    rules = apply_overrides(DEFAULT_RULES, json.loads(args.rules) if args.rules else None)
+    stream = load_stream(args.input) if args.input else synthetic_stream(args.bands, args.hours)
+    report(replay(stream, rules))
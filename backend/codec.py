@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 코덱 모듈
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 동작
+
+- MQTT 페이로드(bytes)는 str 변환 없이 바로 디코딩
+- Socket.IO 발송 데이터는 Encoded로 한 번만 직렬화해 여러 번 재사용
+"""
+
+import json
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:     # 선택 의존성
+    orjson = None
+
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# 디코딩 실패 예외 (orjson.JSONDecodeError도 json.JSONDecodeError의 하위 클래스)
+DecodeError = json.JSONDecodeError
+
+
+class Encoded:
+    """
+    미리 직렬화한 JSON 값
+
+    socketio.emit()에 그대로 넘기면 SocketIOJSON이 패킷을 만들 때 다시 직렬화하지 않고
+    text를 끼워 넣는다. 다른 직렬화 경로(메시지 큐 등)에서는 원본 value를 사용한다.
+    """
+
+    __slots__ = ('value', 'data')
+
+    def __init__(self, value, data=None):
+        """
+        Args:
+            value: 원본 값
+            data: value를 직렬화한 JSON bytes (None이면 여기서 직렬화)
+        """
+        self.value = value
+        self.data = dumps(value) if data is None else data
+
+    @property
+    def text(self):
+        return self.data.decode('utf-8')
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"Encoded({len(self.data)} bytes)"
+
+
+def _default(obj):
+    """기본 직렬화가 지원하지 않는 타입 처리"""
+    if isinstance(obj, Encoded):
+        return obj.value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def loads(data):
+        """bytes, bytearray, memoryview, str를 그대로 디코딩"""
+        return orjson.loads(data)
+
+    def dumps(obj):
+        """압축 JSON bytes"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def loads(data):
+        """bytes, bytearray, memoryview, str를 그대로 디코딩"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(obj):
+        """압축 JSON bytes"""
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_default).encode('utf-8')
+
+
+def dumps_str(obj):
+    """압축 JSON 문자열"""
+    return dumps(obj).decode('utf-8')
+
+
+class SocketIOJSON:
+    """
+    python-socketio/engineio의 json 모듈 대체 (SocketIO(json=SocketIOJSON))
+
+    패킷 데이터([이벤트명, 데이터...]) 중 Encoded 항목은 미리 만든 JSON을 그대로 사용한다.
+    """
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        if isinstance(obj, list) and any(isinstance(item, Encoded) for item in obj):
+            return '[' + ','.join(
+                item.text if isinstance(item, Encoded) else dumps_str(item) for item in obj
+            ) + ']'
+        return dumps_str(obj)
+
+    @staticmethod
+    def loads(data, *args, **kwargs):
+        return loads(data)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 프레임 집계 모듈
+밴드별 변경(생체신호/상태/위치)을 tick 동안 모아 'dashboard' 룸에 dashboard_frame 하나로 발송
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from backend import codec
+
+
+# 프레임의 밴드별 튜플 순서 (변경되지 않은 항목은 None)
+FRAME_FIELDS = ('bid', 'hr', 'spo2', 'battery', 'status', 'latitude', 'longitude')
+
+
+class DashboardFrameAggregator:
+    """
+    대시보드 프레임 집계기
+
+    밴드마다 sensor_summary/band_status/location_update를 따로 보내는 대신,
+    tick 동안 들어온 변경을 밴드별로 병합해 두었다가 한 번에 발송한다.
+
+    프레임 형식:
+        {
+            'seq': 프레임 번호,
+            'ts': 발송 시각,
+            'fields': FRAME_FIELDS,
+            'bands': [[bid, hr, spo2, battery, status, latitude, longitude], ...],
+            'size': bands 인코딩 크기 (bytes),
+            'encode_ms': bands 인코딩 시간 (ms)
+        }
+    """
+
+    def __init__(self, socketio=None, app=None, tick=0.5, room='dashboard'):
+        """
+        Args:
+            socketio: Socket.IO 인스턴스
+            app: Flask 애플리케이션
+            tick: 프레임 발송 주기 (초)
+            room: 발송 대상 룸
+        """
+        self.socketio = socketio
+        self.app = app
+        self.tick = tick
+        self.room = room
+
+        self.running = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = {}      # bid → {필드: 최신 값}
+        self._seq = 0
+
+        self._updates = 0
+        self._frames = 0
+        self._bands_sent = 0
+        self._last_size = 0
+        self._max_size = 0
+        self._encode_ms_total = 0.0
+        self._errors = 0
+
+        if app is not None:
+            self.init_app(app, socketio)
+
+    def init_app(self, app, socketio=None):
+        """설정값 적용"""
+        self.app = app
+        if socketio is not None:
+            self.socketio = socketio
+        self.tick = app.config.get('DASHBOARD_FRAME_INTERVAL', self.tick)
+
+    def start(self):
+        """프레임 발송 스레드 시작"""
+        if self.running:
+            return
+
+        self.running = True
+        self._wakeup.clear()
+        self.thread = threading.Thread(target=self._run, name='dashboard-frame', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        """발송 스레드 중지 (남은 변경은 마지막 프레임으로 발송)"""
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+        self.flush()
+
+    def update(self, bid, **fields):
+        """
+        밴드 변경 반영 (같은 tick 안의 변경은 필드별 최신 값으로 병합)
+
+        Args:
+            bid: 밴드 bid
+            **fields: FRAME_FIELDS 중 hr, spo2, battery, status, latitude, longitude
+        """
+        changes = {k: v for k, v in fields.items() if v is not None and k in FRAME_FIELDS}
+        if not changes:
+            return
+
+        with self._lock:
+            self._pending.setdefault(bid, {}).update(changes)
+            self._updates += 1
+
+        # 발송 스레드가 없으면 바로 발송
+        if not self.running:
+            self.flush()
+
+    def flush(self):
+        """
+        모인 변경을 프레임 하나로 발송
+
+        Returns:
+            dict: 발송한 프레임 (변경이 없으면 None)
+        """
+        with self._lock:
+            if not self._pending:
+                return None
+            pending, self._pending = self._pending, {}
+            self._seq += 1
+            seq = self._seq
+
+        bands = [
+            [bid] + [changes.get(field) for field in FRAME_FIELDS[1:]]
+            for bid, changes in pending.items()
+        ]
+
+        started = time.perf_counter()
+        encoded = codec.dumps(bands)
+        encode_ms = (time.perf_counter() - started) * 1000
+        size = len(encoded)
+
+        frame = {
+            'seq': seq,
+            'ts': datetime.utcnow().isoformat(),
+            'fields': FRAME_FIELDS,
+            'size': size,
+            'encode_ms': round(encode_ms, 3)
+        }
+        # 프레임 머리 + 이미 직렬화한 bands를 이어 붙여 발송 시 다시 직렬화하지 않음
+        data = codec.dumps(frame)[:-1] + b',"bands":' + encoded + b'}'
+        frame['bands'] = bands
+
+        try:
+            self.socketio.emit('dashboard_frame', codec.Encoded(frame, data), room=self.room)
+        except Exception as e:
+            self._errors += 1
+            if self.app:
+                self.app.logger.error(f"Dashboard frame emit failed: {e}")
+            return None
+
+        with self._lock:
+            self._frames += 1
+            self._bands_sent += len(bands)
+            self._last_size = size
+            self._max_size = max(self._max_size, size)
+            self._encode_ms_total += encode_ms
+        return frame
+
+    def _run(self):
+        """프레임 발송 루프"""
+        while self.running:
+            self._wakeup.wait(self.tick)
+            if not self.running:
+                break
+            self.flush()
+
+    def get_stats(self):
+        """프레임 통계"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'tick': self.tick,
+                'pending_bands': len(self._pending),
+                'updates': self._updates,
+                'frames': self._frames,
+                'bands_sent': self._bands_sent,
+                'last_frame_bytes': self._last_size,
+                'max_frame_bytes': self._max_size,
+                'avg_encode_ms': round(self._encode_ms_total / self._frames, 3) if self._frames else 0.0,
+                'errors': self._errors
+            }
+
+
+# 전역 인스턴스
+dashboard_frames = DashboardFrameAggregator()
+
+
+def init_dashboard_frames(app, socketio):
+    """
+    대시보드 프레임 집계기 초기화 및 발송 스레드 시작
+
+    Args:
+        app: Flask 애플리케이션
+        socketio: Socket.IO 인스턴스
+    """
+    dashboard_frames.init_app(app, socketio)
+    dashboard_frames.start()
+    return dashboard_frames
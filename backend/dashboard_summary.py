@@ -0,0 +1,595 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 요약 캐시 모듈
+요약 API/소켓 구독마다 COUNT 쿼리를 실행하지 않고 메모리 카운터를 증분 갱신하며,
+주기적으로 DB와 대조하여 보정
+"""
+
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+
+# 긴급 이벤트 타입 (SOS, 낙상, 심박수높음, 심박수낮음, 산소포화도낮음)
+URGENT_EVENT_TYPES = (6, 7, 8, 9, 10)
+
+# action_status 값
+ACTION_UNREAD = 0
+ACTION_DONE = 2
+
+# NervestimulationStatus.status 진행중
+SESSION_RUNNING = 1
+
+
+class DashboardSummaryCache:
+    """
+    대시보드 요약 캐시
+
+    밴드 온라인 여부, 진행 중 세션, 자극기 연결은 ID 집합으로 유지하여
+    같은 알림이 중복으로 와도 결과가 같고,
+    이벤트/세션 수는 생성·상태 변경 시 카운터를 증감한다.
+    reconcile_interval마다 DB 집계로 전체 값을 다시 맞춘다.
+
+    값이 바뀔 때마다 seq를 1 증가시키고 on_delta(seq, 변경분)를 호출한다.
+    on_delta는 잠금 안에서 seq 순서대로 호출되므로 오래 블록되면 안 된다.
+    seq는 프로세스마다 따로 증가하므로 요약/변경분에 origin(프로세스 식별자)을 함께 싣는다.
+    """
+
+    def __init__(self, app=None, reconcile_interval=60, loader=None, on_delta=None):
+        """
+        Args:
+            app: Flask 애플리케이션
+            reconcile_interval: DB 대조 주기 (초)
+            loader: DB 집계 함수 (기본값: _load_summary)
+            on_delta: 변경분 수신 함수 on_delta(seq, {항목: 증감값})
+        """
+        self.app = app
+        self.reconcile_interval = reconcile_interval
+        self.loader = loader or _load_summary
+        self.on_delta = on_delta
+
+        self.running = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._loaded = False
+        self._seq = 0
+        self.origin = None              # seq를 발급한 프로세스 식별자 (init_dashboard_summary)
+        self.leader = None              # 리더 선출 (None이면 이 프로세스가 발송 담당)
+
+        self._total_bands = 0
+        self._online = set()            # 온라인 band_id
+        self._unread_events = 0
+        self._urgent_events = 0
+        self._today = None              # today_* 카운터 기준 날짜 (UTC)
+        self._today_events = 0
+        self._today_sessions = 0
+        self._active_sessions = set()   # 진행 중 session id
+        self._stimulators = set()       # 자극기가 연결된 bid
+
+        self._reconcile_count = 0
+        self._last_reconcile = None
+        self._last_drift = {}
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """설정값 적용"""
+        self.app = app
+        self.reconcile_interval = app.config.get(
+            'DASHBOARD_SUMMARY_RECONCILE_INTERVAL', self.reconcile_interval
+        )
+
+    def start(self):
+        """주기적 대조 스레드 시작"""
+        if self.running:
+            return
+
+        self.running = True
+        self._wakeup.clear()
+        self.thread = threading.Thread(target=self._run, name='dashboard-summary', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        """대조 스레드 중지"""
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+
+    def _run(self):
+        """주기적 대조 루프"""
+        while self.running:
+            try:
+                with self.app.app_context():
+                    self.reconcile()
+            except Exception as e:
+                if self.app:
+                    self.app.logger.error(f"Dashboard summary reconcile failed: {e}")
+            self._wakeup.wait(self.reconcile_interval)
+
+    # ------------------------------------------------------------
+    # DB 대조
+    # ------------------------------------------------------------
+
+    def reconcile(self):
+        """
+        DB 집계로 카운터 재설정 (앱 컨텍스트 필요)
+
+        Returns:
+            dict: 보정 전후 값이 달랐던 항목 {이름: (캐시 값, DB 값)}
+        """
+        snapshot = self.loader()
+
+        with self._change():
+            drift = {}
+            if self._loaded:
+                current = self._counts()
+                for key, value in (
+                    ('total_bands', snapshot['total_bands']),
+                    ('online_bands', len(snapshot['online_band_ids'])),
+                    ('unread_events', snapshot['unread_events']),
+                    ('urgent_events', snapshot['urgent_events']),
+                    ('today_events', snapshot['today_events']),
+                    ('today_sessions', snapshot['today_sessions']),
+                    ('active_sessions', len(snapshot['active_session_ids'])),
+                ):
+                    if current[key] != value:
+                        drift[key] = (current[key], value)
+
+            self._total_bands = snapshot['total_bands']
+            self._online = set(snapshot['online_band_ids'])
+            self._unread_events = snapshot['unread_events']
+            self._urgent_events = snapshot['urgent_events']
+            self._today = snapshot['today']
+            self._today_events = snapshot['today_events']
+            self._today_sessions = snapshot['today_sessions']
+            self._active_sessions = set(snapshot['active_session_ids'])
+            self._loaded = True
+
+            self._reconcile_count += 1
+            self._last_reconcile = datetime.utcnow()
+            self._last_drift = drift
+
+        if drift and self.app:
+            self.app.logger.info(f"Dashboard summary drift corrected: {drift}")
+        return drift
+
+    # ------------------------------------------------------------
+    # 증분 갱신
+    # ------------------------------------------------------------
+
+    def set_band_online(self, band_id, online):
+        """밴드 온라인/오프라인 전환"""
+        with self._change():
+            if online:
+                self._online.add(band_id)
+            else:
+                self._online.discard(band_id)
+
+    def band_added(self, band_id, online=False):
+        """밴드 등록"""
+        with self._change():
+            self._total_bands += 1
+            if online:
+                self._online.add(band_id)
+
+    def event_created(self, event_type, action_status=ACTION_UNREAD, event_time=None):
+        """이벤트 생성"""
+        action_status = ACTION_UNREAD if action_status is None else action_status
+        with self._change():
+            if action_status == ACTION_UNREAD:
+                self._unread_events += 1
+            if event_type in URGENT_EVENT_TYPES and action_status != ACTION_DONE:
+                self._urgent_events += 1
+            if self._is_today(event_time or datetime.utcnow()):
+                self._today_events += 1
+
+    def event_status_changed(self, event_type, old_status, new_status):
+        """이벤트 처리 상태 변경 (미처리 → 처리중 → 완료)"""
+        old_status = ACTION_UNREAD if old_status is None else old_status
+        new_status = ACTION_UNREAD if new_status is None else new_status
+        if old_status == new_status:
+            return
+        with self._change():
+            if old_status == ACTION_UNREAD:
+                self._unread_events -= 1
+            elif new_status == ACTION_UNREAD:
+                self._unread_events += 1
+            if event_type in URGENT_EVENT_TYPES:
+                if new_status == ACTION_DONE:
+                    self._urgent_events -= 1
+                elif old_status == ACTION_DONE:
+                    self._urgent_events += 1
+
+    def session_status_changed(self, session_id, running):
+        """자극 세션 진행 시작/종료"""
+        with self._change():
+            if running:
+                self._active_sessions.add(session_id)
+            else:
+                self._active_sessions.discard(session_id)
+
+    def session_recorded(self, started_at=None):
+        """자극 이력 기록 (오늘 세션 수)"""
+        with self._change():
+            if self._is_today(started_at or datetime.utcnow()):
+                self._today_sessions += 1
+
+    def set_stimulator_connected(self, bid, connected):
+        """
+        신경자극기 BLE 연결/해제
+
+        bands 테이블에 연결 상태가 저장되지 않으므로 DB 대조 대상이 아니다.
+        수집 워커에서 일어난 연결/해제는 report_stimulator_connected()로 웹 프로세스에 전달된다.
+        """
+        with self._change():
+            if connected:
+                self._stimulators.add(bid)
+            else:
+                self._stimulators.discard(bid)
+
+    def _is_today(self, when):
+        """when이 카운터 기준 날짜인지 확인 (날짜가 바뀌었으면 today_* 카운터 초기화)"""
+        today = datetime.utcnow().date()
+        if self._today != today:
+            self._today = today
+            self._today_events = 0
+            self._today_sessions = 0
+        return when.date() == today
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+
+    @contextmanager
+    def _change(self):
+        """잠금을 잡고 블록 전후 값을 비교하여 변경분 발행"""
+        with self._lock:
+            # 첫 DB 대조 전에는 기준값이 없으므로 발행하지 않음
+            was_loaded = self._loaded
+            before = self._view()
+            yield
+            if was_loaded:
+                self._publish(before)
+
+    def _publish(self, before):
+        """변경분이 있으면 seq 증가 후 on_delta 호출 (잠금 안에서 호출)"""
+        after = self._view()
+        delta = {key: after[key] - before[key] for key in after if after[key] != before[key]}
+        if not delta:
+            return
+
+        self._seq += 1
+        if self.on_delta is not None:
+            try:
+                self.on_delta(self._seq, delta)
+            except Exception as e:
+                if self.app:
+                    self.app.logger.error(f"Dashboard delta publish failed: {e}")
+
+    def _view(self):
+        """클라이언트에 보이는 요약 값"""
+        counts = self._counts()
+        counts['offline_bands'] = max(counts['total_bands'] - counts['online_bands'], 0)
+        counts['stimulator_connected'] = len(self._stimulators)
+        return counts
+
+    def _counts(self):
+        return {
+            'total_bands': self._total_bands,
+            'online_bands': len(self._online),
+            'unread_events': self._unread_events,
+            'urgent_events': self._urgent_events,
+            'today_events': self._today_events,
+            'today_sessions': self._today_sessions,
+            'active_sessions': len(self._active_sessions),
+        }
+
+    def get_summary(self):
+        """
+        대시보드 요약 데이터 (get_dashboard_summary()와 같은 형식)
+
+        대조 스레드가 동작하지 않으면(테스트 설정 등) 매번 DB에서 집계한다 (앱 컨텍스트 필요).
+        """
+        if not self._loaded or not self.running:
+            self.reconcile()
+
+        with self._change():
+            # 자정이 지난 뒤 이벤트가 없었어도 today_* 는 0으로 보여야 함
+            self._is_today(datetime.utcnow())
+
+        with self._lock:
+            summary = self._view()
+            summary['seq'] = self._seq
+            summary['origin'] = self.origin
+
+        summary['timestamp'] = datetime.utcnow().isoformat()
+        return summary
+
+    def is_publisher(self):
+        """이 프로세스가 dashboard_delta/요약 발송 담당(리더)인지 확인"""
+        return self.leader is None or self.leader.is_leader
+
+    def get_stats(self):
+        """캐시 상태"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'loaded': self._loaded,
+                'seq': self._seq,
+                'reconcile_count': self._reconcile_count,
+                'last_reconcile': self._last_reconcile.isoformat() if self._last_reconcile else None,
+                'last_drift': {key: list(values) for key, values in self._last_drift.items()}
+            }
+
+
+def _load_summary():
+    """DB에서 요약 값 집계 (앱 컨텍스트 필요)"""
+    from backend.db import models as db_models
+    Band = db_models.Band
+    Event = db_models.Event
+    NervestimulationStatus = db_models.NervestimulationStatus
+    NervestimulationHist = db_models.NervestimulationHist
+
+    today = datetime.utcnow().date()
+    today_start = datetime.combine(today, datetime.min.time())
+    today_end = today_start + timedelta(days=1)
+
+    return {
+        'total_bands': Band.query.count(),
+        'online_band_ids': [row.id for row in Band.query.with_entities(Band.id).filter_by(connect_state=1)],
+        'unread_events': Event.query.filter(Event.action_status == ACTION_UNREAD).count(),
+        'urgent_events': Event.query.filter(
+            Event.type.in_(URGENT_EVENT_TYPES),
+            Event.action_status != ACTION_DONE
+        ).count(),
+        'today': today,
+        'today_events': Event.query.filter(
+            Event.datetime >= today_start,
+            Event.datetime < today_end
+        ).count(),
+        'today_sessions': NervestimulationHist.query.filter(
+            NervestimulationHist.started_at >= today_start,
+            NervestimulationHist.started_at < today_end
+        ).count(),
+        'active_session_ids': [
+            row.id for row in NervestimulationStatus.query
+            .with_entities(NervestimulationStatus.id)
+            .filter_by(status=SESSION_RUNNING)
+        ],
+    }
+
+
+# ------------------------------------------------------------
+# ORM 변경 감지
+# ------------------------------------------------------------
+
+def _pending(session):
+    return session.info.setdefault('dashboard_summary', [])
+
+
+def _history_change(target, key):
+    """(이전 값, 새 값) 또는 변경 없으면 None"""
+    from sqlalchemy.orm.attributes import get_history
+    history = get_history(target, key)
+    if not history.has_changes():
+        return None
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else None
+    return old, new
+
+
+_watched = set()
+
+
+def watch_models(summary):
+    """
+    ORM으로 저장되는 밴드/이벤트/세션 변경을 커밋 시점에 요약 캐시에 반영
+
+    bulk UPDATE 등 ORM을 거치지 않는 변경은 주기적 DB 대조로 보정된다.
+    """
+    if id(summary) in _watched:
+        return
+    _watched.add(id(summary))
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session, object_session
+    from backend.db import models as db_models
+
+    def queue(target, func, *args):
+        session = object_session(target)
+        if session is not None:
+            _pending(session).append((func, args))
+
+    @event.listens_for(db_models.Event, 'after_insert')
+    def event_inserted(mapper, connection, target):
+        queue(target, summary.event_created, target.type, target.action_status, target.datetime)
+
+    @event.listens_for(db_models.Event, 'after_update')
+    def event_updated(mapper, connection, target):
+        change = _history_change(target, 'action_status')
+        if change:
+            queue(target, summary.event_status_changed, target.type, *change)
+
+    @event.listens_for(db_models.Band, 'after_insert')
+    def band_inserted(mapper, connection, target):
+        queue(target, summary.band_added, target.id, target.connect_state == 1)
+
+    @event.listens_for(db_models.Band, 'after_update')
+    def band_updated(mapper, connection, target):
+        change = _history_change(target, 'connect_state')
+        if change:
+            queue(target, summary.set_band_online, target.id, change[1] == 1)
+
+    @event.listens_for(db_models.NervestimulationStatus, 'after_insert')
+    def session_inserted(mapper, connection, target):
+        if target.status == SESSION_RUNNING:
+            queue(target, summary.session_status_changed, target.id, True)
+
+    @event.listens_for(db_models.NervestimulationStatus, 'after_update')
+    def session_updated(mapper, connection, target):
+        change = _history_change(target, 'status')
+        if change:
+            queue(target, summary.session_status_changed, target.id, change[1] == SESSION_RUNNING)
+
+    @event.listens_for(db_models.NervestimulationHist, 'after_insert')
+    def history_inserted(mapper, connection, target):
+        queue(target, summary.session_recorded, target.started_at)
+
+    @event.listens_for(Session, 'after_commit')
+    def apply_pending(session):
+        for func, args in session.info.pop('dashboard_summary', []):
+            func(*args)
+
+    @event.listens_for(Session, 'after_rollback')
+    def discard_pending(session):
+        session.info.pop('dashboard_summary', None)
+
+
+# 전역 인스턴스
+dashboard_summary = DashboardSummaryCache()
+
+
+# ------------------------------------------------------------
+# 수집 워커 → 웹 프로세스 증분 갱신
+# ------------------------------------------------------------
+
+UPDATE_BAND_ONLINE = 'band_online'
+UPDATE_STIMULATOR = 'stimulator'
+
+_reported = {}                  # (종류, 키) → 마지막으로 알린 값 (수집 워커)
+_reported_lock = threading.Lock()
+
+
+def _report(kind, key, value):
+    """
+    증분 갱신 전달
+
+    요약 캐시가 동작하는 웹 프로세스('all'/'web' 역할)는 바로 반영하고,
+    캐시가 없는 수집 워커(PROCESS_ROLE='ingest')는 값이 바뀔 때만 MQTT로 웹 프로세스에 알린다
+    (측정값마다 오는 온라인 알림을 메시지마다 보내지 않음).
+    """
+    if dashboard_summary.running:
+        apply_update({'kind': kind, 'key': key, 'value': value})
+        return
+
+    with _reported_lock:
+        if _reported.get((kind, key)) == value:
+            return
+        _reported[(kind, key)] = value
+
+    from backend.mqtt_client import publish, Topics
+    if not publish(Topics.DASHBOARD_UPDATE, {'kind': kind, 'key': key, 'value': value}):
+        # 다음 알림 때 다시 시도
+        with _reported_lock:
+            _reported.pop((kind, key), None)
+
+
+def report_band_online(band_id, online):
+    """밴드 온라인/오프라인 전환 알림 (수집 경로)"""
+    _report(UPDATE_BAND_ONLINE, band_id, bool(online))
+
+
+def report_stimulator_connected(bid, connected):
+    """신경자극기 연결/해제 알림 (수집 경로)"""
+    _report(UPDATE_STIMULATOR, bid, bool(connected))
+
+
+def apply_update(update):
+    """
+    증분 갱신 반영 (웹 프로세스, Topics.DASHBOARD_UPDATE 수신)
+
+    Returns:
+        bool: 알 수 없는 형식이면 False
+    """
+    if not isinstance(update, dict) or update.get('key') is None:
+        return False
+    kind = update.get('kind')
+    if kind == UPDATE_BAND_ONLINE:
+        dashboard_summary.set_band_online(update['key'], bool(update.get('value')))
+    elif kind == UPDATE_STIMULATOR:
+        dashboard_summary.set_stimulator_connected(update['key'], bool(update.get('value')))
+    else:
+        return False
+    return True
+
+
+def delta_emitter(socketio, leader=None):
+    """
+    'dashboard' 룸 dashboard_delta 발송 함수
+
+    웹 워커가 여러 개면 워커마다 캐시와 seq가 따로 있으므로 리더 프로세스만 발송한다.
+    모든 워커가 발송하면 클라이언트가 서로 다른 seq를 누락으로 보고 재동기화를 반복하고,
+    워커마다 DB 대조 보정분을 보내 같은 변경이 여러 번 적용된다.
+    다른 워커에서 일어난 변경은 리더의 DB 대조(DASHBOARD_SUMMARY_RECONCILE_INTERVAL) 때 발송된다.
+    클라이언트가 변경분을 이어 붙이는 요약(dashboard_data)도 리더가 보낸다 (send_snapshot).
+
+    Args:
+        socketio: Socket.IO 인스턴스
+        leader: 리더 선출 (None이면 항상 발송)
+    """
+    def emit_delta(seq, delta):
+        if leader is not None and not leader.is_leader:
+            return
+        socketio.emit('dashboard_delta', {'seq': seq, 'delta': delta, 'origin': dashboard_summary.origin},
+                      room='dashboard')
+    return emit_delta
+
+
+def send_snapshot(socketio, sid, forward=True):
+    """
+    sid 클라이언트에 대시보드 요약(dashboard_data) 발송
+
+    dashboard_delta는 리더 워커의 seq/origin으로 발송되므로 요약도 리더 워커의 캐시에서 만들어야
+    클라이언트가 변경분을 이어 붙일 수 있다. 리더가 아니면 MQTT로 리더 워커에 요청하고,
+    리더 워커가 메시지 큐(SOCKETIO_MESSAGE_QUEUE)를 통해 sid로 발송한다.
+
+    Args:
+        socketio: Socket.IO 인스턴스
+        sid: 클라이언트 세션 ID
+        forward: 리더가 아니면 리더 워커에 요청 (False면 리더일 때만 발송, 요청 수신 측)
+
+    Returns:
+        bool: 이 프로세스가 발송했는지 여부
+    """
+    summary = dashboard_summary
+    if not summary.is_publisher():
+        if not forward:
+            return False
+        from backend.mqtt_client import publish, Topics
+        if publish(Topics.DASHBOARD_SNAPSHOT, {'sid': sid}):
+            return False
+        # 브로커에 연결되지 않았으면 이 워커의 요약이라도 보냄 (다음 변경분에서 재동기화)
+        if summary.app:
+            summary.app.logger.warning("Dashboard snapshot request not published, sending local summary")
+
+    if summary.app is not None:
+        with summary.app.app_context():
+            data = summary.get_summary()
+    else:
+        data = summary.get_summary()
+    socketio.emit('dashboard_data', data, room=sid)
+    return True
+
+
+def init_dashboard_summary(app, socketio=None, leader=None):
+    """
+    대시보드 요약 캐시 초기화, ORM 변경 감지 등록 및 대조 스레드 시작
+
+    Args:
+        app: Flask 애플리케이션
+        socketio: Socket.IO 인스턴스 (있으면 'dashboard' 룸에 dashboard_delta 발송)
+        leader: 리더 선출 (있으면 리더 프로세스만 dashboard_delta/요약 발송)
+    """
+    dashboard_summary.init_app(app)
+    dashboard_summary.leader = leader
+    if leader is not None:
+        dashboard_summary.origin = leader.holder
+    if socketio is not None:
+        dashboard_summary.on_delta = delta_emitter(socketio, leader)
+    watch_models(dashboard_summary)
+    dashboard_summary.start()
+    return dashboard_summary
@@ -92,20 +92,10 @@ CREATE TABLE IF NOT EXISTS sensordata (
     PRIMARY KEY (id, datetime),
     INDEX idx_bid_datetime (FK_bid, datetime)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-PARTITION BY RANGE (YEAR(datetime) * 100 + MONTH(datetime)) (
-    PARTITION p202501 VALUES LESS THAN (202502),
-    PARTITION p202502 VALUES LESS THAN (202503),
-    PARTITION p202503 VALUES LESS THAN (202504),
-    PARTITION p202504 VALUES LESS THAN (202505),
-    PARTITION p202505 VALUES LESS THAN (202506),
-    PARTITION p202506 VALUES LESS THAN (202507),
-    PARTITION p202507 VALUES LESS THAN (202508),
-    PARTITION p202508 VALUES LESS THAN (202509),
-    PARTITION p202509 VALUES LESS THAN (202510),
-    PARTITION p202510 VALUES LESS THAN (202511),
-    PARTITION p202511 VALUES LESS THAN (202512),
-    PARTITION p202512 VALUES LESS THAN (202601),
-    PARTITION pmax VALUES LESS THAN MAXVALUE
+-- datetime 범위 조건으로 해당 파티션만 읽도록 RANGE COLUMNS 사용
+-- 일/월 파티션은 스케줄러 작업(backend/partitions.py)이 미리 만들고, 보관 기간이 지나면 DROP PARTITION
+PARTITION BY RANGE COLUMNS(datetime) (
+    PARTITION pmax VALUES LESS THAN (MAXVALUE)
 );
 
 -- 이벤트(알림) 테이블
@@ -209,6 +199,7 @@ CREATE TABLE IF NOT EXISTS prescription_hist (
     duration INT COMMENT '권장 자극 시간',
     sessions_per_day INT DEFAULT 1 COMMENT '일일 권장 횟수',
     schedule_times JSON COMMENT '권장 자극 시간대',
+    vital_thresholds JSON COMMENT '이상 감지 기준',
     valid_from DATETIME DEFAULT CURRENT_TIMESTAMP,
     valid_until DATETIME,
     diagnosis TEXT COMMENT '진단명',
@@ -219,6 +210,27 @@ CREATE TABLE IF NOT EXISTS prescription_hist (
     FOREIGN KEY (prescribed_by) REFERENCES users(id) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- 리더 선출 리스 테이블 (스케줄러 작업을 한 프로세스에서만 실행)
+CREATE TABLE IF NOT EXISTS leader_lease (
+    name VARCHAR(64) PRIMARY KEY COMMENT '리스 이름',
+    holder VARCHAR(128) NOT NULL COMMENT '리더 프로세스 (호스트:pid:임의값)',
+    expires_at DATETIME(3) NOT NULL COMMENT '리스 만료 시각 (UTC)',
+    acquired_at DATETIME(3) COMMENT '현재 리더가 차지한 시각 (UTC)'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 보관 기간 정리 진행 위치 테이블
+CREATE TABLE IF NOT EXISTS retention_checkpoint (
+    name VARCHAR(64) PRIMARY KEY COMMENT '정리 대상 (테이블 이름)',
+    cutoff DATETIME NOT NULL COMMENT '이번 실행 기준 시각 (이전 데이터 삭제)',
+    last_id BIGINT NOT NULL DEFAULT 0 COMMENT '삭제 완료한 마지막 id',
+    archived_through BIGINT NOT NULL DEFAULT 0 COMMENT '보관 파일로 확정한 마지막 id',
+    deleted BIGINT NOT NULL DEFAULT 0 COMMENT '삭제한 행 수',
+    archived BIGINT NOT NULL DEFAULT 0 COMMENT '보관 파일로 내보낸 행 수',
+    started_at DATETIME,
+    updated_at DATETIME,
+    finished_at DATETIME COMMENT 'NULL이면 진행 중 (다음 실행에서 이어서 삭제)'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- ============================================================
 -- 초기 데이터 삽입
 -- ============================================================
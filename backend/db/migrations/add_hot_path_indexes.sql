@@ -0,0 +1,84 @@
+-- sensordata/events 조회 경로 복합 인덱스 추가 마이그레이션
+-- 같은 컬럼 순서로 시작하는 인덱스가 이미 있으면 이름과 관계없이 건너뜀 (MySQL/MariaDB 공통)
+-- (init.sql의 idx_bid_datetime이 있는 DB에 같은 인덱스를 하나 더 만들지 않도록)
+--
+-- 대용량 sensordata는 온라인 DDL로 생성 (ALGORITHM=INPLACE, LOCK=NONE)
+-- 적용 후 확인: SHOW INDEX FROM sensordata; SHOW INDEX FROM events;
+
+-- sensordata (FK_bid, datetime): 밴드별 최신 데이터, 기간 조회, 통계 (init.sql과 같은 이름)
+SET @ddl = (
+    SELECT IF(COUNT(*) = 0,
+        'ALTER TABLE sensordata ADD INDEX idx_bid_datetime (FK_bid, datetime), ALGORITHM=INPLACE, LOCK=NONE',
+        'SELECT ''sensordata (FK_bid, datetime) index exists''')
+    FROM (
+        SELECT index_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'sensordata'
+        GROUP BY index_name
+        HAVING LEFT(CONCAT(GROUP_CONCAT(column_name ORDER BY seq_in_index), ','), 16) = 'FK_bid,datetime,'
+    ) AS existing
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- events (FK_bid, datetime): 밴드별 이벤트 목록, 24시간 이벤트 수 (init.sql과 같은 이름)
+SET @ddl = (
+    SELECT IF(COUNT(*) = 0,
+        'ALTER TABLE events ADD INDEX idx_bid_datetime (FK_bid, datetime), ALGORITHM=INPLACE, LOCK=NONE',
+        'SELECT ''events (FK_bid, datetime) index exists''')
+    FROM (
+        SELECT index_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'events'
+        GROUP BY index_name
+        HAVING LEFT(CONCAT(GROUP_CONCAT(column_name ORDER BY seq_in_index), ','), 16) = 'FK_bid,datetime,'
+    ) AS existing
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- events (datetime): 최근 이벤트 목록, 오늘/7일 통계
+SET @ddl = (
+    SELECT IF(COUNT(*) = 0,
+        'ALTER TABLE events ADD INDEX idx_events_datetime (datetime), ALGORITHM=INPLACE, LOCK=NONE',
+        'SELECT ''events (datetime) index exists''')
+    FROM (
+        SELECT index_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'events'
+        GROUP BY index_name
+        HAVING LEFT(CONCAT(GROUP_CONCAT(column_name ORDER BY seq_in_index), ','), 9) = 'datetime,'
+    ) AS existing
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- events (action_status): 미처리/미해결 이벤트 수
+SET @ddl = (
+    SELECT IF(COUNT(*) = 0,
+        'ALTER TABLE events ADD INDEX idx_events_action_status (action_status), ALGORITHM=INPLACE, LOCK=NONE',
+        'SELECT ''events (action_status) index exists''')
+    FROM (
+        SELECT index_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'events'
+        GROUP BY index_name
+        HAVING LEFT(CONCAT(GROUP_CONCAT(column_name ORDER BY seq_in_index), ','), 14) = 'action_status,'
+    ) AS existing
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- events (type, action_status): 긴급 이벤트(type 6~10) 미처리 수
+SET @ddl = (
+    SELECT IF(COUNT(*) = 0,
+        'ALTER TABLE events ADD INDEX idx_events_type_action_status (type, action_status), ALGORITHM=INPLACE, LOCK=NONE',
+        'SELECT ''events (type, action_status) index exists''')
+    FROM (
+        SELECT index_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'events'
+        GROUP BY index_name
+        HAVING LEFT(CONCAT(GROUP_CONCAT(column_name ORDER BY seq_in_index), ','), 19) = 'type,action_status,'
+    ) AS existing
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- 옵티마이저 통계 갱신
+ANALYZE TABLE sensordata, events;
@@ -0,0 +1,12 @@
+-- 리더 선출 리스 테이블 추가 마이그레이션
+-- 이미 테이블이 존재하는 경우 오류 발생하지 않음
+--
+-- 웹 워커 중 이 행을 가진(holder, expires_at > 현재) 프로세스 하나만 스케줄러 작업을 실행
+-- 동작은 backend/leader.py 참조 (서버 시작 시 없으면 자동 생성)
+
+CREATE TABLE IF NOT EXISTS leader_lease (
+    name VARCHAR(64) PRIMARY KEY COMMENT '리스 이름',
+    holder VARCHAR(128) NOT NULL COMMENT '리더 프로세스 (호스트:pid:임의값)',
+    expires_at DATETIME(3) NOT NULL COMMENT '리스 만료 시각 (UTC)',
+    acquired_at DATETIME(3) COMMENT '현재 리더가 차지한 시각 (UTC)'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
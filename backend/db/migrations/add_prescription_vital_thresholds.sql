@@ -0,0 +1,8 @@
+-- 처방별 생체신호 이상 감지 기준 컬럼 추가 마이그레이션
+-- 이미 컬럼이 존재하는 경우 오류 발생하지 않음
+--
+-- 값 예: {"hr_high": {"enter": 130, "exit": 115, "debounce": 20}, "spo2_low": {"enter": 92}}
+-- 규칙 이름과 항목은 backend/anomaly.py의 DEFAULT_RULES, TUNABLE 참조
+
+ALTER TABLE prescription_hist
+ADD COLUMN IF NOT EXISTS vital_thresholds JSON NULL COMMENT '이상 감지 기준';
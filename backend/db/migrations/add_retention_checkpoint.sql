@@ -0,0 +1,17 @@
+-- 보관 기간 정리 진행 위치 테이블 추가 마이그레이션
+-- 이미 테이블이 존재하는 경우 오류 발생하지 않음
+--
+-- sensordata 정리(backend/retention.py)가 구간마다 진행 위치를 기록하여 중단 후 이어서 실행
+-- 서버 시작 후 첫 정리 때 없으면 자동 생성
+
+CREATE TABLE IF NOT EXISTS retention_checkpoint (
+    name VARCHAR(64) PRIMARY KEY COMMENT '정리 대상 (테이블 이름)',
+    cutoff DATETIME NOT NULL COMMENT '이번 실행 기준 시각 (이전 데이터 삭제)',
+    last_id BIGINT NOT NULL DEFAULT 0 COMMENT '삭제 완료한 마지막 id',
+    archived_through BIGINT NOT NULL DEFAULT 0 COMMENT '보관 파일로 확정한 마지막 id',
+    deleted BIGINT NOT NULL DEFAULT 0 COMMENT '삭제한 행 수',
+    archived BIGINT NOT NULL DEFAULT 0 COMMENT '보관 파일로 내보낸 행 수',
+    started_at DATETIME,
+    updated_at DATETIME,
+    finished_at DATETIME COMMENT 'NULL이면 진행 중 (다음 실행에서 이어서 삭제)'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,36 @@
+-- sensordata 파티션을 RANGE COLUMNS(datetime)으로 변경하는 마이그레이션
+-- 기존 RANGE (YEAR(datetime) * 100 + MONTH(datetime)) 파티션은 datetime 범위 조건으로 파티션을 고르지 못해
+-- 기간 조회가 모든 파티션을 읽음
+--
+-- 기존 데이터는 월 파티션(이번 달까지)으로 옮기고, 이후 일/월 파티션은 스케줄러 작업
+-- (backend/partitions.py, SENSORDATA_PARTITION_UNIT)이 비어 있는 pmax를 나눠 미리 만든다.
+-- 테이블 전체를 다시 쓰므로 트래픽이 적은 시간에 실행 (MySQL 8.0 이상)
+
+SET @first_month = (
+    SELECT DATE_FORMAT(COALESCE(MIN(datetime), NOW()), '%Y-%m-01') FROM sensordata
+);
+
+SET SESSION cte_max_recursion_depth = 10000;
+
+SELECT GROUP_CONCAT(
+           CONCAT('PARTITION p', DATE_FORMAT(m, '%Y%m'),
+                  ' VALUES LESS THAN (''', DATE_FORMAT(m + INTERVAL 1 MONTH, '%Y-%m-%d 00:00:00'), ''')')
+           ORDER BY m SEPARATOR ', ')
+INTO @month_partitions
+FROM (
+    WITH RECURSIVE months (m) AS (
+        SELECT DATE(@first_month)
+        UNION ALL
+        SELECT m + INTERVAL 1 MONTH FROM months WHERE m < DATE_FORMAT(NOW(), '%Y-%m-01')
+    )
+    SELECT m FROM months
+) AS periods;
+
+SET @ddl = CONCAT(
+    'ALTER TABLE sensordata PARTITION BY RANGE COLUMNS(datetime) (',
+    @month_partitions, ', PARTITION pmax VALUES LESS THAN (MAXVALUE))'
+);
+
+PREPARE partition_stmt FROM @ddl;
+EXECUTE partition_stmt;
+DEALLOCATE PREPARE partition_stmt;
@@ -4,7 +4,7 @@
 """
 
 from datetime import datetime, timedelta
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, and_, or_
 # Import 순서 중요: db 패키지를 먼저 import한 후 SQLAlchemy 인스턴스를 import
 from backend.db.table import (
     User, Band, SensorData, Event, Group,
@@ -22,6 +22,17 @@ def get_band_by_bid(bid):
     return Band.query.filter_by(bid=bid, ).first()
 
 
+def get_band_info_by_bid(bid):
+    """
+    밴드 ID로 캐시된 밴드 정보 조회 (MQTT 수신 경로용)
+
+    Returns:
+        BandInfo: id, bid, wearer_name, guardian_phone 등을 담은 스냅샷 (미등록이면 None)
+    """
+    from backend.band_cache import band_cache
+    return band_cache.get(bid)
+
+
 def get_band_by_id(band_id):
     """내부 ID로 밴드 조회"""
     return Band.query.filter_by(id=band_id, ).first()
@@ -35,6 +46,89 @@ def get_all_bands(include_inactive=False):
     return query.order_by(Band.id).all()
 
 
+def get_band_list_page(connect_state=None, name=None, after=None, limit=None):
+    """
+    밴드 목록 + 최신 센서 데이터 + 24시간 이벤트 수를 단일 쿼리로 조회
+
+    정렬: connect_state 내림차순(온라인 우선), 이름, id 오름차순
+    밴드별 최신 행은 max(datetime) 서브쿼리와 조인하여 (FK_bid, datetime) 인덱스를 사용하고,
+    같은 시각의 행이 여러 개면 그중 id가 가장 큰 행 하나만 조인 (limit 전에 밴드당 한 행)
+
+    Args:
+        connect_state: 연결 상태 필터 (0/1, None이면 전체)
+        name: 착용자 이름(name/alias) 부분 일치 필터
+        after: 이전 페이지 마지막 항목의 (connect_state, name, id) 커서
+        limit: 최대 항목 수 (None이면 전체)
+
+    Returns:
+        tuple: ((Band, hr, spo2, battery_level, sensor_datetime, event_count_24h) 목록, 다음 페이지 존재 여부)
+    """
+    since = datetime.utcnow() - timedelta(days=1)
+
+    latest = db.session.query(
+        SensorData.FK_bid.label('FK_bid'),
+        func.max(SensorData.datetime).label('max_datetime')
+    ).group_by(SensorData.FK_bid).subquery()
+
+    latest_row = db.session.query(
+        SensorData.FK_bid.label('FK_bid'),
+        latest.c.max_datetime.label('max_datetime'),
+        func.max(SensorData.id).label('id')
+    ).join(
+        latest,
+        and_(SensorData.FK_bid == latest.c.FK_bid,
+             SensorData.datetime == latest.c.max_datetime)
+    ).group_by(SensorData.FK_bid, latest.c.max_datetime).subquery()
+
+    events = db.session.query(
+        Event.FK_bid.label('FK_bid'),
+        func.count(Event.id).label('event_count')
+    ).filter(Event.datetime >= since).group_by(Event.FK_bid).subquery()
+
+    state = func.coalesce(Band.connect_state, 0)
+    band_name = func.coalesce(Band.name, '')
+
+    query = db.session.query(
+        Band,
+        SensorData.hr,
+        SensorData.spo2,
+        SensorData.battery_level,
+        SensorData.datetime,
+        func.coalesce(events.c.event_count, 0)
+    ).outerjoin(
+        latest_row, latest_row.c.FK_bid == Band.id
+    ).outerjoin(
+        SensorData,
+        and_(SensorData.id == latest_row.c.id,
+             SensorData.datetime == latest_row.c.max_datetime)
+    ).outerjoin(
+        events, events.c.FK_bid == Band.id
+    )
+
+    if connect_state is not None:
+        query = query.filter(state == connect_state)
+    if name:
+        pattern = f'%{name}%'
+        query = query.filter(or_(Band.name.like(pattern), Band.alias.like(pattern)))
+    if after is not None:
+        after_state, after_name, after_id = after
+        query = query.filter(or_(
+            state < after_state,
+            and_(state == after_state, band_name > after_name),
+            and_(state == after_state, band_name == after_name, Band.id > after_id)
+        ))
+
+    query = query.order_by(state.desc(), band_name, Band.id)
+    if limit is not None:
+        # 한 행 더 읽어서 다음 페이지 존재 여부 판단
+        query = query.limit(limit + 1)
+    rows = query.all()
+    has_more = limit is not None and len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+    return rows, has_more
+
+
 def get_online_bands():
     """온라인 상태 밴드 목록 조회"""
     return Band.query.filter_by(connect_state=1, ).all()
@@ -68,6 +162,34 @@ def get_latest_sensordata(bid, limit=1):
         .all()
 
 
+def get_latest_sensordata_per_band():
+    """
+    밴드별 최신 센서 데이터 일괄 조회 (최신 생체신호 저장소 초기 적재용)
+
+    밴드별 max(datetime)과 조인하는 단일 쿼리
+
+    Returns:
+        list: FK_bid, datetime, hr, spo2, battery_level, skin_temp 행 목록
+    """
+    latest = db.session.query(
+        SensorData.FK_bid.label('FK_bid'),
+        func.max(SensorData.datetime).label('max_datetime')
+    ).group_by(SensorData.FK_bid).subquery()
+
+    return db.session.query(
+        SensorData.FK_bid,
+        SensorData.datetime,
+        SensorData.hr,
+        SensorData.spo2,
+        SensorData.battery_level,
+        SensorData.skin_temp
+    ).join(
+        latest,
+        (SensorData.FK_bid == latest.c.FK_bid) &
+        (SensorData.datetime == latest.c.max_datetime)
+    ).all()
+
+
 def get_sensordata_range(bid, start_time, end_time):
     """기간별 센서 데이터 조회"""
     band = get_band_by_bid(bid) if isinstance(bid, str) else Band.query.get(bid)
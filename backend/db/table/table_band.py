@@ -184,6 +184,10 @@ class UserBand(db.Model):
 class SensorData(db.Model):
     """센서 데이터 테이블"""
     __tablename__ = 'sensordata'
+    __table_args__ = (
+        # 밴드별 최신/기간 조회 (init.sql, db/migrations/add_hot_path_indexes.sql)
+        db.Index('idx_bid_datetime', 'FK_bid', 'datetime'),
+    )
 
     # 실제 데이터베이스 컬럼
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -285,12 +289,21 @@ class SensorData(db.Model):
 class Event(db.Model):
     """이벤트(알림) 테이블"""
     __tablename__ = 'events'
+    __table_args__ = (
+        # 대시보드/알림 조회 경로 (db/migrations/add_hot_path_indexes.sql)
+        db.Index('idx_bid_datetime', 'FK_bid', 'datetime').ddl_if(dialect='mysql'),
+        # SQLite(개발/테스트)는 인덱스 이름이 DB 전체에서 유일해야 하므로 sensordata와 다른 이름
+        db.Index('idx_events_bid_datetime', 'FK_bid', 'datetime').ddl_if(dialect='sqlite'),
+        db.Index('idx_events_datetime', 'datetime'),
+        db.Index('idx_events_action_status', 'action_status'),
+        db.Index('idx_events_type_action_status', 'type', 'action_status'),
+    )
 
     # 실제 데이터베이스 컬럼
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     datetime = db.Column(db.DateTime)
     FK_bid = db.Column(db.Integer, db.ForeignKey('bands.id'))
-    type = db.Column(db.Integer)  # 이벤트 타입 (6:SOS, 7:낙상, 8:심박수높음, 9:심박수낮음, 10:산소포화도낮음)
+    type = db.Column(db.Integer)  # 이벤트 타입 (6:SOS, 7:낙상, 8:심박수높음, 9:심박수낮음, 10:산소포화도낮음, 11:기기 오프라인)
     value = db.Column(db.Integer)
     action_status = db.Column(db.Integer, default=0)  # 0:미처리, 1:처리중, 2:완료
     action_time = db.Column(db.DateTime)
@@ -307,6 +320,7 @@ class Event(db.Model):
             8: 'hr_high',
             9: 'hr_low',
             10: 'spo2_low',
+            11: 'device_offline',
         }
         return type_map.get(self.type, 'unknown')
 
@@ -317,6 +331,8 @@ class Event(db.Model):
             return 4
         elif self.type in [8, 9, 10]:  # 생체신호 이상
             return 3
+        elif self.type == 11:  # 기기 오프라인 (주의)
+            return 2
         return 1
 
     @property
@@ -183,6 +183,9 @@ class Prescription(db.Model):
     
     # 스케줄
     schedule_times = db.Column(db.JSON, comment='권장 자극 시간대')
+
+    # 생체신호 이상 감지 기준 (anomaly.py 규칙 이름 → 값, 예: {"hr_high": {"enter": 130, "exit": 115}})
+    vital_thresholds = db.Column(db.JSON, comment='이상 감지 기준')
     
     # 유효 기간
     valid_from = db.Column(db.DateTime, default=datetime.utcnow)
@@ -205,6 +208,7 @@ class Prescription(db.Model):
             'duration': self.duration,
             'sessions_per_day': self.sessions_per_day,
             'schedule_times': self.schedule_times,
+            'vital_thresholds': self.vital_thresholds,
             'valid_from': self.valid_from.isoformat() if self.valid_from else None,
             'valid_until': self.valid_until.isoformat() if self.valid_until else None,
             'diagnosis': self.diagnosis,
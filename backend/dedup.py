@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 메시지 중복 제거 모듈
+QoS 1 구독은 재연결 후 브로커가 같은 메시지를 다시 보낼 수 있으므로
+(bid, 기기 시각/시퀀스, 종류) 키를 일정 시간 기억해 두 번째 수신부터 건너뛴다.
+"""
+
+import threading
+import time
+
+
+class DedupWindow:
+    """
+    시간 구간 단위 중복 키 집합
+
+    키를 현재/이전 두 세대의 set에 보관하고 window초마다 세대를 교체한다.
+    따라서 키는 최소 window초, 최대 2*window초 동안 기억된다.
+    현재 세대가 max_keys에 도달하면 시간과 관계없이 교체하므로
+    밴드 수와 관계없이 메모리는 최대 2*max_keys 키로 고정된다
+    (대신 수신량이 매우 많으면 실제 중복 확인 구간이 window보다 짧아짐).
+    """
+
+    def __init__(self, window=120, max_keys=100000, clock=time.monotonic):
+        """
+        Args:
+            window: 세대 교체 주기 (초)
+            max_keys: 세대당 최대 키 수
+            clock: 단조 증가 시계 (테스트용)
+        """
+        self.window = window
+        self.max_keys = max_keys
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._current = set()
+        self._previous = set()
+        self._rotated_at = clock()
+        self._checked = 0
+        self._duplicates = 0
+        self._rotations = 0
+        self._early_rotations = 0
+
+    def init_app(self, app):
+        """설정값 적용"""
+        self.window = app.config.get('MQTT_DEDUP_WINDOW', self.window)
+        self.max_keys = app.config.get('MQTT_DEDUP_MAX_KEYS', self.max_keys)
+
+    def seen(self, key):
+        """
+        중복 확인 및 기록
+
+        Args:
+            key: 해시 가능한 메시지 키
+
+        Returns:
+            bool: 구간 안에서 이미 받은 키면 True (처음이면 기록 후 False)
+        """
+        now = self._clock()
+        with self._lock:
+            self._checked += 1
+            if now - self._rotated_at >= self.window:
+                self._rotate(now)
+            elif len(self._current) >= self.max_keys:
+                self._early_rotations += 1
+                self._rotate(now)
+
+            if key in self._current or key in self._previous:
+                self._duplicates += 1
+                return True
+            self._current.add(key)
+            return False
+
+    def _rotate(self, now):
+        """세대 교체 (두 구간 이상 지났으면 둘 다 비움)"""
+        if now - self._rotated_at >= 2 * self.window:
+            self._previous = set()
+        else:
+            self._previous = self._current
+        self._current = set()
+        self._rotated_at = now
+        self._rotations += 1
+
+    def clear(self):
+        with self._lock:
+            self._current = set()
+            self._previous = set()
+            self._rotated_at = self._clock()
+
+    def get_stats(self):
+        """중복 제거 통계"""
+        with self._lock:
+            return {
+                'window': self.window,
+                'max_keys': self.max_keys,
+                'keys': len(self._current) + len(self._previous),
+                'checked': self._checked,
+                'duplicates': self._duplicates,
+                'rotations': self._rotations,
+                'early_rotations': self._early_rotations
+            }
+
+
+def message_marker(payload):
+    """
+    메시지를 구별하는 기기 값 (시퀀스 번호 우선, 없으면 기기 timestamp)
+
+    Returns:
+        기기 값이 없으면 None
+    """
+    if not isinstance(payload, dict):
+        return None
+    marker = payload.get('seq')
+    if marker is None:
+        marker = payload.get('timestamp')
+    return marker
+
+
+# 전역 인스턴스
+message_dedup = DedupWindow()
+
+
+def init_dedup(app):
+    """설정값 적용"""
+    message_dedup.init_app(app)
+    return message_dedup
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 간 Socket.IO 발송 버스 모듈
+여러 워커 프로세스가 룸을 공유하도록 python-socketio의 client_manager를 교체
+
+SOCKETIO_MESSAGE_QUEUE 설정값:
+    None                       단일 프로세스 (기본값)
+    local:///run/wellsafer.sock  외부 서비스 없이 UNIX 소켓 브로커로 중계
+    redis://..., kafka://... 등  python-socketio 기본 메시지 큐 사용
+
+local 버스는 워커마다 브로커에 접속하여 발송/룸 변경 메시지를 주고받는다.
+브로커가 없으면 먼저 시작한 워커가 브로커를 띄우고, 그 워커가 종료되면
+다른 워커가 다시 띄운다 (EMIT_BUS_AUTOSTART_BROKER=False면 별도 프로세스로 실행).
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+
+from socketio import PubSubManager
+
+from backend import codec
+
+
+logger = logging.getLogger(__name__)
+
+# 메시지 프레임: 4바이트 길이 + 본문
+_HEADER = struct.Struct('!I')
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+DEFAULT_SOCKET_PATH = '/tmp/wellsafer-socketio.sock'
+
+
+def send_frame(sock, payload):
+    """길이 접두 프레임 전송"""
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock):
+    """
+    길이 접두 프레임 수신
+
+    Returns:
+        bytes: 본문 (연결이 닫히면 None)
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {size}")
+    return _recv_exact(sock, size)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def parse_local_url(url):
+    """'local:///path/to.sock' → '/path/to.sock' (경로가 없으면 기본 경로)"""
+    path = url[len('local://'):] if url.startswith('local://') else url
+    return path or DEFAULT_SOCKET_PATH
+
+
+class EmitBroker:
+    """
+    UNIX 소켓 중계 브로커
+
+    접속한 워커가 보낸 프레임을 수신 워커(보낸 워커 포함)에게 그대로 전달한다.
+    보낸 워커는 host_id로 자기 메시지를 걸러낸다.
+    워커는 접속 직후 {"subscribe": true/false} 프레임을 보내며,
+    발송 전용 워커에는 전달하지 않는다. 수신 워커마다 송신 큐를 두고,
+    읽지 않는 워커의 큐가 max_backlog를 넘으면 연결을 끊어 전체 중계가 막히지 않게 한다.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET_PATH, max_backlog=10000):
+        """
+        Args:
+            path: UNIX 소켓 경로
+            max_backlog: 수신 워커별 송신 대기 프레임 최대 수
+        """
+        self.path = path
+        self.max_backlog = max_backlog
+        self.running = False
+        self.thread = None
+        self._server = None
+        self._lock = threading.Lock()
+        self._peers = set()         # 접속한 모든 워커
+        self._subscribers = {}      # 수신 워커 → 송신 큐
+
+        self._frames = 0
+        self._delivered = 0
+
+    def bind(self):
+        """
+        소켓 바인드 (이미 동작 중인 브로커가 있으면 실패)
+
+        확인 → 남은 소켓 파일 삭제 → bind → listen을 <path>.lock flock 안에서 실행한다.
+        동시에 시작한 워커가 다른 워커가 방금 바인드한 소켓 파일을 지우면
+        브로커가 둘로 나뉘어 워커들이 룸을 공유하지 못하기 때문이다.
+
+        Returns:
+            bool: 바인드 성공 여부
+        """
+        import fcntl
+
+        lock_fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            if _is_listening(self.path):
+                return False
+            # 종료된 브로커가 남긴 소켓 파일 정리
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                server.bind(self.path)
+                server.listen(128)
+            except OSError:
+                server.close()
+                return False
+            self._server = server
+            return True
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+
+    def start(self):
+        """
+        브로커 스레드 시작
+
+        Returns:
+            bool: 시작 여부 (다른 브로커가 이미 동작 중이면 False)
+        """
+        if self.running:
+            return True
+        if self._server is None and not self.bind():
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(target=self.serve_forever, name='emit-broker', daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """브로커 중지 및 소켓 파일 정리"""
+        self.running = False
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+        with self._lock:
+            peers = list(self._peers)
+        for peer in peers:
+            self._drop(peer)
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+            self.thread = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def serve_forever(self):
+        """워커 접속 수락 루프"""
+        if self._server is None and not self.bind():
+            raise RuntimeError(f"Emit broker already running at {self.path}")
+        self.running = True
+
+        while self.running:
+            try:
+                peer, _ = self._server.accept()
+            except OSError:
+                break
+            with self._lock:
+                self._peers.add(peer)
+            threading.Thread(target=self._relay, args=(peer,), name='emit-broker-peer', daemon=True).start()
+
+    def _relay(self, peer):
+        """워커 하나에서 받은 프레임을 수신 워커로 전달"""
+        try:
+            # 첫 프레임: 수신 여부
+            hello = recv_frame(peer)
+            if hello is None:
+                return
+            if json.loads(hello).get('subscribe'):
+                outbox = queue.Queue(maxsize=self.max_backlog)
+                with self._lock:
+                    self._subscribers[peer] = outbox
+                threading.Thread(target=self._write, args=(peer, outbox), name='emit-broker-writer', daemon=True).start()
+
+            while self.running:
+                payload = recv_frame(peer)
+                if payload is None:
+                    break
+                with self._lock:
+                    targets = list(self._subscribers.items())
+                    self._frames += 1
+                for target, outbox in targets:
+                    try:
+                        outbox.put_nowait(payload)
+                    except queue.Full:
+                        logger.warning('Emit broker dropped a slow subscriber')
+                        self._drop(target)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._drop(peer)
+
+    def _write(self, peer, outbox):
+        """수신 워커 하나로 프레임 송신"""
+        while True:
+            payload = outbox.get()
+            if payload is None:
+                break
+            try:
+                send_frame(peer, payload)
+                self._delivered += 1
+            except OSError:
+                break
+        self._drop(peer)
+
+    def _drop(self, peer):
+        with self._lock:
+            self._peers.discard(peer)
+            outbox = self._subscribers.pop(peer, None)
+        if outbox is not None:
+            # 송신 스레드 종료 신호 (큐가 가득 차 있으면 비우고 넣음)
+            while True:
+                try:
+                    outbox.put_nowait(None)
+                    break
+                except queue.Full:
+                    try:
+                        outbox.get_nowait()
+                    except queue.Empty:
+                        pass
+        try:
+            peer.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        peer.close()
+
+    def get_stats(self):
+        """브로커 통계"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'path': self.path,
+                'peers': len(self._peers),
+                'subscribers': len(self._subscribers),
+                'frames': self._frames,
+                'delivered': self._delivered
+            }
+
+
+def _is_listening(path):
+    """해당 경로에서 브로커가 접속을 받고 있는지 확인"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class LocalSocketManager(PubSubManager):
+    """
+    UNIX 소켓 브로커 기반 client_manager
+
+    python-socketio의 RedisManager와 같은 방식으로, 발송/룸 변경 메시지를
+    브로커를 통해 다른 워커에 전달한다. 발송용 연결과 수신용 연결을 따로 두며,
+    수신 연결은 첫 클라이언트 접속 시 시작되는 수신 스레드에서 연다.
+    gevent/eventlet 환경에서는 다른 메시지 큐와 마찬가지로 표준 라이브러리 monkey patch가 필요하다.
+    """
+
+    name = 'local'
+
+    def __init__(self, url='local://', channel='flask-socketio', write_only=False,
+                 logger=None, autostart_broker=True, reconnect_interval=1.0):
+        """
+        Args:
+            url: 'local:///path/to.sock'
+            channel: 채널 이름 (같은 소켓의 다른 채널 메시지는 무시)
+            write_only: True면 발송만 (수신 스레드 없음)
+            autostart_broker: 브로커가 없으면 이 프로세스에서 시작
+            reconnect_interval: 브로커 재접속 대기 (초)
+        """
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.path = parse_local_url(url)
+        self.autostart_broker = autostart_broker
+        self.reconnect_interval = reconnect_interval
+        self.broker = None
+
+        self._pub_sock = None
+        self._pub_lock = threading.Lock()
+        self._broker_lock = threading.Lock()
+
+        self._published = 0
+        self._dropped = 0
+        self._reconnects = 0
+
+    def _open(self, subscribe):
+        """브로커 접속 (필요하면 브로커 시작)"""
+        if self.autostart_broker:
+            with self._broker_lock:
+                if not _is_listening(self.path):
+                    broker = EmitBroker(self.path)
+                    if broker.start():
+                        self.broker = broker
+                        self._get_logger().info(f'Emit broker started at {self.path}')
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+            send_frame(sock, json.dumps({'subscribe': subscribe}).encode('utf-8'))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _publish(self, data):
+        try:
+            payload = codec.dumps({'channel': self.channel, 'message': data})
+        except (TypeError, ValueError) as e:
+            # 직렬화할 수 없는 발송 데이터: 발송한 핸들러(MQTT 등)로 예외를 올리지 않고 버림
+            with self._pub_lock:
+                self._dropped += 1
+            self._get_logger().error(f'Emit bus publish failed (unserializable message): {e}')
+            return
+        with self._pub_lock:
+            for attempt in range(2):
+                try:
+                    if self._pub_sock is None:
+                        self._pub_sock = self._open(subscribe=False)
+                    send_frame(self._pub_sock, payload)
+                    self._published += 1
+                    return
+                except OSError as e:
+                    # 브로커가 바뀌었을 수 있으므로 한 번 재접속
+                    if self._pub_sock is not None:
+                        self._pub_sock.close()
+                        self._pub_sock = None
+                    if attempt:
+                        self._dropped += 1
+                        self._get_logger().error(f'Emit bus publish failed: {e}')
+
+    def _listen(self):
+        while True:
+            try:
+                sock = self._open(subscribe=True)
+            except OSError as e:
+                self._get_logger().warning(f'Emit bus connect failed: {e}')
+                time.sleep(self.reconnect_interval)
+                continue
+
+            try:
+                while True:
+                    payload = recv_frame(sock)
+                    if payload is None:
+                        break
+                    envelope = codec.loads(payload)
+                    if envelope.get('channel') == self.channel:
+                        yield envelope['message']
+            except (OSError, ValueError) as e:
+                self._get_logger().warning(f'Emit bus connection lost: {e}')
+            finally:
+                sock.close()
+
+            # 브로커 종료 → 재접속 (필요하면 이 워커가 브로커를 다시 시작)
+            self._reconnects += 1
+            time.sleep(self.reconnect_interval)
+
+    def get_stats(self):
+        """버스 통계"""
+        return {
+            'path': self.path,
+            'broker_owner': self.broker is not None and self.broker.running,
+            'published': self._published,
+            'dropped': self._dropped,
+            'reconnects': self._reconnects
+        }
+
+
+# URL 스킴별 client_manager (python-socketio 기본 큐 외에 추가한 것)
+BUS_BACKENDS = {
+    'local': LocalSocketManager,
+}
+
+
+def socketio_queue_options(app, write_only=False):
+    """
+    SocketIO.init_app()에 넘길 메시지 큐 옵션
+
+    Args:
+        app: Flask 애플리케이션
+        write_only: True면 발송 전용 (클라이언트를 받지 않는 수집 프로세스 등)
+
+    Returns:
+        dict: {} (단일 프로세스), {'client_manager': ...} 또는 {'message_queue': url}
+    """
+    url = app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    if not url:
+        return {}
+
+    scheme = url.split(':', 1)[0]
+    backend_class = BUS_BACKENDS.get(scheme)
+    if backend_class is None:
+        return {'message_queue': url}
+
+    manager = backend_class(
+        url,
+        write_only=write_only,
+        logger=app.logger,
+        autostart_broker=app.config.get('EMIT_BUS_AUTOSTART_BROKER', True)
+    )
+    return {'client_manager': manager}
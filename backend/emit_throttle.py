@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Socket.IO 발송 속도 제한 모듈
+(이벤트, 룸)별로 최소 발송 간격을 두고, 간격 안에 들어온 메시지는 최신 값 하나로 합쳐 발송
+"""
+
+import threading
+import time
+
+
+class EmitThrottle:
+    """
+    룸별 Socket.IO 발송 제한기
+
+    같은 (이벤트, 룸, key) 조합으로 min_interval 안에 여러 메시지가 오면 마지막 메시지만
+    보관했다가 간격이 지나면 발송한다 (latest-value coalescing).
+    urgent=True 메시지(경보 수준 생체신호 등)는 제한 없이 즉시 발송하고,
+    보관 중이던 이전 값은 버린다.
+    발송 스레드가 동작하지 않으면 모든 메시지를 즉시 발송한다.
+    """
+
+    def __init__(self, socketio=None, app=None, min_interval=0.5, intervals=None, tick=0.05):
+        """
+        Args:
+            socketio: Socket.IO 인스턴스
+            app: Flask 애플리케이션
+            min_interval: 키별 최소 발송 간격 (초, 0.5 = 최대 2Hz)
+            intervals: 이벤트 이름별 최소 간격 {'sensor_summary': 1.0}
+            tick: 보관 메시지 확인 주기 (초)
+        """
+        self.socketio = socketio
+        self.app = app
+        self.min_interval = min_interval
+        self.intervals = dict(intervals or {})
+        self.tick = tick
+
+        self.running = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._last_sent = {}    # (event, room, key) → 마지막 발송 시각
+        self._pending = {}      # (event, room, key) → 보관 중인 최신 data
+
+        self._emitted = 0
+        self._coalesced = 0
+        self._bypassed = 0
+        self._errors = 0
+
+        if app is not None:
+            self.init_app(app, socketio)
+
+    def init_app(self, app, socketio=None):
+        """설정값 적용"""
+        self.app = app
+        if socketio is not None:
+            self.socketio = socketio
+        self.min_interval = app.config.get('SOCKET_EMIT_MIN_INTERVAL', self.min_interval)
+        self.intervals.update(app.config.get('SOCKET_EMIT_INTERVALS') or {})
+
+    def start(self):
+        """보관 메시지 발송 스레드 시작"""
+        if self.running:
+            return
+
+        self.running = True
+        self._wakeup.clear()
+        self.thread = threading.Thread(target=self._run, name='emit-throttle', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        """발송 스레드 중지 (보관 중인 메시지는 모두 발송)"""
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+        self.flush(force=True)
+
+    def interval_for(self, event):
+        return self.intervals.get(event, self.min_interval)
+
+    def emit(self, event, data, room=None, key=None, urgent=False):
+        """
+        제한을 적용하여 발송
+
+        Args:
+            event: Socket.IO 이벤트 이름
+            data: 발송 데이터
+            room: 대상 룸 (None이면 전체)
+            key: 같은 룸 안에서 따로 제한할 구분값 (예: 대시보드 룸의 밴드 ID)
+            urgent: True면 간격 제한 없이 즉시 발송
+
+        Returns:
+            bool: 즉시 발송 여부 (False면 보관 후 나중에 발송)
+        """
+        slot = (event, room, key)
+        now = time.monotonic()
+
+        with self._lock:
+            if urgent:
+                self._pending.pop(slot, None)
+                self._bypassed += 1
+            elif self.running:
+                last = self._last_sent.get(slot)
+                if slot in self._pending or (last is not None and now - last < self.interval_for(event)):
+                    if slot in self._pending:
+                        self._coalesced += 1
+                    self._pending[slot] = data
+                    return False
+            self._last_sent[slot] = now
+
+        self._send(event, data, room)
+        return True
+
+    def flush(self, force=False):
+        """
+        간격이 지난 보관 메시지 발송
+
+        Args:
+            force: True면 간격과 관계없이 모두 발송
+
+        Returns:
+            int: 발송한 메시지 수
+        """
+        now = time.monotonic()
+        ready = []
+
+        with self._lock:
+            for slot, data in list(self._pending.items()):
+                last = self._last_sent.get(slot)
+                if force or last is None or now - last >= self.interval_for(slot[0]):
+                    del self._pending[slot]
+                    self._last_sent[slot] = now
+                    ready.append((slot, data))
+
+        for (event, room, _), data in ready:
+            self._send(event, data, room)
+        return len(ready)
+
+    def _send(self, event, data, room):
+        try:
+            if room is None:
+                self.socketio.emit(event, data)
+            else:
+                self.socketio.emit(event, data, room=room)
+            self._emitted += 1
+        except Exception as e:
+            self._errors += 1
+            if self.app:
+                self.app.logger.error(f"Socket emit failed ({event}, {room}): {e}")
+
+    def _run(self):
+        """보관 메시지 발송 루프"""
+        while self.running:
+            self._wakeup.wait(self.tick)
+            if not self.running:
+                break
+            self.flush()
+
+    def forget(self, room):
+        """룸이 사라졌을 때 발송 기록 정리"""
+        with self._lock:
+            for slot in [s for s in self._last_sent if s[1] == room]:
+                self._last_sent.pop(slot, None)
+                self._pending.pop(slot, None)
+
+    def get_stats(self):
+        """발송 통계"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'min_interval': self.min_interval,
+                'pending': len(self._pending),
+                'emitted': self._emitted,
+                'coalesced': self._coalesced,
+                'bypassed': self._bypassed,
+                'errors': self._errors
+            }
+
+
+# 전역 인스턴스
+emit_throttle = EmitThrottle()
+
+
+def init_emit_throttle(app, socketio):
+    """
+    Socket.IO 발송 제한기 초기화 및 발송 스레드 시작
+
+    Args:
+        app: Flask 애플리케이션
+        socketio: Socket.IO 인스턴스
+    """
+    emit_throttle.init_app(app, socketio)
+    emit_throttle.start()
+    return emit_throttle
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+센서 데이터 배치 적재 모듈
+MQTT 수신 스레드와 DB 쓰기를 분리하여 다중 행 INSERT로 일괄 저장
+"""
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SensorIngestQueue:
+    """
+    센서 데이터 적재 큐
+
+    MQTT 핸들러는 put()으로 행(dict)만 넣고 즉시 반환하며,
+    writer 스레드가 batch_size 또는 flush_interval 중 먼저 도달하는 조건에서
+    SensorData 행을 한 번의 다중 행 INSERT로 저장한다.
+    """
+
+    def __init__(self, app=None, max_size=20000, batch_size=500,
+                 flush_interval=0.2, put_timeout=0, max_retries=3,
+                 retry_delay=0.1, writer=None):
+        """
+        Args:
+            app: Flask 애플리케이션
+            max_size: 큐 최대 길이 (초과 시 드롭)
+            batch_size: 한 번에 저장할 최대 행 수
+            flush_interval: 최대 대기 시간 (초)
+            put_timeout: 큐가 가득 찼을 때 대기할 시간 (초, 0이면 즉시 드롭)
+            max_retries: 저장 실패 시 같은 배치 재시도 횟수
+            retry_delay: 첫 재시도 대기 시간 (초, 재시도마다 2배)
+            writer: 행 목록을 저장하는 함수 (기본값: SensorData 다중 행 INSERT)
+        """
+        self.app = app
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.writer = writer or self._write_rows
+
+        self.running = False
+        self.thread = None
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """설정값 적용"""
+        self.app = app
+        self.max_size = app.config.get('SENSOR_INGEST_QUEUE_SIZE', self.max_size)
+        self.batch_size = app.config.get('SENSOR_INGEST_BATCH_SIZE', self.batch_size)
+        self.flush_interval = app.config.get('SENSOR_INGEST_FLUSH_INTERVAL', self.flush_interval)
+        self.put_timeout = app.config.get('SENSOR_INGEST_PUT_TIMEOUT', self.put_timeout)
+        self.max_retries = app.config.get('SENSOR_INGEST_MAX_RETRIES', self.max_retries)
+        self.retry_delay = app.config.get('SENSOR_INGEST_RETRY_DELAY', self.retry_delay)
+
+        if not self.running:
+            self._queue = queue.Queue(maxsize=self.max_size)
+
+    def _reset_stats(self):
+        self._enqueued = 0
+        self._dropped = 0
+        self._flushed_rows = 0
+        self._failed_rows = 0
+        self._retries = 0
+        self._flush_count = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._last_batch_size = 0
+
+    def start(self):
+        """writer 스레드 시작"""
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='sensor-ingest', daemon=True)
+        self.thread.start()
+
+        if self.app:
+            self.app.logger.info(
+                f"Sensor ingest started (batch={self.batch_size}, "
+                f"interval={self.flush_interval}s, queue={self.max_size})"
+            )
+
+    def stop(self, timeout=5):
+        """writer 스레드 중지 (남은 행은 모두 저장)"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+
+    def put(self, row):
+        """
+        센서 데이터 행 추가
+
+        Args:
+            row: SensorData 컬럼명 → 값 딕셔너리
+
+        Returns:
+            bool: 큐 적재 여부 (가득 차서 드롭되면 False)
+        """
+        try:
+            if self.put_timeout:
+                self._queue.put(row, timeout=self.put_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            return False
+
+        with self._stats_lock:
+            self._enqueued += 1
+        return True
+
+    def qsize(self):
+        """현재 큐 길이"""
+        return self._queue.qsize()
+
+    def _run(self):
+        """writer 메인 루프"""
+        while self.running or not self._queue.empty():
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+
+    def _collect_batch(self):
+        """batch_size 또는 flush_interval 조건까지 행 수집"""
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _flush(self, batch):
+        """
+        배치 저장 및 지연 시간 기록
+
+        일시적인 DB 오류(연결 끊김, 락 대기 초과 등)는 같은 배치를 max_retries번까지
+        대기 시간을 늘려가며 다시 저장하고, 그래도 실패하면 실패 행 수로 기록한다.
+        """
+        log = self.app.logger if self.app else logger
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                self.writer(batch)
+                break
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    with self._stats_lock:
+                        self._failed_rows += len(batch)
+                    log.error(f"Sensor ingest flush failed ({len(batch)} rows, {attempt} retries): {e}")
+                    return
+                log.warning(f"Sensor ingest flush failed ({len(batch)} rows), retrying: {e}")
+                with self._stats_lock:
+                    self._retries += 1
+                time.sleep(self.retry_delay * (2 ** attempt))
+                attempt += 1
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._flush_count += 1
+            self._flushed_rows += len(batch)
+            self._last_batch_size = len(batch)
+            self._last_flush_ms = elapsed_ms
+            self._total_flush_ms += elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+
+    def _write_rows(self, rows):
+        """SensorData 다중 행 INSERT"""
+        from sqlalchemy import insert
+        from backend.db import models as db_models
+        SensorData = db_models.SensorData
+
+        with self.app.app_context():
+            db = self.app.extensions['sqlalchemy']
+            try:
+                db.session.execute(insert(SensorData.__table__), rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def get_stats(self):
+        """
+        큐 길이 및 flush 지연 통계
+
+        Returns:
+            dict: 적재 통계
+        """
+        with self._stats_lock:
+            avg_flush_ms = self._total_flush_ms / self._flush_count if self._flush_count else 0.0
+            return {
+                'running': self.running,
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self.max_size,
+                'enqueued': self._enqueued,
+                'dropped': self._dropped,
+                'flushed_rows': self._flushed_rows,
+                'failed_rows': self._failed_rows,
+                'retries': self._retries,
+                'flush_count': self._flush_count,
+                'last_batch_size': self._last_batch_size,
+                'last_flush_ms': round(self._last_flush_ms, 2),
+                'avg_flush_ms': round(avg_flush_ms, 2),
+                'max_flush_ms': round(self._max_flush_ms, 2)
+            }
+
+
+# 전역 인스턴스
+sensor_ingest = SensorIngestQueue()
+
+
+def write_batch(app, band_id, rows):
+    """
+    밴드 1개의 측정값 묶음을 중복 제외 후 한 번의 다중 행 INSERT로 저장
+
+    (FK_bid, datetime)이 이미 있는 행은 건너뛴다 (QoS 1 재전송, 재연결 후 중복 업로드).
+    기존 시각은 묶음의 시각 범위로 idx_bid_datetime 인덱스에서 한 번에 조회한다.
+    app_context 안에서 호출해야 한다.
+
+    Args:
+        app: Flask 애플리케이션
+        band_id: bands.id
+        rows: SensorData 행 목록 (시각 순, 시각 중복 없음)
+
+    Returns:
+        list: 새로 저장한 행 (rows의 원소 그대로)
+    """
+    from sqlalchemy import insert, select
+    from backend.db import models as db_models
+    SensorData = db_models.SensorData
+
+    if not rows:
+        return []
+
+    db = app.extensions['sqlalchemy']
+    try:
+        existing = set(db.session.execute(
+            select(SensorData.datetime).where(
+                SensorData.FK_bid == band_id,
+                SensorData.datetime.between(rows[0]['datetime'], rows[-1]['datetime'])
+            )
+        ).scalars())
+        new_rows = [row for row in rows if row['datetime'] not in existing]
+        if new_rows:
+            db.session.execute(insert(SensorData.__table__), new_rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return new_rows
+
+
+def init_ingest(app):
+    """
+    센서 적재 큐 초기화 및 writer 시작
+
+    Args:
+        app: Flask 애플리케이션
+    """
+    sensor_ingest.init_app(app)
+    sensor_ingest.start()
+    return sensor_ingest
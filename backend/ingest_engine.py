@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 수집 엔진 모듈
+토픽/페이로드 형식별 센서 데이터를 표준 측정값(SensorReading)으로 정규화하고,
+등록된 처리 단계(저장, 연결 상태, 실시간 전송, 이상치 감지 등)를 순서대로 실행
+"""
+
+import logging
+import threading
+from datetime import datetime as _datetime
+
+from backend.dedup import message_marker
+
+
+logger = logging.getLogger(__name__)
+
+# 표준 측정값 필드 (SensorData 실제 컬럼 이름과 동일)
+READING_FIELDS = (
+    'battery_level', 'hr', 'spo2', 'skin_temp',
+    'x', 'y', 'z',
+    'walk_steps', 'run_steps', 'activity',
+    'motionFlag', 'scdState', 'rssi'
+)
+
+# /DT/eHG4/SensorData 페이로드 필드 → 표준 필드
+SENSORDATA_ALIASES = {
+    'acc_x': 'x',
+    'acc_y': 'y',
+    'acc_z': 'z',
+    'steps': 'walk_steps',
+    'battery': 'battery_level',
+}
+
+
+class SensorReading:
+    """
+    표준 측정값
+
+    토픽 형식과 관계없이 모든 센서 데이터는 이 형태로 변환된 뒤 처리 단계에 전달된다.
+    """
+
+    __slots__ = ('bid', 'datetime', 'marker') + READING_FIELDS
+
+    # 메시지마다 생성되므로 setattr 반복 대신 필드를 직접 대입
+    def __init__(self, bid, datetime=None, battery_level=None, hr=None, spo2=None, skin_temp=None,
+                 x=None, y=None, z=None, walk_steps=None, run_steps=None, activity=None,
+                 motionFlag=None, scdState=None, rssi=None, marker=None):
+        self.bid = bid
+        self.datetime = datetime or _datetime.utcnow()
+        self.marker = marker    # 메시지를 구별하는 기기 시퀀스/timestamp (없으면 중복 제거 안 함)
+        self.battery_level = battery_level
+        self.hr = hr
+        self.spo2 = spo2
+        self.skin_temp = skin_temp
+        self.x = x
+        self.y = y
+        self.z = z
+        self.walk_steps = walk_steps
+        self.run_steps = run_steps
+        self.activity = activity
+        self.motionFlag = motionFlag
+        self.scdState = scdState
+        self.rssi = rssi
+
+    def to_row(self, band_id):
+        """SensorData 행 (컬럼명 → 값)"""
+        row = {'FK_bid': band_id, 'datetime': self.datetime}
+        for name in READING_FIELDS:
+            row[name] = getattr(self, name)
+        return row
+
+    def to_payload(self):
+        """실시간 전송용 딕셔너리 (값이 있는 필드만)"""
+        payload = {'bid': self.bid, 'datetime': self.datetime.isoformat()}
+        for name in READING_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                payload[name] = value
+        return payload
+
+    def __repr__(self):
+        return f"SensorReading(bid={self.bid!r}, hr={self.hr!r}, spo2={self.spo2!r})"
+
+
+def _timestamp(payload):
+    """페이로드의 timestamp(ms)를 UTC datetime으로 변환 (없으면 수신 시각)"""
+    ts = payload.get('timestamp')
+    if isinstance(ts, (int, float)) and ts > 0:
+        return _datetime.utcfromtimestamp(ts / 1000)
+    return _datetime.utcnow()
+
+
+def normalize(bid, payload, aliases=None):
+    """
+    센서 페이로드를 표준 측정값으로 변환
+
+    Args:
+        bid: 밴드 ID
+        payload: 센서 데이터 딕셔너리
+        aliases: 페이로드 필드명 → 표준 필드명 (표준 필드가 없을 때만 사용)
+
+    Returns:
+        SensorReading
+    """
+    fields = {name: payload.get(name) for name in READING_FIELDS}
+    if aliases:
+        for source, target in aliases.items():
+            if fields[target] is None and payload.get(source) is not None:
+                fields[target] = payload[source]
+    return SensorReading(str(bid), _timestamp(payload), marker=message_marker(payload), **fields)
+
+
+def from_band_payload(bid, payload):
+    """wellsafer/band/{bid}/sensor 및 구 백엔드 bandData 형식"""
+    return normalize(bid, payload)
+
+
+def from_sensordata_payload(payload):
+    """
+    /DT/eHG4/SensorData 형식 (bid는 페이로드에 포함, acc_x/steps 등 별칭 사용)
+
+    Returns:
+        SensorReading: bid가 없으면 None
+    """
+    bid = payload.get('bid')
+    if not bid:
+        return None
+    return normalize(bid, payload, SENSORDATA_ALIASES)
+
+
+def from_batch_payload(bid, payload):
+    """
+    wellsafer/band/{bid}/sensor/batch 형식 (통신 두절 동안 밴드에 쌓인 측정값 묶음)
+
+    페이로드는 측정값 배열 또는 {"readings": [...]}이며 각 측정값은 기기 timestamp(ms)가 필수다.
+    timestamp는 sensordata.datetime 정밀도(초)로 맞추고 같은 시각은 마지막 값만 남긴다.
+
+    Returns:
+        list: 시각 순으로 정렬된 SensorReading (timestamp가 없는 측정값은 제외)
+    """
+    items = payload.get('readings') if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return []
+
+    readings = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        ts = item.get('timestamp')
+        if not isinstance(ts, (int, float)) or ts <= 0:
+            continue
+        reading = normalize(bid, item)
+        reading.datetime = reading.datetime.replace(microsecond=0)
+        readings[reading.datetime] = reading
+    return [readings[dt] for dt in sorted(readings)]
+
+
+class SensorContext:
+    """처리 단계 간에 전달되는 측정값 1건의 처리 상태"""
+
+    __slots__ = ('app', 'socketio', 'band', 'reading', 'row', 'connect_state')
+
+    def __init__(self, app, socketio, band, reading):
+        self.app = app
+        self.socketio = socketio
+        self.band = band
+        self.reading = reading
+        self.row = None             # 저장 단계에서 만든 SensorData 행 (배치 토픽은 이미 저장된 행)
+        self.connect_state = None   # 연결 상태 단계에서 결정한 값 (1=온라인, 0=오프라인)
+
+
+class HandlerChain:
+    """
+    처리 단계 목록
+
+    단계는 stage(context) 형태의 함수이며 등록 순서대로 실행된다.
+    단계가 False를 반환하면 이후 단계를 생략하고,
+    예외가 발생하면 기록 후 다음 단계를 계속 실행한다.
+    """
+
+    def __init__(self):
+        self._stages = ()
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._errors = {}
+
+    def add(self, name, stage, before=None):
+        """
+        단계 등록 (같은 이름이 있으면 교체)
+
+        Args:
+            name: 단계 이름
+            stage: 처리 함수
+            before: 이 이름의 단계 앞에 삽입 (None이면 마지막)
+        """
+        with self._lock:
+            stages = [(n, s) for n, s in self._stages if n != name]
+            index = len(stages)
+            if before is not None:
+                names = [n for n, _ in stages]
+                if before not in names:
+                    raise KeyError(before)
+                index = names.index(before)
+            stages.insert(index, (name, stage))
+            # 실행 중인 run()이 보는 목록은 바꾸지 않도록 새 튜플로 교체
+            self._stages = tuple(stages)
+            self._calls.setdefault(name, 0)
+            self._errors.setdefault(name, 0)
+
+    def remove(self, name):
+        """단계 제거"""
+        with self._lock:
+            self._stages = tuple((n, s) for n, s in self._stages if n != name)
+
+    def names(self):
+        """등록된 단계 이름 (실행 순서)"""
+        return [name for name, _ in self._stages]
+
+    def run(self, context):
+        """
+        모든 단계 실행
+
+        Returns:
+            bool: 중간에 멈추지 않고 끝까지 실행했으면 True
+        """
+        for name, stage in self._stages:
+            self._calls[name] += 1
+            try:
+                if stage(context) is False:
+                    return False
+            except Exception as e:
+                self._errors[name] += 1
+                logger.error(f"Ingest stage '{name}' failed: {e}")
+        return True
+
+    def get_stats(self):
+        """단계별 실행/오류 횟수"""
+        return {
+            name: {'calls': self._calls[name], 'errors': self._errors[name]}
+            for name in self.names()
+        }
+
+
+# 센서 측정값 처리 단계 (mqtt_client에서 기본 단계 등록)
+sensor_chain = HandlerChain()
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 수집 워커 프로세스 관리 모듈
+N개의 수집 프로세스를 띄워 감시하고(비정상 종료 시 재시작), 워커별 처리량을 집계
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# 샤딩 방식
+SHARD_MODE_SHARE = 'share'  # MQTT 공유 구독 ($share/그룹/토픽), 브로커가 bid와 관계없이 워커에 분배
+SHARD_MODE_HASH = 'hash'    # 모든 워커가 전체 구독, bid 해시가 자기 번호인 메시지만 처리 (기본값)
+
+SHARD_MODES = (SHARD_MODE_SHARE, SHARD_MODE_HASH)
+
+
+class WorkerState:
+    """워커 프로세스 하나의 상태와 처리량"""
+
+    def __init__(self, index):
+        self.index = index
+        self.process = None
+        self.started_at = None
+        self.restarts = 0
+        self.next_start = 0.0
+        self.backoff = 0.0
+        self.last = None        # 마지막 보고 {'received', 'handled', 'skipped', 'dropped', 'ts'}
+        self.previous = None    # 직전 보고 (처리량 계산용)
+
+    def record(self, report):
+        self.previous, self.last = self.last, report
+
+    def rates(self):
+        """
+        직전 보고 이후 초당 처리량
+
+        Returns:
+            dict: received/s, handled/s (보고가 2회 미만이면 0)
+        """
+        if not self.previous or not self.last:
+            return {'received_per_sec': 0.0, 'handled_per_sec': 0.0}
+        elapsed = self.last['ts'] - self.previous['ts']
+        if elapsed <= 0 or self.last['received'] < self.previous['received']:
+            # 재시작으로 카운터가 초기화된 경우
+            return {'received_per_sec': 0.0, 'handled_per_sec': 0.0}
+        return {
+            'received_per_sec': round((self.last['received'] - self.previous['received']) / elapsed, 1),
+            'handled_per_sec': round((self.last['handled'] - self.previous['handled']) / elapsed, 1)
+        }
+
+    def to_dict(self):
+        alive = self.process is not None and self.process.is_alive()
+        last = self.last or {}
+        return {
+            'index': self.index,
+            'pid': self.process.pid if alive else None,
+            'alive': alive,
+            'restarts': self.restarts,
+            'received': last.get('received', 0),
+            'handled': last.get('handled', 0),
+            'skipped': last.get('skipped', 0),
+            'dropped': last.get('dropped', 0),
+            **self.rates()
+        }
+
+
+class IngestSupervisor:
+    """
+    수집 워커 프로세스 감시자
+
+    워커 함수는 target(index, count, mode, reports, report_interval)으로 호출되며,
+    report_interval마다 reports 큐에 누적 카운터를 넣는다.
+    비정상 종료된 워커는 지수 백오프(최대 max_backoff초)로 재시작한다.
+    """
+
+    def __init__(self, target, workers=2, mode=SHARD_MODE_HASH, report_interval=10.0,
+                 max_backoff=30.0, context='spawn', on_report=None):
+        """
+        Args:
+            target: 워커 프로세스 함수
+            workers: 워커 수
+            mode: 샤딩 방식 (share, hash)
+            report_interval: 처리량 보고 주기 (초)
+            max_backoff: 재시작 대기 최대값 (초)
+            context: multiprocessing 시작 방식 (spawn, fork, forkserver)
+            on_report: 보고 주기마다 get_stats() 결과로 호출할 함수
+        """
+        if mode not in SHARD_MODES:
+            raise ValueError(f"Unknown shard mode: {mode}")
+
+        self.target = target
+        self.workers = workers
+        self.mode = mode
+        self.report_interval = report_interval
+        self.max_backoff = max_backoff
+        self.on_report = on_report
+
+        self._ctx = multiprocessing.get_context(context)
+        self._reports = self._ctx.Queue()
+        self._states = [WorkerState(i) for i in range(workers)]
+        self.running = False
+
+    def start(self):
+        """모든 워커 시작"""
+        self.running = True
+        for state in self._states:
+            self._spawn(state)
+
+    def _spawn(self, state):
+        state.process = self._ctx.Process(
+            target=self.target,
+            args=(state.index, self.workers, self.mode, self._reports, self.report_interval),
+            name=f'ingest-worker-{state.index}',
+            daemon=False
+        )
+        state.process.start()
+        state.started_at = time.monotonic()
+        logger.info(f"Ingest worker {state.index} started (pid {state.process.pid})")
+
+    def check(self):
+        """
+        종료된 워커 재시작 (실행 중인 워커가 max_backoff 이상 살아 있으면 백오프 초기화)
+
+        Returns:
+            int: 이번에 재시작한 워커 수
+        """
+        now = time.monotonic()
+        restarted = 0
+        for state in self._states:
+            process = state.process
+            if process is not None and process.is_alive():
+                if state.backoff and now - state.started_at >= self.max_backoff:
+                    state.backoff = 0.0
+                continue
+            if not self.running:
+                continue
+
+            if process is not None:
+                # 방금 종료를 확인한 워커: 재시작 시각 예약
+                logger.warning(f"Ingest worker {state.index} exited with code {process.exitcode}")
+                process.join(0)
+                state.process = None
+                state.backoff = min(self.max_backoff, state.backoff * 2 or 1.0)
+                state.next_start = now + state.backoff
+                continue
+
+            if now >= state.next_start:
+                state.restarts += 1
+                self._spawn(state)
+                restarted += 1
+        return restarted
+
+    def drain_reports(self, timeout=0.0):
+        """
+        워커 보고 수집
+
+        Args:
+            timeout: 첫 보고를 기다릴 최대 시간 (초)
+
+        Returns:
+            int: 수집한 보고 수
+        """
+        count = 0
+        block = timeout > 0
+        while True:
+            try:
+                report = self._reports.get(block=block, timeout=timeout if block else None)
+            except queue.Empty:
+                return count
+            block = False
+            index = report.get('index')
+            if index is not None and 0 <= index < self.workers:
+                self._states[index].record(report)
+                count += 1
+
+    def run(self, should_stop=None):
+        """
+        감시 루프 (should_stop()이 True가 되거나 stop() 호출 시 종료)
+
+        Args:
+            should_stop: 종료 여부를 반환하는 함수
+        """
+        if not self.running:
+            self.start()
+
+        next_report = time.monotonic() + self.report_interval
+        while self.running and not (should_stop and should_stop()):
+            self.drain_reports(timeout=min(1.0, self.report_interval))
+            self.check()
+            if time.monotonic() >= next_report:
+                next_report += self.report_interval
+                stats = self.get_stats()
+                if self.on_report:
+                    self.on_report(stats)
+                else:
+                    log_stats(stats)
+        self.stop()
+
+    def stop(self, timeout=10.0):
+        """워커에 SIGTERM을 보내고 종료 대기 (시간 내 종료하지 않으면 강제 종료)"""
+        self.running = False
+        for state in self._states:
+            if state.process is not None and state.process.is_alive():
+                state.process.terminate()
+        deadline = time.monotonic() + timeout
+        for state in self._states:
+            if state.process is None:
+                continue
+            state.process.join(max(0.0, deadline - time.monotonic()))
+            if state.process.is_alive():
+                logger.error(f"Ingest worker {state.index} did not stop, killing")
+                state.process.kill()
+                state.process.join(1)
+        self.drain_reports()
+
+    def get_stats(self):
+        """워커별 상태와 처리량"""
+        workers = [state.to_dict() for state in self._states]
+        return {
+            'mode': self.mode,
+            'workers': workers,
+            'received_per_sec': round(sum(w['received_per_sec'] for w in workers), 1),
+            'handled_per_sec': round(sum(w['handled_per_sec'] for w in workers), 1)
+        }
+
+
+def log_stats(stats):
+    """처리량 로그 출력"""
+    logger.info(f"Ingest total: {stats['received_per_sec']} msg/s received, "
+                f"{stats['handled_per_sec']} msg/s handled ({stats['mode']})")
+    for w in stats['workers']:
+        logger.info(f"  worker {w['index']} pid={w['pid']} alive={w['alive']} restarts={w['restarts']} "
+                    f"recv={w['received_per_sec']}/s handled={w['handled_per_sec']}/s "
+                    f"skipped={w['skipped']} dropped={w['dropped']}")
+
+
+def run_ingest_worker(index, count, mode, reports, report_interval):
+    """
+    수집 워커 프로세스 본체
+
+    백엔드 앱을 수집 전용 역할로 만들고, 자기 샤드만 구독/처리하는 paho 클라이언트를 시작한다.
+    SIGTERM을 받으면 큐에 남은 데이터를 저장하고 종료한다.
+    """
+    # 설정 클래스가 환경 변수를 읽기 전에 지정
+    os.environ['PROCESS_ROLE'] = 'ingest'
+    os.environ['MQTT_SHARD_MODE'] = mode
+    os.environ['MQTT_SHARD_INDEX'] = str(index)
+    os.environ['MQTT_SHARD_COUNT'] = str(count)
+
+    from backend import app, socketio
+    from backend.mqtt_client import init_mqtt, disconnect_mqtt, mqtt_handler
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl+C는 감시자가 처리
+
+    init_mqtt(app, socketio)
+    app.logger.info(f"Ingest worker {index}/{count} running ({mode})")
+
+    try:
+        while not stopping.wait(report_interval):
+            stats = mqtt_handler.get_stats()
+            reports.put({'index': index, 'pid': os.getpid(), 'ts': time.monotonic(), **stats})
+    finally:
+        disconnect_mqtt()
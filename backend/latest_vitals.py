@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+밴드별 최신 생체신호 저장소 모듈
+목록/대시보드 API가 밴드마다 sensordata 최신 행을 조회하지 않도록 메모리에 보관
+"""
+
+import threading
+from collections import namedtuple
+
+
+# 밴드별로 보관하는 최신 측정값
+LatestVitals = namedtuple('LatestVitals', ['datetime', 'hr', 'spo2', 'battery_level', 'skin_temp'])
+
+
+def vitals_to_dict(band_id, vitals):
+    """
+    최신 측정값을 SensorData.to_dict()와 같은 키로 변환
+
+    Args:
+        band_id: bands.id
+        vitals: LatestVitals (없으면 None)
+
+    Returns:
+        dict: FK_bid, datetime, hr, spo2, skin_temp, battery_level (없으면 None)
+    """
+    if vitals is None:
+        return None
+    return {
+        'FK_bid': band_id,
+        'datetime': vitals.datetime.isoformat() if vitals.datetime else None,
+        'hr': vitals.hr,
+        'spo2': vitals.spo2,
+        'skin_temp': vitals.skin_temp,
+        'battery_level': vitals.battery_level
+    }
+
+
+class LatestVitalsStore:
+    """
+    최신 생체신호 저장소
+
+    MQTT 수신 경로에서 측정값이 들어올 때마다 갱신하고,
+    시작 시 밴드별 최신 행을 한 번의 그룹 쿼리로 읽어 채운다.
+    늦게 도착한 과거 측정값은 최신 값을 덮어쓰지 않는다.
+    수집을 다른 프로세스가 담당하는 웹 프로세스에서는 start()로 주기적으로 다시 적재한다.
+    """
+
+    def __init__(self, loader=None):
+        """
+        Args:
+            loader: {band_id: LatestVitals}를 반환하는 초기 적재 함수
+                    (기본값: select.get_latest_sensordata_per_band)
+        """
+        self.loader = loader or _load_latest_vitals
+        self._lock = threading.Lock()
+        self._vitals = {}   # band_id → LatestVitals
+        self._updates = 0
+        self._stale = 0
+        self._refreshes = 0
+        self.warmed = False
+
+        self.app = None
+        self.refresh_interval = None
+        self.running = False
+        self.thread = None
+        self._wakeup = threading.Event()
+
+    def warm(self):
+        """
+        DB에서 밴드별 최신 측정값 적재
+
+        Returns:
+            int: 적재된 밴드 수
+        """
+        loaded = self.loader()
+        with self._lock:
+            for band_id, vitals in loaded.items():
+                current = self._vitals.get(band_id)
+                if current is None or _is_newer(vitals, current):
+                    self._vitals[band_id] = vitals
+            self.warmed = True
+        return len(loaded)
+
+    def update(self, band_id, reading):
+        """
+        측정값 반영
+
+        Args:
+            band_id: bands.id
+            reading: datetime, hr, spo2, battery_level, skin_temp 키를 가진 딕셔너리
+
+        Returns:
+            bool: 반영 여부 (기존 값보다 오래된 측정값이면 False)
+        """
+        vitals = LatestVitals(
+            reading.get('datetime'),
+            reading.get('hr'),
+            reading.get('spo2'),
+            reading.get('battery_level'),
+            reading.get('skin_temp')
+        )
+        with self._lock:
+            current = self._vitals.get(band_id)
+            if current is not None and not _is_newer(vitals, current):
+                self._stale += 1
+                return False
+            self._vitals[band_id] = vitals
+            self._updates += 1
+        return True
+
+    def start(self, app, interval):
+        """주기적 재적재 스레드 시작"""
+        if self.running:
+            return
+        self.app = app
+        self.refresh_interval = interval
+        self.running = True
+        self._wakeup.clear()
+        self.thread = threading.Thread(target=self._run, name='latest-vitals-refresh', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def _run(self):
+        """재적재 루프"""
+        while self.running:
+            self._wakeup.wait(self.refresh_interval)
+            if not self.running:
+                break
+            try:
+                with self.app.app_context():
+                    self.warm()
+                    self._refreshes += 1
+            except Exception as e:
+                self.app.logger.error(f"Latest vitals refresh failed: {e}")
+
+    def get(self, band_id):
+        """밴드의 최신 측정값 (없으면 None)"""
+        return self._vitals.get(band_id)
+
+    def remove(self, band_id):
+        """밴드 삭제 시 측정값 제거"""
+        with self._lock:
+            self._vitals.pop(band_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._vitals.clear()
+            self.warmed = False
+
+    def get_stats(self):
+        """저장소 통계"""
+        with self._lock:
+            return {
+                'warmed': self.warmed,
+                'bands': len(self._vitals),
+                'updates': self._updates,
+                'stale_dropped': self._stale,
+                'refreshes': self._refreshes
+            }
+
+
+def _is_newer(vitals, current):
+    """시각을 알 수 없으면 새 값으로 간주"""
+    if vitals.datetime is None or current.datetime is None:
+        return True
+    return vitals.datetime >= current.datetime
+
+
+def _load_latest_vitals():
+    """밴드별 최신 sensordata 행 조회 (앱 컨텍스트 필요)"""
+    from backend.db.service import select
+    return {
+        row.FK_bid: LatestVitals(row.datetime, row.hr, row.spo2, row.battery_level, row.skin_temp)
+        for row in select.get_latest_sensordata_per_band()
+    }
+
+
+# 전역 인스턴스
+latest_vitals = LatestVitalsStore()
+
+
+def init_latest_vitals(app, refresh=False):
+    """
+    최신 생체신호 저장소 초기 적재
+
+    Args:
+        app: Flask 애플리케이션
+        refresh: True면 LATEST_VITALS_REFRESH_INTERVAL마다 DB에서 다시 적재
+                 (MQTT 수집을 별도 프로세스가 담당하는 웹 프로세스용)
+    """
+    with app.app_context():
+        try:
+            count = latest_vitals.warm()
+            app.logger.info(f"Latest vitals warmed for {count} bands")
+        except Exception as e:
+            app.logger.error(f"Latest vitals warm-up failed: {e}")
+    if refresh:
+        latest_vitals.start(app, app.config.get('LATEST_VITALS_REFRESH_INTERVAL', 5))
+    return latest_vitals
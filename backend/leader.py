@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+리더 선출 모듈
+웹 워커가 여러 개일 때 스케줄러 작업(세션 타임아웃, 알림 집계, 데이터 정리 등)을
+리스(lease)를 가진 프로세스 하나에서만 실행한다.
+
+- db: 기존 DB의 leader_lease 행을 조건부 UPDATE로 차지/갱신 (여러 서버)
+- file: 잠금 파일 flock (한 서버의 여러 워커, 프로세스가 죽으면 OS가 즉시 해제)
+- none: 선출하지 않고 항상 리더 (단일 프로세스)
+
+리더가 죽으면 늦어도 리스 만료 시각(마지막 갱신 + ttl초)에 다른 프로세스가 차지한다.
+db 방식은 서버 간 시계가 맞아야 한다 (NTP).
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, insert, select, update
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import IntegrityError
+
+
+# MySQL DATETIME은 초 단위로 반올림하므로 밀리초까지 저장
+_LeaseTime = DateTime().with_variant(mysql.DATETIME(fsp=3), 'mysql')
+
+# leader_lease 테이블 (db/migrations/add_leader_lease.sql)
+lease_table = Table(
+    'leader_lease', MetaData(),
+    Column('name', String(64), primary_key=True),
+    Column('holder', String(128), nullable=False),
+    Column('expires_at', _LeaseTime, nullable=False),
+    Column('acquired_at', _LeaseTime),
+)
+
+# 반납한 리스의 만료 시각 (바로 차지 가능)
+_RELEASED = datetime(1970, 1, 1)
+
+
+def default_holder():
+    """프로세스 식별자 (호스트:pid:임의값)"""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+class DBLease:
+    """DB 행 리스 (자신이 가졌거나 만료된 행만 UPDATE)"""
+
+    def __init__(self, engine, name='background'):
+        self.engine = engine
+        self.name = name
+
+    def create_table(self):
+        lease_table.create(self.engine, checkfirst=True)
+
+    def acquire(self, holder, ttl, now):
+        """
+        리스 차지 또는 갱신
+
+        Args:
+            holder: 프로세스 식별자
+            ttl: 리스 유효 시간 (초)
+            now: 현재 시각 (UTC)
+
+        Returns:
+            tuple: (차지 여부, 현재 리스 만료 시각 또는 None)
+        """
+        table = lease_table
+        expires_at = now + timedelta(seconds=ttl)
+
+        with self.engine.begin() as conn:
+            # 자신이 가진 리스는 갱신
+            if conn.execute(
+                update(table).where(table.c.name == self.name, table.c.holder == holder)
+                .values(expires_at=expires_at)
+            ).rowcount:
+                return True, expires_at
+            # 만료된 리스는 차지 (동시에 시도해도 한 프로세스만 UPDATE됨)
+            if conn.execute(
+                update(table).where(table.c.name == self.name, table.c.expires_at < now)
+                .values(holder=holder, expires_at=expires_at, acquired_at=now)
+            ).rowcount:
+                return True, expires_at
+            current = conn.execute(
+                select(table.c.expires_at).where(table.c.name == self.name)
+            ).scalar()
+
+        if current is not None:
+            return False, current
+
+        # 첫 실행: 행 생성 (동시에 만든 프로세스가 있으면 실패)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(table).values(
+                    name=self.name, holder=holder, expires_at=expires_at, acquired_at=now))
+            return True, expires_at
+        except IntegrityError:
+            return False, None
+
+    def release(self, holder):
+        """리스 반납 (다른 프로세스가 다음 확인 때 바로 차지)"""
+        table = lease_table
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(table).where(table.c.name == self.name, table.c.holder == holder)
+                .values(expires_at=_RELEASED)
+            )
+
+
+class FileLease:
+    """잠금 파일 flock 리스 (한 서버 전용)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def acquire(self, holder, ttl, now):
+        import fcntl
+
+        if self._fd is not None:
+            return True, None
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False, None
+
+        # 현재 리더 확인용
+        os.ftruncate(fd, 0)
+        os.write(fd, holder.encode())
+        self._fd = fd
+        return True, None
+
+    def release(self, holder):
+        import fcntl
+
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class LeaderElector:
+    """
+    리스 기반 리더 선출
+
+    리더는 renew_interval마다 리스를 갱신하고, 갱신하지 못한 채 ttl이 지나면
+    (DB 장애 등) 다른 프로세스가 차지할 수 있으므로 스스로 리더에서 내려온다.
+    리더가 아닌 프로세스는 현재 리스 만료 시각에 맞춰 다시 시도한다.
+    """
+
+    def __init__(self, lease=None, ttl=30, renew_interval=None, holder=None,
+                 clock=time.monotonic, wall_clock=datetime.utcnow, logger=None):
+        """
+        Args:
+            lease: DBLease / FileLease (None이면 항상 리더)
+            ttl: 리스 유효 시간 (초)
+            renew_interval: 리스 갱신/확인 주기 (초, 기본 ttl/3)
+            holder: 프로세스 식별자
+            clock: 리더 유효 시간 판단용 단조 시계 (테스트용)
+            wall_clock: 리스 만료 시각 기록용 UTC 시계 (테스트용)
+            logger: 리더 변경 로그
+        """
+        self.lease = lease
+        self.ttl = ttl
+        self.renew_interval = renew_interval or ttl / 3.0
+        self.holder = holder or default_holder()
+        self._clock = clock
+        self._wall = wall_clock
+        self.logger = logger
+
+        self.running = False
+        self.thread = None
+        self._wakeup = threading.Event()
+        self._valid_until = None    # 리더 자격 만료 (clock 기준)
+        self._transitions = 0
+        self._errors = 0
+        self._last_error = None
+
+    @property
+    def is_leader(self):
+        if self.lease is None:
+            return True
+        return self._valid_until is not None and self._clock() < self._valid_until
+
+    def step(self):
+        """
+        리스 차지/갱신 한 번
+
+        Returns:
+            float: 다음 시도까지 대기 시간 (초)
+        """
+        if self.lease is None:
+            return self.renew_interval
+
+        was_leader = self.is_leader
+        started = self._clock()
+        now = self._wall()
+        try:
+            held, expires_at = self.lease.acquire(self.holder, self.ttl, now)
+        except Exception as e:
+            # 갱신 실패: 기존 자격은 만료 시각까지만 유지
+            self._errors += 1
+            self._last_error = str(e)
+            held, expires_at = False, None
+            if was_leader:
+                self._log('warning', f"Leader lease renew failed: {e}")
+        else:
+            if held:
+                # 요청 전에 잰 시각 기준이므로 DB에 기록된 만료보다 먼저 끝남
+                self._valid_until = started + self.ttl
+            else:
+                self._valid_until = None
+
+        if self.is_leader != was_leader:
+            self._transitions += 1
+            self._log('info', f"Leader {'acquired' if self.is_leader else 'lost'} ({self.holder})")
+
+        if held or expires_at is None:
+            return self.renew_interval
+        # 현재 리더의 리스가 만료되는 시각에 맞춰 다시 시도
+        remaining = (expires_at - now).total_seconds()
+        return min(self.renew_interval, max(0.05, remaining + 0.01))
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+
+    def start(self):
+        """선출 스레드 시작 (첫 시도는 바로 실행)"""
+        if self.running:
+            return
+
+        self.running = True
+        self._wakeup.clear()
+        self.step()
+        self.thread = threading.Thread(target=self._run, name='leader-election', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        """선출 중지 및 리스 반납"""
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+        if self.lease is not None and self._valid_until is not None:
+            try:
+                self.lease.release(self.holder)
+            except Exception as e:
+                self._log('warning', f"Leader lease release failed: {e}")
+            self._valid_until = None
+
+    def _run(self):
+        delay = self.renew_interval
+        while self.running:
+            self._wakeup.wait(delay)
+            if not self.running:
+                break
+            delay = self.step()
+
+    def get_stats(self):
+        """선출 상태"""
+        return {
+            'backend': type(self.lease).__name__ if self.lease is not None else None,
+            'holder': self.holder,
+            'is_leader': self.is_leader,
+            'ttl': self.ttl,
+            'transitions': self._transitions,
+            'errors': self._errors,
+            'last_error': self._last_error
+        }
+
+
+# 전역 인스턴스 (init_leader 전에는 항상 리더)
+leader = LeaderElector()
+
+
+def init_leader(app):
+    """
+    설정(LEADER_ELECTION)에 따라 리스 준비 및 선출 시작
+
+    Args:
+        app: Flask 애플리케이션
+    """
+    mode = app.config.get('LEADER_ELECTION', 'db')
+    leader.ttl = app.config.get('LEADER_LEASE_TTL', leader.ttl)
+    leader.renew_interval = leader.ttl / 3.0
+    leader.logger = app.logger
+
+    if mode == 'db':
+        with app.app_context():
+            lease = DBLease(app.extensions['sqlalchemy'].engine,
+                            app.config.get('LEADER_LEASE_NAME', 'background'))
+        try:
+            lease.create_table()
+        except Exception as e:
+            app.logger.error(f"Leader lease table check failed: {e}")
+        leader.lease = lease
+    elif mode == 'file':
+        leader.lease = FileLease(app.config.get('LEADER_LOCK_FILE', '/tmp/wellsafer-leader.lock'))
+    else:
+        leader.lease = None
+
+    leader.start()
+    return leader
@@ -59,18 +59,26 @@ if cors_origins == '*':
 else:
     CORS(app, origins=cors_origins.split(','), supports_credentials=True)
 
+# 워커 간 Socket.IO 메시지 큐 (없으면 단일 프로세스)
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+
 # ============================================================
 # Socket.IO 설정
 # ============================================================
 
+from backend.codec import SocketIOJSON
+from backend.emit_bus import socketio_queue_options
+
 socketio = SocketIO(
     app,
+    json=SocketIOJSON,
     cors_allowed_origins="*",
     async_mode='eventlet',
     logger=True,
     engineio_logger=True,
     ping_timeout=180,  # 3분으로 증가하여 모바일 연결 안정화
-    ping_interval=60  # 1분으로 증가
+    ping_interval=60,  # 1분으로 증가
+    **socketio_queue_options(app)
 )
 
 # ============================================================
@@ -216,8 +224,7 @@ def test_alert():
     }
 
     # Socket.IO로 알림 전송
-    socketio.emit('alert_new', alert_data, room='alerts')
-    socketio.emit('alert_new', alert_data, room='dashboard')
+    socketio.emit('alert_new', alert_data, to=['alerts', 'dashboard'])
 
     logger.info(f"Test alert sent via Socket.IO")
 
@@ -4,7 +4,7 @@ MQTT 클라이언트 모듈
 스마트밴드 및 신경자극기와의 MQTT 통신 처리
 """
 
-import json
+import os
 import threading
 from datetime import datetime
 from flask import current_app
@@ -12,15 +12,29 @@ import paho.mqtt.client as mqtt
 
 # backend 모듈 import (db 디렉토리와 구분하기 위해)
 import backend as backend_module
-
-# MQTT 클라이언트 인스턴스
+from backend import codec
+from backend.mqtt_dispatch import shard_for
+from backend.mqtt_topic import TopicTrie
+from backend.socket_handlers import alert_rooms
+from backend.dedup import message_marker
+# 생체신호 경보 기준 (실시간 전송 우선 처리, 이상 구간 감지 기본값은 anomaly.DEFAULT_RULES)
+from backend.anomaly import HR_HIGH_THRESHOLD, HR_LOW_THRESHOLD, SPO2_LOW_THRESHOLD
+from backend.ingest_engine import (
+    SensorContext, SensorReading, from_band_payload, from_batch_payload, from_sensordata_payload,
+    sensor_chain
+)
+
+# MQTT 클라이언트 인스턴스 (수신과 명령 발송에 같은 연결 사용)
 _mqtt_client = None
 _mqtt_lock = threading.Lock()
+_subscribe = True
 
 # 토픽 정의
 class Topics:
     # 밴드 → 서버 (수신)
     BAND_SENSOR = "wellsafer/band/{bid}/sensor"
+    BAND_SENSOR_BIN = "wellsafer/band/{bid}/sensor/bin"     # 바이너리 텔레메트리 (telemetry.py)
+    BAND_SENSOR_BATCH = "wellsafer/band/{bid}/sensor/batch" # 재연결 후 밀린 측정값 묶음
     BAND_LOCATION = "wellsafer/band/{bid}/location"
     BAND_STATUS = "wellsafer/band/{bid}/status"
     BAND_EVENT = "wellsafer/band/{bid}/event"
@@ -40,47 +54,219 @@ class Topics:
     BAND_ALL = "wellsafer/band/+/#"
     STIM_ALL = "wellsafer/stim/+/#"
 
+    # 구 백엔드 토픽
+    LEGACY_ASYNC = "/DT/eHG4/naas/post/async"
+    LEGACY_SYNC = "/DT/eHG4/naas/post/sync"
+
+    # 구 Flask-MQTT 핸들러 토픽 (bid는 페이로드에 포함)
+    DT_SENSOR = "/DT/eHG4/SensorData/#"
+    DT_LOCATION = "/DT/eHG4/Location/#"
+    DT_EVENT = "/DT/eHG4/Event/#"
+    DT_STATUS = "/DT/eHG4/Status/#"
+    NERVESTIM_CONNECT = "/DT/eHG4/NerveStim/Connect"
+    NERVESTIM_DISCONNECT = "/DT/eHG4/NerveStim/Disconnect"
+    NERVESTIM_STATUS = "/DT/eHG4/NerveStim/Status"
+    NERVESTIM_COMPLETE = "/DT/eHG4/NerveStim/Complete"
+    NERVESTIM_ERROR = "/DT/eHG4/NerveStim/Error"
+
+    # 서버 프로세스 간 알림 (공유 구독/bid 해시 샤딩 없이 모든 수집 프로세스가 받음)
+    BAND_CACHE_INVALIDATE = "wellsafer/server/band_cache/invalidate"
+
+    # 웹 프로세스가 받는 알림 (수집 전용 워커는 구독하지 않음)
+    DASHBOARD_SNAPSHOT = "wellsafer/server/dashboard/snapshot"
+    DASHBOARD_UPDATE = "wellsafer/server/dashboard/update"
+
+
+# 이 접미사로 끝나는 토픽은 JSON이 아닌 바이너리 페이로드
+BINARY_SUFFIX = "/bin"
+
+
+# 이벤트 유형 → events.type 코드 (6:SOS, 7:낙상, 8:심박수높음, 9:심박수낮음, 10:산소포화도낮음, 11:기기 오프라인)
+EVENT_TYPE_CODES = {
+    'sos': 6,
+    'sos_button': 6,
+    'fall': 7,
+    'fall_detected': 7,
+    'hr_high': 8,
+    'hr_low': 9,
+    'spo2_low': 10,
+    'device_offline': 11,
+}
+
+
+def subscription_topics(app=None):
+    """
+    구독할 토픽 목록
+
+    수집 워커가 여러 개이고 MQTT_SHARD_MODE가 'share'이면
+    공유 구독($share/그룹/토픽)으로 브로커가 메시지를 워커에 나눠 준다.
+    이때 같은 밴드의 메시지가 여러 워커로 흩어지므로 밴드별 순서와
+    프로세스 안의 밴드별 상태(band_state, 이상 구간 감지, 발송 스로틀, 중복 제거)가 보장되지 않는다.
+    """
+    topics = [
+        Topics.BAND_ALL, Topics.STIM_ALL, Topics.LEGACY_ASYNC, Topics.LEGACY_SYNC,
+        Topics.DT_SENSOR, Topics.DT_LOCATION, Topics.DT_EVENT, Topics.DT_STATUS,
+        Topics.NERVESTIM_CONNECT, Topics.NERVESTIM_DISCONNECT, Topics.NERVESTIM_STATUS,
+        Topics.NERVESTIM_COMPLETE, Topics.NERVESTIM_ERROR
+    ]
+    if app is not None and app.config.get('MQTT_SHARD_COUNT', 1) > 1 and app.config.get('MQTT_SHARD_MODE') == 'share':
+        group = app.config.get('MQTT_SHARE_GROUP', 'wellsafer')
+        topics = [f"$share/{group}/{topic}" for topic in topics]
+    return topics + [Topics.BAND_CACHE_INVALIDATE]
+
+
+def web_topics(app=None):
+    """
+    웹 프로세스('all'/'web' 역할)가 구독할 토픽 목록
+
+    웹 워커가 여러 개일 때 리더 워커가 받아 처리하는 요청 (대시보드 요약 발송)과
+    수집 워커가 보내는 대시보드 요약 증분 갱신
+    """
+    if app is not None and app.config.get('PROCESS_ROLE', 'all') == 'ingest':
+        return []
+    return [Topics.DASHBOARD_SNAPSHOT, Topics.DASHBOARD_UPDATE]
+
 
 class MQTTHandler:
     """MQTT 메시지 핸들러"""
     
-    def __init__(self, app=None, socketio=None):
+    def __init__(self, app=None, socketio=None, dispatcher=None):
         self.app = app
         self.socketio = socketio
         self.handlers = {}
+        self.router = TopicTrie()
+        self.dispatcher = dispatcher
+        self.shard = None       # (워커 번호, 워커 수): bid 해시 샤딩 시 자기 몫만 처리
+        self.broadcast = set()  # 샤딩과 관계없이 모든 수집 프로세스가 처리할 핸들러
+        self.received = 0
+        self.skipped = 0
         
-    def register_handler(self, topic_pattern, handler):
-        """토픽 패턴에 대한 핸들러 등록"""
+    def register_handler(self, topic_pattern, handler, broadcast=False):
+        """
+        토픽 패턴에 대한 핸들러 등록
+
+        "{bid}"처럼 이름을 붙인 세그먼트는 매칭 시 추출되어 핸들러에 키워드 인자로 전달된다.
+        예: "wellsafer/band/{bid}/sensor" → handler(topic, payload, bid='...')
+
+        broadcast=True면 bid 해시 샤딩에서도 건너뛰지 않는다 (서버 프로세스 간 알림).
+        """
         self.handlers[topic_pattern] = handler
+        self.router.add(topic_pattern, handler)
+        if broadcast:
+            self.broadcast.add(handler)
+
+    def set_dispatcher(self, dispatcher):
+        """워커 풀 분배기 설정 (None이면 수신 스레드에서 직접 실행)"""
+        self.dispatcher = dispatcher
+
+    def set_shard(self, index, count):
+        """bid 해시 샤딩 설정 (count가 1 이하면 해제)"""
+        self.shard = (index, count) if count > 1 else None
         
     def handle_message(self, topic, payload):
-        """메시지 처리"""
-        for pattern, handler in self.handlers.items():
-            if self._match_topic(pattern, topic):
-                try:
-                    handler(topic, payload)
-                except Exception as e:
-                    if self.app:
-                        self.app.logger.error(f"MQTT handler error: {e}")
-                        
-    def _match_topic(self, pattern, topic):
-        """토픽 패턴 매칭"""
-        pattern_parts = pattern.split('/')
-        topic_parts = topic.split('/')
-        
-        if len(pattern_parts) != len(topic_parts):
-            if '#' not in pattern_parts:
-                return False
-                
-        for i, part in enumerate(pattern_parts):
-            if part == '#':
-                return True
-            if part == '+':
-                continue
-            if i >= len(topic_parts) or part != topic_parts[i]:
-                return False
-                
-        return True
+        """메시지 처리 (분배기가 있으면 bid 기준 워커로 전달)"""
+        matches = self.router.match(topic)
+        if not matches:
+            return
+        self._handle(topic, payload, matches)
+
+    def handle_raw(self, topic, raw, decode):
+        """
+        수신 원문 처리
+
+        토픽에 bid가 있으면(wellsafer/band/{bid}/...) 디코딩 전에 bid 해시 샤딩을 적용하여
+        다른 수집 프로세스 몫의 메시지는 디코딩하지 않는다.
+        구 백엔드 토픽처럼 bid가 페이로드에 있을 때만 먼저 디코딩한다.
+
+        Args:
+            topic: 토픽
+            raw: 수신 bytes
+            decode: 원문 → 페이로드 변환 함수 (예: codec.loads)
+        """
+        matches = self.router.match(topic)
+        if not matches:
+            return
+
+        key = self._topic_key(matches)
+        if key is not None and not self._owns(key, matches):
+            self.received += 1
+            self.skipped += 1
+            return
+
+        self._handle(topic, decode(raw), matches, key)
+
+    def _handle(self, topic, payload, matches, key=None):
+        self.received += 1
+        if key is None:
+            key = self._dispatch_key(topic, payload, matches)
+
+        # 다른 수집 프로세스 몫의 밴드
+        if not self._owns(key, matches):
+            self.skipped += 1
+            return
+
+        if self.dispatcher is not None and self.dispatcher.running:
+            if not self.dispatcher.submit(key, self._run_handlers, topic, payload, matches):
+                if self.app:
+                    self.app.logger.warning(f"MQTT dispatch queue full, dropped message: {topic}")
+            return
+
+        self._run_handlers(topic, payload, matches)
+
+    def _owns(self, key, matches):
+        """이 수집 프로세스가 처리할 메시지인지 확인 (샤딩 미사용 또는 서버 프로세스 간 알림이면 항상)"""
+        if self.shard is None or shard_for(key, self.shard[1]) == self.shard[0]:
+            return True
+        return any(handler in self.broadcast for handler, _ in matches)
+
+    @staticmethod
+    def _topic_key(matches):
+        """토픽에서 추출한 bid (없으면 None)"""
+        for _, params in matches:
+            if params.get('bid'):
+                return params['bid']
+        return None
+
+    def _dispatch_key(self, topic, payload, matches):
+        """
+        순서 보장 키 추출
+
+        토픽에서 추출한 bid를 우선 사용하고,
+        구 백엔드 토픽은 payload의 bid 또는 extAddress를 사용
+        """
+        key = self._topic_key(matches)
+        if key is not None:
+            return key
+
+        if isinstance(payload, dict):
+            if payload.get('bid'):
+                return payload['bid']
+            ext_addr = payload.get('extAddress')
+            if isinstance(ext_addr, dict):
+                return (ext_addr.get('high', 0) << 32) | ext_addr.get('low', 0)
+
+        return topic
+
+    def get_stats(self):
+        """수신/처리 통계 (수집 워커 처리량 보고용)"""
+        dropped = 0
+        if self.dispatcher is not None:
+            dropped = sum(w['dropped'] for w in self.dispatcher.get_stats()['workers'])
+        return {
+            'received': self.received,
+            'skipped': self.skipped,
+            'handled': self.received - self.skipped - dropped,
+            'dropped': dropped
+        }
+
+    def _run_handlers(self, topic, payload, matches):
+        """매칭된 핸들러 실행"""
+        for handler, params in matches:
+            try:
+                handler(topic, payload, **params)
+            except Exception as e:
+                if self.app:
+                    self.app.logger.error(f"MQTT handler error: {e}")
 
 
 # 전역 핸들러 인스턴스
@@ -93,20 +279,22 @@ def get_mqtt_client():
     return _mqtt_client
 
 
-def init_mqtt(app, socketio=None):
+def init_mqtt(app, socketio=None, ingest=True):
     """
     MQTT 클라이언트 초기화
     
     Args:
         app: Flask 애플리케이션
         socketio: Socket.IO 인스턴스
+        ingest: False면 토픽을 구독하지 않고 명령 발송용으로만 연결 ('web' 역할)
     """
-    global _mqtt_client, mqtt_handler
+    global _mqtt_client, mqtt_handler, _subscribe
     
     with _mqtt_lock:
         if _mqtt_client is not None:
             return _mqtt_client
             
+        _subscribe = ingest
         mqtt_handler.app = app
         mqtt_handler.socketio = socketio
         
@@ -115,7 +303,14 @@ def init_mqtt(app, socketio=None):
         username = app.config.get('MQTT_USERNAME')
         password = app.config.get('MQTT_PASSWORD')
         
+        # 수집 워커가 여러 개면 워커 번호/프로세스별로 구분되는 클라이언트 ID 사용
+        shard_index = app.config.get('MQTT_SHARD_INDEX', 0)
+        shard_count = app.config.get('MQTT_SHARD_COUNT', 1)
         client_id = f"wellsafer-server-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        if shard_count > 1:
+            client_id += f"-{shard_index}-{os.getpid()}"
+            if app.config.get('MQTT_SHARD_MODE') == 'hash':
+                mqtt_handler.set_shard(shard_index, shard_count)
         
         _mqtt_client = mqtt.Client(client_id=client_id, protocol=mqtt.MQTTv311)
         
@@ -136,7 +331,61 @@ def init_mqtt(app, socketio=None):
         except Exception as e:
             app.logger.error(f"MQTT connection failed: {e}")
             _mqtt_client = None
+
+        # 웹 워커 간 요청 처리 (리더 워커의 대시보드 요약 발송)
+        _register_web_handlers(app, socketio)
+
+        if not ingest:
+            return _mqtt_client
             
+        # 밴드 식별 캐시 설정
+        from backend.band_cache import band_cache
+        band_cache.init_app(app)
+
+        # 펌웨어별 바이너리 텔레메트리 스키마 등록
+        from backend.telemetry import init_telemetry
+        init_telemetry(app)
+
+        # QoS 1 재전송 중복 제거 구간
+        from backend.dedup import init_dedup
+        init_dedup(app)
+
+        # 생체신호 이상 구간 감지 기준
+        from backend.anomaly import init_anomaly
+        init_anomaly(app)
+
+        # 밴드별 최신 생체신호 초기 적재
+        from backend.latest_vitals import init_latest_vitals
+        init_latest_vitals(app)
+
+        # 센서 데이터 배치 적재 시작
+        from backend.ingest import init_ingest
+        init_ingest(app)
+
+        # 밴드 연결 상태/위치 write-behind 저장 시작
+        from backend.band_state import init_band_state
+        init_band_state(app)
+
+        # 마지막 수신 시각 기반 오프라인 감지 (타이머 휠)
+        from backend.band_presence import init_band_presence
+        init_band_presence(app, socketio)
+
+        # 밴드별 실시간 전송 속도 제한 (경보 수준 생체신호는 즉시 전송)
+        if socketio:
+            from backend.emit_throttle import init_emit_throttle
+            init_emit_throttle(app, socketio)
+
+            # 대시보드용 밴드 변경을 tick 단위 프레임으로 묶어 발송
+            from backend.dashboard_frame import init_dashboard_frames
+            init_dashboard_frames(app, socketio)
+
+        # 핸들러 실행용 워커 풀 (MQTT_DISPATCH_MODE='inline'이면 수신 스레드에서 실행)
+        from backend.mqtt_dispatch import create_dispatcher
+        dispatcher = create_dispatcher(app)
+        if dispatcher is not None:
+            dispatcher.start()
+        mqtt_handler.set_dispatcher(dispatcher)
+
         # 기본 핸들러 등록
         _register_default_handlers(app, socketio)
         
@@ -147,13 +396,13 @@ def _on_connect(client, userdata, flags, rc):
     """연결 콜백"""
     if rc == 0:
         print("MQTT Connected successfully")
-        # 토픽 구독
-        client.subscribe(Topics.BAND_ALL, qos=1)
-        client.subscribe(Topics.STIM_ALL, qos=1)
-        # 구 백엔드 토픽 구독
-        client.subscribe("/DT/eHG4/naas/post/async", qos=1)
-        client.subscribe("/DT/eHG4/naas/post/sync", qos=1)
-        print("Subscribed to legacy topics: /DT/eHG4/naas/post/async, /DT/eHG4/naas/post/sync")
+        topics = web_topics(mqtt_handler.app)
+        if _subscribe:
+            # 토픽 구독 (구 백엔드 토픽 포함)
+            topics = subscription_topics(mqtt_handler.app) + topics
+        for topic in topics:
+            client.subscribe(topic, qos=1)
+            print(f"Subscribed to {topic}")
     else:
         print(f"MQTT Connection failed with code {rc}")
 
@@ -170,65 +419,78 @@ def _on_message(client, userdata, msg):
     """메시지 수신 콜백"""
     try:
         topic = msg.topic
-        payload = json.loads(msg.payload.decode('utf-8'))
-        mqtt_handler.handle_message(topic, payload)
-    except json.JSONDecodeError:
+        # 모든 토픽을 이 연결 하나에서 받아 bytes 그대로 한 번만 디코딩
+        # (바이너리 토픽은 핸들러가 스키마로 직접 해석, 다른 샤드 몫은 디코딩하지 않음)
+        decode = _raw if topic.endswith(BINARY_SUFFIX) else codec.loads
+        mqtt_handler.handle_raw(topic, msg.payload, decode)
+    except codec.DecodeError:
         print(f"Invalid JSON in MQTT message: {msg.topic}")
     except Exception as e:
         print(f"MQTT message handling error: {e}")
 
 
+def _raw(payload):
+    return payload
+
+
+def _register_web_handlers(app, socketio):
+    """웹 프로세스 핸들러 등록 (수집 전용 워커는 등록하지 않음)"""
+    if app.config.get('PROCESS_ROLE', 'all') == 'ingest':
+        return
+
+    def handle_dashboard_snapshot(topic, payload):
+        """다른 웹 워커가 받은 구독/재동기화 요청 → 리더 워커가 요약 발송"""
+        from backend.dashboard_summary import send_snapshot
+        if socketio and isinstance(payload, dict) and payload.get('sid'):
+            send_snapshot(socketio, payload['sid'], forward=False)
+
+    def handle_dashboard_update(topic, payload):
+        """수집 워커의 밴드 온라인/자극기 연결 변경 → 이 프로세스의 요약 캐시에 반영"""
+        from backend.dashboard_summary import apply_update
+        apply_update(payload)
+
+    mqtt_handler.register_handler(Topics.DASHBOARD_SNAPSHOT, handle_dashboard_snapshot, broadcast=True)
+    mqtt_handler.register_handler(Topics.DASHBOARD_UPDATE, handle_dashboard_update, broadcast=True)
+
+
 def _register_default_handlers(app, socketio):
     """기본 메시지 핸들러 등록"""
 
-    def handle_sensor_data(topic, payload):
+    def handle_sensor_data(topic, payload, bid):
         """센서 데이터 처리"""
-        parts = topic.split('/')
-        if len(parts) >= 4:
-            bid = parts[2]
-            _process_sensor_data(app, socketio, bid, payload)
+        _process_sensor_data(app, socketio, bid, payload)
 
-    def handle_location_data(topic, payload):
+    def handle_sensor_binary(topic, payload, bid):
+        """바이너리 센서 데이터 처리"""
+        _process_sensor_binary(app, socketio, bid, payload)
+
+    def handle_sensor_batch(topic, payload, bid):
+        """센서 데이터 묶음 처리"""
+        _process_sensor_batch(app, socketio, bid, payload)
+
+    def handle_location_data(topic, payload, bid):
         """위치 데이터 처리"""
-        parts = topic.split('/')
-        if len(parts) >= 4:
-            bid = parts[2]
-            _process_location_data(app, socketio, bid, payload)
+        _process_location_data(app, socketio, bid, payload)
 
-    def handle_band_status(topic, payload):
+    def handle_band_status(topic, payload, bid):
         """밴드 상태 처리"""
-        parts = topic.split('/')
-        if len(parts) >= 4:
-            bid = parts[2]
-            _process_band_status(app, socketio, bid, payload)
+        _process_band_status(app, socketio, bid, payload)
 
-    def handle_band_event(topic, payload):
+    def handle_band_event(topic, payload, bid):
         """밴드 이벤트 처리"""
-        parts = topic.split('/')
-        if len(parts) >= 4:
-            bid = parts[2]
-            _process_band_event(app, socketio, bid, payload)
+        _process_band_event(app, socketio, bid, payload)
 
-    def handle_stim_status(topic, payload):
+    def handle_stim_status(topic, payload, bid):
         """신경자극기 상태 처리"""
-        parts = topic.split('/')
-        if len(parts) >= 4:
-            bid = parts[2]
-            _process_stim_status(app, socketio, bid, payload)
+        _process_stim_status(app, socketio, bid, payload)
 
-    def handle_stim_connected(topic, payload):
+    def handle_stim_connected(topic, payload, bid):
         """신경자극기 연결 처리"""
-        parts = topic.split('/')
-        if len(parts) >= 4:
-            bid = parts[2]
-            _process_stim_connected(app, socketio, bid, payload)
+        _process_stim_connected(app, socketio, bid, payload)
 
-    def handle_stim_disconnected(topic, payload):
+    def handle_stim_disconnected(topic, payload, bid):
         """신경자극기 연결 해제 처리"""
-        parts = topic.split('/')
-        if len(parts) >= 4:
-            bid = parts[2]
-            _process_stim_disconnected(app, socketio, bid, payload)
+        _process_stim_disconnected(app, socketio, bid, payload)
 
     def handle_legacy_async(topic, payload):
         """구 백엔드 async 토픽 처리"""
@@ -238,151 +500,340 @@ def _register_default_handlers(app, socketio):
         """구 백엔드 sync 토픽 처리"""
         _process_legacy_message(app, socketio, payload, is_sync=True)
 
-    mqtt_handler.register_handler("wellsafer/band/+/sensor", handle_sensor_data)
-    mqtt_handler.register_handler("wellsafer/band/+/location", handle_location_data)
-    mqtt_handler.register_handler("wellsafer/band/+/status", handle_band_status)
-    mqtt_handler.register_handler("wellsafer/band/+/event", handle_band_event)
-    mqtt_handler.register_handler("wellsafer/stim/+/status", handle_stim_status)
-    mqtt_handler.register_handler("wellsafer/stim/+/connected", handle_stim_connected)
-    mqtt_handler.register_handler("wellsafer/stim/+/disconnected", handle_stim_disconnected)
-    mqtt_handler.register_handler("/DT/eHG4/naas/post/async", handle_legacy_async)
-    mqtt_handler.register_handler("/DT/eHG4/naas/post/sync", handle_legacy_sync)
+    def handle_dt_sensor(topic, payload):
+        """/DT/eHG4/SensorData 처리 (acc_x, steps 등은 표준 필드로 변환)"""
+        reading = from_sensordata_payload(payload)
+        if reading is not None:
+            process_reading(app, socketio, reading)
+
+    def handle_dt_location(topic, payload):
+        """/DT/eHG4/Location 처리"""
+        if payload.get('bid') and payload.get('latitude') is not None and payload.get('longitude') is not None:
+            _process_location_data(app, socketio, str(payload['bid']), payload)
+
+    def handle_dt_event(topic, payload):
+        """/DT/eHG4/Event 처리"""
+        if payload.get('bid') and payload.get('event_type'):
+            _process_band_event(app, socketio, str(payload['bid']), payload)
+
+    def handle_dt_status(topic, payload):
+        """/DT/eHG4/Status 처리 (connect_state → status)"""
+        if not payload.get('bid'):
+            return
+        if 'status' not in payload and 'connect_state' in payload:
+            payload = dict(payload, status='online' if payload['connect_state'] == 1 else 'offline')
+        _process_band_status(app, socketio, str(payload['bid']), payload)
+
+    def handle_band_cache_invalidate(topic, payload):
+        """다른 프로세스(웹 API)의 밴드 등록/수정/삭제 알림 → 캐시 무효화"""
+        from backend.band_cache import band_cache
+        if isinstance(payload, dict) and payload.get('bid'):
+            band_cache.invalidate(payload['bid'])
+
+    def nervestim_handler(name):
+        """신경자극 세션 토픽 처리 (api/mqtt_nervestim 핸들러 사용)"""
+        def handle(topic, payload):
+            from backend.api import mqtt_nervestim
+            with app.app_context():
+                getattr(mqtt_nervestim, name)(payload, socketio, app)
+        return handle
+
+    mqtt_handler.register_handler(Topics.BAND_CACHE_INVALIDATE, handle_band_cache_invalidate, broadcast=True)
+    mqtt_handler.register_handler(Topics.BAND_SENSOR, handle_sensor_data)
+    mqtt_handler.register_handler(Topics.BAND_SENSOR_BIN, handle_sensor_binary)
+    mqtt_handler.register_handler(Topics.BAND_SENSOR_BATCH, handle_sensor_batch)
+    mqtt_handler.register_handler(Topics.BAND_LOCATION, handle_location_data)
+    mqtt_handler.register_handler(Topics.BAND_STATUS, handle_band_status)
+    mqtt_handler.register_handler(Topics.BAND_EVENT, handle_band_event)
+    mqtt_handler.register_handler(Topics.STIM_STATUS, handle_stim_status)
+    mqtt_handler.register_handler(Topics.STIM_CONNECTED, handle_stim_connected)
+    mqtt_handler.register_handler(Topics.STIM_DISCONNECTED, handle_stim_disconnected)
+    mqtt_handler.register_handler(Topics.LEGACY_ASYNC, handle_legacy_async)
+    mqtt_handler.register_handler(Topics.LEGACY_SYNC, handle_legacy_sync)
+    mqtt_handler.register_handler(Topics.DT_SENSOR, handle_dt_sensor)
+    mqtt_handler.register_handler(Topics.DT_LOCATION, handle_dt_location)
+    mqtt_handler.register_handler(Topics.DT_EVENT, handle_dt_event)
+    mqtt_handler.register_handler(Topics.DT_STATUS, handle_dt_status)
+    mqtt_handler.register_handler(Topics.NERVESTIM_CONNECT, nervestim_handler('handle_stimulator_connect'))
+    mqtt_handler.register_handler(Topics.NERVESTIM_DISCONNECT, nervestim_handler('handle_stimulator_disconnect'))
+    mqtt_handler.register_handler(Topics.NERVESTIM_STATUS, nervestim_handler('handle_stim_status'))
+    mqtt_handler.register_handler(Topics.NERVESTIM_COMPLETE, nervestim_handler('handle_stim_complete'))
+    mqtt_handler.register_handler(Topics.NERVESTIM_ERROR, nervestim_handler('handle_stim_error'))
+
+    register_sensor_stages(sensor_chain)
 
 
 def _process_sensor_data(app, socketio, bid, payload):
-    """센서 데이터 처리 및 저장"""
-    from flask_sqlalchemy import SQLAlchemy
-    from backend.db import models as db_models
-    Band = db_models.Band
-    SensorData = db_models.SensorData
+    """wellsafer/band/{bid}/sensor 데이터 처리"""
+    process_reading(app, socketio, from_band_payload(bid, payload))
+
+
+def _process_sensor_binary(app, socketio, bid, data):
+    """wellsafer/band/{bid}/sensor/bin 데이터 처리 (밴드 sw_ver의 스키마로 해석)"""
+    from backend.band_cache import band_cache
+    from backend.telemetry import TelemetryError, telemetry_registry
 
     with app.app_context():
-        db = app.extensions['sqlalchemy']
-        band = Band.query.filter_by(bid=bid).first()
+        band = band_cache.get(bid)
         if not band:
             return
-            
-        # 센서 데이터 저장 (실제 DB 컬럼 사용)
-        sensor = SensorData(
-            FK_bid=band.id,
-            datetime=datetime.utcnow(),
-            battery_level=payload.get('battery_level'),
-            hr=payload.get('hr'),
-            spo2=payload.get('spo2'),
-            skin_temp=payload.get('skin_temp'),
-            x=payload.get('x'),
-            y=payload.get('y'),
-            z=payload.get('z'),
-            walk_steps=payload.get('walk_steps'),
-            run_steps=payload.get('run_steps'),
-            activity=payload.get('activity'),
-            motionFlag=payload.get('motionFlag'),
-            scdState=payload.get('scdState')
-        )
-        db.session.add(sensor)
-
-        # 밴드 연결 상태 업데이트
-        # scdState (Skin Contact Detection): 0=벗음, 1=착용
-        scd_state = payload.get('scdState')
-        if scd_state == 0:
-            # 밴드를 벗으면 즉시 오프라인
-            band.connect_state = 0
-            app.logger.info(f"Band {bid} removed (scdState=0), setting offline")
-        else:
-            # 착용 중이면 온라인
-            band.connect_state = 1
-        band.connect_time = datetime.utcnow()
+        try:
+            fields = telemetry_registry.decode(data, band.sw_ver)
+        except TelemetryError as e:
+            app.logger.warning(f"Invalid binary telemetry from band {bid}: {e}")
+            return
+        # 기기 timestamp가 있으면 재전송 판별에 사용 (0이면 수신 시각이므로 중복 제거 안 함)
+        process_reading(app, socketio, SensorReading(bid, marker=fields.get('datetime'), **fields))
+
+
+def _process_sensor_batch(app, socketio, bid, payload):
+    """
+    wellsafer/band/{bid}/sensor/batch 데이터 처리
+
+    묶음 전체를 (bid, 기기 시각) 중복 제외 후 한 번에 저장하고,
+    실시간 전송과 이상치 감지는 가장 최근 측정값 하나만 처리 단계로 보낸다.
+    """
+    from backend.band_cache import band_cache
+    from backend.ingest import write_batch
+
+    readings = from_batch_payload(bid, payload)
+    if not readings:
+        return
+
+    with app.app_context():
+        band = band_cache.get(bid)
+        if not band:
+            return
+
+        rows = [reading.to_row(band.id) for reading in readings]
+        try:
+            inserted = write_batch(app, band.id, rows)
+        except Exception as e:
+            app.logger.error(f"Sensor batch from band {bid} not saved ({len(rows)} readings): {e}")
+            return
+
+        # 최신 측정값이 이미 저장되어 있었다면 (재전송된 묶음) 이미 처리된 값
+        if not inserted or inserted[-1] is not rows[-1]:
+            return
+        ctx = SensorContext(app, socketio, band, readings[-1])
+        ctx.row = rows[-1]
+        sensor_chain.run(ctx)
+
+
+def process_reading(app, socketio, reading, chain=None):
+    """
+    표준 측정값 처리 (모든 센서 토픽 공통)
+
+    Args:
+        reading: SensorReading
+        chain: 처리 단계 목록 (기본값: sensor_chain)
+    """
+    from backend.band_cache import band_cache
+
+    with app.app_context():
+        band = band_cache.get(reading.bid)
+        if not band:
+            return
+        (chain or sensor_chain).run(SensorContext(app, socketio, band, reading))
+
+
+def register_sensor_stages(chain):
+    """기본 센서 처리 단계 등록 (중복 제거 → 저장 → 연결 상태 → 실시간 전송 → 이상치 감지)"""
+    chain.add('dedup', _stage_dedup)
+    chain.add('persist', _stage_persist)
+    chain.add('connection', _stage_connection)
+    chain.add('realtime', _stage_realtime)
+    chain.add('anomaly', _stage_anomaly)
+
+
+def _stage_dedup(ctx):
+    """
+    이미 받은 측정값(같은 밴드, 같은 기기 시퀀스/timestamp)이면 이후 단계 생략
+
+    시퀀스와 timestamp가 모두 없는 메시지는 재전송과 새 측정값을 구별할 수 없으므로 확인하지 않음
+    """
+    from backend.dedup import message_dedup
+
+    marker = ctx.reading.marker
+    if marker is None:
+        return
+    if message_dedup.seen((ctx.reading.bid, marker, 'sensor')):
+        return False
+
+
+def _stage_persist(ctx):
+    """센서 데이터 저장 및 최신 측정값 갱신"""
+    from backend.db import models as db_models
+    from backend.ingest import sensor_ingest
+    from backend.latest_vitals import latest_vitals
+
+    # 배치 토픽의 최신 측정값은 묶음과 함께 이미 저장됨
+    if ctx.row is not None:
+        # 실시간 값보다 오래된 밀린 측정값이면 전송/감지 생략
+        if not latest_vitals.update(ctx.band.id, ctx.row):
+            return False
+        return
+
+    ctx.row = ctx.reading.to_row(ctx.band.id)
+
+    # 목록/대시보드 조회용 최신 측정값 갱신
+    latest_vitals.update(ctx.band.id, ctx.row)
 
+    # 배치 적재 큐가 동작 중이면 writer 스레드가 일괄 INSERT
+    if sensor_ingest.running:
+        if not sensor_ingest.put(ctx.row):
+            ctx.app.logger.warning(f"Sensor ingest queue full, dropped reading from band {ctx.reading.bid}")
+    else:
+        db = ctx.app.extensions['sqlalchemy']
+        db.session.add(db_models.SensorData(**ctx.row))
         db.session.commit()
-        
-        # Socket.IO로 실시간 전송
-        if socketio:
-            socketio.emit('sensor_update', {
-                'bid': bid,
-                'datetime': datetime.utcnow().isoformat(),
-                **payload
-            }, room=f'band_{bid}')
-            
-        # 이상치 감지
-        _check_vital_anomaly(app, socketio, band, payload)
+
+
+def _stage_connection(ctx):
+    """착용 상태에 따른 연결 상태 갱신"""
+    from backend.band_state import band_state
+    from backend.band_presence import band_presence
+    from backend.dashboard_summary import report_band_online
+
+    # scdState (Skin Contact Detection): 0=벗음, 1=착용
+    if ctx.reading.scdState == 0:
+        # 밴드를 벗으면 즉시 오프라인
+        ctx.connect_state = 0
+        ctx.app.logger.info(f"Band {ctx.reading.bid} removed (scdState=0), setting offline")
+    else:
+        # 착용 중이면 온라인
+        ctx.connect_state = 1
+
+    # 연결 상태는 메모리에 모아 주기적으로 반영 (온라인/오프라인 전환 시 즉시)
+    band_state.update(ctx.band.id, connect_state=ctx.connect_state, connect_time=datetime.utcnow())
+    report_band_online(ctx.band.id, ctx.connect_state == 1)
+
+    # 수신이 끊기면 오프라인 처리되도록 마지막 수신 시각 기록 (벗은 밴드는 이미 오프라인)
+    if ctx.connect_state == 1:
+        band_presence.touch(ctx.band.id, ctx.band.bid)
+    else:
+        band_presence.forget(ctx.band.id)
+
+
+def _stage_realtime(ctx):
+    """Socket.IO 실시간 전송 (밴드별 최대 전송 빈도 제한, 경보 수준이면 즉시)"""
+    from backend.emit_throttle import emit_throttle
+    from backend.dashboard_frame import dashboard_frames
+
+    if not ctx.socketio:
+        return
+    reading = ctx.reading
+    payload = reading.to_payload()
+    emit_throttle.emit('sensor_update', payload, room=f'band_{reading.bid}',
+                       urgent=is_alert_vitals(payload))
+    frame = {'hr': reading.hr, 'spo2': reading.spo2, 'battery': reading.battery_level}
+    if ctx.connect_state is not None:
+        frame['status'] = 'online' if ctx.connect_state == 1 else 'offline'
+    dashboard_frames.update(reading.bid, **frame)
+
+
+def _stage_anomaly(ctx):
+    """생체신호 이상 구간 감지 (구간이 시작될 때만 이벤트)"""
+    from backend.anomaly import anomaly_detector
+
+    for onset in anomaly_detector.observe(ctx.band, ctx.reading):
+        _raise_vital_event(ctx.app, ctx.socketio, ctx.band, onset)
 
 
 def _process_location_data(app, socketio, bid, payload):
     """위치 데이터 처리"""
-    from backend.db import models as db_models
-    Band = db_models.Band
+    from backend.band_cache import band_cache
+    from backend.band_state import band_state
+    from backend.dashboard_frame import dashboard_frames
 
     with app.app_context():
-        db = app.extensions['sqlalchemy']
-        band = Band.query.filter_by(bid=bid).first()
+        band = band_cache.get(bid)
         if not band:
             return
-            
-        band.latitude = payload.get('latitude')
-        band.longitude = payload.get('longitude')
-        band.address = payload.get('address', '')
-        band.location_type = payload.get('location_type', 'GPS')
-        
-        db.session.commit()
-        
+
+        latitude = payload.get('latitude')
+        longitude = payload.get('longitude')
+
+        # address, location_type은 DB 컬럼이 없으므로 위경도만 저장
+        band_state.update(band.id, latitude=latitude, longitude=longitude)
+
         if socketio:
             socketio.emit('location_update', {
                 'bid': bid,
-                'latitude': band.latitude,
-                'longitude': band.longitude,
-                'address': band.address,
-                'location_type': band.location_type
+                'latitude': latitude,
+                'longitude': longitude,
+                'address': payload.get('address', ''),
+                'location_type': payload.get('location_type', 'GPS')
             }, room=f'band_{bid}')
+            dashboard_frames.update(bid, latitude=latitude, longitude=longitude)
 
 
 def _process_band_status(app, socketio, bid, payload):
     """밴드 상태 처리"""
-    db = backend_module.db
     from backend.db import models as db_models
+    from backend.band_cache import band_cache
+    from backend.band_presence import band_presence
+    from backend.band_state import band_state
+    from backend.dashboard_summary import report_band_online
+    from backend.dashboard_frame import dashboard_frames
+    from backend.emit_throttle import emit_throttle
     Band = db_models.Band
-    
+
     with app.app_context():
-        band = Band.query.filter_by(bid=bid).first()
+        db = app.extensions['sqlalchemy']
+        band = band_cache.get(bid)
         if not band:
             return
-            
+
         status = payload.get('status', 'offline')
-        band.connect_state = 1 if status == 'online' else 0
-        band.battery = payload.get('battery', band.battery)
-        band.firmware_version = payload.get('firmware_version', band.firmware_version)
-        
-        db.session.commit()
-        
+        if status == 'online':
+            band_state.update(band.id, connect_state=1, connect_time=datetime.utcnow())
+            band_presence.touch(band.id, bid)
+        else:
+            band_state.update(band.id, connect_state=0)
+            band_presence.forget(band.id)
+            # 밴드 룸 발송 제한 기록 정리 (삭제된 밴드도 송신이 끊기면 band_presence에서 정리됨)
+            emit_throttle.forget(f'band_{bid}')
+        report_band_online(band.id, status == 'online')
+
+        # firmware_version은 sw_ver 컬럼에 저장 (펌웨어 보고 시에만)
+        if payload.get('firmware_version') and payload['firmware_version'] != band.sw_ver:
+            Band.query.filter_by(id=band.id).update(
+                {'sw_ver': payload['firmware_version']}, synchronize_session=False
+            )
+            db.session.commit()
+            # 바이너리 텔레메트리 스키마 선택에 쓰이는 캐시의 sw_ver 갱신 (다른 프로세스는 무효화)
+            band_cache.put(band._replace(sw_ver=payload['firmware_version']))
+            publish(Topics.BAND_CACHE_INVALIDATE, {'bid': bid})
+
         if socketio:
             socketio.emit('band_status', {
                 'bid': bid,
                 'status': status,
-                'battery': band.battery
+                'battery': payload.get('battery', 0)
             })
+            dashboard_frames.update(bid, status=status, battery=payload.get('battery'))
 
 
 def _process_band_event(app, socketio, bid, payload):
     """밴드 이벤트 처리"""
     from backend.db import models as db_models
-    Band = db_models.Band
+    from backend.band_cache import band_cache
     Event = db_models.Event
 
     with app.app_context():
         db = app.extensions['sqlalchemy']
-        band = Band.query.filter_by(bid=bid).first()
+        band = band_cache.get(bid)
         if not band:
             return
 
         # event_type 문자열을 type 숫자로 변환
-        event_type_to_int = {
-            'sos': 6,
-            'fall': 7,
-            'hr_high': 8,
-            'hr_low': 9,
-            'spo2_low': 10,
-        }
         event_type_str = payload.get('event_type', 'unknown')
-        event_type_int = event_type_to_int.get(event_type_str, 0)
+        event_type_int = EVENT_TYPE_CODES.get(event_type_str, 0)
+
+        if _event_seen(bid, event_type_str, message_marker(payload)):
+            app.logger.info(f"Duplicate {event_type_str} event from band {bid} ignored")
+            return
 
         event = Event(
             FK_bid=band.id,
@@ -399,16 +850,28 @@ def _process_band_event(app, socketio, bid, payload):
             event_dict = event.to_dict()
             event_dict['bid'] = bid
             event_dict['wearer_name'] = band.wearer_name
-            # 알림은 alerts, dashboard, 그리고 해당 밴드 룸에 전송
-            socketio.emit('alert_new', event_dict, room='alerts')
-            socketio.emit('alert_new', event_dict, room='dashboard')
-            socketio.emit('alert_new', event_dict, room=f'band_{bid}')
+            # 알림은 alerts, dashboard, 그리고 해당 밴드 룸에 한 번에 전송
+            socketio.emit('alert_new', event_dict, to=alert_rooms(bid))
 
         # 긴급 이벤트 SMS 발송
         if event.event_level >= 3:
             _send_emergency_sms(app, band, event)
 
 
+def _event_seen(bid, event_type, marker):
+    """
+    이미 처리한 이벤트 메시지인지 확인
+
+    기기 시퀀스/timestamp가 없는 구 펌웨어 메시지는 재전송과 새 SOS/낙상을 구별할 수 없으므로
+    중복으로 보지 않는다 (반복 SOS를 놓치는 것보다 SMS가 한 번 더 가는 편이 안전).
+    """
+    from backend.dedup import message_dedup
+
+    if marker is None:
+        return False
+    return message_dedup.seen((bid, marker, event_type))
+
+
 def _process_stim_status(app, socketio, bid, payload):
     """신경자극기 상태 처리"""
     from backend.db import models as db_models
@@ -440,104 +903,87 @@ def _process_stim_status(app, socketio, bid, payload):
 
 def _process_stim_connected(app, socketio, bid, payload):
     """신경자극기 BLE 연결 처리"""
-    db = backend_module.db
-    from backend.db import models as db_models
-    Band = db_models.Band
-    
+    from backend.band_cache import band_cache
+    from backend.dashboard_summary import report_stimulator_connected
+
     with app.app_context():
-        band = Band.query.filter_by(bid=bid).first()
+        band = band_cache.get(bid)
         if not band:
             return
-            
-        band.stimulator_connected = True
-        band.stimulator_id = payload.get('stimulator_id')
-        
-        db.session.commit()
-        
+
+        report_stimulator_connected(bid, True)
+
+        # Band 모델에 stimulator 컬럼이 매핑되어 있지 않아 실시간 알림만 전송
         if socketio:
             socketio.emit('stimulator_connected', {
                 'bid': bid,
-                'stimulator_id': band.stimulator_id
+                'stimulator_id': payload.get('stimulator_id')
             })
 
 
 def _process_stim_disconnected(app, socketio, bid, payload):
     """신경자극기 BLE 연결 해제 처리"""
-    db = backend_module.db
-    from backend.db import models as db_models
-    Band = db_models.Band
-    
+    from backend.band_cache import band_cache
+    from backend.dashboard_summary import report_stimulator_connected
+
     with app.app_context():
-        band = Band.query.filter_by(bid=bid).first()
+        band = band_cache.get(bid)
         if not band:
             return
-            
-        band.stimulator_connected = False
-        
-        db.session.commit()
-        
+
+        report_stimulator_connected(bid, False)
+
+        # Band 모델에 stimulator 컬럼이 매핑되어 있지 않아 실시간 알림만 전송
         if socketio:
             socketio.emit('stimulator_disconnected', {
                 'bid': bid
             })
 
 
-def _check_vital_anomaly(app, socketio, band, payload):
-    """생체신호 이상치 감지"""
-    from backend.db import models as db_models
-    Event = db_models.Event
-    db = app.extensions['sqlalchemy']
-
+def is_alert_vitals(payload):
+    """경보 수준 생체신호 여부 (측정값 하나 기준, 이상 구간 감지의 기본 진입 기준과 동일)"""
     hr = payload.get('hr')
     spo2 = payload.get('spo2')
+    if hr and (hr > HR_HIGH_THRESHOLD or hr < HR_LOW_THRESHOLD):
+        return True
+    return bool(spo2 and spo2 < SPO2_LOW_THRESHOLD)
 
-    events = []
 
-    # 심박수 이상
-    if hr:
-        if hr > 120:
-            events.append({
-                'type': 8,  # hr_high
-                'value': hr,
-                'action_note': f'심박수가 높습니다 ({hr}bpm)'
-            })
-        elif hr < 50:
-            events.append({
-                'type': 9,  # hr_low
-                'value': hr,
-                'action_note': f'심박수가 낮습니다 ({hr}bpm)'
-            })
+# 이상 감지 규칙별 이벤트 메모
+VITAL_EVENT_NOTES = {
+    'hr_high': '심박수가 높습니다 ({value}bpm)',
+    'hr_low': '심박수가 낮습니다 ({value}bpm)',
+    'spo2_low': '산소포화도가 저하되었습니다 ({value}%)',
+}
 
-    # 산소포화도 이상
-    if spo2 and spo2 < 95:
-        events.append({
-            'type': 10,  # spo2_low
-            'value': spo2,
-            'action_note': f'산소포화도가 저하되었습니다 ({spo2}%)'
-        })
-        
-    # 이벤트 저장 및 알림
-    for event_data in events:
-        event = Event(
-            FK_bid=band.id,
-            datetime=datetime.utcnow(),
-            action_status=0,
-            **event_data
-        )
-        db.session.add(event)
-        db.session.commit()
 
-        if socketio:
-            event_dict = event.to_dict()
-            event_dict['bid'] = band.bid
-            event_dict['wearer_name'] = band.wearer_name
-            # 알림은 alerts, dashboard, 그리고 해당 밴드 룸에 전송
-            socketio.emit('alert_new', event_dict, room='alerts')
-            socketio.emit('alert_new', event_dict, room='dashboard')
-            socketio.emit('alert_new', event_dict, room=f'band_{band.bid}')
+def _raise_vital_event(app, socketio, band, onset):
+    """이상 구간 시작 이벤트 저장 및 알림 (구간당 한 번)"""
+    from backend.db import models as db_models
+    Event = db_models.Event
+    db = app.extensions['sqlalchemy']
 
-        if event.event_level >= 3:
-            _send_emergency_sms(app, band, event)
+    note = VITAL_EVENT_NOTES.get(onset.rule.name, '{value}')
+    event = Event(
+        FK_bid=band.id,
+        datetime=datetime.utcnow(),
+        type=onset.rule.type,
+        value=onset.value,
+        action_status=0,
+        action_note=note.format(value=onset.value)
+    )
+    db.session.add(event)
+    db.session.commit()
+
+    if socketio:
+        event_dict = event.to_dict()
+        event_dict['bid'] = band.bid
+        event_dict['wearer_name'] = band.wearer_name
+        # 알림은 alerts, dashboard, 그리고 해당 밴드 룸에 한 번에 전송
+        socketio.emit('alert_new', event_dict, to=alert_rooms(band.bid))
+
+    if event.event_level >= 3:
+        _send_emergency_sms(app, band, event)
 
 
 def _send_emergency_sms(app, band, event):
@@ -576,6 +1022,32 @@ def _send_emergency_sms(app, band, event):
 # 명령 발송 함수
 # ============================================================
 
+def publish(topic, payload, qos=1):
+    """
+    임의 토픽으로 메시지 발송 (신경자극 세션 명령 등)
+
+    Args:
+        topic: 토픽
+        payload: 딕셔너리 (JSON으로 변환) 또는 문자열
+        qos: QoS 레벨
+
+    Returns:
+        bool: 발송 요청 성공 여부 (연결되어 있지 않으면 False)
+    """
+    client = _mqtt_client
+    if not client:
+        return False
+
+    if not isinstance(payload, (str, bytes)):
+        payload = codec.dumps(payload)
+
+    try:
+        return client.publish(topic, payload, qos=qos).rc == mqtt.MQTT_ERR_SUCCESS
+    except Exception as e:
+        print(f"Failed to publish to {topic}: {e}")
+        return False
+
+
 def send_band_command(bid, command, params=None):
     """
     밴드에 명령 전송
@@ -598,7 +1070,7 @@ def send_band_command(bid, command, params=None):
     }
     
     try:
-        _mqtt_client.publish(topic, json.dumps(payload), qos=1)
+        _mqtt_client.publish(topic, codec.dumps(payload), qos=1)
         return True
     except Exception as e:
         print(f"Failed to send band command: {e}")
@@ -627,7 +1099,7 @@ def send_stim_command(bid, command, params=None):
     }
     
     try:
-        _mqtt_client.publish(topic, json.dumps(payload), qos=1)
+        _mqtt_client.publish(topic, codec.dumps(payload), qos=1)
         return True
     except Exception as e:
         print(f"Failed to send stim command: {e}")
@@ -662,7 +1134,9 @@ def _process_legacy_message(app, socketio, payload, is_sync=False):
     {"extAddress": {"low": 1855883348, "high": 108776}, "type": 6, "value": 1, "bandData": {...}}
     """
     from backend.db import models as db_models
-    Band = db_models.Band
+    from backend.band_cache import band_cache
+    from backend.band_presence import band_presence
+    from backend.band_state import band_state
     Event = db_models.Event
 
     with app.app_context():
@@ -684,7 +1158,7 @@ def _process_legacy_message(app, socketio, payload, is_sync=False):
                 app.logger.info(f"  bandData: hr={band_data.get('hr')}, spo2={band_data.get('spo2')}, battery={band_data.get('battery_level')}")
 
             # 밴드 찾기
-            band = Band.query.filter_by(bid=bid).first()
+            band = band_cache.get(bid)
             if not band:
                 app.logger.warning(f"Band not found: {bid}")
                 return
@@ -693,31 +1167,13 @@ def _process_legacy_message(app, socketio, payload, is_sync=False):
             value = payload.get('value')
 
             # MQTT 메시지를 받았으므로 밴드가 온라인 상태로 업데이트
-            app.logger.info(f"Setting connect_state=1 for band {bid} (before: {band.connect_state})")
-            band.connect_state = 1
-            band.connect_time = datetime.utcnow()
-            db.session.commit()
-            app.logger.info(f"Committed connect_state for band {bid}")
+            if band_state.update(band.id, connect_state=1, connect_time=datetime.utcnow()):
+                app.logger.info(f"Band {bid} back online")
+            band_presence.touch(band.id, bid)
 
             # bandData가 있으면 센서 데이터로 처리
             if 'bandData' in payload:
-                band_data = payload['bandData']
-                # 실제 DB 컬럼에 맞게 변환
-                new_payload = {
-                    'battery_level': band_data.get('battery_level'),
-                    'hr': band_data.get('hr'),
-                    'spo2': band_data.get('spo2'),
-                    'skin_temp': band_data.get('skin_temp'),
-                    'x': band_data.get('x'),
-                    'y': band_data.get('y'),
-                    'z': band_data.get('z'),
-                    'walk_steps': band_data.get('walk_steps'),
-                    'run_steps': band_data.get('run_steps'),
-                    'activity': band_data.get('activity'),
-                    'motionFlag': band_data.get('motionFlag'),
-                    'scdState': band_data.get('scdState')
-                }
-                _process_sensor_data(app, socketio, bid, new_payload)
+                process_reading(app, socketio, from_band_payload(bid, payload['bandData']))
 
             # type 기반 이벤트 처리
             event_type_names = {
@@ -732,6 +1188,14 @@ def _process_legacy_message(app, socketio, payload, is_sync=False):
                 event_type_name = event_type_names[msg_type]
                 event_level = 4 if msg_type in [6, 7] else 3  # SOS, 낙상은 레벨 4
 
+                # 재전송된 메시지면 이벤트 저장/알림/SMS 생략
+                marker = message_marker(payload)
+                if marker is None:
+                    marker = message_marker(payload.get('bandData'))
+                if _event_seen(bid, event_type_name, marker):
+                    app.logger.info(f"Duplicate legacy {event_type_name} event from band {bid} ignored")
+                    return
+
                 # 실제 DB 컬럼 사용
                 event = Event(
                     FK_bid=band.id,
@@ -749,10 +1213,8 @@ def _process_legacy_message(app, socketio, payload, is_sync=False):
                     event_dict = event.to_dict()
                     event_dict['bid'] = bid
                     event_dict['wearer_name'] = band.wearer_name
-                    # 알림은 alerts, dashboard, 그리고 해당 밴드 룸에 전송
-                    socketio.emit('alert_new', event_dict, room='alerts')
-                    socketio.emit('alert_new', event_dict, room='dashboard')
-                    socketio.emit('alert_new', event_dict, room=f'band_{bid}')
+                    # 알림은 alerts, dashboard, 그리고 해당 밴드 룸에 한 번에 전송
+                    socketio.emit('alert_new', event_dict, to=alert_rooms(bid))
                     app.logger.info(f"Alert sent via Socket.IO: {event_type_name}")
 
                 # 긴급 SMS 발송
@@ -774,3 +1236,22 @@ def disconnect_mqtt():
             _mqtt_client.loop_stop()
             _mqtt_client.disconnect()
             _mqtt_client = None
+
+    # 대기 중인 메시지 처리 후 워커 종료
+    if mqtt_handler.dispatcher is not None:
+        mqtt_handler.dispatcher.stop()
+
+    # 큐에 남은 센서 데이터 저장
+    from backend.ingest import sensor_ingest
+    sensor_ingest.stop()
+
+    # 메모리에 남은 밴드 상태 저장
+    from backend.band_state import band_state
+    band_state.stop()
+
+    # 보관 중인 실시간 메시지 전송
+    from backend.emit_throttle import emit_throttle
+    emit_throttle.stop()
+
+    from backend.dashboard_frame import dashboard_frames
+    dashboard_frames.stop()
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 메시지 분배 모듈
+paho 네트워크 스레드에서 핸들러 실행을 분리하여 워커 풀에서 처리
+"""
+
+import queue
+import threading
+import zlib
+
+
+# 큐가 가득 찼을 때의 처리 정책
+OVERFLOW_BLOCK = 'block'              # 자리가 날 때까지 대기 (수신 스레드에 배압 전달)
+OVERFLOW_DROP_NEW = 'drop_new'        # 새 메시지 버림
+OVERFLOW_DROP_OLDEST = 'drop_oldest'  # 가장 오래된 메시지를 버리고 새 메시지 적재
+
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_NEW, OVERFLOW_DROP_OLDEST)
+
+# 워커 종료 신호
+_STOP = object()
+
+
+def shard_for(key, count):
+    """
+    키를 0 ~ count-1 범위의 워커 번호로 변환 (프로세스 간에도 동일한 결과)
+
+    Args:
+        key: 분배 키 (밴드 ID 등)
+        count: 워커 수
+
+    Returns:
+        int: 워커 번호
+    """
+    if count <= 1:
+        return 0
+    return zlib.crc32(str(key).encode('utf-8')) % count
+
+
+class KeyedDispatcher:
+    """
+    키 해시 기반 워커 풀
+
+    같은 키(bid)의 메시지는 항상 같은 워커 큐로 들어가므로 밴드별 처리 순서가 유지되고,
+    느린 핸들러(DB 커밋, SMS 발송)는 해당 워커만 지연시킨다.
+    """
+
+    def __init__(self, app=None, workers=8, queue_size=1000,
+                 overflow=OVERFLOW_BLOCK, mode='thread', block_timeout=None):
+        """
+        Args:
+            app: Flask 애플리케이션
+            workers: 워커 수
+            queue_size: 워커별 큐 최대 길이
+            overflow: 큐가 가득 찼을 때 정책 ('block', 'drop_new', 'drop_oldest')
+            mode: 'thread' 또는 'gevent'
+            block_timeout: 'block' 정책에서 최대 대기 시간 (초, None이면 무제한)
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow}")
+
+        self.app = app
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.mode = mode
+        self.block_timeout = block_timeout
+
+        self.running = False
+        self._queues = []
+        self._runners = []
+        self._stats_lock = threading.Lock()
+        self._processed = [0] * self.workers
+        self._dropped = [0] * self.workers
+        self._errors = 0
+
+    def start(self):
+        """워커 시작"""
+        if self.running:
+            return
+
+        queue_cls, spawn = self._backend()
+        self._queues = [queue_cls(maxsize=self.queue_size) for _ in range(self.workers)]
+        self._processed = [0] * self.workers
+        self._dropped = [0] * self.workers
+        self.running = True
+        self._runners = [spawn(self._worker, index) for index in range(self.workers)]
+
+        if self.app:
+            self.app.logger.info(
+                f"MQTT dispatcher started ({self.mode}, workers={self.workers}, "
+                f"queue={self.queue_size}, overflow={self.overflow})"
+            )
+
+    def _backend(self):
+        """실행 모드별 큐 클래스와 워커 생성 함수"""
+        if self.mode == 'gevent':
+            try:
+                import gevent
+                import gevent.queue
+            except ImportError:
+                if self.app:
+                    self.app.logger.warning("gevent not available, falling back to thread dispatcher")
+                self.mode = 'thread'
+            else:
+                return gevent.queue.Queue, lambda target, index: gevent.spawn(target, index)
+
+        def spawn_thread(target, index):
+            thread = threading.Thread(target=target, args=(index,),
+                                      name=f'mqtt-dispatch-{index}', daemon=True)
+            thread.start()
+            return thread
+
+        return queue.Queue, spawn_thread
+
+    def stop(self, timeout=5):
+        """워커 중지 (큐에 남은 메시지는 처리 후 종료)"""
+        if not self.running:
+            return
+
+        self.running = False
+        for q in self._queues:
+            q.put(_STOP)
+        for runner in self._runners:
+            runner.join(timeout=timeout)
+        self._runners = []
+
+    def submit(self, key, func, *args):
+        """
+        작업 제출
+
+        Args:
+            key: 분배 키 (같은 키는 같은 워커에서 순서대로 처리)
+            func: 실행할 함수
+            *args: 함수 인자
+
+        Returns:
+            bool: 적재 여부 (overflow 정책으로 버려지면 False)
+        """
+        index = shard_for(key, self.workers)
+        q = self._queues[index]
+        item = (func, args)
+
+        if self.overflow == OVERFLOW_BLOCK:
+            try:
+                q.put(item, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                self._count_drop(index)
+                return False
+
+        try:
+            q.put_nowait(item)
+            return True
+        except queue.Full:
+            if self.overflow == OVERFLOW_DROP_NEW:
+                self._count_drop(index)
+                return False
+
+        # drop_oldest: 가장 오래된 항목을 하나 버리고 다시 시도
+        try:
+            q.get_nowait()
+            self._count_drop(index)
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+            return True
+        except queue.Full:
+            self._count_drop(index)
+            return False
+
+    def _count_drop(self, index):
+        with self._stats_lock:
+            self._dropped[index] += 1
+
+    def _worker(self, index):
+        """워커 루프"""
+        q = self._queues[index]
+        while True:
+            item = q.get()
+            if item is _STOP:
+                break
+
+            func, args = item
+            try:
+                func(*args)
+            except Exception as e:
+                with self._stats_lock:
+                    self._errors += 1
+                if self.app:
+                    self.app.logger.error(f"MQTT dispatch worker {index} error: {e}")
+
+            with self._stats_lock:
+                self._processed[index] += 1
+
+    def get_stats(self):
+        """워커별 큐 길이 및 처리 통계"""
+        with self._stats_lock:
+            return {
+                'mode': self.mode,
+                'running': self.running,
+                'overflow': self.overflow,
+                'errors': self._errors,
+                'workers': [
+                    {
+                        'index': i,
+                        'queue_depth': self._queues[i].qsize() if self._queues else 0,
+                        'processed': self._processed[i],
+                        'dropped': self._dropped[i]
+                    }
+                    for i in range(self.workers)
+                ]
+            }
+
+
+def create_dispatcher(app):
+    """
+    설정에 따라 분배기 생성 (MQTT_DISPATCH_MODE가 'inline'이면 None)
+
+    Args:
+        app: Flask 애플리케이션
+
+    Returns:
+        KeyedDispatcher: 분배기 또는 None
+    """
+    mode = app.config.get('MQTT_DISPATCH_MODE', 'thread')
+    if mode == 'inline':
+        return None
+
+    return KeyedDispatcher(
+        app,
+        workers=app.config.get('MQTT_DISPATCH_WORKERS', 8),
+        queue_size=app.config.get('MQTT_DISPATCH_QUEUE_SIZE', 1000),
+        overflow=app.config.get('MQTT_DISPATCH_OVERFLOW', OVERFLOW_BLOCK),
+        mode=mode,
+        block_timeout=app.config.get('MQTT_DISPATCH_BLOCK_TIMEOUT')
+    )
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 토픽 라우터 모듈
+토픽 필터를 트라이로 미리 구성하여 메시지마다 패턴 전체를 훑지 않고 매칭
+"""
+
+import itertools
+import re
+
+
+# {bid}처럼 이름이 붙은 단일 레벨 와일드카드
+_NAMED_SEGMENT = re.compile(r'^\{(\w+)\}$')
+
+
+def to_subscription(pattern):
+    """
+    라우터 패턴을 MQTT 구독 필터로 변환
+
+    예: "wellsafer/band/{bid}/sensor" → "wellsafer/band/+/sensor"
+    """
+    return '/'.join(
+        '+' if _NAMED_SEGMENT.match(part) else part
+        for part in pattern.split('/')
+    )
+
+
+def match_topic_linear(pattern, topic):
+    """
+    패턴 하나와 토픽을 직접 비교 (트라이 도입 전 매칭 방식, 벤치마크 비교용)
+    """
+    pattern_parts = pattern.split('/')
+    topic_parts = topic.split('/')
+
+    if len(pattern_parts) != len(topic_parts):
+        if '#' not in pattern_parts:
+            return False
+
+    for i, part in enumerate(pattern_parts):
+        if part == '#':
+            return True
+        if part == '+':
+            continue
+        if i >= len(topic_parts) or part != topic_parts[i]:
+            return False
+
+    return True
+
+
+class _Node:
+    __slots__ = ('children', 'plus', 'hash_routes', 'routes')
+
+    def __init__(self):
+        self.children = {}
+        self.plus = None
+        self.hash_routes = []
+        self.routes = []
+
+
+class _Route:
+    __slots__ = ('pattern', 'handler', 'captures', 'order')
+
+    def __init__(self, pattern, handler, captures, order):
+        self.pattern = pattern
+        self.handler = handler
+        self.captures = captures
+        self.order = order
+
+
+class TopicTrie:
+    """
+    MQTT 토픽 트라이
+
+    '+'(단일 레벨)와 '#'(다중 레벨, 마지막에만) 와일드카드를 지원하며,
+    "{bid}"처럼 이름을 붙인 단일 레벨 와일드카드는 매칭 시 값을 추출한다.
+    같은 패턴을 다시 등록하면 기존 핸들러를 대체한다.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._routes = {}
+        self._counter = itertools.count()
+
+    def add(self, pattern, handler):
+        """
+        패턴에 핸들러 등록
+
+        Args:
+            pattern: 토픽 패턴 (예: "wellsafer/band/{bid}/sensor", "wellsafer/band/+/#")
+            handler: 핸들러 함수
+        """
+        parts = pattern.split('/')
+        captures = []
+        node = self._root
+
+        for level, part in enumerate(parts):
+            if part == '#':
+                if level != len(parts) - 1:
+                    raise ValueError(f"'#' must be the last level: {pattern}")
+                break
+
+            named = _NAMED_SEGMENT.match(part)
+            if named or part == '+':
+                if named:
+                    captures.append((level, named.group(1)))
+                if node.plus is None:
+                    node.plus = _Node()
+                node = node.plus
+            else:
+                node = node.children.setdefault(part, _Node())
+
+        existing = self._routes.get(pattern)
+        order = existing.order if existing else next(self._counter)
+        route = _Route(pattern, handler, tuple(captures), order)
+
+        bucket = node.hash_routes if parts[-1] == '#' else node.routes
+        if existing:
+            bucket[:] = [r for r in bucket if r.pattern != pattern]
+        bucket.append(route)
+        self._routes[pattern] = route
+
+    def patterns(self):
+        """등록된 패턴 목록 (등록 순서)"""
+        return [r.pattern for r in sorted(self._routes.values(), key=lambda r: r.order)]
+
+    def match(self, topic):
+        """
+        토픽에 매칭되는 핸들러 검색
+
+        Args:
+            topic: 수신 토픽
+
+        Returns:
+            list: (handler, params) 튜플 목록 (등록 순서), params는 {이름: 세그먼트 값}
+        """
+        parts = topic.split('/')
+        depth = len(parts)
+        found = []
+
+        # '$'로 시작하는 토픽은 첫 레벨 와일드카드에 매칭하지 않음 (MQTT 규격)
+        system_topic = topic.startswith('$')
+
+        stack = [(self._root, 0)]
+        while stack:
+            node, level = stack.pop()
+
+            if node.hash_routes and not (system_topic and level == 0):
+                found.extend(node.hash_routes)
+
+            if level == depth:
+                found.extend(node.routes)
+                continue
+
+            child = node.children.get(parts[level])
+            if child is not None:
+                stack.append((child, level + 1))
+            if node.plus is not None and not (system_topic and level == 0):
+                stack.append((node.plus, level + 1))
+
+        if len(found) > 1:
+            found.sort(key=lambda r: r.order)
+
+        return [
+            (route.handler, {name: parts[level] for level, name in route.captures})
+            for route in found
+        ]
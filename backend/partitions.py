@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+sensordata 시간 파티션 관리 모듈
+MySQL RANGE COLUMNS(datetime) 파티션을 일(day) 또는 월(month) 단위로 미리 만들고,
+보관 기간이 지난 파티션은 행 DELETE 대신 DROP PARTITION으로 한 번에 지운다.
+
+- 기간 조회(get_sensordata_range 등)는 datetime 조건으로 해당 파티션만 읽으므로 쿼리 변경 없음
+- 마지막 파티션 pmax(MAXVALUE)는 항상 비어 있도록 미리 만들어 두므로 REORGANIZE가 행을 복사하지 않음
+- 파티션이 적용되지 않은 DB(개발용 SQLite 등)에서는 아무것도 하지 않음 (정리는 retention.py 구간 삭제)
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, select, text
+
+
+UNITS = ('day', 'month')
+MAXVALUE = 'pmax'
+
+
+def period_start(dt, unit):
+    """dt가 속한 기간의 시작 시각"""
+    if unit == 'month':
+        return datetime(dt.year, dt.month, 1)
+    return datetime(dt.year, dt.month, dt.day)
+
+
+def next_period(start, unit):
+    """다음 기간의 시작 시각"""
+    if unit == 'month':
+        return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def partition_name(start, unit):
+    """기간 시작 시각 → 파티션 이름 (p20250101 / p202501)"""
+    return start.strftime('p%Y%m' if unit == 'month' else 'p%Y%m%d')
+
+
+def plan_partitions(existing, now, unit='day', premake=7, retention_days=None):
+    """
+    파티션 추가/삭제 계획
+
+    Args:
+        existing: (이름, 상한 datetime 또는 MAXVALUE면 None) 목록 (파티션 순서)
+        now: 현재 시각
+        unit: 'day' 또는 'month'
+        premake: 현재 기간 이후 미리 만들어 둘 기간 수
+        retention_days: 보관 기간 (None이면 삭제 계획 없음)
+
+    Returns:
+        tuple: (추가할 (이름, 상한) 목록, 삭제할 (이름, 하한, 상한) 목록)
+    """
+    if unit not in UNITS:
+        raise ValueError(f"unknown partition unit: '{unit}'")
+
+    bounds = [bound for _, bound in existing if bound is not None]
+    current = period_start(now, unit)
+    target = current
+    for _ in range(premake + 1):
+        target = next_period(target, unit)
+
+    add = []
+    if not bounds:
+        # 파티션이 pmax뿐이면 현재 기간 이전 행을 모두 담는 파티션부터
+        add.append(('p_history', current))
+        upper = current
+    else:
+        upper = max(bounds)
+        if upper < current:
+            # 유지 작업이 오래 멈췄던 경우: 지난 기간은 파티션 하나로 (이미 pmax에 쌓인 행)
+            add.append((partition_name(period_start(upper, unit), unit), current))
+            upper = current
+    while upper < target:
+        # 단위를 바꾼 경우 (예: 일 → 월) 경계가 기간 중간이면 다음 기간 경계까지 먼저 채움
+        start = period_start(upper, unit)
+        upper = next_period(start, unit)
+        add.append((partition_name(start, unit), upper))
+
+    drop = []
+    if retention_days is not None:
+        cutoff = now - timedelta(days=retention_days)
+        lower = None
+        for name, bound in existing:
+            if bound is not None and bound <= cutoff:
+                drop.append((name, lower, bound))
+            lower = bound
+    return add, drop
+
+
+def _literal(bound):
+    return f"'{bound:%Y-%m-%d %H:%M:%S}'"
+
+
+def add_partitions_ddl(table, add, has_maxvalue):
+    """파티션 추가 DDL (pmax가 있으면 비어 있는 pmax를 나눔)"""
+    parts = [f"PARTITION {name} VALUES LESS THAN ({_literal(bound)})" for name, bound in add]
+    if has_maxvalue:
+        parts.append(f"PARTITION {MAXVALUE} VALUES LESS THAN (MAXVALUE)")
+        return f"ALTER TABLE {table} REORGANIZE PARTITION {MAXVALUE} INTO ({', '.join(parts)})"
+    return f"ALTER TABLE {table} ADD PARTITION ({', '.join(parts)})"
+
+
+def drop_partitions_ddl(table, names):
+    return f"ALTER TABLE {table} DROP PARTITION {', '.join(names)}"
+
+
+def _parse_bound(description):
+    """information_schema PARTITION_DESCRIPTION → datetime (MAXVALUE면 None)"""
+    if description is None or description.upper() == 'MAXVALUE':
+        return None
+    return datetime.fromisoformat(description.strip("'"))
+
+
+class PartitionManager:
+    """
+    sensordata 파티션 유지 관리
+
+    maintain()은 앞으로 premake 기간만큼 파티션을 미리 만들고,
+    drop_expired()는 상한이 보관 기준 시각 이전인 파티션을 (보관 파일로 내보낸 뒤) 삭제한다.
+    """
+
+    def __init__(self, engine, table, unit='day', premake=7, retention_days=90,
+                 archive=None, chunk_size=5000, logger=None):
+        """
+        Args:
+            engine: SQLAlchemy 엔진
+            table: 파티션 테이블 (SQLAlchemy Table, datetime 컬럼 필요)
+            unit: 파티션 기간 단위 ('day' 또는 'month')
+            premake: 미리 만들어 둘 기간 수
+            retention_days: 보관 기간 (일)
+            archive: 삭제 전 행을 내보낼 retention.ArchiveWriter (None이면 내보내지 않음)
+            chunk_size: 내보낼 때 한 번에 읽을 행 수
+            logger: 진행 로그
+        """
+        if unit not in UNITS:
+            raise ValueError(f"unknown partition unit: '{unit}'")
+
+        self.engine = engine
+        self.table = table
+        self.unit = unit
+        self.premake = premake
+        self.retention_days = retention_days
+        self.archive = archive
+        self.chunk_size = chunk_size
+        self.logger = logger
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def partitions(self):
+        """현재 파티션 (이름, 상한) 목록 (파티션 미적용 또는 MySQL이 아니면 빈 목록)"""
+        if self.engine.dialect.name != 'mysql':
+            return []
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION"
+            ), {'table': self.table.name}).all()
+        return [(name, _parse_bound(description)) for name, description in rows]
+
+    def is_partitioned(self):
+        return bool(self.partitions())
+
+    def _execute(self, ddl):
+        with self.engine.begin() as conn:
+            conn.execute(text(ddl))
+
+    def maintain(self, now=None):
+        """
+        앞으로 쓸 파티션 미리 생성
+
+        Returns:
+            list: 추가한 파티션 이름 (파티션 미적용이면 None)
+        """
+        existing = self.partitions()
+        if not existing:
+            return None
+
+        add, _ = plan_partitions(existing, now or datetime.utcnow(), self.unit, self.premake)
+        if add:
+            has_maxvalue = any(bound is None for _, bound in existing)
+            self._execute(add_partitions_ddl(self.table.name, add, has_maxvalue))
+            self._log(f"Partitions added to {self.table.name}: {[name for name, _ in add]}")
+        return [name for name, _ in add]
+
+    def drop_expired(self, now=None):
+        """
+        보관 기간이 지난 파티션 삭제
+
+        Returns:
+            dict: 삭제한 파티션, 내보낸 행 수 (파티션 미적용이면 None)
+        """
+        existing = self.partitions()
+        if not existing:
+            return None
+
+        _, drop = plan_partitions(existing, now or datetime.utcnow(), self.unit, 0, self.retention_days)
+        # 마지막 기간 파티션은 남김 (pmax만 남으면 새 파티션을 다시 나눠야 함)
+        if drop and len(drop) == sum(1 for _, bound in existing if bound is not None):
+            drop = drop[:-1]
+
+        archived = 0
+        for name, lower, upper in drop:
+            if self.archive is not None:
+                archived += self._archive_partition(lower, upper)
+            # 파티션마다 내보낸 직후 삭제 (중단되어도 내보낸 파티션만 삭제됨)
+            self._execute(drop_partitions_ddl(self.table.name, [name]))
+            self._log(f"Partition {self.table.name}.{name} dropped (< {upper})")
+
+        return {'dropped': [name for name, _, _ in drop], 'archived': archived}
+
+    def _archive_partition(self, lower, upper):
+        """파티션 범위의 행을 id 순서로 나눠 읽어 파일 하나로 내보냄"""
+        table = self.table
+        conditions = [table.c.datetime < upper]
+        if lower is not None:
+            conditions.append(table.c.datetime >= lower)
+
+        after, written, opened = 0, 0, False
+        try:
+            while True:
+                with self.engine.connect() as conn:
+                    rows = conn.execute(
+                        select(*table.columns).where(and_(table.c.id > after, *conditions))
+                        .order_by(table.c.id).limit(self.chunk_size)
+                    ).all()
+                if not rows:
+                    break
+                if not opened:
+                    self.archive.open(rows[0].id, period_start(upper - timedelta(seconds=1), self.unit))
+                    opened = True
+                self.archive.write(rows)
+                written += len(rows)
+                after = rows[-1].id
+            if opened:
+                path = self.archive.close()
+                self._log(f"Partition archive: {written} rows → {path}")
+        except Exception:
+            self.archive.abort()
+            raise
+        return written
+
+
+def create_sensor_partitions(app):
+    """설정값으로 sensordata 파티션 관리자 생성"""
+    from backend.db import models as db_models
+    from backend.retention import ArchiveWriter
+
+    config = app.config
+    table = db_models.SensorData.__table__
+    with app.app_context():
+        engine = app.extensions['sqlalchemy'].engine
+
+    archive = None
+    if config.get('RETENTION_ARCHIVE_DIR'):
+        archive = ArchiveWriter(config['RETENTION_ARCHIVE_DIR'], table,
+                                config.get('RETENTION_ARCHIVE_FORMAT', 'csv.gz'))
+
+    return PartitionManager(
+        engine, table,
+        unit=config.get('SENSORDATA_PARTITION_UNIT', 'day'),
+        premake=config.get('SENSORDATA_PARTITION_PREMAKE', 7),
+        retention_days=config.get('RETENTION_DAYS', 90),
+        archive=archive,
+        chunk_size=config.get('RETENTION_CHUNK_SIZE', 5000),
+        logger=app.logger,
+    )
@@ -0,0 +1,493 @@
+# -*- coding: utf-8 -*-
+"""
+데이터 보관 기간 정리 모듈
+보관 기간이 지난 sensordata 행을 한 번의 DELETE가 아니라 기본 키 순서의 작은 구간(chunk)으로 나눠 삭제한다.
+
+- 구간마다 짧은 트랜잭션으로 커밋하므로 잠금 시간과 undo 로그가 구간 크기로 제한됨
+- 구간 사이에 DELETE 소요 시간에 비례해 쉬고, 복제 지연이 기준을 넘으면 줄어들 때까지 대기
+  (max_lag_wait 안에 줄지 않으면 이번 실행을 멈추고 다음 실행에서 이어감)
+- 진행 위치(마지막 삭제 id)를 retention_checkpoint 행에 기록하여 중단 후 같은 기준 시각으로 이어서 실행
+- 보관 디렉토리를 지정하면 삭제 전에 행을 압축 파일(CSV.gz, pyarrow가 있으면 Parquet)로 내보냄
+"""
+
+import csv
+import gzip
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    BigInteger, Boolean, Column, DateTime, Float, Integer, MetaData, Numeric, String, Table,
+    and_, delete, func, insert, select, text, update
+)
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:     # 선택 의존성 (없으면 CSV.gz만 지원)
+    pyarrow = None
+
+
+# retention_checkpoint 테이블 (db/migrations/add_retention_checkpoint.sql)
+checkpoint_table = Table(
+    'retention_checkpoint', MetaData(),
+    Column('name', String(64), primary_key=True),
+    Column('cutoff', DateTime, nullable=False),
+    Column('last_id', BigInteger, nullable=False, default=0),
+    Column('archived_through', BigInteger, nullable=False, default=0),
+    Column('deleted', BigInteger, nullable=False, default=0),
+    Column('archived', BigInteger, nullable=False, default=0),
+    Column('started_at', DateTime),
+    Column('updated_at', DateTime),
+    Column('finished_at', DateTime),
+)
+
+
+class Checkpoint:
+    """진행 위치 (retention_checkpoint 행 하나)"""
+
+    def __init__(self, engine, name):
+        self.engine = engine
+        self.name = name
+
+    def create_table(self):
+        checkpoint_table.create(self.engine, checkfirst=True)
+
+    def load(self):
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(checkpoint_table).where(checkpoint_table.c.name == self.name)
+            ).mappings().first()
+        return dict(row) if row else None
+
+    def start(self, cutoff):
+        """새 실행 시작 (이전 진행 위치 초기화)"""
+        now = datetime.utcnow()
+        values = dict(cutoff=cutoff, last_id=0, archived_through=0, deleted=0, archived=0,
+                      started_at=now, updated_at=now, finished_at=None)
+        with self.engine.begin() as conn:
+            if not conn.execute(
+                update(checkpoint_table).where(checkpoint_table.c.name == self.name).values(**values)
+            ).rowcount:
+                conn.execute(insert(checkpoint_table).values(name=self.name, **values))
+        return self.load()
+
+    def save(self, **values):
+        values['updated_at'] = datetime.utcnow()
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(checkpoint_table).where(checkpoint_table.c.name == self.name).values(**values)
+            )
+
+
+def _arrow_type(column):
+    kind = column.type
+    if isinstance(kind, DateTime):
+        return pyarrow.timestamp('us')
+    if isinstance(kind, Boolean):
+        return pyarrow.bool_()
+    if isinstance(kind, (Integer, BigInteger)):
+        return pyarrow.int64()
+    if isinstance(kind, (Float, Numeric)):
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+class ArchiveWriter:
+    """
+    삭제할 행을 압축 파일로 내보냄
+
+    파일은 임시 이름으로 쓴 뒤 fsync 후 이름을 바꾸며, 파일 이름이 첫 행 id로 정해지므로
+    중단 후 같은 구간을 다시 내보내면 같은 파일을 덮어쓴다.
+    """
+
+    def __init__(self, directory, table, fmt='csv.gz'):
+        if fmt == 'parquet' and pyarrow is None:
+            raise ValueError("parquet archive requires pyarrow")
+        if fmt not in ('csv.gz', 'parquet'):
+            raise ValueError(f"unknown archive format: '{fmt}'")
+
+        self.directory = directory
+        self.table = table
+        self.format = fmt
+        self.columns = [column.name for column in table.columns]
+        self._path = None
+        self._tmp = None
+        self._file = None
+        self._writer = None
+
+    def open(self, first_id, cutoff):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{self.table.name}_{cutoff:%Y%m%d}_{first_id:012d}.{self.format}"
+        self._path = os.path.join(self.directory, name)
+        self._tmp = self._path + '.tmp'
+
+        if self.format == 'parquet':
+            schema = pyarrow.schema([(column.name, _arrow_type(column)) for column in self.table.columns])
+            self._writer = pyarrow.parquet.ParquetWriter(self._tmp, schema, compression='zstd')
+        else:
+            self._file = gzip.open(self._tmp, 'wt', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns)
+
+    def write(self, rows):
+        """rows: 테이블 컬럼 순서의 행 목록"""
+        if self.format == 'parquet':
+            self._writer.write_table(pyarrow.Table.from_pylist(
+                [dict(zip(self.columns, row)) for row in rows], schema=self._writer.schema))
+        else:
+            self._writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                for row in rows
+            )
+
+    def close(self):
+        """파일 확정 (fsync 후 이름 변경)"""
+        if self.format == 'parquet':
+            self._writer.close()
+        else:
+            self._file.close()
+        with open(self._tmp, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(self._tmp, self._path)
+        path, self._path, self._tmp, self._file, self._writer = self._path, None, None, None, None
+        return path
+
+    def abort(self):
+        try:
+            if self._file is not None:
+                self._file.close()
+            elif self._writer is not None and self.format == 'parquet':
+                self._writer.close()
+        finally:
+            if self._tmp and os.path.exists(self._tmp):
+                os.remove(self._tmp)
+            self._path = self._tmp = self._file = self._writer = None
+
+
+def mysql_replica_lag(engine):
+    """
+    복제 지연 (초, 복제본 엔진에서 실행)
+
+    Returns:
+        float: Seconds_Behind_Source, 복제가 아니거나 알 수 없으면 None
+    """
+    with engine.connect() as conn:
+        for statement in ('SHOW REPLICA STATUS', 'SHOW SLAVE STATUS'):
+            try:
+                row = conn.execute(text(statement)).mappings().first()
+            except Exception:
+                continue
+            if not row:
+                return None
+            lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+            return float(lag) if lag is not None else None
+    return None
+
+
+class RetentionPurge:
+    """
+    보관 기간 정리
+
+    run()은 체크포인트가 끝나지 않았으면 저장된 기준 시각(cutoff)과 id부터 이어서,
+    끝났으면 새 기준 시각으로 처음부터 실행한다.
+    보관 파일을 쓰는 경우 archive_rows개씩 파일을 확정(archived_through 기록)한 다음
+    그 범위 안에서만 삭제하므로, 삭제된 행은 항상 확정된 파일에 들어 있다.
+
+    실행마다 기준 시각 이전 행의 최대 id를 먼저 구해 그 id까지만 훑는다.
+    상한이 없으면 마지막 확인 쿼리(남은 대상 없음)가 기본 키 끝까지 전체 테이블을 읽는다.
+    """
+
+    def __init__(self, engine, table, time_column='datetime', group_column=None,
+                 retention_days=90, chunk_size=5000,
+                 sleep_ratio=1.0, max_sleep=5.0, max_lag=5.0, max_lag_wait=300.0, lag_probe=None,
+                 upper_window=timedelta(days=1),
+                 archive_dir=None, archive_format='csv.gz', archive_rows=200000,
+                 name=None, logger=None, sleep=time.sleep, clock=time.monotonic):
+        """
+        Args:
+            engine: SQLAlchemy 엔진 (쓰기)
+            table: 정리할 테이블 (정수 기본 키 id 필요)
+            time_column: 보관 기간 판단 컬럼
+            group_column: (group_column, time_column) 인덱스의 앞 컬럼 (있으면 그룹별로 최대 id를 구함)
+            retention_days: 보관 기간 (일)
+            chunk_size: 한 번에 삭제할 최대 행 수
+            sleep_ratio: 구간 사이 휴식 시간 = DELETE 소요 시간 × sleep_ratio
+            max_sleep: 구간 사이 최대 휴식 시간 (초)
+            max_lag: 복제 지연이 이 값(초)을 넘으면 줄어들 때까지 대기
+            max_lag_wait: 복제 지연 최대 대기 시간 (초, 넘으면 이번 실행 중단)
+            lag_probe: 복제 지연(초)을 반환하는 함수 (None이면 확인 안 함)
+            upper_window: 최대 id를 구할 때 읽는 기준 시각 직전 기간
+            archive_dir: 보관 파일 디렉토리 (None이면 내보내지 않음)
+            archive_format: 'csv.gz' 또는 'parquet'
+            archive_rows: 보관 파일 하나의 최대 행 수
+            name: 체크포인트 이름 (기본: 테이블 이름)
+            logger: 진행 로그
+            sleep, clock: 테스트용
+        """
+        self.engine = engine
+        self.table = table
+        self.time_column = table.c[time_column]
+        self.group_column = table.c[group_column] if group_column else None
+        self.retention_days = retention_days
+        self.chunk_size = chunk_size
+        self.sleep_ratio = sleep_ratio
+        self.max_sleep = max_sleep
+        self.max_lag = max_lag
+        self.max_lag_wait = max_lag_wait
+        self.lag_probe = lag_probe
+        self.upper_window = upper_window
+        self.archive = ArchiveWriter(archive_dir, table, archive_format) if archive_dir else None
+        self.archive_rows = archive_rows
+        self.checkpoint = Checkpoint(engine, name or table.name)
+        self.logger = logger
+        self._sleep = sleep
+        self._clock = clock
+        self.stopping = False
+        self._upper_id = None
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def _resume_or_start(self, now):
+        state = self.checkpoint.load()
+        if state and state['finished_at'] is None:
+            self._log(f"Retention purge resumes {self.table.name} from id {state['last_id']} "
+                      f"(cutoff {state['cutoff']})")
+            return state
+        return self.checkpoint.start(now - timedelta(days=self.retention_days))
+
+    def _max_expired_id(self, cutoff):
+        """
+        기준 시각 이전 행의 최대 id (없으면 None)
+
+        id는 수신 순서로 증가하므로 기준 시각 직전 upper_window 기간의 행만 읽어 최대 id를 구한다.
+        group_column이 있으면 그룹 값을 참조 테이블(예: bands.id)에서 가져와
+        (group_column, time_column) 인덱스의 그룹별 구간만 읽는 쿼리 하나로 처리한다.
+        그 기간에 행이 없을 때(첫 실행, 수집 중단 기간)만 기준 시각 이전 전체에서 구한다.
+        늦게 올라와 upper_window보다 오래된 시각으로 저장된 행은 다음 실행에서 정리된다.
+        """
+        id_column = self.table.c.id
+        conditions = [self.time_column < cutoff]
+        if self.group_column is not None:
+            conditions.append(self.group_column.in_(self._group_values()))
+
+        with self.engine.connect() as conn:
+            upper = conn.execute(
+                select(func.max(id_column)).where(self.time_column >= cutoff - self.upper_window, *conditions)
+            ).scalar()
+            if upper is None:
+                upper = conn.execute(select(func.max(id_column)).where(*conditions)).scalar()
+            return upper
+
+    def _group_values(self):
+        """그룹 값 (외래 키면 참조 테이블에서, 아니면 정리 대상 테이블에서)"""
+        for foreign_key in self.group_column.foreign_keys:
+            return select(foreign_key.column)
+        return select(self.group_column).distinct()
+
+    def _candidates(self, after_id, cutoff, limit, through=None, columns=None):
+        """after_id 다음부터 기준 시각 이전 행 (id 순, 최대 id까지)"""
+        id_column = self.table.c.id
+        conditions = [id_column > after_id, self.time_column < cutoff]
+        if self._upper_id is not None:
+            conditions.append(id_column <= self._upper_id)
+        if through is not None:
+            conditions.append(id_column <= through)
+        query = select(*(columns or [id_column])).where(and_(*conditions)).order_by(id_column).limit(limit)
+        with self.engine.connect() as conn:
+            return conn.execute(query).all()
+
+    def _archive_next(self, state):
+        """last_id 다음부터 archive_rows개까지 파일로 확정하고 archived_through 반환"""
+        cutoff, after = state['cutoff'], state['last_id']
+        written = 0
+        first = None
+        try:
+            while written < self.archive_rows and not self.stopping:
+                rows = self._candidates(after, cutoff, min(self.chunk_size, self.archive_rows - written),
+                                        columns=list(self.table.columns))
+                if not rows:
+                    break
+                if first is None:
+                    first = rows[0].id
+                    self.archive.open(first, cutoff)
+                self.archive.write(rows)
+                written += len(rows)
+                after = rows[-1].id
+            if first is None:
+                return None
+            path = self.archive.close()
+        except Exception:
+            self.archive.abort()
+            raise
+
+        archived = state['archived'] + written
+        self.checkpoint.save(archived_through=after, archived=archived)
+        state.update(archived_through=after, archived=archived)
+        self._log(f"Retention archive: {written} rows → {path}")
+        return after
+
+    def _delete_chunk(self, state, through):
+        """
+        다음 구간 삭제
+
+        Returns:
+            int: 이번 구간의 대상 행 수 (남은 행이 없으면 0)
+        """
+        ids = self._candidates(state['last_id'], state['cutoff'], self.chunk_size, through)
+        if not ids:
+            return 0
+
+        first, last = ids[0].id, ids[-1].id
+        id_column = self.table.c.id
+        with self.engine.begin() as conn:
+            deleted = conn.execute(
+                delete(self.table).where(id_column >= first, id_column <= last,
+                                         self.time_column < state['cutoff'])
+            ).rowcount
+        total = state['deleted'] + deleted
+        self.checkpoint.save(last_id=last, deleted=total)
+        state.update(last_id=last, deleted=total)
+        return len(ids)
+
+    def _throttle(self, elapsed):
+        """
+        DELETE 소요 시간에 비례해 쉬고, 복제 지연이 크면 줄어들 때까지 대기
+
+        Returns:
+            tuple: (쉰 시간, 복제 지연이 기준 아래로 내려왔는지)
+        """
+        pause = min(self.max_sleep, elapsed * self.sleep_ratio)
+        if pause > 0:
+            self._sleep(pause)
+
+        if self.lag_probe is None:
+            return pause, True
+        waited = 0.0
+        while not self.stopping:
+            try:
+                lag = self.lag_probe()
+            except Exception:
+                lag = None
+            if lag is None or lag <= self.max_lag:
+                break
+            if waited >= self.max_lag_wait:
+                return pause + waited, False
+            self._sleep(1.0)
+            waited += 1.0
+        return pause + waited, True
+
+    def run(self, max_seconds=None, now=None):
+        """
+        정리 실행
+
+        Args:
+            max_seconds: 최대 실행 시간 (초과 시 체크포인트를 남기고 중단, 다음 실행에서 이어감)
+            now: 기준 현재 시각 (UTC, 테스트용)
+
+        Returns:
+            dict: 이번 실행 결과
+        """
+        self.stopping = False
+        self.checkpoint.create_table()
+        state = self._resume_or_start(now or datetime.utcnow())
+        started = self._clock()
+        deleted_before, archived_before = state['deleted'], state['archived']
+        chunks, slept, finished, lagging = 0, 0.0, False, False
+
+        self._upper_id = self._max_expired_id(state['cutoff'])
+        if self._upper_id is None or self._upper_id <= state['last_id']:
+            # 지울 행이 없음
+            finished = True
+
+        while not finished and not self.stopping:
+            if max_seconds is not None and self._clock() - started >= max_seconds:
+                break
+
+            through = None
+            if self.archive is not None:
+                through = state['archived_through']
+                if through <= state['last_id']:
+                    through = self._archive_next(state)
+                    if through is None:
+                        finished = not self.stopping
+                        break
+
+            began = self._clock()
+            count = self._delete_chunk(state, through)
+            if not count:
+                if through is not None:
+                    # 확정된 파일 범위를 모두 삭제함: 다음 파일로
+                    self.checkpoint.save(last_id=through)
+                    state['last_id'] = through
+                    continue
+                finished = True
+                break
+            chunks += 1
+            paused, caught_up = self._throttle(self._clock() - began)
+            slept += paused
+            if not caught_up:
+                # 복제본이 따라오지 못함: 더 지우지 않고 체크포인트에서 다음 실행이 이어감
+                lagging = True
+                self._log(f"Retention purge paused: replica lag stayed above {self.max_lag}s "
+                          f"for {self.max_lag_wait}s")
+                break
+
+        if finished:
+            self.checkpoint.save(finished_at=datetime.utcnow())
+
+        result = {
+            'table': self.table.name,
+            'cutoff': state['cutoff'].isoformat(),
+            'finished': finished,
+            'deleted': state['deleted'] - deleted_before,
+            'archived': state['archived'] - archived_before,
+            'chunks': chunks,
+            'slept': round(slept, 3),
+            'replica_lagging': lagging,
+            'last_id': state['last_id']
+        }
+        self._log(f"Retention purge {'finished' if finished else 'paused'}: {result}")
+        return result
+
+    def stop(self):
+        self.stopping = True
+
+
+# 복제 지연 확인용 엔진 (RETENTION_REPLICA_URL → Engine)
+_replica_engines = {}
+
+
+def create_sensor_purge(app):
+    """설정값으로 sensordata 정리기 생성"""
+    from sqlalchemy import create_engine
+    from backend.db import models as db_models
+
+    config = app.config
+    with app.app_context():
+        engine = app.extensions['sqlalchemy'].engine
+
+    lag_probe = None
+    url = config.get('RETENTION_REPLICA_URL')
+    if url:
+        # 실행마다 새 연결 풀을 만들지 않도록 URL별로 한 번만 생성
+        replica = _replica_engines.get(url)
+        if replica is None:
+            replica = _replica_engines[url] = create_engine(url, pool_pre_ping=True, pool_size=1)
+        lag_probe = lambda: mysql_replica_lag(replica)
+
+    return RetentionPurge(
+        engine, db_models.SensorData.__table__, group_column='FK_bid',
+        retention_days=config.get('RETENTION_DAYS', 90),
+        chunk_size=config.get('RETENTION_CHUNK_SIZE', 5000),
+        sleep_ratio=config.get('RETENTION_SLEEP_RATIO', 1.0),
+        max_lag=config.get('RETENTION_MAX_LAG', 5.0),
+        max_lag_wait=config.get('RETENTION_MAX_LAG_WAIT', 300.0),
+        lag_probe=lag_probe,
+        archive_dir=config.get('RETENTION_ARCHIVE_DIR') or None,
+        archive_format=config.get('RETENTION_ARCHIVE_FORMAT', 'csv.gz'),
+        archive_rows=config.get('RETENTION_ARCHIVE_ROWS', 200000),
+        logger=app.logger,
+    )
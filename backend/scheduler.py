@@ -4,124 +4,361 @@
 주기적 작업, 데이터 정리, 알림 처리
 """
 
+import bisect
+import random
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from flask import current_app
 
 
+# 실행 시간 히스토그램 구간 상한 (초)
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+
+
+class CronSchedule:
+    """
+    cron 형식 실행 시각 (분 시 일 월 요일)
+
+    각 필드는 *, 숫자, 범위(a-b), 목록(a,b), 간격(*/n, a-b/n)을 지원하며
+    요일은 0(또는 7)이 일요일이다. 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행한다 (cron과 동일).
+    """
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expr):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields: '{expr}'")
+
+        self.expr = expr
+        fields = [self._parse(part, low, high) for part, (low, high) in zip(parts, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+
+    @staticmethod
+    def _parse(part, low, high):
+        values = set()
+        for item in part.split(','):
+            item, _, step = item.partition('/')
+            step = int(step) if step else 1
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start, end = (int(v) for v in item.split('-', 1))
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"cron field out of range: '{part}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt):
+        weekday = (dt.weekday() + 1) % 7       # datetime은 월요일=0, cron은 일요일=0
+        if self._any_day:
+            return weekday in self.weekdays
+        if self._any_weekday:
+            return dt.day in self.days
+        return dt.day in self.days or weekday in self.weekdays
+
+    def next_after(self, dt):
+        """dt 이후 첫 실행 시각 (분 단위)"""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"cron expression never matches: '{self.expr}'")
+
+
+class DurationHistogram:
+    """실행 시간 누적 히스토그램 (고정 구간)"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """q 분위가 속한 구간의 상한 (마지막 구간은 최댓값)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        buckets = {str(bound): count for bound, count in zip(self.buckets, self.counts)}
+        buckets['+Inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'sum': round(self.total, 3),
+            'max': round(self.max, 3),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': buckets
+        }
+
+
+class Job:
+    """등록된 작업 하나의 일정과 실행 통계"""
+
+    def __init__(self, func, name, interval=None, cron=None, jitter=0, args=(), singleton=True):
+        if (interval is None) == (cron is None):
+            raise ValueError(f"job '{name}' needs exactly one of interval or cron")
+
+        self.func = func
+        self.name = name
+        self.interval = interval
+        self.cron = CronSchedule(cron) if isinstance(cron, str) else cron
+        self.jitter = jitter
+        self.args = args
+        self.singleton = singleton  # 리더 프로세스에서만 실행
+
+        self.due = None             # 이번 회차 예정 시각 (지터 제외)
+        self.fire_at = None         # 실제 실행 시각 (지터 포함)
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.missed = 0
+        self.skipped_not_leader = 0
+        self.last_started = None
+        self.last_duration = None
+        self.last_error = None
+        self.histogram = DurationHistogram()
+
+    def next_after(self, ts):
+        """ts(epoch 초) 이후 다음 예정 시각"""
+        if self.interval is not None:
+            return ts + self.interval
+        return self.cron.next_after(datetime.fromtimestamp(ts)).timestamp()
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'schedule': self.cron.expr if self.cron else f'every {self.interval}s',
+            'jitter': self.jitter,
+            'singleton': self.singleton,
+            'running': self.running,
+            'next_run': datetime.fromtimestamp(self.fire_at).isoformat() if self.fire_at else None,
+            'last_started': datetime.fromtimestamp(self.last_started).isoformat() if self.last_started else None,
+            'last_duration': round(self.last_duration, 3) if self.last_duration is not None else None,
+            'last_error': self.last_error,
+            'runs': self.runs,
+            'failures': self.failures,
+            'missed': self.missed,
+            'skipped_not_leader': self.skipped_not_leader,
+            'duration': self.histogram.to_dict()
+        }
+
+
 class Scheduler:
-    """간단한 스케줄러"""
-    
-    def __init__(self, app=None):
+    """
+    작업 스케줄러
+
+    스케줄러 스레드는 실행 시각만 관리하고 작업은 크기가 정해진 스레드 풀에서 실행하므로
+    느린 작업(데이터 정리, 외부 API 호출)이 다른 작업의 실행 시각을 밀지 않는다.
+    같은 작업은 겹쳐 실행하지 않으며, 이전 실행이 끝나지 않았거나 스케줄러가 밀려
+    지나간 회차는 한 번으로 합쳐 실행하고 놓친 횟수(missed)로 센다.
+    singleton 작업은 leader.is_leader인 프로세스에서만 실행한다 (리더가 아니면 회차만 넘김).
+    """
+
+    def __init__(self, app=None, max_workers=4, clock=time.time, random_source=None, leader=None):
+        """
+        Args:
+            app: Flask 애플리케이션
+            max_workers: 동시에 실행할 수 있는 작업 수
+            clock: epoch 초 시계 (테스트용)
+            random_source: 지터용 난수 생성기 (테스트용)
+            leader: 리더 선출 (LeaderElector, None이면 모든 작업 실행)
+        """
         self.app = app
+        self.leader = leader
+        self.max_workers = max_workers
         self.jobs = []
         self.running = False
         self.thread = None
-        
+        self._clock = clock
+        self._random = random_source or random.Random()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._executor = None
+
     def init_app(self, app):
         self.app = app
-        
-    def add_job(self, func, interval_seconds, name=None):
+        self.max_workers = app.config.get('SCHEDULER_MAX_WORKERS', self.max_workers)
+
+    def add_job(self, func, interval_seconds=None, name=None, cron=None, jitter=0, args=(), singleton=True):
         """
         작업 추가
-        
+
         Args:
             func: 실행할 함수
             interval_seconds: 실행 간격 (초)
             name: 작업 이름
+            cron: cron 형식 실행 시각 (interval_seconds 대신, 서버 현지 시각 기준)
+            jitter: 회차마다 0~jitter초 무작위로 늦춰 실행 (여러 작업/서버의 동시 실행 분산)
+            args: func에 넘길 인자
+            singleton: 여러 프로세스 중 리더에서만 실행 (프로세스별 작업은 False)
         """
-        self.jobs.append({
-            'func': func,
-            'interval': interval_seconds,
-            'name': name or func.__name__,
-            'last_run': None
-        })
-        
+        job = Job(func, name or func.__name__, interval_seconds, cron, jitter, args, singleton)
+        with self._lock:
+            self._schedule(job, job.next_after(self._clock()))
+            self.jobs.append(job)
+        self._wakeup.set()
+        return job
+
+    def _schedule(self, job, due):
+        job.due = due
+        job.fire_at = due + (self._random.uniform(0, job.jitter) if job.jitter else 0)
+
     def start(self):
         """스케줄러 시작"""
         if self.running:
             return
-            
+
         self.running = True
-        self.thread = threading.Thread(target=self._run, daemon=True)
+        self._wakeup.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scheduler-job')
+        self.thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
         self.thread.start()
-        
+
         if self.app:
-            self.app.logger.info("Scheduler started")
-            
-    def stop(self):
-        """스케줄러 중지"""
+            self.app.logger.info(f"Scheduler started ({len(self.jobs)} jobs, {self.max_workers} workers)")
+
+    def stop(self, timeout=5):
+        """스케줄러 중지 (실행 중인 작업은 끝까지 실행)"""
         self.running = False
+        self._wakeup.set()
         if self.thread:
-            self.thread.join(timeout=5)
-            
+            self.thread.join(timeout=timeout)
+            self.thread = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
     def _run(self):
-        """메인 루프"""
+        """메인 루프: 가장 가까운 실행 시각까지 대기"""
         while self.running:
-            now = datetime.utcnow()
-            
+            self._wakeup.clear()
+            self.run_pending()
+            with self._lock:
+                next_fire = min((job.fire_at for job in self.jobs), default=None)
+            delay = 1.0 if next_fire is None else next_fire - self._clock()
+            self._wakeup.wait(min(max(delay, 0.01), 1.0))
+
+    def run_pending(self, now=None):
+        """
+        실행 시각이 된 작업을 풀에 넘김
+
+        Returns:
+            list: 이번에 실행을 시작한 작업 이름
+        """
+        now = self._clock() if now is None else now
+        is_leader = self.leader is None or self.leader.is_leader
+        started = []
+        with self._lock:
             for job in self.jobs:
-                if job['last_run'] is None:
-                    job['last_run'] = now
+                if job.fire_at > now:
                     continue
-                    
-                elapsed = (now - job['last_run']).total_seconds()
-                
-                if elapsed >= job['interval']:
-                    try:
-                        if self.app:
-                            with self.app.app_context():
-                                job['func']()
-                        else:
-                            job['func']()
-                        job['last_run'] = now
-                    except Exception as e:
-                        if self.app:
-                            self.app.logger.error(f"Scheduler job '{job['name']}' failed: {e}")
-                        else:
-                            print(f"Scheduler job '{job['name']}' failed: {e}")
-            
-            time.sleep(1)
 
+                # 스케줄러가 밀려 지나간 회차는 건너뛰고 한 번만 실행
+                due = job.next_after(job.due)
+                while due <= now:
+                    if is_leader or not job.singleton:
+                        job.missed += 1
+                    due = job.next_after(due)
+                scheduled = job.fire_at
+                self._schedule(job, due)
 
-# ============================================================
-# 배치 작업 함수들
-# ============================================================
+                if job.singleton and not is_leader:
+                    job.skipped_not_leader += 1
+                    continue
+                if job.running:
+                    # 이전 실행이 아직 진행 중: 겹쳐 실행하지 않음
+                    job.missed += 1
+                    continue
+                job.running = True
+                started.append((job, scheduled))
 
-def check_offline_bands():
-    """
-    오프라인 밴드 감지
-    1분 이상 데이터가 없는 밴드를 오프라인으로 처리
-    """
-    from backend.db.models import db, Band, Event
+        for job, scheduled in started:
+            self._submit(job, scheduled)
+        return [job.name for job, _ in started]
 
-    threshold = datetime.utcnow() - timedelta(minutes=1)
-    
-    # 온라인 상태지만 데이터가 오래된 밴드
-    bands = Band.query.filter(
-        Band.is_active == True,
-        Band.connect_state == 1,
-        Band.last_data_at < threshold
-    ).all()
-    
-    for band in bands:
-        band.connect_state = 0
-        
-        # 오프라인 이벤트 생성
-        event = Event(
-            FK_bid=band.id,
-            datetime=datetime.utcnow(),
-            event_type='device_offline',
-            event_level=2,
-            message=f'{band.wearer_name or "밴드"} 연결이 끊겼습니다'
-        )
-        db.session.add(event)
-        
-    if bands:
-        db.session.commit()
-        current_app.logger.info(f"Marked {len(bands)} bands as offline")
+    def _submit(self, job, scheduled):
+        if self._executor is None:
+            self._execute(job, scheduled)
+        else:
+            self._executor.submit(self._execute, job, scheduled)
+
+    def _execute(self, job, scheduled):
+        """작업 실행 (풀 스레드)"""
+        started = self._clock()
+        began = time.perf_counter()
+        error = None
+        try:
+            if self.app:
+                with self.app.app_context():
+                    job.func(*job.args)
+            else:
+                job.func(*job.args)
+        except Exception as e:
+            error = str(e)
+            if self.app:
+                self.app.logger.error(f"Scheduler job '{job.name}' failed: {e}")
+            else:
+                print(f"Scheduler job '{job.name}' failed: {e}")
+        finally:
+            duration = time.perf_counter() - began
+            with self._lock:
+                job.running = False
+                job.runs += 1
+                job.last_started = started
+                job.last_duration = duration
+                job.histogram.observe(duration)
+                if error is not None:
+                    job.failures += 1
+                    job.last_error = error
 
+    def get_status(self):
+        """작업별 일정/실행 통계"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'leader': self.leader.get_stats() if self.leader is not None else None,
+                'max_workers': self.max_workers,
+                'busy': sum(1 for job in self.jobs if job.running),
+                'jobs': [job.to_dict() for job in self.jobs]
+            }
+
+
+# ============================================================
+# 배치 작업 함수들
+# ============================================================
 
 def check_battery_low():
     """
@@ -176,68 +413,94 @@ def check_battery_low():
     db.session.commit()
 
 
-def check_stimulation_sessions():
+def check_stimulation_sessions(socketio=None):
     """
     자극 세션 타임아웃 체크
-    시작 후 예정 시간이 지난 세션 자동 종료
+    시작 후 예정 시간 + 5분이 지난 세션을 중단 처리
     """
-    from backend.db.models import db, Band, NervestimulationStatus, NervestimulationHist
-    
+    from backend.db.models import db, NerveStimSession, SessionStatus, EndReason
+
     # 진행 중인 세션
-    active_sessions = NervestimulationStatus.query.filter_by(status=1).all()
-    
-    for session in active_sessions:
+    running_sessions = NerveStimSession.query.filter_by(status=SessionStatus.RUNNING).all()
+
+    for session in running_sessions:
         if not session.started_at:
             continue
-            
+
         # 예정 시간 + 5분 여유
         expected_end = session.started_at + timedelta(minutes=session.duration + 5)
-        
+
         if datetime.utcnow() > expected_end:
-            # 세션 자동 종료
-            session.status = 2  # 완료
+            # 타임아웃 처리
+            session.status = SessionStatus.STOPPED
             session.ended_at = datetime.utcnow()
-            session.end_reason = 'timeout'
-            
-            duration_actual = int((session.ended_at - session.started_at).total_seconds() / 60)
-            
-            # 히스토리 저장
-            history = NervestimulationHist(
-                session_id=session.session_id,
-                FK_bid=session.FK_bid,
-                stimulator_id=session.stimulator_id,
-                stim_level=session.stim_level,
-                frequency=session.frequency,
-                pulse_width=session.pulse_width,
-                duration_planned=session.duration,
-                duration_actual=duration_actual,
-                started_at=session.started_at,
-                ended_at=session.ended_at,
-                end_reason='timeout'
-            )
-            db.session.add(history)
-            
-            current_app.logger.info(f"Session {session.session_id} auto-completed (timeout)")
-    
-    db.session.commit()
+            session.end_reason = EndReason.TIMEOUT
+            db.session.commit()
+
+            current_app.logger.warning(f"Session {session.session_id} timed out")
+
+            # WebSocket 알림
+            if socketio is not None:
+                socketio.emit('stim_session_update', {
+                    'session_id': session.session_id,
+                    'status': SessionStatus.STOPPED,
+                    'status_text': '타임아웃',
+                    'end_reason': EndReason.TIMEOUT
+                })
+
+
+def aggregate_alerts(socketio=None):
+    """
+    알림 집계
+    읽지 않은 알림이 많으면 대시보드에 요약 발송
+    """
+    from backend.db.service import select
+
+    unread_count = select.get_unread_events_count()
+
+    if unread_count > 10:
+        current_app.logger.warning(f"High number of unread alerts: {unread_count}")
+
+        if socketio is not None:
+            socketio.emit('alert_summary', {
+                'unread_count': unread_count,
+                'timestamp': datetime.utcnow().isoformat()
+            }, room='dashboard')
 
 
 def cleanup_old_data():
     """
     오래된 데이터 정리
-    90일 이상 된 센서 데이터 삭제
+    보관 기간(RETENTION_DAYS, 기본 90일)이 지난 센서 데이터 삭제
+    sensordata가 시간 파티션 테이블이면 기간이 지난 파티션을 통째로 삭제 (partitions.py)하고,
+    아니면 구간별로 나눠 삭제 (retention.py), RETENTION_MAX_RUNTIME을 넘기면 멈추고 다음 실행에서 이어서 삭제
     """
-    from backend.db.models import db, SensorData
-    
-    threshold = datetime.utcnow() - timedelta(days=90)
-    
-    deleted = SensorData.query.filter(
-        SensorData.datetime < threshold
-    ).delete(synchronize_session=False)
-    
-    if deleted:
-        db.session.commit()
-        current_app.logger.info(f"Cleaned up {deleted} old sensor records")
+    from backend.partitions import create_sensor_partitions
+    from backend.retention import create_sensor_purge
+
+    result = create_sensor_partitions(current_app).drop_expired()
+    if result is not None:
+        if result['dropped']:
+            current_app.logger.info(f"Dropped sensor partitions: {result['dropped']}")
+        return
+
+    purge = create_sensor_purge(current_app)
+    result = purge.run(max_seconds=current_app.config.get('RETENTION_MAX_RUNTIME', 3600))
+
+    if result['deleted']:
+        current_app.logger.info(f"Cleaned up {result['deleted']} old sensor records")
+
+
+def maintain_sensor_partitions():
+    """
+    sensordata 파티션 미리 생성
+    SENSORDATA_PARTITION_PREMAKE 기간 뒤까지 파티션을 만들어 두어 새 데이터가 pmax에 쌓이지 않게 함
+    """
+    from backend.partitions import create_sensor_partitions
+
+    added = create_sensor_partitions(current_app).maintain()
+    if added:
+        current_app.logger.info(f"Created sensor partitions: {added}")
 
 
 def send_daily_report():
@@ -259,10 +522,11 @@ def send_daily_report():
         Event.datetime < yesterday_end
     ).count()
     
+    # event_level은 type에서 계산하는 프로퍼티이므로 type으로 조회 (3 이상: SOS, 낙상, 생체신호 이상)
     urgent_count = Event.query.filter(
         Event.datetime >= yesterday_start,
         Event.datetime < yesterday_end,
-        Event.event_level >= 3
+        Event.type.in_([6, 7, 8, 9, 10])
     ).count()
     
     # 자극 세션 수
@@ -280,18 +544,15 @@ def send_daily_report():
 
 def check_extreme_weather():
     """
-    극단적 기상 상황 확인 및 알림
+    기상 특보 확인 및 알림
     """
     try:
-        from api.crawling import check_extreme_weather as get_weather_warnings
-        
-        result = get_weather_warnings()
-        
-        if result.get('has_warnings'):
-            # TODO: 관리자에게 알림 발송
-            for warning in result.get('warnings', []):
-                current_app.logger.warning(f"Weather warning: {warning.get('message')}")
-                
+        from backend.api.crawling import check_weather_alerts
+
+        # TODO: 관리자에게 알림 발송
+        for alert in check_weather_alerts() or []:
+            current_app.logger.warning(f"Weather warning: {alert.get('title')}")
+
     except Exception as e:
         current_app.logger.error(f"Weather check failed: {e}")
 
@@ -303,23 +564,31 @@ def check_extreme_weather():
 scheduler = Scheduler()
 
 
-def init_scheduler(app):
+def init_scheduler(app, socketio=None, leader=None):
     """
     스케줄러 초기화 및 작업 등록
-    
+
     Args:
         app: Flask 애플리케이션
+        socketio: Socket.IO 인스턴스 (세션 타임아웃/알림 요약 발송)
+        leader: 리더 선출 (있으면 리더 프로세스에서만 작업 실행)
     """
     scheduler.init_app(app)
-    
+    scheduler.leader = leader
+    jitter = app.config.get('SCHEDULER_JITTER', 5)
+
     # 작업 등록
-    scheduler.add_job(check_offline_bands, 60, "check_offline_bands")  # 1분마다
-    scheduler.add_job(check_battery_low, 300, "check_battery_low")  # 5분마다
-    scheduler.add_job(check_stimulation_sessions, 60, "check_stimulation_sessions")  # 1분마다
-    scheduler.add_job(cleanup_old_data, 86400, "cleanup_old_data")  # 24시간마다
-    scheduler.add_job(check_extreme_weather, 3600, "check_extreme_weather")  # 1시간마다
-    
+    # check_battery_low는 bands에 배터리 컬럼이 없어 등록하지 않음
+    scheduler.add_job(check_stimulation_sessions, 60, args=(socketio,), jitter=jitter)  # 1분마다
+    scheduler.add_job(aggregate_alerts, 300, args=(socketio,), jitter=jitter)  # 5분마다
+    scheduler.add_job(check_extreme_weather, 3600, jitter=jitter)  # 1시간마다
+    scheduler.add_job(cleanup_old_data, cron=app.config.get('SCHEDULER_CLEANUP_CRON', '30 3 * * *'),
+                      jitter=jitter)  # 매일 03:30
+    scheduler.add_job(maintain_sensor_partitions, cron=app.config.get('SENSORDATA_PARTITION_CRON', '15 0 * * *'),
+                      jitter=jitter)  # 매일 00:15
+    scheduler.add_job(send_daily_report, cron=app.config.get('SCHEDULER_DAILY_REPORT_CRON', '0 9 * * *'))  # 매일 09:00
+
     # 스케줄러 시작
     scheduler.start()
-    
+
     return scheduler
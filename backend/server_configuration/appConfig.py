@@ -29,7 +29,122 @@ class Config:
     MQTT_PASSWORD = os.environ.get('MQTT_PASSWORD', 'Psalms23##cross')
     MQTT_KEEPALIVE = 60
     MQTT_TLS_ENABLED = False
+
+    # MQTT 핸들러 실행 워커 풀 ('inline', 'thread', 'gevent')
+    # 같은 bid의 메시지는 같은 워커에서 순서대로 처리
+    MQTT_DISPATCH_MODE = os.environ.get('MQTT_DISPATCH_MODE', 'thread')
+    MQTT_DISPATCH_WORKERS = int(os.environ.get('MQTT_DISPATCH_WORKERS', 8))
+    MQTT_DISPATCH_QUEUE_SIZE = int(os.environ.get('MQTT_DISPATCH_QUEUE_SIZE', 1000))
+    MQTT_DISPATCH_OVERFLOW = os.environ.get('MQTT_DISPATCH_OVERFLOW', 'block')  # block, drop_new, drop_oldest
+    MQTT_DISPATCH_BLOCK_TIMEOUT = None
+
+    # QoS 1 재전송 중복 제거 (키는 WINDOW~2*WINDOW초 기억, 메모리는 최대 2*MAX_KEYS 키)
+    MQTT_DEDUP_WINDOW = float(os.environ.get('MQTT_DEDUP_WINDOW', 120))
+    MQTT_DEDUP_MAX_KEYS = int(os.environ.get('MQTT_DEDUP_MAX_KEYS', 100000))
+
+    # 프로세스 역할
+    # 'all' = 웹 + MQTT 수집 (단일 프로세스, 기본값)
+    # 'web' = 웹만 (paho 수집은 run_ingest.py 워커가 담당)
+    # 'ingest' = 수집 워커 (run_ingest.py가 지정)
+    PROCESS_ROLE = os.environ.get('PROCESS_ROLE', 'all')
+
+    # 수집 워커 샤딩 ('hash' = 전체 구독 후 bid 해시로 자기 몫만 처리, 'share' = MQTT 공유 구독)
+    # 'share'는 브로커가 bid와 관계없이 메시지를 나누므로 밴드별 순서와 프로세스 안의 밴드별 상태
+    # (band_state 지연 기록, 이상 구간 감지, 발송 스로틀, 중복 제거 구간)가 워커마다 갈라짐 → 상태 없는 처리에만 사용
+    MQTT_SHARD_MODE = os.environ.get('MQTT_SHARD_MODE', 'hash')
+    MQTT_SHARE_GROUP = os.environ.get('MQTT_SHARE_GROUP', 'wellsafer')
+    MQTT_SHARD_INDEX = int(os.environ.get('MQTT_SHARD_INDEX', 0))
+    MQTT_SHARD_COUNT = int(os.environ.get('MQTT_SHARD_COUNT', 1))
+    INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', 2))
+    INGEST_REPORT_INTERVAL = float(os.environ.get('INGEST_REPORT_INTERVAL', 10))
+    # 'web' 역할에서 최신 생체신호 저장소를 DB에서 다시 적재하는 주기 (초)
+    LATEST_VITALS_REFRESH_INTERVAL = float(os.environ.get('LATEST_VITALS_REFRESH_INTERVAL', 5))
+
+    # 센서 데이터 배치 적재 (다중 행 INSERT)
+    SENSOR_INGEST_QUEUE_SIZE = int(os.environ.get('SENSOR_INGEST_QUEUE_SIZE', 20000))
+    SENSOR_INGEST_BATCH_SIZE = int(os.environ.get('SENSOR_INGEST_BATCH_SIZE', 500))
+    SENSOR_INGEST_FLUSH_INTERVAL = float(os.environ.get('SENSOR_INGEST_FLUSH_INTERVAL', 0.2))
+    SENSOR_INGEST_PUT_TIMEOUT = 0
+    # 저장 실패 시 같은 배치 재시도 (대기 시간은 재시도마다 2배)
+    SENSOR_INGEST_MAX_RETRIES = int(os.environ.get('SENSOR_INGEST_MAX_RETRIES', 3))
+    SENSOR_INGEST_RETRY_DELAY = float(os.environ.get('SENSOR_INGEST_RETRY_DELAY', 0.1))
+
+    # 밴드 식별 캐시 (bid → Band)
+    BAND_CACHE_TTL = int(os.environ.get('BAND_CACHE_TTL', 300))
+    BAND_CACHE_NEGATIVE_TTL = int(os.environ.get('BAND_CACHE_NEGATIVE_TTL', 60))
+    BAND_CACHE_MAX_SIZE = 20000
+    BAND_CACHE_MAX_NEGATIVE_SIZE = 10000
+
+    # 오프라인 감지: 마지막 수신 후 TIMEOUT초가 지나면 오프라인 (TICK초 단위로 확인)
+    BAND_OFFLINE_TIMEOUT = int(os.environ.get('BAND_OFFLINE_TIMEOUT', 300))
+    BAND_OFFLINE_TICK = float(os.environ.get('BAND_OFFLINE_TICK', 1.0))
+
+    # 밴드 연결 상태/위치 write-behind 반영 주기 (초)
+    BAND_STATE_FLUSH_INTERVAL = float(os.environ.get('BAND_STATE_FLUSH_INTERVAL', 5))
+
+    # 대시보드 요약 캐시 DB 대조 주기 (초)
+    DASHBOARD_SUMMARY_RECONCILE_INTERVAL = int(os.environ.get('DASHBOARD_SUMMARY_RECONCILE_INTERVAL', 60))
+
+    # Socket.IO 실시간 전송 최소 간격 (초, 밴드·룸별, 0.5 = 최대 2Hz)
+    SOCKET_EMIT_MIN_INTERVAL = float(os.environ.get('SOCKET_EMIT_MIN_INTERVAL', 0.5))
+    # 이벤트별 최소 간격 (기본값과 다르게 둘 이벤트만, 예: {'sensor_update': 1.0})
+    SOCKET_EMIT_INTERVALS = {}
+
+    # 워커 간 Socket.IO 메시지 큐 (없으면 단일 프로세스)
+    # 'local:///tmp/wellsafer-socketio.sock' = 외부 서비스 없는 UNIX 소켓 브로커, 'redis://...' 등도 가능
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    # local 브로커가 없으면 워커가 직접 시작 (False면 'python manage.py emit_broker'로 별도 실행)
+    EMIT_BUS_AUTOSTART_BROKER = os.environ.get('EMIT_BUS_AUTOSTART_BROKER', 'true').lower() == 'true'
+
+    # 대시보드 프레임 발송 주기 (초, 이 동안의 밴드 변경을 dashboard_frame 하나로 묶음)
+    DASHBOARD_FRAME_INTERVAL = float(os.environ.get('DASHBOARD_FRAME_INTERVAL', 0.5))
+
+    # 바이너리 센서 토픽(wellsafer/band/{bid}/sensor/bin) 펌웨어별 스키마 버전 (예: {'2.1': 1})
+    # 등록되지 않은 펌웨어는 프레임의 버전 바이트로 스키마 선택
+    TELEMETRY_SCHEMA_BY_SW_VER = {}
+
+    # 생체신호 이상 구간 감지 (anomaly.py 규칙 이름 → enter/exit/window/debounce/clear_after)
+    # 예: ANOMALY_RULES = {'hr_high': {'enter': 130}}, ANOMALY_RULES_BY_BAND = {'<bid>': {...}}
+    # 처방(prescription_hist.vital_thresholds)이 있으면 밴드별 설정보다 우선
+    ANOMALY_RULES = {}
+    ANOMALY_RULES_BY_BAND = {}
+    ANOMALY_PROFILE_TTL = int(os.environ.get('ANOMALY_PROFILE_TTL', 300))
+    ANOMALY_GAP_RESET = int(os.environ.get('ANOMALY_GAP_RESET', 300))
     
+    # 스케줄러: 동시 실행 작업 수, 회차별 지터 상한(초), cron 작업 실행 시각 (서버 현지 시각)
+    SCHEDULER_MAX_WORKERS = int(os.environ.get('SCHEDULER_MAX_WORKERS', 4))
+    SCHEDULER_JITTER = float(os.environ.get('SCHEDULER_JITTER', 5))
+    SCHEDULER_CLEANUP_CRON = os.environ.get('SCHEDULER_CLEANUP_CRON', '30 3 * * *')
+    SCHEDULER_DAILY_REPORT_CRON = os.environ.get('SCHEDULER_DAILY_REPORT_CRON', '0 9 * * *')
+
+    # 센서 데이터 보관 기간 정리 (retention.py): 기간(일), 구간 크기(행), 구간 사이 휴식 = DELETE 시간 × 비율
+    # RETENTION_REPLICA_URL을 지정하면 복제 지연이 RETENTION_MAX_LAG초 아래로 내려갈 때까지 대기
+    # RETENTION_ARCHIVE_DIR을 지정하면 삭제 전에 csv.gz(또는 pyarrow 설치 시 parquet) 파일로 내보냄
+    RETENTION_DAYS = int(os.environ.get('RETENTION_DAYS', 90))
+    RETENTION_CHUNK_SIZE = int(os.environ.get('RETENTION_CHUNK_SIZE', 5000))
+    RETENTION_SLEEP_RATIO = float(os.environ.get('RETENTION_SLEEP_RATIO', 1.0))
+    RETENTION_MAX_LAG = float(os.environ.get('RETENTION_MAX_LAG', 5))
+    # 복제 지연 최대 대기 시간 (초, 넘으면 이번 실행은 중단하고 다음 실행에서 이어감)
+    RETENTION_MAX_LAG_WAIT = float(os.environ.get('RETENTION_MAX_LAG_WAIT', 300))
+    RETENTION_MAX_RUNTIME = int(os.environ.get('RETENTION_MAX_RUNTIME', 3600))
+    RETENTION_REPLICA_URL = os.environ.get('RETENTION_REPLICA_URL', '')
+    RETENTION_ARCHIVE_DIR = os.environ.get('RETENTION_ARCHIVE_DIR', '')
+    RETENTION_ARCHIVE_FORMAT = os.environ.get('RETENTION_ARCHIVE_FORMAT', 'csv.gz')
+    RETENTION_ARCHIVE_ROWS = int(os.environ.get('RETENTION_ARCHIVE_ROWS', 200000))
+
+    # sensordata 시간 파티션 (partitions.py, MySQL RANGE COLUMNS(datetime)): 단위('day'/'month'), 미리 만들 기간 수
+    # 파티션 테이블이면 보관 기간 정리는 행 DELETE 대신 기간이 지난 파티션을 DROP
+    SENSORDATA_PARTITION_UNIT = os.environ.get('SENSORDATA_PARTITION_UNIT', 'day')
+    SENSORDATA_PARTITION_PREMAKE = int(os.environ.get('SENSORDATA_PARTITION_PREMAKE', 7))
+    SENSORDATA_PARTITION_CRON = os.environ.get('SENSORDATA_PARTITION_CRON', '15 0 * * *')
+
+    # 리더 선출: 스케줄러 작업을 한 프로세스에서만 실행 ('db': leader_lease 행, 'file': 한 서버 잠금 파일, 'none')
+    # 리더가 죽으면 최대 LEADER_LEASE_TTL초 안에 다른 프로세스가 이어받음
+    LEADER_ELECTION = os.environ.get('LEADER_ELECTION', 'db')
+    LEADER_LEASE_TTL = float(os.environ.get('LEADER_LEASE_TTL', 30))
+    LEADER_LEASE_NAME = os.environ.get('LEADER_LEASE_NAME', 'background')
+    LEADER_LOCK_FILE = os.environ.get('LEADER_LOCK_FILE', '/tmp/wellsafer-leader.lock')
+
     # JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
@@ -37,11 +37,15 @@ def register_socket_handlers(socketio, app):
         join_room('dashboard')
         app.logger.debug(f"Client {request.sid} subscribed to dashboard")
         
-        # 현재 대시보드 데이터 전송
-        from api.dashboard import get_dashboard_summary
-        with app.app_context():
-            summary = get_dashboard_summary()
-            emit('dashboard_data', summary)
+        # 현재 대시보드 데이터 전송 (dashboard_delta를 발송하는 리더 워커의 요약)
+        from backend.dashboard_summary import send_snapshot
+        send_snapshot(socketio, request.sid)
+    
+    @socketio.on('dashboard_resync')
+    def handle_dashboard_resync():
+        """대시보드 재동기화 - dashboard_delta seq 누락/origin 변경 시 전체 요약 재전송"""
+        from backend.dashboard_summary import send_snapshot
+        send_snapshot(socketio, request.sid)
     
     @socketio.on('unsubscribe_dashboard')
     def handle_unsubscribe_dashboard():
@@ -61,18 +65,18 @@ def register_socket_handlers(socketio, app):
         app.logger.debug(f"Client {request.sid} subscribed to band {bid}")
         
         # 현재 밴드 상태 전송
-        from backend.db.models import Band, SensorData
+        from backend.db.models import Band
+        from backend.latest_vitals import latest_vitals, vitals_to_dict
         with app.app_context():
             band = Band.query.filter_by(bid=bid).first()
             if band:
-                # 최신 센서 데이터
-                latest_sensor = SensorData.query.filter_by(FK_bid=band.id)\
-                    .order_by(SensorData.datetime.desc()).first()
+                # 최신 센서 데이터 (메모리 저장소에서 조회)
+                latest_sensor = vitals_to_dict(band.id, latest_vitals.get(band.id))
                 
                 emit('band_current_state', {
                     'bid': bid,
                     'band': band.to_dict(),
-                    'latest_sensor': latest_sensor.to_dict() if latest_sensor else None
+                    'latest_sensor': latest_sensor
                 })
     
     @socketio.on('unsubscribe_band')
@@ -244,19 +248,21 @@ def broadcast_sensor_update(socketio, bid, sensor_data):
         bid: 밴드 ID
         sensor_data: 센서 데이터 dict
     """
+    from backend.dashboard_frame import dashboard_frames
+    from backend.emit_throttle import emit_throttle
+    from backend.mqtt_client import is_alert_vitals
+
+    # 밴드별 전송 빈도 제한 (경보 수준 생체신호는 즉시 전송)
+    urgent = is_alert_vitals(sensor_data)
     room = f'band_{bid}'
-    socketio.emit('sensor_update', {
+    emit_throttle.emit('sensor_update', {
         'bid': bid,
         'datetime': datetime.utcnow().isoformat(),
         **sensor_data
-    }, room=room)
+    }, room=room, urgent=urgent)
     
-    # 대시보드에도 요약 전송
-    socketio.emit('sensor_summary', {
-        'bid': bid,
-        'hr': sensor_data.get('hr'),
-        'spo2': sensor_data.get('spo2')
-    }, room='dashboard')
+    # 대시보드에는 프레임으로 묶어 전송
+    dashboard_frames.update(bid, hr=sensor_data.get('hr'), spo2=sensor_data.get('spo2'))
 
 
 def broadcast_location_update(socketio, bid, location_data):
@@ -268,11 +274,18 @@ def broadcast_location_update(socketio, bid, location_data):
         bid: 밴드 ID
         location_data: 위치 데이터 dict
     """
+    from backend.dashboard_frame import dashboard_frames
+
     room = f'band_{bid}'
     socketio.emit('location_update', {
         'bid': bid,
         **location_data
     }, room=room)
+    dashboard_frames.update(
+        bid,
+        latitude=location_data.get('latitude'),
+        longitude=location_data.get('longitude')
+    )
 
 
 def broadcast_band_status(socketio, bid, status, battery=None):
@@ -292,8 +305,11 @@ def broadcast_band_status(socketio, bid, status, battery=None):
     }
     if battery is not None:
         data['battery'] = battery
-        
-    socketio.emit('band_status', data, room='dashboard')
+
+    from backend.dashboard_frame import dashboard_frames
+
+    # 대시보드에는 프레임으로 묶어 전송
+    dashboard_frames.update(bid, status=status, battery=battery)
     socketio.emit('band_status', data, room=f'band_{bid}')
 
 
@@ -305,13 +321,16 @@ def broadcast_alert(socketio, alert_data):
         socketio: Socket.IO 인스턴스
         alert_data: 알림 데이터 dict
     """
-    socketio.emit('alert_new', alert_data, room='alerts')
-    socketio.emit('alert_new', alert_data, room='dashboard')
-    
-    # 해당 밴드 구독자에게도 전송
-    bid = alert_data.get('bid')
+    # 룸 목록으로 한 번에 발송 (패킷은 한 번만 직렬화되고, 여러 룸에 속한 클라이언트도 한 번만 수신)
+    socketio.emit('alert_new', alert_data, to=alert_rooms(alert_data.get('bid')))
+
+
+def alert_rooms(bid=None):
+    """알림 수신 룸 (alerts, dashboard, 해당 밴드 구독자)"""
+    rooms = ['alerts', 'dashboard']
     if bid:
-        socketio.emit('alert_new', alert_data, room=f'band_{bid}')
+        rooms.append(f'band_{bid}')
+    return rooms
 
 
 def broadcast_stim_update(socketio, session_id, status_data):
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+바이너리 텔레메트리 모듈
+밴드 센서 업링크의 고정 길이 바이너리 형식 (wellsafer/band/{bid}/sensor/bin)
+
+프레임 = 스키마 버전(uint8) + 스키마별 고정 레이아웃 (리틀 엔디언)
+JSON 센서 토픽(wellsafer/band/{bid}/sensor)은 그대로 유지되며,
+바이너리를 보내지 않는 펌웨어는 JSON을 계속 사용한다.
+"""
+
+import operator
+import struct
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+
+class TelemetryError(ValueError):
+    """해석할 수 없는 바이너리 프레임"""
+
+
+# 필드 정의: name은 표준 측정값 필드명, fmt는 struct 형식 문자,
+# scale은 전송 정수값 → 실제 값 나눗수, missing은 '값 없음' 표시값
+Field = namedtuple('Field', ['name', 'fmt', 'scale', 'missing'], defaults=(1, None))
+
+# 형식별 기본 '값 없음' 표시값 (해당 타입의 최대/최소값)
+MISSING = {
+    'B': 0xFF,
+    'b': -0x80,
+    'H': 0xFFFF,
+    'h': -0x8000,
+    'I': 0xFFFFFFFF,
+    'i': -0x80000000,
+}
+
+_VERSION = struct.Struct('<B')
+
+
+class TelemetrySchema:
+    """
+    스키마 버전 하나의 고정 레이아웃
+
+    생성 시 struct.Struct로 한 번 컴파일하고, 프레임마다 unpack_from만 수행한다.
+    timestamp 필드(epoch 초)는 datetime으로 변환된다.
+    """
+
+    def __init__(self, version, fields):
+        if not 0 <= version <= 0xFF:
+            raise ValueError(f"Schema version out of range: {version}")
+        self.version = version
+        self.fields = tuple(fields)
+        self.struct = struct.Struct('<' + ''.join(f.fmt for f in self.fields))
+        self.size = _VERSION.size + self.struct.size
+        # 인코딩/디코딩에서 쓰는 (이름, 나눗수, 표시값) 목록
+        self._plan = tuple(
+            (f.name, f.scale, MISSING.get(f.fmt) if f.missing is None else f.missing)
+            for f in self.fields
+        )
+        self._names = tuple(name for name, _, _ in self._plan)
+        self._missing = tuple(missing for _, _, missing in self._plan)
+        self._scaled = tuple((f.name, f.scale) for f in self.fields if f.scale != 1)
+        self._has_timestamp = 'timestamp' in self._names
+
+    def decode(self, data):
+        """
+        프레임 → 측정값 딕셔너리
+
+        Args:
+            data: 버전 바이트를 포함한 프레임 (bytes, bytearray, memoryview)
+
+        Returns:
+            dict: 표준 측정값 필드 (값 없음은 None, timestamp는 'datetime' 키)
+        """
+        if len(data) != self.size:
+            raise TelemetryError(f"Schema v{self.version} frame must be {self.size} bytes, got {len(data)}")
+
+        raw = self.struct.unpack_from(data, _VERSION.size)
+        # 대부분의 프레임은 '값 없음'이 없으므로 먼저 한 번에 비교하고, 있을 때만 필드별로 변환
+        if any(map(operator.eq, raw, self._missing)):
+            values = {
+                name: None if value == missing else value
+                for name, value, missing in zip(self._names, raw, self._missing)
+            }
+        else:
+            values = dict(zip(self._names, raw))
+        for name, scale in self._scaled:
+            if values[name] is not None:
+                values[name] = values[name] / scale
+
+        if self._has_timestamp:
+            ts = values.pop('timestamp')
+            values['datetime'] = datetime.utcfromtimestamp(ts) if ts else None
+        return values
+
+    def encode(self, values):
+        """
+        측정값 딕셔너리 → 프레임 (기기 시뮬레이터 및 테스트용)
+
+        Args:
+            values: 필드명 → 값 (없거나 None이면 '값 없음' 표시값)
+        """
+        packed = []
+        for name, scale, missing in self._plan:
+            value = values.get(name)
+            if isinstance(value, datetime):
+                value = int((value - datetime(1970, 1, 1)).total_seconds())
+            packed.append(missing if value is None else int(round(value * scale)))
+        try:
+            return _VERSION.pack(self.version) + self.struct.pack(*packed)
+        except struct.error as e:
+            raise TelemetryError(f"Cannot encode schema v{self.version}: {e}")
+
+    def __repr__(self):
+        return f"TelemetrySchema(v{self.version}, {self.size} bytes)"
+
+
+# 스키마 v1 (29바이트, 같은 내용의 JSON 대비 약 1/8)
+SCHEMA_V1 = TelemetrySchema(1, [
+    Field('timestamp', 'I', missing=0),    # epoch 초 (0이면 수신 시각)
+    Field('battery_level', 'B'),           # %
+    Field('hr', 'B'),                      # bpm
+    Field('spo2', 'B'),                    # %
+    Field('skin_temp', 'h', scale=100),    # 0.01°C
+    Field('x', 'h'),
+    Field('y', 'h'),
+    Field('z', 'h'),
+    Field('walk_steps', 'I'),
+    Field('run_steps', 'I'),
+    Field('activity', 'H'),
+    Field('motionFlag', 'B'),
+    Field('scdState', 'B'),
+    Field('rssi', 'b'),                    # dBm
+])
+
+
+class SchemaRegistry:
+    """
+    스키마 레지스트리
+
+    펌웨어 버전(bands.sw_ver)별로 보내는 스키마를 등록해 두고 그 스키마로 해석한다.
+    sw_ver가 등록되지 않았거나 프레임의 버전 바이트와 다르면
+    (펌웨어 업데이트 직후 sw_ver 보고 전 등) 버전 바이트의 스키마를 사용한다.
+    """
+
+    def __init__(self, schemas=()):
+        self._lock = threading.Lock()
+        self._schemas = {}      # 스키마 버전 → TelemetrySchema
+        self._firmware = {}     # sw_ver → 스키마 버전
+        self._resolved = {}     # sw_ver → TelemetrySchema (접두사 검색 결과 캐시)
+        self._decoded = 0
+        self._mismatch = 0
+        self._errors = 0
+        for schema in schemas:
+            self.register(schema)
+
+    def register(self, schema, sw_vers=()):
+        """
+        스키마 등록
+
+        Args:
+            schema: TelemetrySchema
+            sw_vers: 이 스키마를 보내는 펌웨어 버전 목록
+        """
+        with self._lock:
+            self._schemas[schema.version] = schema
+            for sw_ver in sw_vers:
+                self._firmware[sw_ver] = schema.version
+            self._resolved = {}
+
+    def map_firmware(self, sw_ver, version):
+        """펌웨어 버전 → 스키마 버전 지정"""
+        if version not in self._schemas:
+            raise KeyError(f"Unknown telemetry schema version: {version}")
+        with self._lock:
+            self._firmware[sw_ver] = version
+            self._resolved = {}
+
+    def get(self, version):
+        return self._schemas.get(version)
+
+    def for_firmware(self, sw_ver):
+        """
+        펌웨어 버전의 스키마 ('2.1.3'은 '2.1.3', '2.1', '2' 순서로 찾음)
+
+        Returns:
+            TelemetrySchema: 등록되지 않았으면 None
+        """
+        try:
+            return self._resolved[sw_ver]
+        except KeyError:
+            pass
+
+        schema = None
+        key = sw_ver
+        while key:
+            version = self._firmware.get(key)
+            if version is not None:
+                schema = self._schemas.get(version)
+                break
+            key = key.rpartition('.')[0]
+        self._resolved[sw_ver] = schema
+        return schema
+
+    def decode(self, data, sw_ver=None):
+        """
+        프레임 해석
+
+        Args:
+            data: 바이너리 프레임
+            sw_ver: 밴드 펌웨어 버전
+
+        Returns:
+            dict: 표준 측정값 필드
+        """
+        if not data:
+            self._errors += 1
+            raise TelemetryError("Empty telemetry frame")
+
+        version = data[0]
+        schema = self.for_firmware(sw_ver)
+        if schema is None or schema.version != version:
+            if schema is not None:
+                self._mismatch += 1
+            schema = self._schemas.get(version)
+            if schema is None:
+                self._errors += 1
+                raise TelemetryError(f"Unknown telemetry schema version: {version}")
+
+        try:
+            values = schema.decode(data)
+        except TelemetryError:
+            self._errors += 1
+            raise
+        self._decoded += 1
+        return values
+
+    def get_stats(self):
+        """해석 통계"""
+        return {
+            'schemas': sorted(self._schemas),
+            'firmware': dict(self._firmware),
+            'decoded': self._decoded,
+            'firmware_mismatch': self._mismatch,
+            'errors': self._errors
+        }
+
+
+# 전역 레지스트리
+telemetry_registry = SchemaRegistry([SCHEMA_V1])
+
+
+def init_telemetry(app):
+    """
+    설정의 펌웨어 → 스키마 매핑 등록
+
+    TELEMETRY_SCHEMA_BY_SW_VER = {'2.1': 1, ...}
+    """
+    for sw_ver, version in app.config.get('TELEMETRY_SCHEMA_BY_SW_VER', {}).items():
+        try:
+            telemetry_registry.map_firmware(sw_ver, int(version))
+        except (KeyError, ValueError) as e:
+            app.logger.warning(f"Telemetry schema mapping for sw_ver {sw_ver} ignored: {e}")
+    return telemetry_registry
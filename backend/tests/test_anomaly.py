@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+생체신호 이상 구간 감지 테스트
+"""
+
+from datetime import datetime, timedelta
+
+from anomaly import AnomalyDetector, DEFAULT_RULES, apply_overrides
+from band_cache import BandInfo
+from ingest_engine import SensorReading
+
+
+BAND = BandInfo(7, '467191213660619', '홍길동', None, None, '')
+START = datetime(2024, 5, 1, 9, 0, 0)
+
+
+def _feed(detector, values, field='hr', start=0, band=BAND):
+    """1초 간격 측정값 재생 → 발생한 Onset 목록"""
+    onsets = []
+    for i, value in enumerate(values):
+        reading = SensorReading(band.bid, START + timedelta(seconds=start + i), **{field: value})
+        onsets.extend(detector.observe(band, reading))
+    return onsets
+
+
+def _detector(**kwargs):
+    return AnomalyDetector(profile_loader=lambda band_id: None, **kwargs)
+
+
+class TestEpisodes:
+    """구간당 이벤트 한 번"""
+
+    def test_one_event_per_episode(self):
+        """기준 부근에서 오르내리는 빈맥 5분 → 이벤트 1건"""
+        detector = _detector()
+        episode = [125, 131, 118, 128, 122, 136] * 50
+        onsets = _feed(detector, [75] * 30 + episode + [75] * 60)
+
+        assert [o.rule.name for o in onsets] == ['hr_high']
+        assert onsets[0].rule.type == 8
+        assert onsets[0].value >= 131
+        # 디바운스(10초) 만큼 늦게 감지
+        assert 10 <= onsets[0].detected_at - onsets[0].started_at < 12
+
+    def test_short_spike_is_ignored(self):
+        detector = _detector()
+        assert _feed(detector, [75] * 20 + [180, 185] + [75] * 20) == []
+
+    def test_hysteresis_and_rearm(self):
+        """해제 기준(110) 아래로 clear_after초 유지해야 다음 구간 이벤트"""
+        detector = _detector()
+        onsets = _feed(detector, [130] * 20 + [115] * 60 + [130] * 20)
+        assert len(onsets) == 1
+
+        onsets = _feed(detector, [80] * 40 + [130] * 20, start=100)
+        assert len(onsets) == 1
+
+    def test_independent_rules(self):
+        detector = _detector()
+        onsets = []
+        for i in range(30):
+            reading = SensorReading(BAND.bid, START + timedelta(seconds=i), hr=45, spo2=91)
+            onsets.extend(detector.observe(BAND, reading))
+        assert sorted(o.rule.name for o in onsets) == ['hr_low', 'spo2_low']
+
+    def test_zero_is_not_a_reading(self):
+        detector = _detector()
+        assert _feed(detector, [0] * 60) == []
+
+    def test_gap_resets_window(self):
+        """측정 공백 뒤에는 이전 값으로 구간을 이어가지 않음"""
+        detector = _detector(gap_reset=60)
+        assert _feed(detector, [130] * 8) == []
+        assert _feed(detector, [130] * 8, start=600) == []
+
+
+class TestProfiles:
+    """설정/밴드/처방별 기준"""
+
+    def test_apply_overrides(self):
+        rules = apply_overrides(DEFAULT_RULES, {'hr_high': {'enter': 140, 'window': '3', 'bogus': 1}})
+        hr_high = rules[0]
+        assert (hr_high.enter, hr_high.window, hr_high.exit) == (140, 3, 110)
+        assert rules[1:] == DEFAULT_RULES[1:]
+
+    def test_prescription_overrides_band_config(self):
+        """운동 처방 환자는 빈맥 기준을 높게"""
+        other = BandInfo(8, '467191213660620', '김철수', None, None, '')
+        detector = AnomalyDetector(
+            profile_loader=lambda band_id: {'hr_high': {'enter': 150}} if band_id == 7 else None)
+        detector.band_overrides = {BAND.bid: {'hr_high': {'enter': 140, 'debounce': 0}}}
+
+        assert _feed(detector, [145] * 30) == []
+        assert len(_feed(detector, [145] * 30, band=other)) == 1
+
+    def test_profile_reload_after_ttl(self):
+        clock = [0.0]
+        profile = {}
+        detector = AnomalyDetector(profile_loader=lambda band_id: profile, profile_ttl=60,
+                                   clock=lambda: clock[0])
+        _feed(detector, [100] * 5)
+
+        profile['hr_high'] = {'enter': 90, 'exit': 85}
+        assert _feed(detector, [100] * 20, start=5) == []
+        clock[0] = 61
+        assert len(_feed(detector, [100] * 20, start=25)) == 1
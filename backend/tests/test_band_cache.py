@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+밴드 식별 캐시 테스트
+"""
+
+import time
+import pytest
+from band_cache import BandCache, BandInfo
+
+
+def _make_loader(known):
+    calls = []
+
+    def loader(bid):
+        calls.append(bid)
+        if bid in known:
+            return BandInfo(known[bid], bid, '홍길동', None, None, '')
+        return None
+
+    return loader, calls
+
+
+class TestBandCache:
+    """bid → BandInfo 캐시 테스트"""
+
+    def test_hit_after_first_load(self):
+        """첫 조회 이후에는 loader를 호출하지 않음"""
+        loader, calls = _make_loader({'467191213660619': 1})
+        cache = BandCache(loader=loader)
+
+        assert cache.get('467191213660619').id == 1
+        assert cache.get('467191213660619').id == 1
+        assert calls == ['467191213660619']
+        assert cache.get_stats()['hits'] == 1
+
+    def test_negative_cache(self):
+        """미등록 bid도 캐시하여 반복 조회 차단"""
+        loader, calls = _make_loader({})
+        cache = BandCache(loader=loader)
+
+        for _ in range(5):
+            assert cache.get('999999999999999') is None
+
+        assert calls == ['999999999999999']
+        assert cache.get_stats()['negative_hits'] == 4
+
+    def test_ttl_expiry(self):
+        """TTL이 지나면 다시 조회"""
+        loader, calls = _make_loader({'467191213660619': 1})
+        cache = BandCache(ttl=0.01, loader=loader)
+
+        cache.get('467191213660619')
+        time.sleep(0.02)
+        cache.get('467191213660619')
+
+        assert len(calls) == 2
+
+    def test_invalidate_clears_negative_entry(self):
+        """밴드 등록 후 무효화하면 즉시 조회됨"""
+        known = {}
+        loader, calls = _make_loader(known)
+        cache = BandCache(loader=loader)
+
+        assert cache.get('467191213660620') is None
+        known['467191213660620'] = 2
+        cache.invalidate('467191213660620')
+
+        assert cache.get('467191213660620').id == 2
+
+    def test_negative_cache_is_bounded(self):
+        """위조 bid가 많아도 미등록 캐시 크기는 제한됨"""
+        loader, _ = _make_loader({})
+        cache = BandCache(max_negative_size=10, loader=loader)
+
+        for i in range(100):
+            cache.get(f'spoofed-{i}')
+
+        assert cache.get_stats()['negative_size'] == 10
+
+    def test_invalidate_during_load_is_not_cached(self):
+        """조회 도중 무효화되면 읽어온 (이전) 행을 캐시하지 않음"""
+        known = {'467191213660619': 1}
+        calls = []
+        cache = None
+
+        def loader(bid):
+            calls.append(bid)
+            info = BandInfo(known[bid], bid, '홍길동', None, None, '')
+            if len(calls) == 1:
+                # 조회 중 다른 프로세스에서 밴드 수정 → 무효화 도착
+                known[bid] = 2
+                cache.invalidate(bid)
+            return info
+
+        cache = BandCache(loader=loader)
+        assert cache.get('467191213660619').id == 1
+        assert cache.get('467191213660619').id == 2
+        assert cache.get('467191213660619').id == 2
+        assert len(calls) == 2
+
+    def test_put_is_bounded(self):
+        """직접 등록도 최대 크기를 넘으면 오래된 항목부터 제거"""
+        cache = BandCache(max_size=3, loader=lambda bid: None)
+        for i in range(5):
+            cache.put(BandInfo(i, f'b{i}', None, None, None, ''))
+
+        assert cache.get_stats()['size'] == 3
+        assert cache.get('b0') is None
+        assert cache.get('b4').id == 4
+
+    def test_invalidate_band_notifies_other_processes(self, monkeypatch):
+        """등록/수정/삭제 무효화는 MQTT로 수집 워커에도 알림"""
+        import band_cache as module
+        from backend import mqtt_client
+
+        published = []
+        monkeypatch.setattr(mqtt_client, 'publish', lambda topic, payload: published.append((topic, payload)))
+        loader, _ = _make_loader({})
+        cache = BandCache(loader=loader)
+        monkeypatch.setattr(module, 'band_cache', cache)
+
+        assert cache.get('467191213660620') is None
+        module.invalidate_band('467191213660620')
+
+        assert cache.get_stats()['negative_size'] == 0
+        assert published == [(mqtt_client.Topics.BAND_CACHE_INVALIDATE, {'bid': '467191213660620'})]
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+타이머 휠 기반 오프라인 감지 테스트
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+import backend
+from backend.band_presence import BandPresence, TimerWheel
+from backend.db.table import Band, Event
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _presence(clock, timeout=300, offline=None):
+    """writer가 만료된 밴드를 그대로 오프라인 처리하는 BandPresence"""
+    def writer(expired):
+        if offline is not None:
+            offline.extend(band_id for band_id, _, _ in expired)
+        return expired
+    return BandPresence(timeout=timeout, tick=1.0, clock=clock, writer=writer)
+
+
+class TestTimerWheel:
+    """만료된 항목만 꺼냄"""
+
+    def test_expires_only_due_keys(self):
+        wheel = TimerWheel(tick=1.0, slots=64)
+        for i in range(1000):
+            wheel.schedule(i, 10 + i % 50)
+
+        assert wheel.advance(9) == []
+        assert sorted(wheel.advance(10)) == [i for i in range(1000) if i % 50 == 0]
+        assert len(wheel) == 980
+
+    def test_deadline_beyond_one_lap(self):
+        wheel = TimerWheel(tick=1.0, slots=8)
+        wheel.schedule('far', 20)
+        assert wheel.advance(12) == []
+        assert 'far' in wheel
+        assert wheel.advance(20) == ['far']
+
+    def test_cancel_and_reschedule(self):
+        wheel = TimerWheel(tick=1.0, slots=16)
+        wheel.schedule('a', 5)
+        wheel.schedule('b', 5)
+        wheel.cancel('a')
+        wheel.schedule('b', 9)
+        assert wheel.advance(5) == []
+        assert wheel.advance(9) == ['b']
+        assert len(wheel) == 0
+
+    def test_long_stall_checks_every_slot_once(self):
+        wheel = TimerWheel(tick=1.0, slots=16)
+        wheel.schedule('a', 3)
+        wheel.schedule('b', 40)
+        assert sorted(wheel.advance(1000)) == ['a', 'b']
+
+
+class TestBandPresence:
+    """마지막 수신 후 timeout이 지나면 한 번만 오프라인"""
+
+    def test_silent_band_goes_offline(self):
+        clock, offline = FakeClock(), []
+        presence = _presence(clock, offline=offline)
+        presence.touch(1, 'b1')
+        presence.touch(2, 'b2')
+
+        clock.now = 299
+        assert presence.expire() == []
+        clock.now = 300
+        assert sorted(presence.expire()) == [1, 2]
+        clock.now = 900
+        assert presence.expire() == []
+        assert sorted(offline) == [1, 2]
+
+    def test_active_band_is_rescheduled_lazily(self):
+        """메시지마다 휠을 조작하지 않고 만료 시점에 마지막 수신 기준으로 재등록"""
+        clock, offline = FakeClock(), []
+        presence = _presence(clock, offline=offline)
+        for second in range(0, 600, 10):
+            clock.now = second
+            presence.touch(1, 'b1')
+            presence.expire()
+
+        stats = presence.get_stats()
+        assert offline == []
+        assert stats['touches'] == 60
+        assert stats['rescheduled'] == 1
+        assert stats['tracked_bands'] == 1
+
+        clock.now = 590 + 300
+        assert presence.expire() == [1]
+
+    def test_offline_band_releases_throttle_state(self, monkeypatch):
+        """오프라인이 된 밴드 룸의 발송 제한 기록 정리"""
+        from backend.emit_throttle import EmitThrottle
+
+        throttle = EmitThrottle()
+        throttle._last_sent = {('sensor_update', 'band_b1', None): 0.0, ('sensor_update', 'band_b2', None): 0.0}
+        monkeypatch.setattr('backend.emit_throttle.emit_throttle', throttle)
+
+        clock = FakeClock()
+        presence = _presence(clock)
+        presence.touch(1, 'b1')
+        clock.now = 200
+        presence.touch(2, 'b2')
+        clock.now = 300
+        assert presence.expire() == [1]
+        assert list(throttle._last_sent) == [('sensor_update', 'band_b2', None)]
+
+    def test_forget_stops_tracking(self):
+        clock = FakeClock()
+        presence = _presence(clock)
+        presence.touch(1, 'b1')
+        presence.forget(1)
+        clock.now = 1000
+        assert presence.expire() == []
+
+    def test_seed_uses_last_connect_time(self):
+        """재시작 전 온라인 밴드는 DB의 connect_time 기준으로 남은 시간만 기다림"""
+        clock = FakeClock()
+        presence = _presence(clock)
+        now = datetime.utcnow()
+        presence.seed([
+            (1, 'b1', now - timedelta(seconds=250)),
+            (2, 'b2', now - timedelta(seconds=10)),
+            (3, 'b3', None),
+        ])
+
+        clock.now = 1
+        assert presence.expire() == [3]
+        clock.now = 60
+        assert presence.expire() == [1]
+        clock.now = 300
+        assert presence.expire() == [2]
+
+    def test_skipped_bands_are_counted(self):
+        """다른 워커가 최근 메시지를 받은 밴드는 writer가 건너뜀"""
+        clock = FakeClock()
+        presence = BandPresence(timeout=60, clock=clock, writer=lambda expired: expired[:1])
+        presence.touch(1, 'b1')
+        presence.touch(2, 'b2')
+        clock.now = 60
+        assert len(presence.expire()) == 1
+        assert presence.get_stats()['skipped'] == 1
+
+
+class TestWriteOffline:
+    """bands 일괄 UPDATE"""
+
+    @pytest.fixture
+    def app(self, monkeypatch):
+        db = backend.app.extensions['sqlalchemy']
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        monkeypatch.setattr('backend.band_state.band_state.note_persisted', lambda band_id, state: None)
+
+        with app.app_context():
+            db.metadata.create_all(db.engine)
+            now = datetime.utcnow()
+            db.session.add_all([
+                Band(id=1, bid='b1', name='a', connect_state=1, connect_time=now - timedelta(seconds=600)),
+                # 다른 워커가 방금 메시지를 받아 connect_time을 갱신한 밴드
+                Band(id=2, bid='b2', name='b', connect_state=1, connect_time=now),
+                Band(id=3, bid='b3', name='c', connect_state=0, connect_time=now - timedelta(seconds=600)),
+            ])
+            db.session.commit()
+        yield app, db
+
+    def test_only_stale_online_bands(self, app):
+        app, db = app
+        presence = BandPresence(app, timeout=300)
+        offline = presence._write_offline([(1, 'b1', 300.0), (2, 'b2', 300.0), (3, 'b3', 300.0)])
+
+        assert [band_id for band_id, _, _ in offline] == [1]
+        with app.app_context():
+            states = {band.id: band.connect_state for band in db.session.query(Band).all()}
+            assert states == {1: 0, 2: 1, 3: 0}
+            assert db.session.get(Band, 1).disconnect_time is not None
+
+    def test_inserts_offline_events(self, app):
+        """오프라인 처리한 밴드마다 기기 오프라인 이벤트 (같은 트랜잭션, INSERT 한 번)"""
+        from sqlalchemy import event as sa_event
+
+        app, db = app
+        presence = BandPresence(app, timeout=300)
+        inserts = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO events'):
+                inserts.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        sa_event.listen(engine, 'before_cursor_execute', before_execute)
+        try:
+            presence._write_offline([(1, 'b1', 300.0), (2, 'b2', 300.0), (3, 'b3', 300.0)])
+        finally:
+            sa_event.remove(engine, 'before_cursor_execute', before_execute)
+
+        assert len(inserts) == 1
+        with app.app_context():
+            events = db.session.query(Event).all()
+            assert [(e.FK_bid, e.event_type, e.event_level, e.action_status) for e in events] == [
+                (1, 'device_offline', 2, 0)
+            ]
+            assert events[0].message == 'a님 밴드 연결 끊김'
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+밴드 상태 write-behind 저장소 테스트
+"""
+
+import pytest
+from band_state import BandStateStore
+
+
+class _Writer:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError('db down')
+        self.calls.append(sorted(rows, key=lambda r: r['id']))
+
+
+def _running_store(writer):
+    """반영 스레드 없이 running 상태로 둔 저장소 (주기 반영은 flush()로 대신)"""
+    store = BandStateStore(writer=writer)
+    store.running = True
+    return store
+
+
+class TestBandStateStore:
+    """밴드 상태 저장소 테스트"""
+
+    def test_transition_flushes_immediately(self):
+        """온라인 전환은 바로 DB 반영"""
+        writer = _Writer()
+        store = _running_store(writer)
+
+        assert store.update(1, connect_state=1, connect_time='t1') is True
+        assert writer.calls == [[{'id': 1, 'connect_state': 1, 'connect_time': 't1'}]]
+        assert store.dirty_count() == 0
+
+    def test_non_transition_updates_are_coalesced(self):
+        """같은 상태의 반복 갱신은 최신 값 하나로 모아 반영"""
+        writer = _Writer()
+        store = _running_store(writer)
+        store.update(1, connect_state=1, connect_time='t1')
+
+        for t in ('t2', 't3', 't4'):
+            assert store.update(1, connect_state=1, connect_time=t) is False
+        store.update(2, latitude=37.5, longitude=127.0)
+        assert len(writer.calls) == 1
+
+        assert store.flush() == 2
+        assert writer.calls[-1] == [
+            {'id': 1, 'connect_time': 't4'},
+            {'id': 2, 'latitude': 37.5, 'longitude': 127.0},
+        ]
+        assert store.flush() == 0
+
+    def test_failed_flush_keeps_rows_dirty(self):
+        """저장 실패 시 다음 주기에 다시 반영"""
+        writer = _Writer()
+        store = _running_store(writer)
+        store.update(1, connect_state=1, connect_time='t1')
+
+        writer.fail = True
+        store.update(1, connect_time='t2')
+        with pytest.raises(RuntimeError):
+            store.flush()
+        assert store.dirty_count() == 1
+
+        writer.fail = False
+        assert store.flush() == 1
+        assert writer.calls[-1] == [{'id': 1, 'connect_time': 't2'}]
+
+    def test_note_persisted_from_offline_checker(self):
+        """오프라인 감지 스레드가 기록한 상태 이후 재접속은 전환으로 처리"""
+        writer = _Writer()
+        store = _running_store(writer)
+        store.update(1, connect_state=1, connect_time='t1')
+
+        store.note_persisted(1, 0)
+        assert store.get(1)['connect_state'] == 0
+        assert store.update(1, connect_state=1, connect_time='t2') is True
+        assert writer.calls[-1] == [{'id': 1, 'connect_state': 1, 'connect_time': 't2'}]
+
+    def test_seeded_state_is_not_a_transition(self):
+        """시작 시 DB의 connect_state를 기준으로 두면 첫 메시지는 주기 반영으로 모음"""
+        writer = _Writer()
+        store = _running_store(writer)
+        store.seed_persisted({1: 1, 2: 0})
+
+        assert store.update(1, connect_state=1, connect_time='t1') is False
+        assert writer.calls == []
+        assert store.update(2, connect_state=1, connect_time='t1') is True
+        # 전환 시 즉시 반영에는 모아둔 밴드 1도 함께 포함
+        assert [[row['id'] for row in rows] for rows in writer.calls] == [[1, 2]]
+
+        # 이미 아는 밴드의 기준값은 유지
+        store.seed_persisted({2: 0})
+        assert store.update(2, connect_state=1, connect_time='t2') is False
+
+    def test_load_persisted_reads_bands(self):
+        from flask import Flask
+        import backend
+        from backend.db.table import Band
+
+        db = backend.app.extensions['sqlalchemy']
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.metadata.create_all(db.engine, tables=[Band.__table__])
+            db.session.add_all([Band(id=1, bid='b1', connect_state=1), Band(id=2, bid='b2', connect_state=0)])
+            db.session.commit()
+
+        assert BandStateStore(app, writer=_Writer())._load_persisted() == {1: 1, 2: 0}
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            BandStateStore(writer=_Writer()).update(1, battery=50)
@@ -90,3 +90,106 @@ class TestBandAPI:
         data = json.loads(response.data)
         assert data['success'] is True
         assert 'bid' in data['data']
+
+
+@pytest.fixture(scope='module')
+def page_app():
+    """이름 정렬/동시각 센서 행 확인용 SQLite 앱"""
+    from datetime import datetime
+    from flask import Flask
+    import backend
+    from backend.db.table import Band, SensorData
+
+    db = backend.app.extensions['sqlalchemy']
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.metadata.create_all(db.engine)
+        at = datetime(2024, 8, 1, 12, 0, 0)
+        # id 순서와 이름 순서가 다르도록 (온라인 3개, 오프라인 2개)
+        names = {1: '홍길동', 2: '김철수', 3: '박영희', 4: '이민수', 5: '김철수'}
+        for band_id, name in names.items():
+            db.session.add(Band(id=band_id, bid=f'46719121366{band_id:04d}', name=name,
+                                connect_state=1 if band_id in (1, 2, 5) else 0))
+            # 모든 밴드가 같은 시각의 센서 행을 두 개씩 가짐
+            for hr in (70, 80):
+                db.session.add(SensorData(FK_bid=band_id, datetime=at, hr=hr, spo2=98, battery_level=80))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+class TestBandListPage:
+    """get_band_list_page() 정렬/페이지 경계"""
+
+    def _pages(self, limit):
+        from backend.db.service import select
+
+        pages, after = [], None
+        while True:
+            rows, has_more = select.get_band_list_page(after=after, limit=limit)
+            pages.append(([row[0].id for row in rows], has_more))
+            if not has_more:
+                return pages
+            last = rows[-1][0]
+            after = (last.connect_state or 0, last.name or '', last.id)
+
+    def test_orders_by_state_then_name(self, page_app):
+        from backend.db.service import select
+
+        with page_app.app_context():
+            rows, has_more = select.get_band_list_page()
+        assert [row[0].id for row in rows] == [2, 5, 1, 3, 4]
+        assert has_more is False
+        # 같은 시각의 행이 여러 개여도 밴드당 한 행 (id가 큰 행)
+        assert [row[1] for row in rows] == [80] * 5
+
+    def test_keyset_pages_follow_name_order(self, page_app):
+        with page_app.app_context():
+            pages = self._pages(limit=2)
+        assert pages == [([2, 5], True), ([1, 3], True), ([4], False)]
+
+    def test_has_more_is_exact_with_tied_sensor_rows(self, page_app):
+        with page_app.app_context():
+            pages = self._pages(limit=5)
+        assert pages == [([2, 5, 1, 3, 4], False)]
+
+    def _get_list(self, page_app, query, monkeypatch):
+        """인증 데코레이터를 건너뛰고 목록 API 뷰 함수 직접 호출"""
+        from backend.api import bands
+
+        # Band.stimulator_connected 매핑 문제로 Band.to_dict()가 실패하므로 항목 변환은 bid만
+        monkeypatch.setattr(bands, 'band_list_item', lambda row: {'bid': row[0].bid})
+        with page_app.test_request_context(f'/list?{query}'):
+            response = bands.get_band_list.__wrapped__()
+            if isinstance(response, tuple):
+                response, status = response
+            else:
+                status = response.status_code
+            return status, response.get_json()
+
+    def test_api_cursor_pagination(self, page_app, monkeypatch):
+        """커서 페이지네이션으로 전체 밴드를 중복 없이 조회"""
+        seen = []
+        query = 'limit=2'
+        while query:
+            status, data = self._get_list(page_app, query, monkeypatch)
+            assert status == 200
+            assert len(data['data']) <= 2
+            seen.extend(band['bid'] for band in data['data'])
+            query = f"limit=2&cursor={data['next_cursor']}" if data['next_cursor'] else None
+
+        assert seen == ['467191213660002', '467191213660005', '467191213660001',
+                        '467191213660003', '467191213660004']
+
+    def test_api_invalid_cursor(self, page_app, monkeypatch):
+        """잘못된 커서 또는 정렬 키 형식이 다른 커서는 400"""
+        from backend.utils import encode_cursor
+
+        for cursor in ('not-a-cursor', encode_cursor(1, 5), encode_cursor('1', '김철수', 2),
+                       encode_cursor(1, 7, 2), encode_cursor(1, '김철수', '2')):
+            status, _ = self._get_list(page_app, f'cursor={cursor}', monkeypatch)
+            assert status == 400, cursor
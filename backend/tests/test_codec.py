@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 코덱 테스트
+"""
+
+import importlib.util
+import json
+import sys
+from datetime import datetime
+
+import pytest
+import socketio
+from socketio import packet
+
+from backend import codec
+from backend.codec import Encoded, SocketIOJSON
+from backend.socket_handlers import alert_rooms
+
+
+SAMPLE = {'bid': '467191213660619', 'hr': 72, 'skin_temp': 36.5, 'name': '홍길동', 'tags': ['a', None]}
+
+
+class TestCodec:
+    """디코딩/인코딩 테스트"""
+
+    @pytest.mark.parametrize('raw', [
+        json.dumps(SAMPLE).encode(),
+        bytearray(json.dumps(SAMPLE).encode()),
+        memoryview(json.dumps(SAMPLE).encode()),
+        json.dumps(SAMPLE),
+    ])
+    def test_loads_without_str_copy(self, raw):
+        assert codec.loads(raw) == SAMPLE
+
+    def test_decode_error(self):
+        with pytest.raises(codec.DecodeError):
+            codec.loads(b'{"hr": ')
+
+    def test_dumps_compact_bytes(self):
+        data = codec.dumps({'dt': datetime(2024, 1, 2, 3, 4, 5), 'hr': 70})
+        assert data == b'{"dt":"2024-01-02T03:04:05","hr":70}'
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        """orjson이 없어도 같은 결과 (별도 이름으로 모듈을 다시 불러 확인)"""
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+        spec = importlib.util.spec_from_file_location('codec_fallback', codec.__file__)
+        fallback = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(fallback)
+
+        assert fallback.BACKEND == 'json'
+        assert fallback.loads(memoryview(b'{"a":1}')) == {'a': 1}
+        assert json.loads(fallback.dumps(SAMPLE)) == SAMPLE
+
+
+class TestEncoded:
+    """미리 직렬화한 값 재사용"""
+
+    def test_socketio_packet_uses_preencoded_text(self):
+        encoded = Encoded({'seq': 1}, b'{"seq":1,"bands":[]}')
+        assert SocketIOJSON.dumps(['dashboard_frame', encoded]) == '["dashboard_frame",{"seq":1,"bands":[]}]'
+        assert SocketIOJSON.dumps(['sensor_update', {'hr': 70}]) == '["sensor_update",{"hr":70}]'
+
+    def test_other_serializers_use_value(self):
+        encoded = Encoded({'seq': 1})
+        assert codec.loads(codec.dumps({'message': encoded})) == {'message': {'seq': 1}}
+
+    def test_room_list_emit_encodes_once(self, monkeypatch):
+        """알림을 여러 룸에 보내도 패킷 직렬화는 한 번, 클라이언트별 수신도 한 번"""
+        monkeypatch.setattr(packet.Packet, 'json', SocketIOJSON)
+        calls = []
+        dumps = SocketIOJSON.dumps
+        monkeypatch.setattr(SocketIOJSON, 'dumps', staticmethod(lambda obj, *a, **k: calls.append(obj) or dumps(obj)))
+
+        server = socketio.Server()
+        sent = []
+        monkeypatch.setattr(server, '_send_eio_packet', lambda eio_sid, pkt: sent.append(eio_sid))
+
+        both = server.manager.connect('eio-1', '/')
+        server.manager.enter_room(both, '/', 'alerts')
+        server.manager.enter_room(both, '/', 'dashboard')
+        band = server.manager.connect('eio-2', '/')
+        server.manager.enter_room(band, '/', 'band_b1')
+
+        server.emit('alert_new', {'type': 6}, to=alert_rooms('b1'))
+
+        assert len(calls) == 1
+        assert sorted(sent) == ['eio-1', 'eio-2']
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 프레임 집계기 테스트
+"""
+
+import json
+
+from dashboard_frame import DashboardFrameAggregator, FRAME_FIELDS
+
+
+class _SocketIO:
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, event, data, room=None):
+        self.sent.append((event, data, room))
+
+
+def _running_aggregator():
+    """발송 스레드 없이 running 상태로 둔 집계기 (tick은 flush()로 대신)"""
+    socketio = _SocketIO()
+    aggregator = DashboardFrameAggregator(socketio=socketio)
+    aggregator.running = True
+    return aggregator, socketio
+
+
+class TestDashboardFrameAggregator:
+    """대시보드 프레임 집계기 테스트"""
+
+    def test_tick_emits_one_frame_for_many_bands(self):
+        aggregator, socketio = _running_aggregator()
+
+        for i in range(100):
+            aggregator.update(f'bid{i}', hr=70 + i % 10, spo2=98)
+        assert socketio.sent == []
+
+        frame = aggregator.flush()
+        assert len(socketio.sent) == 1
+        event, data, room = socketio.sent[0]
+        assert (event, room) == ('dashboard_frame', 'dashboard')
+        # 발송 데이터는 한 번 직렬화된 프레임
+        assert data.value is frame
+        assert json.loads(data.data) == json.loads(json.dumps(frame))
+        assert len(frame['bands']) == 100
+        assert frame['fields'] == FRAME_FIELDS
+
+    def test_changes_merge_per_band(self):
+        """같은 tick 안의 변경은 필드별 최신 값으로 병합, 변경 없는 항목은 None"""
+        aggregator, _ = _running_aggregator()
+
+        aggregator.update('b1', hr=70, spo2=98)
+        aggregator.update('b1', hr=75)
+        aggregator.update('b1', status='online', battery=None)
+        aggregator.update('b1', latitude=37.5, longitude=127.0)
+
+        frame = aggregator.flush()
+        assert frame['bands'] == [['b1', 75, 98, None, 'online', 37.5, 127.0]]
+
+    def test_frame_metrics(self):
+        aggregator, _ = _running_aggregator()
+        aggregator.update('b1', hr=70)
+
+        frame = aggregator.flush()
+        assert frame['size'] == len(json.dumps(frame['bands'], separators=(',', ':')))
+        assert frame['encode_ms'] >= 0
+
+        stats = aggregator.get_stats()
+        assert stats['frames'] == 1
+        assert stats['bands_sent'] == 1
+        assert stats['last_frame_bytes'] == frame['size']
+
+    def test_empty_tick_sends_nothing(self):
+        aggregator, socketio = _running_aggregator()
+
+        assert aggregator.flush() is None
+        aggregator.update('b1', hr=None)
+        assert aggregator.flush() is None
+        assert socketio.sent == []
+
+    def test_seq_increases(self):
+        aggregator, _ = _running_aggregator()
+
+        aggregator.update('b1', hr=70)
+        first = aggregator.flush()
+        aggregator.update('b1', hr=71)
+        second = aggregator.flush()
+
+        assert second['seq'] == first['seq'] + 1
+
+    def test_immediate_when_not_running(self):
+        socketio = _SocketIO()
+        aggregator = DashboardFrameAggregator(socketio=socketio)
+
+        aggregator.update('b1', hr=70)
+        assert len(socketio.sent) == 1
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 요약 캐시 테스트
+"""
+
+from datetime import datetime, timedelta
+import dashboard_summary as summary_module
+from dashboard_summary import DashboardSummaryCache, delta_emitter, send_snapshot
+
+
+def _snapshot(**overrides):
+    snapshot = {
+        'total_bands': 3,
+        'online_band_ids': [1],
+        'unread_events': 2,
+        'urgent_events': 1,
+        'today': datetime.utcnow().date(),
+        'today_events': 2,
+        'today_sessions': 0,
+        'active_session_ids': [],
+    }
+    snapshot.update(overrides)
+    return snapshot
+
+
+class TestDashboardSummaryCache:
+    """대시보드 요약 캐시 테스트"""
+
+    def _cache(self, **overrides):
+        cache = DashboardSummaryCache(loader=lambda: _snapshot(**overrides))
+        cache.reconcile()
+        cache.running = True  # 조회 시 매번 DB 대조하지 않도록
+        return cache
+
+    def test_band_online_is_idempotent(self):
+        """같은 밴드의 반복 온라인 알림은 한 번만 집계"""
+        cache = self._cache()
+        for _ in range(3):
+            cache.set_band_online(2, True)
+        cache.set_band_online(1, False)
+
+        summary = cache.get_summary()
+        assert summary['online_bands'] == 1
+        assert summary['offline_bands'] == 2
+
+    def test_event_lifecycle(self):
+        """이벤트 생성 → 처리중 → 완료"""
+        cache = self._cache()
+        cache.event_created(6, 0)
+        summary = cache.get_summary()
+        assert (summary['unread_events'], summary['urgent_events'], summary['today_events']) == (3, 2, 3)
+
+        cache.event_status_changed(6, 0, 1)
+        cache.event_status_changed(6, 1, 2)
+        summary = cache.get_summary()
+        assert (summary['unread_events'], summary['urgent_events']) == (2, 1)
+
+    def test_non_urgent_and_old_events(self):
+        """긴급 타입이 아니거나 어제 이벤트는 해당 카운터에 포함하지 않음"""
+        cache = self._cache()
+        cache.event_created(1, 0, datetime.utcnow() - timedelta(days=1))
+
+        summary = cache.get_summary()
+        assert (summary['unread_events'], summary['urgent_events'], summary['today_events']) == (3, 1, 2)
+
+    def test_sessions_and_stimulators(self):
+        cache = self._cache()
+        cache.session_status_changed(10, True)
+        cache.session_status_changed(10, True)
+        cache.session_recorded(datetime.utcnow())
+        cache.set_stimulator_connected('467191213660619', True)
+
+        summary = cache.get_summary()
+        assert summary['active_sessions'] == 1
+        assert summary['today_sessions'] == 1
+        assert summary['stimulator_connected'] == 1
+
+        cache.session_status_changed(10, False)
+        assert cache.get_summary()['active_sessions'] == 0
+
+    def test_reconcile_corrects_drift(self):
+        """DB 대조 시 어긋난 값을 보정하고 보고"""
+        snapshots = [_snapshot(), _snapshot(unread_events=5)]
+        cache = DashboardSummaryCache(loader=lambda: snapshots.pop(0))
+        cache.reconcile()
+        cache.event_created(1, 0)
+
+        drift = cache.reconcile()
+        assert drift == {'unread_events': (3, 5), 'today_events': (3, 2)}
+        cache.running = True
+        assert cache.get_summary()['unread_events'] == 5
+
+    def test_reads_db_when_not_running(self):
+        """대조 스레드가 없으면 매번 DB 집계 사용"""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return _snapshot()
+
+        cache = DashboardSummaryCache(loader=loader)
+        cache.get_summary()
+        cache.get_summary()
+        assert len(calls) == 2
+
+
+class TestDashboardDelta:
+    """대시보드 변경분 발행 테스트"""
+
+    def _cache(self):
+        deltas = []
+        cache = DashboardSummaryCache(
+            loader=_snapshot,
+            on_delta=lambda seq, delta: deltas.append((seq, delta))
+        )
+        cache.reconcile()
+        cache.running = True
+        return cache, deltas
+
+    def test_first_load_does_not_publish(self):
+        cache, deltas = self._cache()
+        assert deltas == []
+        assert cache.get_summary()['seq'] == 0
+
+    def test_changes_publish_sequenced_deltas(self):
+        """변경마다 seq 증가, 변경 없는 호출은 발행하지 않음"""
+        cache, deltas = self._cache()
+        cache.set_band_online(2, True)
+        cache.set_band_online(2, True)
+        cache.event_created(6, 0)
+
+        assert deltas == [
+            (1, {'online_bands': 1, 'offline_bands': -1}),
+            (2, {'unread_events': 1, 'urgent_events': 1, 'today_events': 1}),
+        ]
+        assert cache.get_summary()['seq'] == 2
+
+    def test_deltas_rebuild_summary(self):
+        """스냅샷 + 변경분 적용 결과가 최신 요약과 같음"""
+        cache, deltas = self._cache()
+        client = cache.get_summary()
+
+        cache.set_band_online(3, True)
+        cache.event_created(7, 0)
+        cache.event_status_changed(7, 0, 2)
+        cache.session_status_changed(1, True)
+        cache.set_stimulator_connected('467191213660619', True)
+
+        for seq, delta in deltas:
+            assert seq == client['seq'] + 1
+            client['seq'] = seq
+            for key, value in delta.items():
+                client[key] += value
+
+        latest = cache.get_summary()
+        for key in latest:
+            if key != 'timestamp':
+                assert client[key] == latest[key], key
+
+    def test_reconcile_drift_is_published(self):
+        """DB 대조로 보정된 값도 변경분으로 발행"""
+        snapshots = [_snapshot(), _snapshot(total_bands=4)]
+        deltas = []
+        cache = DashboardSummaryCache(
+            loader=lambda: snapshots.pop(0),
+            on_delta=lambda seq, delta: deltas.append((seq, delta))
+        )
+        cache.reconcile()
+        cache.reconcile()
+
+        assert deltas == [(1, {'total_bands': 1, 'offline_bands': 1})]
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data, room=None):
+        self.emitted.append((event, data, room))
+
+
+class FakeLeader:
+    def __init__(self, is_leader):
+        self.is_leader = is_leader
+
+
+class TestDeltaEmitter:
+    """여러 워커 중 리더만 dashboard_delta 발송"""
+
+    def test_only_leader_emits(self):
+        socketio = FakeSocketIO()
+        leader = FakeLeader(False)
+        emit_delta = delta_emitter(socketio, leader)
+
+        emit_delta(1, {'online_bands': 1})
+        assert socketio.emitted == []
+
+        leader.is_leader = True
+        emit_delta(2, {'online_bands': -1})
+        assert [(event, data['seq'], room) for event, data, room in socketio.emitted] == [
+            ('dashboard_delta', 2, 'dashboard')
+        ]
+        assert 'origin' in socketio.emitted[0][1]
+
+    def test_without_leader_always_emits(self):
+        socketio = FakeSocketIO()
+        delta_emitter(socketio)(1, {'total_bands': 1})
+        assert len(socketio.emitted) == 1
+
+
+class TestSendSnapshot:
+    """요약(dashboard_data)도 dashboard_delta를 발송하는 리더 워커의 seq/origin으로"""
+
+    def _workers(self, monkeypatch):
+        """리더 워커와 다른 워커의 캐시 (같은 DB, seq는 리더에서만 증가)"""
+        leader_cache = DashboardSummaryCache(loader=_snapshot)
+        leader_cache.leader, leader_cache.origin = FakeLeader(True), 'host:1:leader'
+        other_cache = DashboardSummaryCache(loader=_snapshot)
+        other_cache.leader, other_cache.origin = FakeLeader(False), 'host:2:other'
+        for cache in (leader_cache, other_cache):
+            cache.reconcile()
+            cache.running = True
+        leader_cache.set_band_online(2, True)
+
+        published = []
+        monkeypatch.setattr('backend.mqtt_client.publish',
+                            lambda topic, payload: published.append((topic, payload)) or True)
+        return leader_cache, other_cache, published
+
+    def test_non_leader_forwards_to_leader(self, monkeypatch):
+        from backend.mqtt_client import Topics
+
+        leader_cache, other_cache, published = self._workers(monkeypatch)
+        socketio = FakeSocketIO()
+
+        # 클라이언트 소켓을 가진 워커는 요약을 직접 보내지 않고 리더에 요청
+        monkeypatch.setattr(summary_module, 'dashboard_summary', other_cache)
+        assert send_snapshot(socketio, 'sid-1') is False
+        assert socketio.emitted == []
+        assert published == [(Topics.DASHBOARD_SNAPSHOT, {'sid': 'sid-1'})]
+
+        # 요청을 받은 리더 워커가 자신의 seq/origin으로 sid에 발송
+        monkeypatch.setattr(summary_module, 'dashboard_summary', leader_cache)
+        assert send_snapshot(socketio, 'sid-1', forward=False) is True
+        event, data, room = socketio.emitted[0]
+        assert (event, room) == ('dashboard_data', 'sid-1')
+        assert (data['seq'], data['origin'], data['online_bands']) == (1, 'host:1:leader', 2)
+
+    def test_forwarded_request_ignored_by_non_leader(self, monkeypatch):
+        _, other_cache, published = self._workers(monkeypatch)
+        socketio = FakeSocketIO()
+        monkeypatch.setattr(summary_module, 'dashboard_summary', other_cache)
+
+        assert send_snapshot(socketio, 'sid-1', forward=False) is False
+        assert socketio.emitted == [] and published == []
+
+    def test_sends_local_summary_when_request_not_published(self, monkeypatch):
+        _, other_cache, _ = self._workers(monkeypatch)
+        monkeypatch.setattr('backend.mqtt_client.publish', lambda topic, payload: False)
+        monkeypatch.setattr(summary_module, 'dashboard_summary', other_cache)
+        socketio = FakeSocketIO()
+
+        assert send_snapshot(socketio, 'sid-1') is True
+        assert socketio.emitted[0][1]['origin'] == 'host:2:other'
+
+
+class TestIngestWebSplit:
+    """수집 워커(PROCESS_ROLE='ingest')의 변경이 웹 프로세스 요약 캐시에 반영"""
+
+    def test_ingest_updates_reach_web_process(self, monkeypatch):
+        from flask import Flask
+        from backend import dashboard_summary as backend_summary
+        from backend import mqtt_client
+
+        published = []
+        monkeypatch.setattr(mqtt_client, 'publish',
+                            lambda topic, payload: published.append((topic, payload)) or True)
+        monkeypatch.setattr(backend_summary, '_reported', {})
+
+        # 수집 워커: 요약 캐시가 동작하지 않음 → 바뀔 때만 MQTT로 알림
+        monkeypatch.setattr(backend_summary, 'dashboard_summary', DashboardSummaryCache(loader=_snapshot))
+        for _ in range(3):
+            backend_summary.report_band_online(2, True)
+        backend_summary.report_stimulator_connected('467191213660619', True)
+        assert [payload for _, payload in published] == [
+            {'kind': 'band_online', 'key': 2, 'value': True},
+            {'kind': 'stimulator', 'key': '467191213660619', 'value': True},
+        ]
+
+        # 웹 프로세스: 알림 토픽을 받아 자신의 캐시에 반영하고 변경분 발송
+        deltas = []
+        web_cache = DashboardSummaryCache(loader=_snapshot, on_delta=lambda seq, delta: deltas.append(delta))
+        web_cache.reconcile()
+        web_cache.running = True
+        monkeypatch.setattr(backend_summary, 'dashboard_summary', web_cache)
+
+        app = Flask(__name__)
+        app.config['PROCESS_ROLE'] = 'web'
+        handler = mqtt_client.MQTTHandler()
+        monkeypatch.setattr(mqtt_client, 'mqtt_handler', handler)
+        mqtt_client._register_web_handlers(app, None)
+        for topic, payload in published:
+            assert topic in mqtt_client.web_topics(app)
+            handler.handle_message(topic, payload)
+
+        summary = web_cache.get_summary()
+        assert (summary['online_bands'], summary['stimulator_connected']) == (2, 1)
+        assert deltas == [{'online_bands': 1, 'offline_bands': -1}, {'stimulator_connected': 1}]
+
+    def test_web_process_applies_locally(self, monkeypatch):
+        from backend import dashboard_summary as backend_summary
+        from backend import mqtt_client
+
+        published = []
+        monkeypatch.setattr(mqtt_client, 'publish', lambda topic, payload: published.append(topic) or True)
+        cache = DashboardSummaryCache(loader=_snapshot)
+        cache.reconcile()
+        cache.running = True
+        monkeypatch.setattr(backend_summary, 'dashboard_summary', cache)
+
+        backend_summary.report_band_online(1, False)
+        assert published == []
+        assert cache.get_summary()['online_bands'] == 0
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+QoS 1 재전송 중복 제거 테스트
+"""
+
+import time
+
+import pytest
+from flask import Flask
+
+import backend
+from backend import dedup, mqtt_client
+from backend.band_cache import BandInfo, band_cache
+from backend.db.table import Band, Event, SensorData
+from backend.dedup import DedupWindow, message_marker
+from backend.ingest_engine import HandlerChain
+
+
+BID = '467191213660619'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDedupWindow:
+    """시간 구간 단위 키 집합"""
+
+    def test_duplicate_within_window(self):
+        clock = FakeClock()
+        dedup = DedupWindow(window=60, clock=clock)
+        assert dedup.seen(('b1', 1000, 'sensor')) is False
+        clock.now = 90      # 이전 세대로 넘어가도 기억
+        assert dedup.seen(('b1', 1000, 'sensor')) is True
+        assert dedup.seen(('b2', 1000, 'sensor')) is False
+
+    def test_forgets_after_two_windows(self):
+        clock = FakeClock()
+        dedup = DedupWindow(window=60, clock=clock)
+        dedup.seen('k')
+        clock.now = 61
+        dedup.seen('other')
+        clock.now = 122
+        assert dedup.seen('k') is False
+
+    def test_memory_is_bounded(self):
+        dedup = DedupWindow(window=3600, max_keys=100, clock=FakeClock())
+        for i in range(10000):
+            dedup.seen(('band', i))
+
+        stats = dedup.get_stats()
+        assert stats['keys'] <= 200
+        assert stats['early_rotations'] > 0
+        # 직전 키는 여전히 중복으로 판단
+        assert dedup.seen(('band', 9999)) is True
+
+    def test_message_marker(self):
+        assert message_marker({'seq': 0, 'timestamp': 5}) == 0
+        assert message_marker({'timestamp': 5}) == 5
+        assert message_marker({'hr': 70}) is None
+        assert message_marker(None) is None
+
+
+class TestRedelivery:
+    """같은 메시지를 두 번 받아도 한 번만 저장/발송"""
+
+    @pytest.fixture
+    def env(self, monkeypatch):
+        db = backend.app.extensions['sqlalchemy']
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+
+        sms = []
+        monkeypatch.setattr('backend.dedup.message_dedup', DedupWindow())
+        monkeypatch.setattr('backend.band_state.band_state.update', lambda band_id, **fields: False)
+        monkeypatch.setattr('backend.ingest.sensor_ingest.running', False)
+        monkeypatch.setattr(mqtt_client, '_send_emergency_sms', lambda app, band, event: sms.append(event.type))
+        monkeypatch.setattr(mqtt_client, 'mqtt_handler', mqtt_client.MQTTHandler())
+        monkeypatch.setattr(mqtt_client, 'sensor_chain', HandlerChain())
+        monkeypatch.setattr(mqtt_client, 'register_sensor_stages', lambda c: (
+            c.add('dedup', mqtt_client._stage_dedup), c.add('persist', mqtt_client._stage_persist)))
+        monkeypatch.setattr(band_cache, 'loader', lambda b: BandInfo(7, b, '홍길동', None, '01000000000', ''))
+        band_cache.clear()
+
+        with app.app_context():
+            db.metadata.create_all(db.engine)
+            db.session.add(Band(id=7, bid=BID, name='홍길동'))
+            db.session.commit()
+            mqtt_client._register_default_handlers(app, None)
+            yield db, sms
+            db.session.remove()
+        band_cache.clear()
+
+    def _deliver_twice(self, topic, payload):
+        for _ in range(2):
+            mqtt_client.mqtt_handler.handle_message(topic, dict(payload))
+
+    def test_sensor_reading(self, env):
+        db, _ = env
+        self._deliver_twice(f'wellsafer/band/{BID}/sensor', {'timestamp': 1714555800000, 'hr': 72})
+        self._deliver_twice(f'wellsafer/band/{BID}/sensor', {'timestamp': 1714555801000, 'hr': 73})
+        assert db.session.query(SensorData).count() == 2
+
+    def test_band_event(self, env):
+        db, sms = env
+        self._deliver_twice(f'wellsafer/band/{BID}/event', {'event_type': 'fall', 'seq': 41})
+        self._deliver_twice(f'wellsafer/band/{BID}/event', {'event_type': 'fall', 'seq': 42})
+        assert db.session.query(Event).count() == 2
+        assert sms == [7, 7]
+
+    def test_sensor_seq_without_timestamp(self, env):
+        """timestamp 없이 seq만 있는 측정값도 재전송 제거"""
+        db, _ = env
+        self._deliver_twice(f'wellsafer/band/{BID}/sensor', {'seq': 7, 'hr': 72})
+        assert db.session.query(SensorData).count() == 1
+
+    def test_sensor_without_marker_is_not_deduped(self, env):
+        """seq/timestamp가 모두 없으면 중복 확인 키를 만들지 않음"""
+        db, _ = env
+        self._deliver_twice(f'wellsafer/band/{BID}/sensor', {'hr': 72})
+        assert db.session.query(SensorData).count() == 2
+        assert dedup.message_dedup.get_stats()['keys'] == 0
+
+    def _legacy(self, **fields):
+        bid = int(BID)
+        return dict({'extAddress': {'low': bid & 0xFFFFFFFF, 'high': bid >> 32}, 'type': 6, 'value': 1}, **fields)
+
+    def test_legacy_sos_redelivery_with_timestamp(self, env):
+        db, sms = env
+        self._deliver_twice('/DT/eHG4/naas/post/async', self._legacy(timestamp=1714555800000))
+
+        assert db.session.query(Event).filter_by(type=6).count() == 1
+        assert sms == [6]
+
+    def test_legacy_sos_without_marker_is_never_dropped(self, env):
+        """시퀀스/timestamp가 없는 구 펌웨어 SOS는 1초 간격으로 두 번 와도 둘 다 저장/발송"""
+        db, sms = env
+        mqtt_client.mqtt_handler.handle_message('/DT/eHG4/naas/post/async', self._legacy())
+        time.sleep(1)
+        mqtt_client.mqtt_handler.handle_message('/DT/eHG4/naas/post/async', self._legacy())
+
+        assert db.session.query(Event).filter_by(type=6).count() == 2
+        assert sms == [6, 6]
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 간 Socket.IO 발송 버스 테스트
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+from emit_bus import EmitBroker, LocalSocketManager, recv_frame, send_frame
+
+
+@pytest.fixture
+def sock_path():
+    # UNIX 소켓 경로 길이 제한 때문에 짧은 임시 디렉토리 사용
+    directory = tempfile.mkdtemp(prefix='bus', dir='/tmp')
+    yield os.path.join(directory, 'bus.sock')
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _peer(path, subscribe):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    sock.settimeout(5)
+    send_frame(sock, json.dumps({'subscribe': subscribe}).encode())
+    return sock
+
+
+def _publish_from_child(path, message):
+    manager = LocalSocketManager(f'local://{path}', autostart_broker=False)
+    manager._publish(message)
+
+
+def _wait_subscribers(broker, count):
+    deadline = time.monotonic() + 5
+    while broker.get_stats()['subscribers'] != count:
+        assert time.monotonic() < deadline, 'subscriber count did not settle'
+        time.sleep(0.01)
+
+
+def _start_listener(manager, broker):
+    """수신 스레드 시작 후 브로커에 구독이 등록될 때까지 대기"""
+    received = queue.Queue()
+
+    def listen():
+        for message in manager._listen():
+            received.put(message)
+
+    threading.Thread(target=listen, daemon=True).start()
+    _wait_subscribers(broker, 1)
+    return received
+
+
+class TestEmitBroker:
+    """UNIX 소켓 브로커 테스트"""
+
+    def test_fan_out_to_subscribers(self, sock_path):
+        broker = EmitBroker(sock_path)
+        assert broker.start()
+        try:
+            a = _peer(sock_path, True)
+            b = _peer(sock_path, True)
+            writer = _peer(sock_path, False)
+            _wait_subscribers(broker, 2)
+
+            send_frame(writer, b'hello')
+            assert recv_frame(a) == b'hello'
+            assert recv_frame(b) == b'hello'
+        finally:
+            broker.stop()
+
+    def test_second_broker_does_not_start(self, sock_path):
+        first = EmitBroker(sock_path)
+        assert first.start()
+        try:
+            assert EmitBroker(sock_path).start() is False
+        finally:
+            first.stop()
+
+    def test_concurrent_start_binds_one_broker(self, sock_path):
+        """동시에 시작해도 브로커는 하나 (다른 워커가 바인드한 소켓 파일을 지우지 않음)"""
+        brokers = [EmitBroker(sock_path) for _ in range(8)]
+        barrier = threading.Barrier(len(brokers))
+        results = [None] * len(brokers)
+
+        def bind(index):
+            barrier.wait()
+            results[index] = brokers[index].bind()
+
+        threads = [threading.Thread(target=bind, args=(i,)) for i in range(len(brokers))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        try:
+            assert results.count(True) == 1
+            # 소켓 경로로 접속하면 바인드에 성공한 브로커가 받음
+            server = brokers[results.index(True)]._server
+            server.settimeout(1)
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(sock_path)
+            server.accept()[0].close()
+            client.close()
+        finally:
+            for broker in brokers:
+                if broker._server is not None:
+                    broker._server.close()
+
+    def test_stale_socket_file_is_replaced(self, sock_path):
+        """종료된 브로커가 남긴 소켓 파일이 있어도 새 브로커 시작"""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(sock_path)
+        stale.close()
+        assert os.path.exists(sock_path)
+
+        broker = EmitBroker(sock_path)
+        assert broker.start()
+        broker.stop()
+        assert not os.path.exists(sock_path)
+
+    def test_slow_subscriber_is_dropped(self, sock_path):
+        broker = EmitBroker(sock_path, max_backlog=1)
+        write = broker._write
+        stalled = []
+
+        def _write(peer, outbox):
+            if not stalled:     # 첫 워커는 송신하지 않음
+                stalled.append(peer)
+                return
+            write(peer, outbox)
+
+        broker._write = _write
+        assert broker.start()
+        try:
+            idle = _peer(sock_path, True)
+            _wait_subscribers(broker, 1)
+            writer = _peer(sock_path, False)
+            for _ in range(3):
+                send_frame(writer, b'x')
+            _wait_subscribers(broker, 0)
+
+            # 다른 워커의 중계는 계속됨
+            reader = _peer(sock_path, True)
+            _wait_subscribers(broker, 1)
+            send_frame(writer, b'after')
+            assert recv_frame(reader) == b'after'
+            idle.close()
+        finally:
+            broker.stop()
+
+
+class TestLocalSocketManager:
+    """UNIX 소켓 client_manager 테스트"""
+
+    def test_publish_autostarts_broker_and_reaches_listener(self, sock_path):
+        publisher = LocalSocketManager(f'local://{sock_path}')
+        publisher._publish({'method': 'warmup'})   # 브로커 시작
+        broker = publisher.broker
+        assert broker is not None and broker.running
+        try:
+            listener = LocalSocketManager(f'local://{sock_path}')
+            received = _start_listener(listener, broker)
+            assert listener.broker is None      # 이미 동작 중인 브로커 사용
+
+            publisher._publish({'method': 'emit', 'event': 'x'})
+            assert received.get(timeout=5) == {'method': 'emit', 'event': 'x'}
+        finally:
+            broker.stop()
+
+    def test_unserializable_message_is_counted_not_raised(self, sock_path):
+        """직렬화할 수 없는 발송 데이터는 발송한 쪽으로 예외를 올리지 않고 버린 수로 집계"""
+        manager = LocalSocketManager(f'local://{sock_path}', autostart_broker=False)
+        manager._publish({'method': 'emit', 'data': object()})
+        stats = manager.get_stats()
+        assert (stats['published'], stats['dropped']) == (0, 1)
+
+    def test_cross_process_publish(self, sock_path):
+        """다른 프로세스에서 발송한 메시지 수신"""
+        broker = EmitBroker(sock_path)
+        assert broker.start()
+        try:
+            listener = LocalSocketManager(f'local://{sock_path}', autostart_broker=False)
+            received = _start_listener(listener, broker)
+
+            child = multiprocessing.Process(target=_publish_from_child,
+                                            args=(sock_path, {'method': 'emit', 'room': 'dashboard'}))
+            child.start()
+            child.join(10)
+            assert child.exitcode == 0
+            assert received.get(timeout=5) == {'method': 'emit', 'room': 'dashboard'}
+        finally:
+            broker.stop()
+
+    def test_other_channel_is_ignored(self, sock_path):
+        broker = EmitBroker(sock_path)
+        assert broker.start()
+        try:
+            other = LocalSocketManager(f'local://{sock_path}', channel='other', autostart_broker=False)
+            mine = LocalSocketManager(f'local://{sock_path}', autostart_broker=False)
+            received = _start_listener(mine, broker)
+
+            other._publish({'method': 'skip'})
+            mine._publish({'method': 'mine'})
+            assert received.get(timeout=5) == {'method': 'mine'}
+            assert received.empty()
+        finally:
+            broker.stop()
+
+    def test_listener_restarts_broker_after_owner_exits(self, sock_path):
+        """브로커를 띄운 워커가 종료되면 남은 워커가 브로커를 다시 시작"""
+        owner = LocalSocketManager(f'local://{sock_path}')
+        owner._publish({'method': 'warmup'})
+        first = owner.broker
+
+        survivor = LocalSocketManager(f'local://{sock_path}', reconnect_interval=0.05)
+        _start_listener(survivor, first)
+        first.stop()
+
+        deadline = time.monotonic() + 5
+        while survivor.broker is None or not survivor.broker.running:
+            assert time.monotonic() < deadline, 'broker was not restarted'
+            time.sleep(0.01)
+        survivor.broker.stop()
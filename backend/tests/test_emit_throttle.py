@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Socket.IO 발송 속도 제한기 테스트
+"""
+
+import time
+
+from emit_throttle import EmitThrottle
+
+
+class _SocketIO:
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, event, data, room=None):
+        self.sent.append((event, data, room))
+
+
+def _running_throttle(min_interval=10.0, **kwargs):
+    """발송 스레드 없이 running 상태로 둔 제한기 (주기 발송은 flush()로 대신)"""
+    socketio = _SocketIO()
+    throttle = EmitThrottle(socketio=socketio, min_interval=min_interval, **kwargs)
+    throttle.running = True
+    return throttle, socketio
+
+
+class TestEmitThrottle:
+    """발송 제한기 테스트"""
+
+    def test_first_emit_is_immediate(self):
+        throttle, socketio = _running_throttle()
+
+        assert throttle.emit('sensor_update', {'hr': 70}, room='band_1') is True
+        assert socketio.sent == [('sensor_update', {'hr': 70}, 'band_1')]
+
+    def test_burst_is_coalesced_to_latest(self):
+        """간격 안의 메시지는 마지막 값 하나만 발송"""
+        throttle, socketio = _running_throttle()
+
+        throttle.emit('sensor_update', {'hr': 70}, room='band_1')
+        for hr in (71, 72, 73):
+            assert throttle.emit('sensor_update', {'hr': hr}, room='band_1') is False
+        assert len(socketio.sent) == 1
+
+        assert throttle.flush() == 0   # 간격이 지나지 않음
+        assert throttle.flush(force=True) == 1
+        assert socketio.sent[-1] == ('sensor_update', {'hr': 73}, 'band_1')
+        assert throttle.get_stats()['coalesced'] == 2
+
+    def test_pending_sent_after_interval(self):
+        throttle, socketio = _running_throttle(min_interval=0.01)
+
+        throttle.emit('sensor_update', {'hr': 70}, room='band_1')
+        throttle.emit('sensor_update', {'hr': 71}, room='band_1')
+        time.sleep(0.02)
+
+        assert throttle.flush() == 1
+        assert socketio.sent[-1][1] == {'hr': 71}
+
+    def test_rooms_and_keys_are_independent(self):
+        """밴드 룸별, 같은 룸 안에서는 key별로 따로 제한"""
+        throttle, socketio = _running_throttle()
+
+        throttle.emit('sensor_update', {'hr': 70}, room='band_1')
+        throttle.emit('sensor_update', {'hr': 80}, room='band_2')
+        throttle.emit('sensor_summary', {'bid': 'a'}, room='dashboard', key='a')
+        throttle.emit('sensor_summary', {'bid': 'b'}, room='dashboard', key='b')
+
+        assert len(socketio.sent) == 4
+
+    def test_urgent_bypasses_and_drops_pending(self):
+        """경보 수준 메시지는 즉시 발송하고 보관 중이던 이전 값은 버림"""
+        throttle, socketio = _running_throttle()
+
+        throttle.emit('sensor_update', {'hr': 70}, room='band_1')
+        throttle.emit('sensor_update', {'hr': 71}, room='band_1')
+        assert throttle.emit('sensor_update', {'hr': 160}, room='band_1', urgent=True) is True
+
+        assert socketio.sent[-1][1] == {'hr': 160}
+        assert throttle.flush(force=True) == 0
+        assert throttle.get_stats()['bypassed'] == 1
+
+    def test_event_interval_override(self):
+        throttle, socketio = _running_throttle(min_interval=10.0, intervals={'sensor_summary': 0})
+
+        throttle.emit('sensor_summary', {'hr': 70}, room='dashboard')
+        throttle.emit('sensor_summary', {'hr': 71}, room='dashboard')
+
+        assert len(socketio.sent) == 2
+
+    def test_passthrough_when_not_running(self):
+        socketio = _SocketIO()
+        throttle = EmitThrottle(socketio=socketio, min_interval=10.0)
+
+        throttle.emit('sensor_update', {'hr': 70}, room='band_1')
+        throttle.emit('sensor_update', {'hr': 71}, room='band_1')
+
+        assert len(socketio.sent) == 2
+
+    def test_stop_flushes_pending(self):
+        socketio = _SocketIO()
+        throttle = EmitThrottle(socketio=socketio, min_interval=10.0)
+        throttle.start()
+
+        throttle.emit('sensor_update', {'hr': 70}, room='band_1')
+        throttle.emit('sensor_update', {'hr': 71}, room='band_1')
+        throttle.stop()
+
+        assert [data for _, data, _ in socketio.sent] == [{'hr': 70}, {'hr': 71}]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+센서 데이터 배치 적재 큐 테스트
+"""
+
+import time
+import pytest
+from ingest import SensorIngestQueue
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSensorIngestQueue:
+    """센서 적재 큐 테스트"""
+
+    def test_flush_on_batch_size(self):
+        """batch_size 도달 시 한 번에 저장"""
+        batches = []
+        ingest = SensorIngestQueue(batch_size=10, flush_interval=5, writer=batches.append)
+        ingest.start()
+
+        for i in range(10):
+            assert ingest.put({'FK_bid': 1, 'hr': 60 + i}) is True
+
+        assert _wait_until(lambda: len(batches) == 1)
+        assert len(batches[0]) == 10
+        ingest.stop()
+
+    def test_flush_on_interval(self):
+        """batch_size 미만이어도 flush_interval 경과 시 저장"""
+        batches = []
+        ingest = SensorIngestQueue(batch_size=500, flush_interval=0.05, writer=batches.append)
+        ingest.start()
+
+        ingest.put({'FK_bid': 1, 'hr': 70})
+        ingest.put({'FK_bid': 2, 'hr': 71})
+
+        assert _wait_until(lambda: sum(len(b) for b in batches) == 2)
+        ingest.stop()
+
+    def test_drop_when_full(self):
+        """큐가 가득 차면 드롭하고 통계에 기록"""
+        ingest = SensorIngestQueue(max_size=2, writer=lambda rows: None)
+
+        assert ingest.put({'FK_bid': 1}) is True
+        assert ingest.put({'FK_bid': 1}) is True
+        assert ingest.put({'FK_bid': 1}) is False
+
+        stats = ingest.get_stats()
+        assert stats['queue_depth'] == 2
+        assert stats['dropped'] == 1
+
+    def test_stop_drains_queue(self):
+        """중지 시 남은 행 모두 저장"""
+        rows = []
+        ingest = SensorIngestQueue(batch_size=3, flush_interval=0.01, writer=rows.extend)
+        for i in range(7):
+            ingest.put({'FK_bid': 1, 'hr': i})
+
+        ingest.start()
+        ingest.stop()
+
+        assert len(rows) == 7
+        assert ingest.get_stats()['flushed_rows'] == 7
+
+    def test_failed_flush_is_counted(self):
+        """저장 실패 시 실패 행 수 기록"""
+        def failing_writer(rows):
+            raise RuntimeError('db down')
+
+        ingest = SensorIngestQueue(batch_size=2, flush_interval=0.01, writer=failing_writer)
+        ingest.put({'FK_bid': 1})
+        ingest.put({'FK_bid': 1})
+        ingest.start()
+        ingest.stop()
+
+        stats = ingest.get_stats()
+        assert stats['failed_rows'] == 2
+        assert stats['flush_count'] == 0
+
+    def test_failed_flush_is_retried(self):
+        """일시적인 저장 실패는 같은 배치를 다시 저장"""
+        batches = []
+
+        def flaky_writer(rows):
+            if not batches:
+                batches.append(None)
+                raise RuntimeError('lock wait timeout')
+            batches.append(list(rows))
+
+        ingest = SensorIngestQueue(batch_size=2, flush_interval=0.01, retry_delay=0, writer=flaky_writer)
+        ingest.put({'FK_bid': 1})
+        ingest.put({'FK_bid': 2})
+        ingest.start()
+        ingest.stop()
+
+        assert batches[1:] == [[{'FK_bid': 1}, {'FK_bid': 2}]]
+        stats = ingest.get_stats()
+        assert (stats['flushed_rows'], stats['failed_rows'], stats['retries']) == (2, 0, 1)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 수집 엔진 (정규화, 처리 단계) 테스트
+"""
+
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from band_cache import BandInfo
+from ingest_engine import (
+    HandlerChain, SensorReading, from_band_payload, from_sensordata_payload
+)
+
+
+BID = '467191213660619'
+
+
+class TestNormalize:
+    """페이로드 형식별 표준 측정값 변환"""
+
+    def test_sensordata_aliases_match_band_payload(self):
+        """/DT/eHG4/SensorData의 acc_x, steps 등이 실제 컬럼으로 변환"""
+        band = from_band_payload(BID, {'hr': 72, 'spo2': 98, 'x': 1, 'y': 2, 'z': 3,
+                                       'walk_steps': 40, 'battery_level': 80})
+        legacy = from_sensordata_payload({'bid': BID, 'hr': 72, 'spo2': 98, 'acc_x': 1, 'acc_y': 2,
+                                          'acc_z': 3, 'steps': 40, 'battery': 80, 'hrv_sdnn': 50})
+
+        band_row = band.to_row(1)
+        legacy_row = legacy.to_row(1)
+        band_row.pop('datetime')
+        legacy_row.pop('datetime')
+        assert band_row == legacy_row
+        assert 'hrv_sdnn' not in legacy_row
+
+    def test_standard_field_wins_over_alias(self):
+        reading = from_sensordata_payload({'bid': BID, 'x': 5, 'acc_x': 9})
+        assert reading.x == 5
+
+    def test_missing_bid(self):
+        assert from_sensordata_payload({'hr': 70}) is None
+
+    def test_device_timestamp(self):
+        reading = from_sensordata_payload({'bid': 467191213660619, 'timestamp': 1700000000000})
+        assert reading.bid == BID
+        assert reading.datetime == datetime(2023, 11, 14, 22, 13, 20)
+
+    def test_payload_skips_empty_fields(self):
+        payload = SensorReading(BID, hr=70).to_payload()
+        assert payload['hr'] == 70 and 'spo2' not in payload
+        assert payload['bid'] == BID and 'datetime' in payload
+
+
+class TestHandlerChain:
+    """처리 단계 목록 테스트"""
+
+    def test_order_and_insert_before(self):
+        calls = []
+        chain = HandlerChain()
+        chain.add('persist', lambda ctx: calls.append('persist'))
+        chain.add('realtime', lambda ctx: calls.append('realtime'))
+        chain.add('dedup', lambda ctx: calls.append('dedup'), before='persist')
+
+        assert chain.run(None) is True
+        assert calls == ['dedup', 'persist', 'realtime']
+
+        with pytest.raises(KeyError):
+            chain.add('x', lambda ctx: None, before='missing')
+
+    def test_replace_and_remove(self):
+        calls = []
+        chain = HandlerChain()
+        chain.add('a', lambda ctx: calls.append(1))
+        chain.add('a', lambda ctx: calls.append(2))
+        chain.run(None)
+        assert calls == [2]
+
+        chain.remove('a')
+        assert chain.names() == []
+
+    def test_false_stops_chain(self):
+        calls = []
+        chain = HandlerChain()
+        chain.add('filter', lambda ctx: False)
+        chain.add('persist', lambda ctx: calls.append(ctx))
+        assert chain.run(None) is False
+        assert calls == []
+
+    def test_error_does_not_stop_chain(self):
+        calls = []
+        chain = HandlerChain()
+        chain.add('broken', lambda ctx: 1 / 0)
+        chain.add('persist', lambda ctx: calls.append(ctx))
+        chain.run('ctx')
+
+        assert calls == ['ctx']
+        assert chain.get_stats()['broken'] == {'calls': 1, 'errors': 1}
+
+
+class TestUnifiedTopics:
+    """paho 클라이언트 하나로 두 토픽 체계를 처리"""
+
+    def test_subscribes_legacy_flask_mqtt_topics(self):
+        from backend.mqtt_client import subscription_topics
+
+        topics = subscription_topics()
+        assert '/DT/eHG4/SensorData/#' in topics
+        assert '/DT/eHG4/NerveStim/Connect' in topics
+        # 서버가 발송하는 명령 토픽은 구독하지 않음
+        assert not any(t.startswith('/DT/eHG4/NerveStim/+') for t in topics)
+
+    def test_both_sensor_formats_reach_same_chain(self, monkeypatch):
+        from backend import mqtt_client
+        from backend.band_cache import band_cache
+
+        collected = []
+        chain = HandlerChain()
+        monkeypatch.setattr(mqtt_client, 'mqtt_handler', mqtt_client.MQTTHandler())
+        monkeypatch.setattr(mqtt_client, 'sensor_chain', chain)
+        monkeypatch.setattr(mqtt_client, 'register_sensor_stages',
+                            lambda c: c.add('collect', collected.append))
+        monkeypatch.setattr(band_cache, 'loader',
+                            lambda bid: BandInfo(7, bid, '홍길동', None, None, '') if bid == BID else None)
+        band_cache.clear()
+
+        app = Flask(__name__)
+        mqtt_client._register_default_handlers(app, None)
+        handler = mqtt_client.mqtt_handler
+        handler.handle_message(f'wellsafer/band/{BID}/sensor', {'hr': 71, 'x': 3, 'walk_steps': 9})
+        handler.handle_message('/DT/eHG4/SensorData/gw1', {'bid': BID, 'hr': 71, 'acc_x': 3, 'steps': 9})
+        handler.handle_message('/DT/eHG4/SensorData/gw1', {'bid': '999', 'hr': 71})
+        band_cache.clear()
+
+        assert len(collected) == 2
+        rows = [ctx.reading.to_row(ctx.band.id) for ctx in collected]
+        for row in rows:
+            row.pop('datetime')
+        assert rows[0] == rows[1]
+        assert rows[0]['FK_bid'] == 7 and rows[0]['x'] == 3 and rows[0]['walk_steps'] == 9
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 수집 워커 감시자 및 샤딩 테스트
+"""
+
+import os
+import time
+
+import pytest
+from flask import Flask
+
+from ingest_supervisor import IngestSupervisor, WorkerState
+from mqtt_dispatch import shard_for
+
+
+def _counting_worker(index, count, mode, reports, report_interval):
+    """초당 약 100건을 처리한 것처럼 보고하는 워커"""
+    received = 0
+    while True:
+        received += int(100 * report_interval)
+        reports.put({'index': index, 'pid': os.getpid(), 'ts': time.monotonic(),
+                     'received': received, 'handled': received, 'skipped': 0, 'dropped': 0})
+        time.sleep(report_interval)
+
+
+def _crashing_worker(index, count, mode, reports, report_interval):
+    reports.put({'index': index, 'pid': os.getpid(), 'ts': time.monotonic(),
+                 'received': 1, 'handled': 1, 'skipped': 0, 'dropped': 0})
+    os._exit(3)
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition not met'
+        time.sleep(0.05)
+
+
+class TestIngestSupervisor:
+    """수집 워커 감시자 테스트"""
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            IngestSupervisor(_counting_worker, mode='round_robin')
+
+    def test_per_worker_throughput(self):
+        supervisor = IngestSupervisor(_counting_worker, workers=2, report_interval=0.1, context='fork')
+        supervisor.start()
+        try:
+            def reported_twice():
+                supervisor.drain_reports(timeout=0.1)
+                return all(w['received'] >= 20 for w in supervisor.get_stats()['workers'])
+            _wait_for(reported_twice)
+
+            stats = supervisor.get_stats()
+            assert [w['index'] for w in stats['workers']] == [0, 1]
+            assert all(w['alive'] and w['pid'] for w in stats['workers'])
+            assert all(w['received_per_sec'] > 0 for w in stats['workers'])
+        finally:
+            supervisor.stop(timeout=5)
+
+        assert not any(w['alive'] for w in supervisor.get_stats()['workers'])
+
+    def test_crashed_worker_is_restarted_with_backoff(self):
+        supervisor = IngestSupervisor(_crashing_worker, workers=1, report_interval=0.1,
+                                      max_backoff=0.2, context='fork')
+        supervisor.start()
+        try:
+            def restarted():
+                supervisor.check()
+                return supervisor.get_stats()['workers'][0]['restarts'] >= 2
+            _wait_for(restarted)
+            assert supervisor._states[0].backoff == 0.2
+        finally:
+            supervisor.stop(timeout=5)
+
+    def test_run_stops_workers(self):
+        calls = []
+        supervisor = IngestSupervisor(_counting_worker, workers=1, report_interval=0.1,
+                                      context='fork', on_report=calls.append)
+        started = time.monotonic()
+        supervisor.run(should_stop=lambda: time.monotonic() - started > 0.5)
+
+        assert calls and calls[-1]['workers'][0]['index'] == 0
+        assert not supervisor.get_stats()['workers'][0]['alive']
+
+
+class TestWorkerState:
+    """워커별 처리량 계산"""
+
+    def test_counter_reset_after_restart(self):
+        state = WorkerState(0)
+        state.record({'ts': 0.0, 'received': 500, 'handled': 500})
+        state.record({'ts': 1.0, 'received': 10, 'handled': 10})
+        assert state.rates() == {'received_per_sec': 0.0, 'handled_per_sec': 0.0}
+
+    def test_rates(self):
+        state = WorkerState(0)
+        state.record({'ts': 0.0, 'received': 0, 'handled': 0})
+        state.record({'ts': 2.0, 'received': 400, 'handled': 300})
+        assert state.rates() == {'received_per_sec': 200.0, 'handled_per_sec': 150.0}
+
+
+class TestShardedSubscription:
+    """수집 워커 샤딩 (mqtt_client)"""
+
+    def _app(self, **config):
+        app = Flask(__name__)
+        app.config.update(config)
+        return app
+
+    def test_shared_subscription_topics(self):
+        from backend.mqtt_client import subscription_topics, Topics
+
+        app = self._app(MQTT_SHARD_COUNT=3, MQTT_SHARD_MODE='share', MQTT_SHARE_GROUP='wellsafer')
+        topics = subscription_topics(app)
+        assert f'$share/wellsafer/{Topics.BAND_ALL}' in topics
+        # 서버 프로세스 간 알림은 모든 워커가 받도록 공유 구독하지 않음
+        assert topics[-1] == Topics.BAND_CACHE_INVALIDATE
+        assert all(t.startswith('$share/wellsafer/') for t in topics[:-1])
+
+        # 단일 워커 또는 hash 방식은 일반 구독
+        assert subscription_topics(self._app(MQTT_SHARD_COUNT=1, MQTT_SHARD_MODE='share'))[0] == Topics.BAND_ALL
+        assert subscription_topics(self._app(MQTT_SHARD_COUNT=3, MQTT_SHARD_MODE='hash'))[0] == Topics.BAND_ALL
+
+    def test_web_topics_only_for_web_processes(self):
+        """리더 워커 요청 토픽은 웹 프로세스만 구독 (수집 워커는 제외)"""
+        from backend.mqtt_client import web_topics, Topics
+
+        assert web_topics(self._app(PROCESS_ROLE='ingest')) == []
+        web = [Topics.DASHBOARD_SNAPSHOT, Topics.DASHBOARD_UPDATE]
+        assert web_topics(self._app(PROCESS_ROLE='web')) == web
+        assert web_topics(self._app()) == web
+
+    def test_default_mode_keeps_band_on_one_worker(self):
+        """기본값은 hash (공유 구독은 밴드별 순서/상태를 나눔)"""
+        from backend.server_configuration.appConfig import Config
+
+        assert Config.MQTT_SHARD_MODE == 'hash'
+        assert IngestSupervisor(_counting_worker).mode == 'hash'
+
+    def test_band_cache_invalidation_reaches_every_shard(self, monkeypatch):
+        """bid 해시 샤딩에서도 모든 워커가 캐시 무효화 알림을 처리"""
+        from backend import mqtt_client
+        from backend.band_cache import BandCache, BandInfo
+
+        caches = []
+        for index in range(3):
+            cache = BandCache(loader=lambda bid: BandInfo(1, bid, None, None, None, None))
+            cache.get('467191213660619')
+            caches.append(cache)
+
+            handler = mqtt_client.MQTTHandler()
+            handler.set_shard(index, 3)
+            monkeypatch.setattr('backend.band_cache.band_cache', cache)
+            monkeypatch.setattr(mqtt_client, 'mqtt_handler', handler)
+            mqtt_client._register_default_handlers(self._app(), None)
+            handler.handle_message(mqtt_client.Topics.BAND_CACHE_INVALIDATE, {'bid': '467191213660619'})
+
+        assert [cache.get_stats()['size'] for cache in caches] == [0, 0, 0]
+
+    def test_hash_shard_filters_by_bid(self):
+        from backend.mqtt_client import MQTTHandler
+
+        handled = []
+        workers = [MQTTHandler() for _ in range(3)]
+        for index, handler in enumerate(workers):
+            handler.set_shard(index, 3)
+            handler.register_handler('wellsafer/band/{bid}/sensor',
+                                     lambda topic, payload, bid, i=index: handled.append((i, bid)))
+
+        bids = [f'46719121360{n:04d}' for n in range(30)]
+        for bid in bids:
+            for handler in workers:
+                handler.handle_message(f'wellsafer/band/{bid}/sensor', {'hr': 70})
+
+        # 각 밴드는 정확히 한 워커에서, bid 해시가 가리키는 워커에서만 처리
+        assert sorted(bid for _, bid in handled) == sorted(bids)
+        assert all(index == shard_for(bid, 3) for index, bid in handled)
+        assert sum(h.get_stats()['skipped'] for h in workers) == 60
+
+    def test_other_shard_messages_are_not_decoded(self):
+        """토픽에 bid가 있으면 디코딩 전에 샤딩 (워커 수만큼 JSON을 다시 해석하지 않음)"""
+        from backend.mqtt_client import MQTTHandler
+        from backend import codec
+
+        decoded, handled = [], []
+
+        def decode(raw):
+            decoded.append(raw)
+            return codec.loads(raw)
+
+        workers = [MQTTHandler() for _ in range(3)]
+        for index, handler in enumerate(workers):
+            handler.set_shard(index, 3)
+            handler.register_handler('wellsafer/band/{bid}/sensor',
+                                     lambda topic, payload, bid: handled.append(bid))
+            handler.register_handler('/DT/eHG4/SensorData/#',
+                                     lambda topic, payload: handled.append(payload['bid']))
+
+        bids = [f'46719121360{n:04d}' for n in range(30)]
+        for bid in bids:
+            for handler in workers:
+                handler.handle_raw(f'wellsafer/band/{bid}/sensor', codec.dumps({'hr': 70}), decode)
+        assert len(decoded) == len(bids)
+        assert sorted(handled) == sorted(bids)
+
+        # 구 백엔드 토픽은 bid가 페이로드에 있으므로 워커마다 디코딩 후 샤딩
+        decoded.clear()
+        for handler in workers:
+            handler.handle_raw('/DT/eHG4/SensorData/gw1', codec.dumps({'bid': bids[0]}), decode)
+        assert len(decoded) == 3
+        assert handled.count(bids[0]) == 2
+        assert sum(h.get_stats()['skipped'] for h in workers) == 60 + 2
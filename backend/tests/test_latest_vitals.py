@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+최신 생체신호 저장소 테스트
+"""
+
+from datetime import datetime, timedelta
+from latest_vitals import LatestVitals, LatestVitalsStore, vitals_to_dict
+
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _reading(dt, hr=72, spo2=98, battery_level=80, skin_temp=33):
+    return {'datetime': dt, 'hr': hr, 'spo2': spo2, 'battery_level': battery_level, 'skin_temp': skin_temp}
+
+
+class TestLatestVitalsStore:
+    """최신 생체신호 저장소 테스트"""
+
+    def test_update_and_get(self):
+        store = LatestVitalsStore(loader=dict)
+        assert store.update(1, _reading(NOW, hr=90)) is True
+
+        vitals = store.get(1)
+        assert vitals.hr == 90
+        assert vitals.datetime == NOW
+        assert store.get(2) is None
+
+    def test_older_reading_does_not_overwrite(self):
+        """늦게 도착한 과거 측정값은 무시"""
+        store = LatestVitalsStore(loader=dict)
+        store.update(1, _reading(NOW, hr=90))
+
+        assert store.update(1, _reading(NOW - timedelta(seconds=5), hr=60)) is False
+        assert store.get(1).hr == 90
+        assert store.get_stats()['stale_dropped'] == 1
+
+    def test_warm_keeps_newer_live_value(self):
+        """초기 적재 중 들어온 최신 값은 DB 값으로 덮어쓰지 않음"""
+        loaded = {
+            1: LatestVitals(NOW - timedelta(minutes=1), 70, 97, 50, 32),
+            2: LatestVitals(NOW, 80, 99, 60, 34),
+        }
+        store = LatestVitalsStore(loader=lambda: loaded)
+        store.update(1, _reading(NOW, hr=100))
+
+        assert store.warm() == 2
+        assert store.get(1).hr == 100
+        assert store.get(2).hr == 80
+        assert store.get_stats()['warmed'] is True
+
+    def test_vitals_to_dict(self):
+        vitals = LatestVitals(NOW, 72, 98, 80, 33)
+        assert vitals_to_dict(5, vitals) == {
+            'FK_bid': 5,
+            'datetime': NOW.isoformat(),
+            'hr': 72,
+            'spo2': 98,
+            'skin_temp': 33,
+            'battery_level': 80
+        }
+        assert vitals_to_dict(5, None) is None
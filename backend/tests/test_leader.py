@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+리스 기반 리더 선출 테스트
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend.leader import DBLease, FileLease, LeaderElector
+from backend.scheduler import Scheduler
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeClocks:
+    """단조 시계와 UTC 시계를 함께 진행"""
+
+    def __init__(self):
+        self.mono = 0.0
+        self.wall = datetime(2024, 5, 1, 9, 0, 0)
+
+    def advance(self, seconds):
+        self.mono += seconds
+        self.wall += timedelta(seconds=seconds)
+
+    def elector(self, lease, holder, ttl=30):
+        return LeaderElector(lease, ttl=ttl, holder=holder,
+                             clock=lambda: self.mono, wall_clock=lambda: self.wall)
+
+
+@pytest.fixture
+def db_lease(tmp_path):
+    lease = DBLease(create_engine(f'sqlite:///{tmp_path / "lease.db"}'))
+    lease.create_table()
+    return lease
+
+
+class TestDBLease:
+    """leader_lease 행 차지/갱신/만료"""
+
+    def test_single_leader_and_failover_at_expiry(self, db_lease):
+        clocks = FakeClocks()
+        a = clocks.elector(db_lease, 'a')
+        b = clocks.elector(db_lease, 'b')
+
+        a.step()
+        wait = b.step()
+        assert a.is_leader and not b.is_leader
+        assert wait == pytest.approx(10)
+
+        # a가 갱신을 멈춤 (프로세스 정지): 만료 직전까지는 a만 리더
+        clocks.advance(29)
+        assert b.step() == pytest.approx(1.01)
+        assert not b.is_leader
+
+        clocks.advance(1.5)
+        assert not a.is_leader
+        b.step()
+        assert b.is_leader
+        a.step()
+        assert not a.is_leader
+
+    def test_renewal_keeps_leadership(self, db_lease):
+        clocks = FakeClocks()
+        a = clocks.elector(db_lease, 'a')
+        b = clocks.elector(db_lease, 'b')
+        for _ in range(10):
+            a.step()
+            b.step()
+            clocks.advance(10)
+        assert a.is_leader and not b.is_leader
+        assert a.get_stats()['transitions'] == 1
+
+    def test_release_hands_over_immediately(self, db_lease):
+        clocks = FakeClocks()
+        a = clocks.elector(db_lease, 'a')
+        b = clocks.elector(db_lease, 'b')
+        a.step()
+        a.stop()
+        b.step()
+        assert b.is_leader
+
+    def test_renew_failure_steps_down_after_ttl(self, db_lease):
+        """DB 장애로 갱신하지 못하면 ttl이 지난 뒤 스스로 내려옴"""
+        clocks = FakeClocks()
+        a = clocks.elector(db_lease, 'a')
+        a.step()
+
+        def broken(holder, ttl, now):
+            raise RuntimeError('db down')
+
+        db_lease.acquire = broken
+        clocks.advance(20)
+        a.step()
+        assert a.is_leader
+        clocks.advance(10)
+        assert not a.is_leader
+        assert a.get_stats()['errors'] == 1
+
+
+class TestFileLease:
+    def test_exclusive_lock(self, tmp_path):
+        path = str(tmp_path / 'leader.lock')
+        a, b = FileLease(path), FileLease(path)
+        assert a.acquire('a', 30, None) == (True, None)
+        assert a.acquire('a', 30, None) == (True, None)
+        assert b.acquire('b', 30, None) == (False, None)
+        a.release('a')
+        assert b.acquire('b', 30, None) == (True, None)
+        b.release('b')
+
+
+class FixedLeader:
+    def __init__(self, is_leader):
+        self.is_leader = is_leader
+
+    def get_stats(self):
+        return {'is_leader': self.is_leader}
+
+
+class TestSchedulerGate:
+    """singleton 작업은 리더에서만 실행"""
+
+    def test_follower_skips_singleton_jobs(self):
+        scheduler = Scheduler(clock=lambda: 0.0, leader=FixedLeader(False))
+        singleton = scheduler.add_job(lambda: None, 60, name='cleanup')
+        local = scheduler.add_job(lambda: None, 60, name='local', singleton=False)
+
+        assert scheduler.run_pending(60 * 3) == ['local']
+        assert singleton.runs == 0 and singleton.missed == 0
+        assert singleton.skipped_not_leader == 1
+        assert local.missed == 2
+
+        scheduler.leader.is_leader = True
+        assert sorted(scheduler.run_pending(60 * 4)) == ['cleanup', 'local']
+        assert scheduler.get_status()['leader'] == {'is_leader': True}
+
+
+# 자식 프로세스: 리더일 때만 20ms마다 시각을 기록 (backend 패키지를 import하지 않음)
+WORKER = '''
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from sqlalchemy import create_engine
+from leader import DBLease, FileLease, LeaderElector
+
+mode, target, ttl, out = sys.argv[2:6]
+if mode == 'db':
+    lease = DBLease(create_engine('sqlite:///' + target, connect_args={'timeout': 10}))
+else:
+    lease = FileLease(target)
+elector = LeaderElector(lease, ttl=float(ttl))
+elector.start()
+with open(out, 'a', buffering=1) as f:
+    while True:
+        if elector.is_leader:
+            f.write('%f\\n' % time.time())
+        time.sleep(0.02)
+'''
+
+
+def _read_ticks(paths):
+    ticks = []
+    for index, path in enumerate(paths):
+        if os.path.exists(path):
+            with open(path) as f:
+                ticks.extend((float(line), index) for line in f if line.strip())
+    return sorted(ticks)
+
+
+def _wait_for(predicate, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.05)
+    return None
+
+
+class TestMultiProcess:
+    """로컬 프로세스 여러 개 중 하나만 리더, 리더가 죽으면 리스 기간 안에 다른 프로세스가 이어받음"""
+
+    TTL = 1.0
+
+    @pytest.mark.parametrize('mode', ['db', 'file'])
+    def test_failover(self, tmp_path, mode):
+        if mode == 'db':
+            target = str(tmp_path / 'lease.db')
+            DBLease(create_engine(f'sqlite:///{target}')).create_table()
+        else:
+            target = str(tmp_path / 'leader.lock')
+
+        outputs = [str(tmp_path / f'worker{i}.log') for i in range(3)]
+        workers = [
+            subprocess.Popen([sys.executable, '-c', WORKER, BACKEND_DIR, mode, target, str(self.TTL), out])
+            for out in outputs
+        ]
+        try:
+            assert _wait_for(lambda: _read_ticks(outputs), timeout=20), 'no leader elected'
+            time.sleep(1.0)
+
+            ticks = _read_ticks(outputs)
+            leader = ticks[-1][1]
+            assert {index for _, index in ticks} == {leader}
+
+            workers[leader].send_signal(signal.SIGKILL)
+            workers[leader].wait()
+            killed_at = time.time()
+
+            def takeover():
+                later = [(t, i) for t, i in _read_ticks(outputs) if i != leader]
+                return later[0] if later else None
+
+            taken = _wait_for(takeover, timeout=10)
+            assert taken, 'no failover'
+            assert taken[0] - killed_at <= self.TTL + 0.5
+            time.sleep(1.0)
+        finally:
+            for worker in workers:
+                if worker.poll() is None:
+                    worker.kill()
+                    worker.wait()
+
+        # 리더가 바뀐 것은 한 번뿐 (두 프로세스가 동시에 리더였다면 번갈아 기록됨)
+        ticks = _read_ticks(outputs)
+        switches = sum(1 for (_, a), (_, b) in zip(ticks, ticks[1:]) if a != b)
+        assert switches == 1
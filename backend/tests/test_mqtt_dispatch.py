@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 메시지 분배 워커 풀 테스트
+"""
+
+import queue
+import threading
+import pytest
+from mqtt_dispatch import KeyedDispatcher, shard_for
+
+
+class TestShard:
+    """키 분배 테스트"""
+
+    def test_shard_is_stable(self):
+        """같은 키는 항상 같은 워커"""
+        assert shard_for('467191213660619', 8) == shard_for('467191213660619', 8)
+        assert 0 <= shard_for('467191213660619', 8) < 8
+
+    def test_single_worker(self):
+        assert shard_for('anything', 1) == 0
+
+
+class TestKeyedDispatcher:
+    """키 기반 워커 풀 테스트"""
+
+    def test_per_key_ordering(self):
+        """같은 bid의 메시지는 순서대로 처리"""
+        results = {}
+        lock = threading.Lock()
+
+        def handler(bid, seq):
+            with lock:
+                results.setdefault(bid, []).append(seq)
+
+        dispatcher = KeyedDispatcher(workers=4, queue_size=1000)
+        dispatcher.start()
+        for seq in range(200):
+            for bid in ('band-a', 'band-b', 'band-c'):
+                dispatcher.submit(bid, handler, bid, seq)
+        dispatcher.stop()
+
+        for bid in ('band-a', 'band-b', 'band-c'):
+            assert results[bid] == list(range(200))
+
+    def test_drop_new_policy(self):
+        """drop_new: 가득 차면 새 메시지를 버림"""
+        dispatcher = KeyedDispatcher(workers=1, queue_size=2, overflow='drop_new')
+        dispatcher._queues = [queue.Queue(maxsize=2)]
+
+        assert dispatcher.submit('k', print, 1) is True
+        assert dispatcher.submit('k', print, 2) is True
+        assert dispatcher.submit('k', print, 3) is False
+        assert dispatcher.get_stats()['workers'][0]['dropped'] == 1
+
+    def test_drop_oldest_policy(self):
+        """drop_oldest: 가장 오래된 메시지를 버리고 새 메시지 적재"""
+        dispatcher = KeyedDispatcher(workers=1, queue_size=2, overflow='drop_oldest')
+        dispatcher._queues = [queue.Queue(maxsize=2)]
+
+        dispatcher.submit('k', print, 1)
+        dispatcher.submit('k', print, 2)
+        assert dispatcher.submit('k', print, 3) is True
+
+        remaining = [dispatcher._queues[0].get_nowait()[1][0] for _ in range(2)]
+        assert remaining == [2, 3]
+
+    def test_handler_error_does_not_stop_worker(self):
+        """핸들러 예외가 나도 워커는 계속 처리"""
+        done = []
+
+        def failing():
+            raise RuntimeError('boom')
+
+        dispatcher = KeyedDispatcher(workers=1)
+        dispatcher.start()
+        dispatcher.submit('k', failing)
+        dispatcher.submit('k', done.append, 1)
+        dispatcher.stop()
+
+        assert done == [1]
+        assert dispatcher.get_stats()['errors'] == 1
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            KeyedDispatcher(overflow='unknown')
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+MQTT 토픽 라우터 테스트
+"""
+
+import pytest
+from mqtt_topic import TopicTrie, match_topic_linear, to_subscription
+
+
+PATTERNS = [
+    'wellsafer/band/+/sensor',
+    'wellsafer/band/+/location',
+    'wellsafer/band/+/#',
+    'wellsafer/stim/+/status',
+    '/DT/eHG4/naas/post/async',
+    '/DT/eHG4/SensorData/#',
+]
+
+TOPICS = [
+    'wellsafer/band/467191213660619/sensor',
+    'wellsafer/band/467191213660619/location',
+    'wellsafer/band/467191213660619/sensor/extra',
+    'wellsafer/stim/467191213660619/status',
+    'wellsafer/stim/467191213660619/connected',
+    '/DT/eHG4/naas/post/async',
+    '/DT/eHG4/naas/post/sync',
+    '/DT/eHG4/SensorData/467191213660619',
+    'unknown/topic',
+]
+
+
+class TestTopicTrie:
+    """토픽 트라이 매칭 테스트"""
+
+    def test_same_result_as_linear_matcher(self):
+        """기존 선형 매칭과 같은 핸들러 집합"""
+        trie = TopicTrie()
+        for pattern in PATTERNS:
+            trie.add(pattern, pattern)
+
+        for topic in TOPICS:
+            expected = [p for p in PATTERNS if match_topic_linear(p, topic)]
+            actual = [handler for handler, _ in trie.match(topic)]
+            assert actual == expected, topic
+
+    def test_named_segment_extraction(self):
+        """{bid} 세그먼트 값 추출"""
+        trie = TopicTrie()
+        trie.add('wellsafer/band/{bid}/sensor', 'sensor')
+
+        matches = trie.match('wellsafer/band/467191213660619/sensor')
+        assert matches == [('sensor', {'bid': '467191213660619'})]
+        assert trie.match('wellsafer/band/467191213660619/location') == []
+
+    def test_hash_matches_parent_level(self):
+        """'#'은 상위 레벨 자체에도 매칭 (MQTT 규격)"""
+        trie = TopicTrie()
+        trie.add('wellsafer/band/#', 'all')
+
+        assert [h for h, _ in trie.match('wellsafer/band')] == ['all']
+        assert [h for h, _ in trie.match('wellsafer/band/1/sensor')] == ['all']
+
+    def test_system_topic_not_matched_by_wildcard(self):
+        """'$'로 시작하는 토픽은 첫 레벨 와일드카드에 매칭하지 않음"""
+        trie = TopicTrie()
+        trie.add('#', 'all')
+        trie.add('+/broker/load', 'plus')
+
+        assert trie.match('$SYS/broker/load') == []
+
+    def test_reregister_replaces_handler(self):
+        """같은 패턴을 다시 등록하면 대체"""
+        trie = TopicTrie()
+        trie.add('wellsafer/band/+/sensor', 'old')
+        trie.add('wellsafer/band/+/sensor', 'new')
+
+        assert [h for h, _ in trie.match('wellsafer/band/1/sensor')] == ['new']
+        assert trie.patterns() == ['wellsafer/band/+/sensor']
+
+    def test_hash_must_be_last(self):
+        with pytest.raises(ValueError):
+            TopicTrie().add('wellsafer/#/sensor', 'bad')
+
+    def test_to_subscription(self):
+        assert to_subscription('wellsafer/band/{bid}/sensor') == 'wellsafer/band/+/sensor'
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+sensordata 시간 파티션 관리 테스트 (파티션 계획, DDL, 보관 기간 파티션 삭제)
+"""
+
+import csv
+import glob
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from backend.db.table import Band, SensorData
+from backend.partitions import (
+    PartitionManager, _parse_bound, add_partitions_ddl, drop_partitions_ddl, plan_partitions,
+)
+from backend.retention import ArchiveWriter
+
+
+NOW = datetime(2024, 8, 1, 13, 0, 0)
+TABLE = SensorData.__table__
+
+
+def _daily(first, count):
+    return [(f'p{first + timedelta(days=i):%Y%m%d}', first + timedelta(days=i + 1)) for i in range(count)]
+
+
+class TestPlan:
+    """추가/삭제할 파티션 계획"""
+
+    def test_premakes_future_days(self):
+        existing = _daily(datetime(2024, 7, 30), 3) + [('pmax', None)]
+        add, drop = plan_partitions(existing, NOW, 'day', premake=3)
+        assert add == [
+            ('p20240802', datetime(2024, 8, 3)),
+            ('p20240803', datetime(2024, 8, 4)),
+            ('p20240804', datetime(2024, 8, 5)),
+        ]
+        assert drop == []
+
+    def test_nothing_to_add_when_ahead(self):
+        existing = _daily(datetime(2024, 8, 1), 10) + [('pmax', None)]
+        assert plan_partitions(existing, NOW, 'day', premake=3) == ([], [])
+
+    def test_monthly(self):
+        existing = [('p202407', datetime(2024, 8, 1)), ('pmax', None)]
+        add, _ = plan_partitions(existing, datetime(2024, 12, 20), 'month', premake=1)
+        # 멈춰 있던 기간은 파티션 하나로, 이후 월 파티션 (연도 넘김)
+        assert add == [
+            ('p202408', datetime(2024, 12, 1)),
+            ('p202412', datetime(2025, 1, 1)),
+            ('p202501', datetime(2025, 2, 1)),
+        ]
+
+    def test_only_maxvalue_starts_with_history(self):
+        add, _ = plan_partitions([('pmax', None)], NOW, 'day', premake=1)
+        assert add == [
+            ('p_history', datetime(2024, 8, 1)),
+            ('p20240801', datetime(2024, 8, 2)),
+            ('p20240802', datetime(2024, 8, 3)),
+        ]
+
+    def test_unit_switch_fills_to_boundary(self):
+        existing = _daily(datetime(2024, 8, 1), 3) + [('pmax', None)]
+        add, _ = plan_partitions(existing, NOW, 'month', premake=1)
+        assert add == [('p202408', datetime(2024, 9, 1)), ('p202409', datetime(2024, 10, 1))]
+
+    def test_drops_only_fully_expired(self):
+        existing = _daily(datetime(2024, 4, 30), 5) + [('pmax', None)]
+        _, drop = plan_partitions(existing, datetime(2024, 8, 1, 12), 'day', retention_days=90)
+        # 기준 시각 2024-05-03 12:00: 상한이 그 이전인 파티션만
+        assert drop == [
+            ('p20240430', None, datetime(2024, 5, 1)),
+            ('p20240501', datetime(2024, 5, 1), datetime(2024, 5, 2)),
+            ('p20240502', datetime(2024, 5, 2), datetime(2024, 5, 3)),
+        ]
+
+    def test_unknown_unit(self):
+        with pytest.raises(ValueError):
+            plan_partitions([], NOW, 'week')
+
+
+class TestDDL:
+    def test_reorganize_empty_maxvalue(self):
+        ddl = add_partitions_ddl('sensordata', [('p20240802', datetime(2024, 8, 3))], has_maxvalue=True)
+        assert ddl == (
+            "ALTER TABLE sensordata REORGANIZE PARTITION pmax INTO ("
+            "PARTITION p20240802 VALUES LESS THAN ('2024-08-03 00:00:00'), "
+            "PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+        )
+
+    def test_add_without_maxvalue(self):
+        ddl = add_partitions_ddl('sensordata', [('p202409', datetime(2024, 10, 1))], has_maxvalue=False)
+        assert ddl == "ALTER TABLE sensordata ADD PARTITION (PARTITION p202409 VALUES LESS THAN ('2024-10-01 00:00:00'))"
+        assert drop_partitions_ddl('sensordata', ['p1', 'p2']) == "ALTER TABLE sensordata DROP PARTITION p1, p2"
+
+    def test_parse_bound(self):
+        assert _parse_bound("'2024-08-03 00:00:00'") == datetime(2024, 8, 3)
+        assert _parse_bound('MAXVALUE') is None
+
+
+class FakePartitions(PartitionManager):
+    """information_schema 대신 파티션 목록을 직접 두고 DDL은 기록만 함"""
+
+    def __init__(self, engine, existing, **kwargs):
+        super().__init__(engine, TABLE, **kwargs)
+        self.existing = existing
+        self.executed = []
+
+    def partitions(self):
+        return list(self.existing)
+
+    def _execute(self, ddl):
+        self.executed.append(ddl)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "partitions.db"}')
+    TABLE.metadata.create_all(engine, tables=[Band.__table__, TABLE])
+    rows = [
+        {'FK_bid': 1, 'datetime': datetime(2024, 4, 29, 12) + timedelta(hours=i), 'hr': 70}
+        for i in range(96)
+    ]
+    with engine.begin() as conn:
+        conn.execute(TABLE.insert(), rows)
+    return engine
+
+
+class TestManager:
+    """파티션 유지/삭제"""
+
+    def test_not_partitioned_is_noop(self, engine):
+        manager = PartitionManager(engine, TABLE)
+        assert manager.partitions() == []
+        assert manager.maintain(NOW) is None
+        assert manager.drop_expired(NOW) is None
+
+    def test_maintain_issues_single_reorganize(self, engine):
+        manager = FakePartitions(engine, _daily(datetime(2024, 7, 31), 2) + [('pmax', None)], premake=2)
+        assert manager.maintain(NOW) == ['p20240802', 'p20240803']
+        assert len(manager.executed) == 1
+        assert manager.executed[0].startswith('ALTER TABLE sensordata REORGANIZE PARTITION pmax')
+
+    def test_drop_keeps_last_bounded_partition(self, engine):
+        existing = _daily(datetime(2024, 4, 1), 3) + [('pmax', None)]
+        manager = FakePartitions(engine, existing, retention_days=90)
+        result = manager.drop_expired(NOW)
+        assert result == {'dropped': ['p20240401', 'p20240402'], 'archived': 0}
+        assert manager.executed == [
+            'ALTER TABLE sensordata DROP PARTITION p20240401',
+            'ALTER TABLE sensordata DROP PARTITION p20240402',
+        ]
+
+    def test_archives_partition_rows_before_drop(self, engine, tmp_path):
+        directory = str(tmp_path / 'archive')
+        existing = [('p_history', datetime(2024, 4, 30))] + _daily(datetime(2024, 4, 30), 4) + [('pmax', None)]
+        manager = FakePartitions(engine, existing, retention_days=90, chunk_size=7,
+                                 archive=ArchiveWriter(directory, TABLE))
+        result = manager.drop_expired(datetime(2024, 8, 1, 12))
+
+        # 기준 시각 2024-05-03 12:00 → p_history, 4/30, 5/1, 5/2 파티션
+        assert result['dropped'] == ['p_history', 'p20240430', 'p20240501', 'p20240502']
+        with engine.connect() as conn:
+            expected = conn.execute(
+                select(func.count()).select_from(TABLE).where(TABLE.c.datetime < datetime(2024, 5, 3))
+            ).scalar()
+        assert result['archived'] == expected == 84
+
+        paths = sorted(glob.glob(f'{directory}/*.csv.gz'))
+        assert [path.rsplit('/', 1)[1][:19] for path in paths] == [
+            'sensordata_20240429', 'sensordata_20240430', 'sensordata_20240501', 'sensordata_20240502',
+        ]
+        with gzip.open(paths[1], 'rt', newline='') as f:
+            times = [row['datetime'] for row in csv.DictReader(f)]
+        assert len(times) == 24 and all(t.startswith('2024-04-30') for t in times)
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+보관 기간 정리 테스트 (구간 삭제, 휴식/복제 지연 대기, 중단 후 재개, 보관 파일)
+"""
+
+import csv
+import glob
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+
+from backend import retention
+from backend.db.table import Band, SensorData
+from backend.retention import ArchiveWriter, RetentionPurge
+
+
+NOW = datetime(2024, 8, 1, 0, 0, 0)
+TABLE = SensorData.__table__
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "retention.db"}')
+    TABLE.metadata.create_all(engine, tables=[Band.__table__, TABLE])
+    # 오래된 행 1000개와 최근 행 200개가 id 순서상 섞여 있음
+    rows = []
+    for i in range(1200):
+        old = i % 6 != 5
+        at = NOW - timedelta(days=120 if old else 10, seconds=i)
+        rows.append({'FK_bid': 1, 'datetime': at, 'hr': 60 + i % 40})
+    with engine.begin() as conn:
+        conn.execute(TABLE.insert(), rows)
+    return engine
+
+
+def _count(engine, old=None):
+    query = select(func.count()).select_from(TABLE)
+    if old is not None:
+        cutoff = NOW - timedelta(days=90)
+        query = query.where(TABLE.c.datetime < cutoff if old else TABLE.c.datetime >= cutoff)
+    with engine.connect() as conn:
+        return conn.execute(query).scalar()
+
+
+def _purge(engine, **kwargs):
+    sleeps = kwargs.pop('sleeps', [])
+    kwargs.setdefault('chunk_size', 100)
+    return RetentionPurge(engine, TABLE, sleep=sleeps.append, **kwargs)
+
+
+class TestChunkedPurge:
+    """기본 키 순서 구간 삭제"""
+
+    def test_deletes_only_expired_rows_in_chunks(self, engine):
+        sleeps = []
+        result = _purge(engine, sleeps=sleeps).run(now=NOW)
+
+        assert result['finished'] is True
+        assert result['deleted'] == 1000
+        assert result['chunks'] == 10
+        assert len(sleeps) == 10
+        assert _count(engine, old=True) == 0
+        assert _count(engine, old=False) == 200
+
+    def test_sleep_follows_query_time(self, engine):
+        ticks = iter(range(0, 10000, 2))
+        sleeps = []
+        purge = RetentionPurge(engine, TABLE, chunk_size=500, sleep_ratio=0.5, max_sleep=0.8,
+                               sleep=sleeps.append, clock=lambda: next(ticks))
+        purge.run(now=NOW)
+        # 구간당 clock 2틱(2초) × 0.5 = 1초 → max_sleep으로 제한
+        assert sleeps == [0.8, 0.8]
+
+    def test_waits_for_replica_lag(self, engine):
+        lags = iter([12.0, 7.0, 1.0] + [0.0] * 100)
+        sleeps = []
+        purge = _purge(engine, sleeps=sleeps, chunk_size=1000, max_lag=5, sleep_ratio=0,
+                       lag_probe=lambda: next(lags))
+        purge.run(now=NOW)
+        assert sleeps == [1.0, 1.0]
+
+    def test_stops_when_replica_lag_persists(self, engine):
+        """복제 지연 대기 시간을 넘기면 더 지우지 않고 체크포인트에서 다음 실행이 이어감"""
+        sleeps = []
+        purge = _purge(engine, sleeps=sleeps, max_lag=5, max_lag_wait=3, sleep_ratio=0,
+                       lag_probe=lambda: 30.0)
+        first = purge.run(now=NOW)
+
+        assert (first['finished'], first['replica_lagging'], first['chunks']) == (False, True, 1)
+        assert sleeps == [1.0, 1.0, 1.0]
+        assert _count(engine, old=True) == 900
+
+        second = _purge(engine, lag_probe=lambda: 0.0).run(now=NOW)
+        assert second['finished'] is True and second['deleted'] == 900
+    def test_resume_after_crash_keeps_cutoff(self, engine, monkeypatch):
+        """중단 후 다음 실행은 처음 기준 시각으로 이어서 삭제"""
+        purge = _purge(engine)
+        original = RetentionPurge._delete_chunk
+        calls = []
+
+        def crashing(self, state, through):
+            calls.append(1)
+            if len(calls) == 4:
+                raise RuntimeError('connection lost')
+            return original(self, state, through)
+
+        monkeypatch.setattr(RetentionPurge, '_delete_chunk', crashing)
+        with pytest.raises(RuntimeError):
+            purge.run(now=NOW)
+        monkeypatch.setattr(RetentionPurge, '_delete_chunk', original)
+
+        assert _count(engine, old=True) == 700
+        # 하루 뒤 재개해도 기준 시각은 유지 (새 기준이면 최근 행 일부도 대상이 됨)
+        result = _purge(engine).run(now=NOW + timedelta(days=85))
+        assert result['finished'] is True
+        assert result['deleted'] == 700
+        assert _count(engine) == 200
+
+    def test_time_budget_pauses(self, engine):
+        ticks = iter(range(10000))
+        purge = RetentionPurge(engine, TABLE, chunk_size=100, sleep=lambda s: None,
+                               clock=lambda: next(ticks))
+        first = purge.run(max_seconds=5, now=NOW)
+        assert first['finished'] is False
+        assert 0 < first['deleted'] < 1000
+
+        second = _purge(engine).run(now=NOW)
+        assert second['finished'] is True
+        assert first['deleted'] + second['deleted'] == 1000
+
+
+    def test_scan_is_bounded_by_max_expired_id(self, engine):
+        """마지막 확인 쿼리도 기간 지난 행의 최대 id까지만 읽음 (전체 테이블을 훑지 않음)"""
+        with engine.begin() as conn:
+            conn.execute(Band.__table__.insert(), [{'id': 1, 'bid': 'b1'}, {'id': 2, 'bid': 'b2'}])
+            conn.execute(TABLE.insert(), [
+                {'FK_bid': 2, 'datetime': NOW - timedelta(days=100), 'hr': 70},
+                {'FK_bid': 2, 'datetime': NOW - timedelta(days=1), 'hr': 70},
+            ])
+            expected_upper = conn.execute(
+                select(func.max(TABLE.c.id)).where(TABLE.c.datetime < NOW - timedelta(days=90))
+            ).scalar()
+
+        statements = []
+        listen = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', listen)
+        try:
+            purge = _purge(engine, group_column='FK_bid')
+            result = purge.run(now=NOW)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listen)
+
+        assert purge._upper_id == expected_upper
+        assert result['finished'] is True and result['deleted'] == 1001
+        scans = [sql for sql in statements if sql.lstrip().startswith('SELECT sensordata.id')]
+        assert scans and all('sensordata.id <= ?' in sql for sql in scans)
+
+        # 그룹 값은 bands에서 가져옴 (sensordata 전체를 DISTINCT로 읽지 않음)
+        assert not any('DISTINCT' in sql for sql in statements)
+
+        # 지울 행이 없으면 구간 조회 없이 끝남
+        assert _purge(engine, group_column='FK_bid').run(now=NOW)['chunks'] == 0
+
+
+    def test_upper_id_from_window_before_cutoff(self, engine):
+        """기준 시각 직전 기간에 행이 있으면 쿼리 하나로 최대 id를 구함"""
+        cutoff = NOW - timedelta(days=90)
+        with engine.begin() as conn:
+            conn.execute(Band.__table__.insert(), [{'id': 1, 'bid': 'b1'}])
+            conn.execute(TABLE.insert(), [{'FK_bid': 1, 'datetime': cutoff - timedelta(hours=1), 'hr': 70}])
+            expected_upper = conn.execute(select(func.max(TABLE.c.id))).scalar()
+
+        statements = []
+        listen = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', listen)
+        try:
+            upper = _purge(engine, group_column='FK_bid')._max_expired_id(cutoff)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listen)
+
+        assert upper == expected_upper
+        assert len(statements) == 1 and 'FROM bands' in statements[0]
+
+
+class TestArchive:
+    """삭제 전 보관 파일"""
+
+    def _archived_ids(self, directory):
+        ids = []
+        for path in sorted(glob.glob(f'{directory}/*.csv.gz')):
+            with gzip.open(path, 'rt', newline='') as f:
+                ids.extend(int(row['id']) for row in csv.DictReader(f))
+        return ids
+
+    def test_csv_archive_contains_every_deleted_row(self, engine, tmp_path):
+        directory = tmp_path / 'archive'
+        with engine.connect() as conn:
+            expected = conn.execute(
+                select(TABLE.c.id).where(TABLE.c.datetime < NOW - timedelta(days=90)).order_by(TABLE.c.id)
+            ).scalars().all()
+
+        result = _purge(engine, archive_dir=str(directory), archive_rows=300).run(now=NOW)
+
+        assert result['archived'] == result['deleted'] == 1000
+        assert len(glob.glob(f'{directory}/*.csv.gz')) == 4
+        assert self._archived_ids(directory) == expected
+        assert not glob.glob(f'{directory}/*.tmp')
+
+    def test_crash_between_archive_and_delete(self, engine, tmp_path, monkeypatch):
+        """파일 확정 후 삭제 전에 중단되어도 재개 시 같은 행을 다시 내보내지 않음"""
+        directory = str(tmp_path / 'archive')
+        original = RetentionPurge._delete_chunk
+        calls = []
+
+        def crashing(self, state, through):
+            calls.append(1)
+            if len(calls) == 5:
+                raise RuntimeError('killed')
+            return original(self, state, through)
+
+        monkeypatch.setattr(RetentionPurge, '_delete_chunk', crashing)
+        with pytest.raises(RuntimeError):
+            _purge(engine, archive_dir=directory, archive_rows=300).run(now=NOW)
+        monkeypatch.setattr(RetentionPurge, '_delete_chunk', original)
+
+        _purge(engine, archive_dir=directory, archive_rows=300).run(now=NOW)
+        ids = self._archived_ids(directory)
+        assert len(ids) == len(set(ids)) == 1000
+        assert _count(engine, old=True) == 0
+
+    def test_parquet_requires_pyarrow(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(retention, 'pyarrow', None)
+        with pytest.raises(ValueError):
+            ArchiveWriter(str(tmp_path), TABLE, 'parquet')
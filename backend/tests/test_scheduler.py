@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+스케줄러 테스트 (cron, 겹침 방지, 놓친 회차, 지터, 실행 시간 히스토그램)
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.scheduler import CronSchedule, DurationHistogram, Scheduler
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCronSchedule:
+    """cron 형식 다음 실행 시각"""
+
+    def test_daily(self):
+        cron = CronSchedule('0 9 * * *')
+        assert cron.next_after(datetime(2024, 5, 1, 8, 59, 30)) == datetime(2024, 5, 1, 9, 0)
+        assert cron.next_after(datetime(2024, 5, 1, 9, 0)) == datetime(2024, 5, 2, 9, 0)
+
+    def test_steps_ranges_and_lists(self):
+        cron = CronSchedule('*/15 8-9 * * *')
+        assert cron.next_after(datetime(2024, 5, 1, 9, 50)) == datetime(2024, 5, 2, 8, 0)
+        assert CronSchedule('5,35 * * * *').next_after(datetime(2024, 5, 1, 10, 6)) == datetime(2024, 5, 1, 10, 35)
+
+    def test_weekday_and_month_rollover(self):
+        # 2024-05-01은 수요일, 일요일(0)은 5월 5일
+        assert CronSchedule('0 0 * * 0').next_after(datetime(2024, 5, 1)) == datetime(2024, 5, 5)
+        assert CronSchedule('0 0 * * 7').next_after(datetime(2024, 5, 1)) == datetime(2024, 5, 5)
+        assert CronSchedule('0 0 31 * *').next_after(datetime(2024, 4, 1)) == datetime(2024, 5, 31)
+        assert CronSchedule('0 0 29 2 *').next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+
+    def test_day_or_weekday(self):
+        """일과 요일을 모두 지정하면 둘 중 하나만 맞아도 실행"""
+        cron = CronSchedule('0 0 10 * 0')
+        assert cron.next_after(datetime(2024, 5, 1)) == datetime(2024, 5, 5)
+        assert cron.next_after(datetime(2024, 5, 6)) == datetime(2024, 5, 10)
+
+    @pytest.mark.parametrize('expr', ['* * * *', '60 * * * *', '0 24 * * *', '0 0 0 * *', '*/0 * * * *'])
+    def test_invalid(self, expr):
+        with pytest.raises(ValueError):
+            CronSchedule(expr)
+
+
+class TestDurationHistogram:
+    def test_buckets_and_quantiles(self):
+        histogram = DurationHistogram()
+        for seconds in [0.02] * 90 + [2.0] * 9 + [1000.0]:
+            histogram.observe(seconds)
+
+        data = histogram.to_dict()
+        assert data['count'] == 100
+        assert data['buckets']['0.05'] == 90
+        assert data['buckets']['5'] == 9
+        assert data['buckets']['+Inf'] == 1
+        assert data['p50'] == 0.05
+        assert data['p95'] == 5
+        assert data['max'] == 1000.0
+
+
+def _wait_idle(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while job.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestScheduler:
+    """실행 시각 관리와 작업 실행"""
+
+    def test_interval_job_runs_on_schedule(self):
+        clock, calls = FakeClock(), []
+        scheduler = Scheduler(clock=clock)
+        scheduler.add_job(lambda: calls.append(clock.now), 60, name='tick')
+
+        assert scheduler.run_pending(59) == []
+        assert scheduler.run_pending(60) == ['tick']
+        assert scheduler.run_pending(119) == []
+        assert scheduler.run_pending(120) == ['tick']
+        assert len(calls) == 2
+
+    def test_missed_runs_are_coalesced(self):
+        """스케줄러가 밀린 동안 지나간 회차는 한 번만 실행하고 놓친 횟수로 기록"""
+        clock, calls = FakeClock(), []
+        scheduler = Scheduler(clock=clock)
+        job = scheduler.add_job(lambda: calls.append(1), 60, name='tick')
+
+        scheduler.run_pending(60 * 5 + 10)
+        assert calls == [1]
+        assert job.missed == 4
+        assert job.due == 360
+
+    def test_no_overlap(self):
+        """이전 실행이 끝나지 않았으면 이번 회차는 건너뜀"""
+        clock = FakeClock()
+        scheduler = Scheduler(max_workers=2, clock=clock)
+        release, entered = threading.Event(), threading.Event()
+        active, peak = [0], [0]
+
+        def slow():
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            entered.set()
+            release.wait(5)
+            active[0] -= 1
+
+        job = scheduler.add_job(slow, 10, name='slow')
+        fast = scheduler.add_job(lambda: None, 10, name='fast')
+        scheduler.start()
+        try:
+            # 실제 시계 대신 직접 진행 (스케줄러 스레드는 1초 이내 실행 시각이 없으므로 대기)
+            assert sorted(scheduler.run_pending(10)) == ['fast', 'slow']
+            assert entered.wait(5)
+            for now in (20, 30):
+                _wait_idle(fast)
+                assert scheduler.run_pending(now) == ['fast']
+            assert job.missed == 2
+            assert scheduler.get_status()['busy'] >= 1
+        finally:
+            release.set()
+            scheduler.stop()
+        assert peak[0] == 1
+        assert fast.missed == 0
+
+    def test_jitter_delays_within_bound(self):
+        clock = FakeClock(1000.0)
+        scheduler = Scheduler(clock=clock)
+        jobs = [scheduler.add_job(lambda: None, 60, name=f'j{i}', jitter=5) for i in range(50)]
+        offsets = [job.fire_at - job.due for job in jobs]
+        assert all(0 <= offset <= 5 for offset in offsets)
+        assert len(set(offsets)) > 1
+        # 지터는 회차마다 새로 뽑고 기준 시각은 밀리지 않음
+        scheduler.run_pending(1100)
+        assert all(job.due == 1120 for job in jobs)
+
+    def test_cron_job(self):
+        start = datetime(2024, 5, 1, 8, 0).timestamp()
+        clock, calls = FakeClock(start), []
+        scheduler = Scheduler(clock=clock)
+        scheduler.add_job(lambda: calls.append(1), cron='0 9 * * *', name='daily')
+
+        assert scheduler.run_pending(start + 3599) == []
+        assert scheduler.run_pending(start + 3600) == ['daily']
+        assert scheduler.get_status()['jobs'][0]['next_run'] == '2024-05-02T09:00:00'
+
+    def test_failure_is_recorded(self):
+        clock = FakeClock()
+        scheduler = Scheduler(clock=clock)
+
+        def broken():
+            raise RuntimeError('db down')
+
+        scheduler.add_job(broken, 60, name='broken')
+        scheduler.run_pending(60)
+        scheduler.run_pending(120)
+
+        status = scheduler.get_status()['jobs'][0]
+        assert status['runs'] == 2
+        assert status['failures'] == 2
+        assert status['last_error'] == 'db down'
+        assert status['running'] is False
+        assert status['duration']['count'] == 2
+
+    def test_requires_one_schedule(self):
+        scheduler = Scheduler(clock=FakeClock())
+        with pytest.raises(ValueError):
+            scheduler.add_job(lambda: None, name='none')
+        with pytest.raises(ValueError):
+            scheduler.add_job(lambda: None, 60, cron='* * * * *', name='both')
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+센서 데이터 묶음 토픽(wellsafer/band/{bid}/sensor/batch) 테스트
+"""
+
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+import backend
+from backend import mqtt_client
+from backend.band_cache import BandInfo, band_cache
+from backend.db.table import Band, SensorData
+from backend.ingest import write_batch
+from backend.ingest_engine import HandlerChain, from_batch_payload
+from backend.latest_vitals import LatestVitalsStore
+
+
+BID = '467191213660619'
+T0 = 1714555800000     # 2024-05-01 09:30:00 UTC (ms)
+
+
+def _batch(*offsets, hr=70):
+    """T0 기준 offsets(초) 시각의 측정값 배열"""
+    return [{'timestamp': T0 + offset * 1000, 'hr': hr + offset, 'spo2': 98} for offset in offsets]
+
+
+@pytest.fixture
+def batch_app():
+    """sensordata 테이블을 가진 SQLite 앱"""
+    db = backend.app.extensions['sqlalchemy']
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.metadata.create_all(db.engine)
+        db.session.add(Band(id=7, bid=BID, name='홍길동'))
+        db.session.commit()
+        yield app, db
+        db.session.remove()
+
+
+class TestBatchPayload:
+    """묶음 페이로드 변환"""
+
+    def test_sorted_and_deduplicated(self):
+        payload = _batch(2, 0, 1) + [{'timestamp': T0 + 1400, 'hr': 99}]
+        readings = from_batch_payload(BID, {'readings': payload})
+
+        assert [r.datetime.second for r in readings] == [0, 1, 2]
+        # 같은 초의 측정값은 마지막 값
+        assert readings[1].hr == 99
+
+    def test_requires_device_timestamp(self):
+        readings = from_batch_payload(BID, [{'hr': 70}, {'timestamp': 0, 'hr': 71}, 'x'] + _batch(0))
+        assert len(readings) == 1
+        assert from_batch_payload(BID, {'hr': 70}) == []
+
+
+class TestWriteBatch:
+    """(bid, 기기 시각) 중복 제외 일괄 저장"""
+
+    def test_redelivered_rows_are_skipped(self, batch_app):
+        app, db = batch_app
+        rows = [r.to_row(7) for r in from_batch_payload(BID, _batch(0, 1, 2))]
+        assert len(write_batch(app, 7, rows)) == 3
+
+        # 재전송 + 새 측정값 하나
+        rows = [r.to_row(7) for r in from_batch_payload(BID, _batch(1, 2, 3))]
+        inserted = write_batch(app, 7, rows)
+        assert [row['datetime'].second for row in inserted] == [3]
+        assert db.session.query(SensorData).filter_by(FK_bid=7).count() == 4
+
+
+class TestBatchTopic:
+    """묶음 토픽 수신 → 저장 및 최신 측정값만 처리 단계로 전달"""
+
+    @pytest.fixture
+    def collected(self, batch_app, monkeypatch):
+        app, _ = batch_app
+        collected = []
+        monkeypatch.setattr(mqtt_client, 'mqtt_handler', mqtt_client.MQTTHandler())
+        monkeypatch.setattr(mqtt_client, 'sensor_chain', HandlerChain())
+        monkeypatch.setattr(mqtt_client, 'register_sensor_stages', lambda c: (
+            c.add('persist', mqtt_client._stage_persist), c.add('collect', collected.append)))
+        monkeypatch.setattr('backend.latest_vitals.latest_vitals', LatestVitalsStore(loader=dict))
+        monkeypatch.setattr(band_cache, 'loader', lambda b: BandInfo(7, b, '홍길동', None, None, ''))
+        band_cache.clear()
+        mqtt_client._register_default_handlers(app, None)
+        yield collected
+        band_cache.clear()
+
+    def _send(self, payload):
+        mqtt_client.mqtt_handler.handle_message(f'wellsafer/band/{BID}/sensor/batch', payload)
+
+    def test_only_newest_reaches_chain(self, batch_app, collected):
+        _, db = batch_app
+        self._send(_batch(0, 1, 2, 3, 4))
+
+        assert db.session.query(SensorData).filter_by(FK_bid=7).count() == 5
+        assert len(collected) == 1
+        assert collected[0].reading.hr == 74
+        assert collected[0].reading.datetime == datetime(2024, 5, 1, 9, 30, 4)
+
+    def test_redelivered_batch_is_not_processed_again(self, batch_app, collected):
+        _, db = batch_app
+        self._send(_batch(0, 1, 2))
+        self._send(_batch(0, 1, 2))
+
+        assert db.session.query(SensorData).filter_by(FK_bid=7).count() == 3
+        assert len(collected) == 1
+
+    def test_backlog_older_than_live_reading_is_not_emitted(self, batch_app, collected):
+        """실시간 토픽으로 더 최근 값이 이미 들어왔으면 밀린 값은 저장만"""
+        _, db = batch_app
+        self._send(_batch(10))
+        self._send(_batch(0, 1))
+
+        assert db.session.query(SensorData).filter_by(FK_bid=7).count() == 3
+        assert len(collected) == 1
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+바이너리 텔레메트리 스키마 테스트
+"""
+
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from band_cache import BandInfo
+from ingest_engine import HandlerChain
+from telemetry import (
+    Field, SCHEMA_V1, SchemaRegistry, TelemetryError, TelemetrySchema
+)
+
+
+READING = {
+    'timestamp': datetime(2024, 5, 1, 9, 30, 0),
+    'battery_level': 87, 'hr': 72, 'spo2': 98, 'skin_temp': 36.54,
+    'x': -120, 'y': 15, 'z': 980,
+    'walk_steps': 5321, 'run_steps': 210, 'activity': 3,
+    'motionFlag': 1, 'scdState': 1, 'rssi': -71,
+}
+
+# 필드를 줄이고 순서를 바꾼 가상의 다음 버전
+SCHEMA_V2 = TelemetrySchema(2, [
+    Field('timestamp', 'I', missing=0),
+    Field('hr', 'B'),
+    Field('spo2', 'B'),
+    Field('battery_level', 'B'),
+    Field('scdState', 'B'),
+])
+
+
+class TestTelemetrySchema:
+    """고정 레이아웃 인코딩/디코딩"""
+
+    def test_round_trip(self):
+        frame = SCHEMA_V1.encode(READING)
+        assert len(frame) == SCHEMA_V1.size == 29
+        assert frame[0] == 1
+
+        values = SCHEMA_V1.decode(frame)
+        assert values['datetime'] == READING['timestamp']
+        assert values['skin_temp'] == pytest.approx(36.54)
+        assert {k: values[k] for k in ('hr', 'spo2', 'x', 'walk_steps', 'rssi')} == \
+            {'hr': 72, 'spo2': 98, 'x': -120, 'walk_steps': 5321, 'rssi': -71}
+
+    def test_missing_values(self):
+        values = SCHEMA_V1.decode(SCHEMA_V1.encode({'hr': 65}))
+        assert values['hr'] == 65
+        assert values['spo2'] is None and values['rssi'] is None and values['walk_steps'] is None
+        assert values['datetime'] is None
+
+    def test_wrong_length(self):
+        with pytest.raises(TelemetryError):
+            SCHEMA_V1.decode(SCHEMA_V1.encode(READING)[:-1])
+
+    def test_out_of_range_value(self):
+        with pytest.raises(TelemetryError):
+            SCHEMA_V1.encode({'hr': 300})
+
+
+class TestSchemaRegistry:
+    """sw_ver 기반 스키마 선택"""
+
+    def test_firmware_prefix_lookup(self):
+        registry = SchemaRegistry([SCHEMA_V1, SCHEMA_V2])
+        registry.map_firmware('2.1', 2)
+        assert registry.for_firmware('2.1.3') is SCHEMA_V2
+        assert registry.for_firmware('2.2.0') is None
+
+        with pytest.raises(KeyError):
+            registry.map_firmware('3.0', 9)
+
+    def test_decode_by_firmware(self):
+        registry = SchemaRegistry([SCHEMA_V1, SCHEMA_V2])
+        registry.register(SCHEMA_V2, sw_vers=['2.1'])
+
+        values = registry.decode(SCHEMA_V2.encode({'hr': 80, 'scdState': 0}), sw_ver='2.1.0')
+        assert values['hr'] == 80 and values['scdState'] == 0
+
+    def test_version_byte_wins_after_firmware_update(self):
+        """sw_ver 보고 전에 새 펌웨어가 보낸 프레임도 버전 바이트로 해석"""
+        registry = SchemaRegistry([SCHEMA_V1, SCHEMA_V2])
+        registry.map_firmware('2.0', 1)
+
+        values = registry.decode(SCHEMA_V2.encode({'hr': 90}), sw_ver='2.0.5')
+        assert values['hr'] == 90
+        assert registry.get_stats()['firmware_mismatch'] == 1
+
+    def test_unknown_version(self):
+        registry = SchemaRegistry([SCHEMA_V1])
+        with pytest.raises(TelemetryError):
+            registry.decode(bytes([7]) + bytes(28))
+        with pytest.raises(TelemetryError):
+            registry.decode(b'')
+        assert registry.get_stats()['errors'] == 2
+
+
+class TestBinaryTopic:
+    """wellsafer/band/{bid}/sensor/bin 수신"""
+
+    def test_binary_frame_reaches_sensor_chain(self, monkeypatch):
+        from collections import namedtuple
+        from backend import mqtt_client
+        from backend.band_cache import band_cache
+
+        bid = '467191213660619'
+        collected = []
+        monkeypatch.setattr(mqtt_client, 'mqtt_handler', mqtt_client.MQTTHandler())
+        monkeypatch.setattr(mqtt_client, 'sensor_chain', HandlerChain())
+        monkeypatch.setattr(mqtt_client, 'register_sensor_stages',
+                            lambda c: c.add('collect', collected.append))
+        monkeypatch.setattr(band_cache, 'loader',
+                            lambda b: BandInfo(7, b, '홍길동', None, None, '', '2.0.1'))
+        band_cache.clear()
+
+        mqtt_client._register_default_handlers(Flask(__name__), None)
+        Message = namedtuple('Message', ['topic', 'payload'])
+        # JSON 디코딩 없이 원본 bytes가 핸들러로 전달됨
+        mqtt_client._on_message(None, None, Message(f'wellsafer/band/{bid}/sensor/bin', SCHEMA_V1.encode(READING)))
+        mqtt_client._on_message(None, None, Message(f'wellsafer/band/{bid}/sensor/bin', b'\x01\x02'))
+        band_cache.clear()
+
+        assert len(collected) == 1
+        reading = collected[0].reading
+        assert (reading.bid, reading.hr, reading.walk_steps) == (bid, 72, 5321)
+        assert reading.datetime == READING['timestamp']
@@ -7,7 +7,8 @@ import pytest
 from utils import (
     validate_phone, validate_email, validate_bid, validate_stim_level,
     generate_session_id, safe_int, safe_float,
-    calculate_distance, is_in_geofence
+    calculate_distance, is_in_geofence,
+    encode_cursor, decode_cursor
 )
 
 
@@ -123,3 +124,27 @@ class TestGeo:
         # 먼 위치 = 펜스 밖
         far_lat, far_lon = 37.5700, 126.9900
         assert is_in_geofence(far_lat, far_lon, center_lat, center_lon, radius) is False
+
+
+class TestCursor:
+    """커서 페이지네이션 유틸리티 테스트"""
+    
+    def test_round_trip(self):
+        cursor = encode_cursor(1, 12345)
+        assert decode_cursor(cursor, 2) == (1, 12345)
+    
+    def test_invalid_cursor(self):
+        assert decode_cursor(None, 2) is None
+        assert decode_cursor('not-a-cursor', 2) is None
+        assert decode_cursor(encode_cursor(1), 2) is None
+    
+    def test_round_trip_with_name(self):
+        cursor = encode_cursor(1, '홍길동:1', 42)
+        assert decode_cursor(cursor, 3) == (1, '홍길동:1', 42)
+        assert decode_cursor(cursor, 2) is None
+    
+    def test_typed_fields(self):
+        cursor = encode_cursor(1, '홍길동', 42)
+        assert decode_cursor(cursor, 3, types=(int, str, int)) == (1, '홍길동', 42)
+        assert decode_cursor(encode_cursor('1', '홍길동', 42), 3, types=(int, str, int)) is None
+        assert decode_cursor(encode_cursor(1, 2, 42), 3, types=(int, str, int)) is None
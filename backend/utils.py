@@ -4,6 +4,8 @@
 """
 
 import re
+import json
+import base64
 import hashlib
 import secrets
 from datetime import datetime, timedelta
@@ -322,6 +324,50 @@ def paginate_query(query, page=1, per_page=20, max_per_page=100):
     }
 
 
+def encode_cursor(*values):
+    """
+    커서 페이지네이션용 커서 문자열 생성
+
+    Args:
+        *values: 마지막 항목의 정렬 키 값 (정수 또는 문자열)
+
+    Returns:
+        str: URL-safe 커서 문자열
+    """
+    raw = json.dumps([v if isinstance(v, str) else int(v) for v in values],
+                     ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size, types=None):
+    """
+    커서 문자열 해석
+
+    Args:
+        cursor: encode_cursor()로 만든 문자열
+        size: 정렬 키 개수
+        types: 정렬 키별 형식 (예: (int, str, int), None이면 정수 또는 문자열)
+
+    Returns:
+        tuple: 정렬 키 값 (형식이 잘못되면 None)
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    for i, value in enumerate(values):
+        expected = types[i] if types is not None else (int, str)
+        # JSON true/false는 bool(int의 하위 형식)로 해석되므로 제외
+        if isinstance(value, bool) or not isinstance(value, expected):
+            return None
+    return tuple(values)
+
+
 def get_pagination_params():
     """
     요청에서 페이지네이션 파라미터 추출
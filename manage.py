@@ -63,6 +63,20 @@ def name():
         return
     with app.app_context():
         DBManager.insert_dummy_name()  
+
+# python manage.py emit_broker
+@manager.command
+def emit_broker():
+    """로컬 Socket.IO 발송 브로커 실행 (SOCKETIO_MESSAGE_QUEUE=local://...)"""
+    from backend.emit_bus import EmitBroker, parse_local_url
+    url = app.config.get('SOCKETIO_MESSAGE_QUEUE') or 'local://'
+    broker = EmitBroker(parse_local_url(url))
+    print(f"emit broker listening on {broker.path}")
+    try:
+        broker.serve_forever()
+    finally:
+        broker.stop()
+
 def check_message(message):
     inp = input(message)
     if inp == 'Y':
@@ -146,6 +146,27 @@ export const SocketProvider = ({ children }) => {
     };
   }, [dashboard]);
 
+  // dashboard_frame - 밴드별 변경 묶음 (변경되지 않은 항목은 null)
+  useEffect(() => {
+    const handleDashboardFrame = (frame) => {
+      frame.bands.forEach((values) => {
+        const changes = {};
+        frame.fields.forEach((field, i) => {
+          if (i > 0 && values[i] !== null) {
+            changes[field] = values[i];
+          }
+        });
+        dashboard.updateBandStatus(values[0], changes);
+      });
+    };
+
+    socketService.on('dashboard_frame', handleDashboardFrame);
+
+    return () => {
+      socketService.off('dashboard_frame', handleDashboardFrame);
+    };
+  }, [dashboard]);
+
   // location_update - 위치 업데이트
   useEffect(() => {
     const handleLocationUpdate = (data) => {
@@ -5,6 +5,7 @@ class SocketService {
     this.socket = null;
     this.listeners = new Map();
     this.isConnected = false;
+    this.dashboard = null; // 마지막 대시보드 요약 (seq 포함)
   }
 
   /**
@@ -135,12 +136,50 @@ class SocketService {
       this.emit('sensor_summary', data);
     });
 
-    // dashboard_data - 대시보드 전체 데이터
+    // dashboard_frame - tick 동안의 밴드별 변경 묶음 {seq, fields, bands: [[bid, ...], ...]}
+    this.socket.on('dashboard_frame', (frame) => {
+      this.emit('dashboard_frame', frame);
+    });
+
+    // dashboard_data - 대시보드 전체 데이터 (구독/재동기화 시)
     this.socket.on('dashboard_data', (data) => {
       console.log('dashboard_data:', data);
+      this.dashboard = data;
       this.emit('dashboard_data', data);
     });
 
+    // dashboard_delta - 대시보드 변경분 {seq, delta: {항목: 증감값}, origin}
+    // seq는 발송 워커(origin)별로 이어지므로 origin이 다르면 seq를 비교하지 않고 재동기화
+    this.socket.on('dashboard_delta', (data) => {
+      const current = this.dashboard;
+      if (!current) {
+        return; // 스냅샷 도착 전
+      }
+      if (data.origin !== current.origin) {
+        // 리더 워커 교체 - 새 발송 워커의 전체 요약 재요청
+        console.log(`dashboard_delta origin changed: ${current.origin} -> ${data.origin}, resync`);
+        this.dashboard = null;
+        this.socket.emit('dashboard_resync');
+        return;
+      }
+      if (data.seq <= current.seq) {
+        return; // 스냅샷 이전 변경분
+      }
+      if (data.seq !== current.seq + 1) {
+        // seq 누락 - 전체 요약 재요청 (스냅샷 도착 전까지 변경분 무시)
+        console.log(`dashboard_delta gap: ${current.seq} -> ${data.seq}, resync`);
+        this.dashboard = null;
+        this.socket.emit('dashboard_resync');
+        return;
+      }
+      const next = { ...current, seq: data.seq };
+      Object.entries(data.delta).forEach(([key, value]) => {
+        next[key] = (next[key] || 0) + value;
+      });
+      this.dashboard = next;
+      this.emit('dashboard_data', next);
+    });
+
     // band_list - 밴드 목록
     this.socket.on('band_list', (data) => {
       console.log('band_list:', data);
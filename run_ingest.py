@@ -0,0 +1,63 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+MQTT 수집 전용 실행기
+
+웹 서버와 분리된 N개의 수집 프로세스를 띄우고 감시한다.
+웹 서버는 PROCESS_ROLE=web, 워커 간 Socket.IO 발송은 SOCKETIO_MESSAGE_QUEUE로 연결한다.
+
+    python run_ingest.py --workers 4
+    python run_ingest.py --workers 4 --mode hash --report-interval 5
+
+--mode share(MQTT 공유 구독)는 밴드별 순서와 밴드별 상태를 보장하지 않으므로 권장하지 않음
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+
+# backend 패키지를 불러올 때 웹/수집 기능이 시작되지 않도록 먼저 지정
+os.environ['PROCESS_ROLE'] = 'ingest'
+
+from backend.ingest_supervisor import IngestSupervisor, SHARD_MODES, run_ingest_worker
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Wellsafer MQTT ingest runner')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('INGEST_WORKERS', 2)),
+                        help='number of ingest worker processes')
+    parser.add_argument('--mode', choices=SHARD_MODES, default=os.environ.get('MQTT_SHARD_MODE', 'hash'),
+                        help="'hash' = filter by bid hash (default), 'share' = MQTT shared subscription (no per-band ordering)")
+    parser.add_argument('--report-interval', type=float,
+                        default=float(os.environ.get('INGEST_REPORT_INTERVAL', 10)),
+                        help='seconds between per-worker throughput reports')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if not os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+        logging.warning("SOCKETIO_MESSAGE_QUEUE is not set; realtime emits from ingest workers "
+                        "will not reach web clients")
+
+    supervisor = IngestSupervisor(
+        run_ingest_worker,
+        workers=args.workers,
+        mode=args.mode,
+        report_interval=args.report_interval
+    )
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.append(signum))
+
+    supervisor.run(should_stop=lambda: bool(stopping))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())